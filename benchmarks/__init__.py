@@ -0,0 +1,40 @@
+"""
+==========
+Benchmarks
+==========
+
+Performance benchmarks for the workflow model, the signal manager, the
+canvas, workflow I/O, the node properties serialization, the widget
+registry and the widget search.
+
+The layout is compatible with `asv <https://asv.readthedocs.io>`_: every
+``bench_*`` module defines classes with ``time_*`` (and ``track_*``)
+methods, optionally parameterized with ``params``/``param_names`` and
+prepared by ``setup(*params)``. The benchmarks can also be run without
+asv::
+
+    python -m benchmarks run -o results.json
+    python -m benchmarks compare base.json results.json --threshold 1.2
+
+The results are written in the pytest-benchmark JSON format.
+
+Qt is always used with the offscreen platform (unless `QT_QPA_PLATFORM`
+is already set).
+"""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+_app = None
+
+
+def application():
+    """
+    Return the `QApplication` instance (create one if needed).
+    """
+    global _app
+    from AnyQt.QtWidgets import QApplication
+    app = QApplication.instance()
+    if app is None:
+        app = _app = QApplication(["benchmarks"])
+    return app
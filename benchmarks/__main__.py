@@ -0,0 +1,370 @@
+"""
+Run the benchmarks or compare two result files.
+
+Run with::
+
+    python -m benchmarks run [-k PATTERN] [-o results.json] [--quick]
+    python -m benchmarks compare base.json results.json [--threshold 1.2]
+
+`run` times every ``time_*`` method of the classes in the ``bench_*``
+modules (for all combinations of the class's ``params``) and writes the
+results in the pytest-benchmark JSON format. The values returned by the
+``track_*`` methods (in their ``unit``) are recorded as single rounds. The benchmark names are
+``module.Class.time_method[param-param]`` and `PATTERN` is a regular
+expression searched for in them.
+
+`compare` prints the ratio of a timing statistic (the median by default)
+for every benchmark in both files and exits with status 1 if any ratio
+exceeds the threshold.
+"""
+import os
+import re
+import sys
+import json
+import time
+import inspect
+import platform
+import argparse
+import datetime
+import importlib
+import itertools
+import statistics
+import subprocess
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import benchmarks
+
+STATS = ["min", "max", "mean", "median"]
+
+
+def benchmark_modules():
+    # type: () -> List[Any]
+    """Return all the ``bench_*`` modules."""
+    directory = os.path.dirname(benchmarks.__file__)
+    names = sorted(name[:-3] for name in os.listdir(directory)
+                   if name.startswith("bench_") and name.endswith(".py"))
+    return [importlib.import_module("benchmarks." + name) for name in names]
+
+
+def benchmark_classes(module):
+    # type: (Any) -> List[type]
+    """
+    Return the benchmark classes (with ``time_*`` or ``track_*`` methods)
+    in `module`.
+    """
+    return [cls for _, cls in inspect.getmembers(module, inspect.isclass)
+            if cls.__module__ == module.__name__ and benchmark_methods(cls)]
+
+
+def benchmark_methods(cls):
+    # type: (type) -> List[str]
+    return sorted(name for name in dir(cls)
+                  if name.startswith(("time_", "track_")))
+
+
+def parameters(cls):
+    # type: (type) -> Tuple[List[str], List[tuple]]
+    """
+    Return the parameter names and all parameter combinations of a
+    benchmark class (following the asv conventions).
+    """
+    params = getattr(cls, "params", [])
+    if not params:
+        return [], [()]
+    if not isinstance(params[0], (list, tuple)):
+        params = [params]
+    names = list(getattr(cls, "param_names", []))
+    names += ["param{}".format(i + 1) for i in range(len(names), len(params))]
+    return names, list(itertools.product(*params))
+
+
+def param_id(params):
+    # type: (tuple) -> str
+    return "-".join(map(str, params))
+
+
+def measure(func, min_time, min_rounds, max_rounds, warmup=True):
+    # type: (Callable[[], Any], float, int, int, bool) -> List[float]
+    """
+    Call `func` repeatedly and return the durations (in seconds).
+
+    `func` is called at least `min_rounds` and at most `max_rounds` times
+    and until at least `min_time` seconds have passed.
+    """
+    if warmup:
+        func()
+    times = []  # type: List[float]
+    total = 0.0
+    while len(times) < max_rounds and \
+            (len(times) < min_rounds or total < min_time):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        total += elapsed
+    return times
+
+
+def compute_stats(times):
+    # type: (List[float]) -> Dict[str, float]
+    data = sorted(times)
+    if len(data) > 1:
+        q1, _, q3 = statistics.quantiles(data, n=4)
+        stddev = statistics.stdev(data)
+    else:
+        q1 = q3 = data[0]
+        stddev = 0.0
+    mean = statistics.mean(data)
+    return {
+        "min": data[0],
+        "max": data[-1],
+        "mean": mean,
+        "stddev": stddev,
+        "median": statistics.median(data),
+        "q1": q1,
+        "q3": q3,
+        "iqr": q3 - q1,
+        "rounds": len(data),
+        "iterations": 1,
+        "total": sum(data),
+        "ops": 1 / mean if mean > 0 else 0.0,
+    }
+
+
+def run(pattern=None, min_time=0.2, min_rounds=3, max_rounds=1000,
+        warmup=True, report=None):
+    # type: (Optional[str], float, int, int, bool, Optional[Callable[[Dict[str, Any]], None]]) -> List[Dict[str, Any]]
+    """
+    Run the benchmarks whose names match the `pattern` regular expression
+    and return the results (pytest-benchmark 'benchmarks' entries).
+    """
+    regex = re.compile(pattern) if pattern else None
+    results = []
+    for module in benchmark_modules():
+        group = module.__name__.rsplit(".", 1)[-1]
+        for cls in benchmark_classes(module):
+            names, combinations = parameters(cls)
+            for params in combinations:
+                pid = param_id(params)
+                suffix = "[{}]".format(pid) if pid else ""
+                methods = [
+                    (method, "{}.{}.{}{}".format(group, cls.__name__, method,
+                                                 suffix))
+                    for method in benchmark_methods(cls)
+                ]
+                methods = [(method, fullname) for method, fullname in methods
+                           if regex is None or regex.search(fullname)]
+                if not methods:
+                    continue
+                instance = cls()
+                try:
+                    if hasattr(instance, "setup"):
+                        instance.setup(*params)
+                except NotImplementedError:
+                    # asv convention for skipping a parameter combination
+                    continue
+                try:
+                    for method, fullname in methods:
+                        func = getattr(instance, method)
+                        extra_info = {}  # type: Dict[str, Any]
+                        if method.startswith("track_"):
+                            values = [float(func(*params))]
+                            extra_info["unit"] = getattr(func, "unit",
+                                                         "unit")
+                        else:
+                            values = measure(lambda: func(*params), min_time,
+                                             min_rounds, max_rounds, warmup)
+                        result = {
+                            "group": group,
+                            "name": method + suffix,
+                            "fullname": fullname,
+                            "params": dict(zip(names, params)),
+                            "param": pid,
+                            "extra_info": extra_info,
+                            "stats": compute_stats(values),
+                        }
+                        results.append(result)
+                        if report is not None:
+                            report(result)
+                finally:
+                    if hasattr(instance, "teardown"):
+                        instance.teardown(*params)
+    return results
+
+
+def commit_info():
+    # type: () -> Dict[str, Any]
+    directory = os.path.dirname(os.path.dirname(benchmarks.__file__))
+
+    def git(*args):
+        return subprocess.run(
+            ("git",) + args, cwd=directory, check=True,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            universal_newlines=True
+        ).stdout.strip()
+    try:
+        return {
+            "id": git("rev-parse", "HEAD"),
+            "branch": git("rev-parse", "--abbrev-ref", "HEAD"),
+            "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        }
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+
+
+def machine_info():
+    # type: () -> Dict[str, Any]
+    return {
+        "node": platform.node(),
+        "processor": platform.processor(),
+        "machine": platform.machine(),
+        "python_implementation": platform.python_implementation(),
+        "python_version": platform.python_version(),
+        "system": platform.system(),
+        "release": platform.release(),
+        "cpu": {"count": os.cpu_count()},
+    }
+
+
+def results_document(results):
+    # type: (List[Dict[str, Any]]) -> Dict[str, Any]
+    return {
+        "machine_info": machine_info(),
+        "commit_info": commit_info(),
+        "benchmarks": results,
+        "datetime": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "version": "1",
+    }
+
+
+def format_time(seconds):
+    # type: (float) -> str
+    for unit, scale in [("s", 1), ("ms", 1e-3), ("us", 1e-6)]:
+        if seconds >= scale:
+            return "{:.3f} {}".format(seconds / scale, unit)
+    return "{:.3f} ns".format(seconds / 1e-9)
+
+
+def format_value(value, unit=None):
+    # type: (float, Optional[str]) -> str
+    """Format a time (`unit` is None) or a tracked value."""
+    if unit is None:
+        return format_time(value)
+    return "{:.3f} {}".format(value, unit)
+
+
+def compare(base, current, threshold=1.2, stat="median", stream=None):
+    # type: (Dict[str, Any], Dict[str, Any], float, str, Any) -> List[str]
+    """
+    Compare two results documents and return the names of the benchmarks
+    whose `stat` in `current` is more than `threshold` times the `base`.
+    """
+    if stream is None:
+        stream = sys.stdout
+    base_ = {b["fullname"]: b["stats"][stat] for b in base["benchmarks"]}
+    current_ = {b["fullname"]: b["stats"][stat]
+                for b in current["benchmarks"]}
+    units = {}  # type: Dict[str, Optional[str]]
+    for b in base["benchmarks"] + current["benchmarks"]:
+        if units.get(b["fullname"]) is None:
+            units[b["fullname"]] = b.get("extra_info", {}).get("unit")
+    slower = []
+    width = max(map(len, list(base_) + list(current_) + ["benchmark"]))
+    row = "{:<%d} {:>12} {:>12} {:>8} {}" % width
+    stream.write(row.format("benchmark", "base", "current", "ratio", "")
+                 .rstrip() + "\n")
+    for name in sorted(set(base_) | set(current_)):
+        if name not in current_:
+            stream.write(row.format(name, format_value(base_[name],
+                                                       units[name]),
+                                    "-", "-", "(missing)") + "\n")
+            continue
+        if name not in base_:
+            stream.write(row.format(name, "-",
+                                    format_value(current_[name], units[name]),
+                                    "-", "(new)") + "\n")
+            continue
+        ratio = current_[name] / base_[name] if base_[name] > 0 else 1.0
+        mark = ""
+        if ratio > threshold:
+            slower.append(name)
+            mark = "SLOWER"
+        elif ratio < 1 / threshold:
+            mark = "faster"
+        stream.write(row.format(name, format_value(base_[name], units[name]),
+                                format_value(current_[name], units[name]),
+                                "{:.2f}".format(ratio), mark).rstrip() + "\n")
+    return slower
+
+
+def arg_parser():
+    # type: () -> argparse.ArgumentParser
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+    run_ = commands.add_parser("run", help="Run the benchmarks")
+    run_.add_argument("-k", "--pattern", default=None,
+                      help="Only run benchmarks matching the regular "
+                           "expression")
+    run_.add_argument("-o", "--output", default=None,
+                      help="Write the results (JSON) to a file")
+    run_.add_argument("--min-time", type=float, default=0.2,
+                      help="Minimum total time per benchmark (seconds)")
+    run_.add_argument("--min-rounds", type=int, default=3)
+    run_.add_argument("--max-rounds", type=int, default=1000)
+    run_.add_argument("--quick", action="store_true",
+                      help="Run every benchmark once (no warmup)")
+    compare_ = commands.add_parser(
+        "compare", help="Compare two result files"
+    )
+    compare_.add_argument("base")
+    compare_.add_argument("current")
+    compare_.add_argument("--threshold", type=float, default=1.2,
+                          help="Fail if the current/base ratio exceeds the "
+                               "threshold (default 1.2)")
+    compare_.add_argument("--stat", choices=STATS, default="median",
+                          help="The compared statistic (default median)")
+    return parser
+
+
+def main(argv=None):
+    # type: (Optional[List[str]]) -> int
+    if argv is None:
+        argv = sys.argv
+    options = arg_parser().parse_args(argv[1:])
+    if options.command == "compare":
+        with open(options.base, "r") as f:
+            base = json.load(f)
+        with open(options.current, "r") as f:
+            current = json.load(f)
+        slower = compare(base, current, options.threshold, options.stat)
+        if slower:
+            print("{} benchmark(s) slower than the threshold ({:.2f})"
+                  .format(len(slower), options.threshold))
+            return 1
+        return 0
+
+    def report(result):
+        # type: (Dict[str, Any]) -> None
+        stats = result["stats"]
+        print("{:<70} {:>12} ({} rounds)".format(
+            result["fullname"],
+            format_value(stats["median"], result["extra_info"].get("unit")),
+            stats["rounds"]), flush=True)
+
+    if options.quick:
+        kwargs = dict(min_time=0, min_rounds=1, max_rounds=1, warmup=False)
+    else:
+        kwargs = dict(min_time=options.min_time,
+                      min_rounds=options.min_rounds,
+                      max_rounds=options.max_rounds)
+    results = run(options.pattern, report=report, **kwargs)
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(results_document(results), f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
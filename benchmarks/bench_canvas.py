@@ -0,0 +1,129 @@
+"""
+Canvas scene benchmarks.
+"""
+from AnyQt.QtWidgets import QApplication
+
+from orangecanvas.canvas.scene import CanvasScene
+from orangecanvas.canvas.view import CanvasView
+from orangecanvas.canvas.overview import CanvasOverview
+from orangecanvas.registry.tests import small_testing_registry
+
+from . import application
+from .generators import GENERATORS, generate
+
+
+class SetScheme:
+    """Populate a `CanvasScene` from a workflow."""
+    params = [[10, 100, 1000], list(GENERATORS)]
+    param_names = ["nodes", "topology"]
+
+    def setup(self, nodes, topology):
+        application()
+        self.registry = small_testing_registry()
+        self.workflow = generate(topology, nodes, self.registry)
+
+    def time_set_scheme(self, nodes, topology):
+        scene = CanvasScene()
+        scene.set_registry(self.registry)
+        scene.set_scheme(self.workflow)
+        scene.clear_scene()
+        scene.deleteLater()
+
+
+class VirtualizedScene:
+    """
+    Load a workflow into a `CanvasScene` shown in a `CanvasView` and pan
+    over it, with all the items created ('full') or in the virtualized
+    mode ('virtual').
+    """
+    params = [[1000, 20000], ["full", "virtual"]]
+    param_names = ["nodes", "mode"]
+
+    def setup(self, nodes, mode):
+        if nodes > 1000 and mode == "full":
+            # takes minutes
+            raise NotImplementedError
+        application()
+        self.registry = small_testing_registry()
+        self.workflow = generate("chain", nodes, self.registry)
+        self.scene = self.new_scene(mode)
+        self.view = CanvasView(self.scene)
+        self.view.resize(1200, 800)
+        self.view.show()
+        self.scene.set_scheme(self.workflow)
+        # update the scene rect
+        QApplication.processEvents()
+
+    def teardown(self, nodes, mode):
+        self.scene.clear_scene()
+        self.view.deleteLater()
+        self.scene.deleteLater()
+
+    def new_scene(self, mode):
+        scene = CanvasScene()
+        scene.set_registry(self.registry)
+        scene.set_virtualized(mode == "virtual")
+        return scene
+
+    def time_load(self, nodes, mode):
+        scene = self.new_scene(mode)
+        view = CanvasView(scene)
+        view.resize(1200, 800)
+        scene.set_scheme(self.workflow)
+        scene.clear_scene()
+        view.deleteLater()
+        scene.deleteLater()
+
+    def time_pan(self, nodes, mode):
+        # pan one view width in 20 steps (repainting after each)
+        bar = self.view.horizontalScrollBar()
+        viewport = self.view.viewport()
+        start = bar.value()
+        for i in range(1, 21):
+            bar.setValue(start + 60 * i)
+            viewport.repaint()
+        bar.setValue(start)
+
+
+class Overview:
+    """
+    Move a node and update the `CanvasOverview` render incrementally or
+    by rendering the whole scene ('full').
+    """
+    params = [[100, 1000], ["incremental", "full"]]
+    param_names = ["nodes", "mode"]
+
+    def setup(self, nodes, mode):
+        application()
+        self.registry = small_testing_registry()
+        self.workflow = generate("chain", nodes, self.registry)
+        self.scene = CanvasScene()
+        self.scene.set_registry(self.registry)
+        self.scene.set_node_animation_enabled(False)
+        self.scene.set_scheme(self.workflow)
+        self.view = CanvasView(self.scene)
+        self.view.resize(800, 600)
+        self.view.show()
+        self.overview = CanvasOverview(view=self.view)
+        if mode == "full":
+            self.overview.FullRenderThreshold = 0
+        self.overview.resize(300, 200)
+        self.overview.show()
+        QApplication.processEvents()
+        self.overview.renderPending()
+        self.node = self.workflow.nodes[len(self.workflow.nodes) // 2]
+        self.position = self.node.position
+
+    def teardown(self, nodes, mode):
+        self.overview.setView(None)
+        self.overview.deleteLater()
+        self.scene.clear_scene()
+        self.view.deleteLater()
+        self.scene.deleteLater()
+
+    def time_move_node(self, nodes, mode):
+        x, y = self.position
+        for dx in [10, 20, 10, 0]:
+            self.node.position = (x + dx, y)
+            QApplication.processEvents()
+            self.overview.renderPending()
@@ -0,0 +1,52 @@
+"""
+Widget discovery benchmarks.
+"""
+from orangecanvas.registry import WidgetRegistry, CategoryDescription
+from orangecanvas.registry.discovery import WidgetDiscovery
+from orangecanvas.registry.tests import make_module
+
+
+class EntryPoint:
+    """A minimal stand in for `importlib.metadata.EntryPoint`."""
+    def __init__(self, name, obj):
+        self.name = name
+        self.obj = obj
+        self.dist = None
+
+    def load(self):
+        return self.obj
+
+
+def widget_modules(n):
+    return [
+        make_module(
+            "widget{}".format(i), __name__,
+            NAME="Widget {}".format(i),
+            DESCRIPTION="A synthetic widget number {}".format(i),
+            CATEGORY="Category {}".format(i % 20),
+            PRIORITY=(i * 7919) % 1000,
+            INPUTS=[("In {}".format(j), int, "set_{}".format(j))
+                    for j in range(3)],
+            OUTPUTS=[("Out {}".format(j), int) for j in range(2)],
+            WIDGET_CLASS="Widget",
+            Widget=None,
+        )
+        for i in range(n)
+    ]
+
+
+class Discovery:
+    """`WidgetDiscovery.run` over widget module entry points."""
+    params = [10, 100, 1000]
+    param_names = ["widgets"]
+
+    def setup(self, widgets):
+        categories = [CategoryDescription("Category {}".format(i), priority=i)
+                      for i in range(20)]
+        self.entry_points = [EntryPoint("categories", categories)] + [
+            EntryPoint("Widget {}".format(i), module)
+            for i, module in enumerate(widget_modules(widgets))
+        ]
+
+    def time_run(self, widgets):
+        WidgetDiscovery(WidgetRegistry()).run(self.entry_points)
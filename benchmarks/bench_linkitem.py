@@ -0,0 +1,150 @@
+"""
+Link label layout benchmarks.
+
+A hub node connected to many nodes is dragged. The label text layout is
+rebuilt on every curve change ('baseline', the previous implementation) or
+cached ('current').
+"""
+import math
+from collections import Counter
+from unittest import mock
+from xml.sax.saxutils import escape
+
+from AnyQt.QtWidgets import QGraphicsScene
+from AnyQt.QtGui import QTextDocument, QPainterPath, QTransform
+from AnyQt.QtCore import QPointF
+
+from orangecanvas.canvas.items import NodeItem, LinkItem
+from orangecanvas.canvas.items.graphicstextitem import GraphicsTextItem
+from orangecanvas.registry.tests import small_testing_registry
+
+from . import application
+
+
+def baseline_update_curve(self):
+    # type: (LinkItem) -> None
+    # The previous LinkItem.__updateCurve/__updateText
+    self.prepareGeometryChange()
+    if self.sourceAnchor and self.sinkAnchor:
+        source_pos = self.curveItem.mapFromScene(
+            self.sourceAnchor.anchorScenePos())
+        sink_pos = self.curveItem.mapFromScene(
+            self.sinkAnchor.anchorScenePos())
+        delta = source_pos - sink_pos
+        dist = math.sqrt(delta.x() ** 2 + delta.y() ** 2)
+        cp_offset = min(dist / 2.0, 60.0)
+        path = QPainterPath()
+        path.moveTo(source_pos)
+        path.cubicTo(source_pos + QPointF(cp_offset, 0),
+                     sink_pos - QPointF(cp_offset, 0),
+                     sink_pos)
+        self.curveItem.setCurvePath(path)
+        baseline_update_text(self)
+    else:
+        self.setHoverState(False)
+        self.curveItem.setPath(QPainterPath())
+
+
+def baseline_update_text(self):
+    # type: (LinkItem) -> None
+    text = ("<nobr>{0}</nobr> → <nobr>{1}</nobr>"
+            .format(escape(self.sourceName()), escape(self.sinkName())))
+    self.linkTextItem.setHtml(
+        '<div align="center" style="font-size: small" >{0}</div>'
+        .format(text))
+    path = self.curveItem.curvePath()
+    if not path.isEmpty():
+        diff = path.pointAtPercent(0.0) - path.pointAtPercent(1.0)
+        available_width = math.sqrt(diff.x() ** 2 + diff.y() ** 2)
+        doc = self.linkTextItem.document().clone(self)
+        doc.setTextWidth(-1)
+        idealwidth = doc.idealWidth()
+        doc.deleteLater()
+        textwidth = max(100, min(available_width, idealwidth))
+        self.linkTextItem.setTextWidth(textwidth)
+    else:
+        self.linkTextItem.setTextWidth(-1)
+    if not path.isEmpty():
+        center = path.pointAtPercent(0.5)
+        angle = path.angleAtPercent(0.5)
+        brect = self.linkTextItem.boundingRect()
+        transform = QTransform()
+        transform.translate(center.x(), center.y())
+        if 90 <= angle < 270:
+            transform.rotate(180 - angle)
+        else:
+            transform.rotate(-angle)
+        transform.translate(-brect.width() / 2, -brect.height())
+        self.linkTextItem.setTransform(transform)
+
+
+def counting(counter, name, func):
+    def wrapper(*args, **kwargs):
+        counter[name] += 1
+        return func(*args, **kwargs)
+    return wrapper
+
+
+class DragHub:
+    params = [[50, 200], ["baseline", "current"]]
+    param_names = ["links", "implementation"]
+    #: The number of drag steps
+    steps = 50
+
+    def setup(self, links, implementation):
+        application()
+        reg = small_testing_registry()
+        self.scene = QGraphicsScene()
+        self.hub = NodeItem(reg.widget("one"))
+        self.scene.addItem(self.hub)
+        for i in range(links):
+            node = NodeItem(reg.widget("negate"))
+            node.setPos(400, i * 40)
+            self.scene.addItem(node)
+            link = LinkItem()
+            link.setSourceItem(self.hub)
+            link.setSinkItem(node)
+            link.setSourceName("value")
+            link.setSinkName("value {}".format(i % 3))
+            self.scene.addItem(link)
+        self.patch = None
+        if implementation == "baseline":
+            self.patch = mock.patch.object(
+                LinkItem, "_LinkItem__updateCurve", baseline_update_curve)
+            self.patch.start()
+
+    def teardown(self, links, implementation):
+        if self.patch is not None:
+            self.patch.stop()
+        self.scene.clear()
+        self.scene.deleteLater()
+
+    def drag(self):
+        for i in range(self.steps):
+            self.hub.setPos(i * 0.7, i * 2.3)
+
+    def time_drag(self, links, implementation):
+        self.drag()
+
+    def track_text_layouts(self, links, implementation):
+        # The number of label text (re)layouts (`setHtml`, `setTextWidth`
+        # and the document clones used for measuring)
+        counter = Counter()  # type: Counter
+        patches = [
+            mock.patch.object(GraphicsTextItem, name, counting(
+                counter, name, getattr(GraphicsTextItem, name)))
+            for name in ["setHtml", "setTextWidth"]
+        ] + [
+            mock.patch.object(QTextDocument, "clone", counting(
+                counter, "clone", QTextDocument.clone))
+        ]
+        for p in patches:
+            p.start()
+        try:
+            self.drag()
+        finally:
+            for p in patches:
+                p.stop()
+        return sum(counter.values())
+
+    track_text_layouts.unit = "calls"
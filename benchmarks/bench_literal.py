@@ -0,0 +1,81 @@
+"""
+Node properties literal serialization benchmarks.
+
+The `readwrite.literal_dumps`/`readwrite.literal_loads` are compared with
+the previous implementation (a validating walk followed by
+`repr`/`pprint.pformat` and `ast.literal_eval`).
+"""
+import math
+import numbers
+import pprint
+import random
+from ast import literal_eval
+from itertools import chain
+
+from orangecanvas.scheme import readwrite
+
+
+def baseline_literal_dumps(obj, indent=None):
+    # The previous readwrite.literal_dumps (relaxed type check)
+    memo = {}
+    builtins = {int, float, bool, type(None), str, bytes}
+
+    def check_relaxed(obj):
+        if isinstance(obj, numbers.Real) and not math.isfinite(obj):
+            raise TypeError
+        if type(obj) in builtins:
+            return True
+        if id(obj) in memo:
+            raise ValueError
+        memo[id(obj)] = obj
+        if type(obj) in {list, tuple}:
+            return all(map(check_relaxed, obj))
+        elif type(obj) in {dict}:
+            return all(map(check_relaxed, chain(obj.keys(), obj.values())))
+        raise TypeError
+
+    check_relaxed(obj)
+    if indent is not None:
+        return pprint.pformat(obj, width=80 * 2, indent=indent, compact=True)
+    else:
+        return repr(obj)
+
+
+def payload(name):
+    rng = random.Random(0)
+    if name == "floats":
+        return {"values": [rng.random() for _ in range(100000)]}
+    elif name == "ints":
+        return {"values": list(range(100000))}
+    elif name == "table":
+        return {"rows": [(i, "name {}".format(i), rng.random(), None, True)
+                         for i in range(20000)]}
+    elif name == "nested":
+        return {"items": {
+            "key {}".format(i): {"a": [i, i + 1], "b": {"c": (i, "d")}}
+            for i in range(10000)
+        }}
+    raise ValueError(name)
+
+
+class Literal:
+    params = [["floats", "ints", "table", "nested"], ["baseline", "current"]]
+    param_names = ["payload", "implementation"]
+
+    def setup(self, payload_, implementation):
+        self.obj = payload(payload_)
+        self.contents = repr(self.obj)
+        if implementation == "baseline":
+            self.dumps, self.loads = baseline_literal_dumps, literal_eval
+        else:
+            self.dumps = readwrite.literal_dumps
+            self.loads = readwrite.literal_loads
+
+    def time_dumps(self, payload_, implementation):
+        self.dumps(self.obj)
+
+    def time_dumps_indent(self, payload_, implementation):
+        self.dumps(self.obj, indent=1)
+
+    def time_loads(self, payload_, implementation):
+        self.loads(self.contents)
@@ -0,0 +1,73 @@
+"""
+Node properties snapshot history benchmarks.
+
+A workflow's node properties (large settings dicts) are edited (every edit
+changes a single setting of a single node) and a snapshot of all node
+properties is kept after every edit (as an undo history or a journal
+would). Full copies (`copy.deepcopy`) are compared with
+:class:`PropertyStore` snapshots.
+"""
+import copy
+import random
+import tracemalloc
+
+from typing import Any, Callable, Dict, List
+
+from orangecanvas.scheme.propertystore import PropertyStore
+
+
+def node_properties(i):
+    # type: (int) -> Dict[str, Any]
+    return {
+        "controlAreaVisible": True,
+        "savedWidgetGeometry": bytes(range(256)) * 4,
+        "selection": list(range(i, i + 2000)),
+        "domain_role_hints": {
+            ("feature {}".format(j), j % 3): ("attribute", j)
+            for j in range(200)
+        },
+        "threshold": 0.5,
+        "__version__": 2,
+    }
+
+
+def history(nodes, edits, snapshot):
+    # type: (int, int, Callable[[Dict[str, Any]], Any]) -> List[Any]
+    rng = random.Random(0)
+    props = [node_properties(i) for i in range(nodes)]
+    snapshots = []
+    for _ in range(edits):
+        k = rng.randrange(nodes)
+        props[k] = dict(props[k], threshold=rng.random())
+        snapshots.append([snapshot(p) for p in props])
+    return snapshots
+
+
+class SnapshotHistory:
+    params = [[10], [100, 1000], ["deepcopy", "store"]]
+    param_names = ["nodes", "edits", "snapshot"]
+    timeout = 300
+
+    def snapshot(self, snapshot):
+        # type: (str) -> Callable[[Dict[str, Any]], Any]
+        if snapshot == "deepcopy":
+            return copy.deepcopy
+        return PropertyStore().snapshot
+
+    def time_history(self, nodes, edits, snapshot):
+        history(nodes, edits, self.snapshot(snapshot))
+
+    def track_memory(self, nodes, edits, snapshot):
+        # The memory (in MB) used by the snapshot history
+        func = self.snapshot(snapshot)
+        tracemalloc.start()
+        try:
+            base = tracemalloc.get_traced_memory()[0]
+            snapshots = history(nodes, edits, func)
+            usage = tracemalloc.get_traced_memory()[0] - base
+        finally:
+            tracemalloc.stop()
+        del snapshots
+        return usage / 2 ** 20
+
+    track_memory.unit = "MB"
@@ -0,0 +1,107 @@
+"""
+Widget registry and widget toolbox population benchmarks (with a large
+number of synthetic widgets).
+"""
+from typing import List
+
+from orangecanvas.registry import (
+    WidgetRegistry, WidgetDescription, CategoryDescription, InputSignal,
+    OutputSignal
+)
+from orangecanvas.registry.qt import QtWidgetRegistry
+from orangecanvas.application.widgettoolbox import WidgetToolBox
+
+from . import application
+
+
+def synthetic_widgets(n, ncategories=20):
+    # type: (int, int) -> List[WidgetDescription]
+    return [
+        WidgetDescription(
+            "Widget {}".format(i), "widget-{}".format(i),
+            category="Category {}".format(i % ncategories),
+            qualified_name="{}.widget{}".format(__name__, i),
+            package=__package__,
+            description="A synthetic widget number {}".format(i),
+            priority=(i * 7919) % 1000,
+            inputs=[InputSignal("In {}".format(j), "int", "set_{}".format(j))
+                    for j in range(3)],
+            outputs=[OutputSignal("Out {}".format(j), "int")
+                     for j in range(2)],
+        )
+        for i in range(n)
+    ]
+
+
+def categories(n=20):
+    # type: (int) -> List[CategoryDescription]
+    return [CategoryDescription("Category {}".format(i), priority=i,
+                                package=__package__)
+            for i in range(n)]
+
+
+def populate(descs, bulk=True):
+    # type: (List[WidgetDescription], bool) -> WidgetRegistry
+    reg = WidgetRegistry()
+    for cat in categories():
+        reg.register_category(cat)
+    if bulk:
+        reg.register_widgets(descs)
+    else:
+        for desc in descs:
+            reg.register_widget(desc)
+    return reg
+
+
+def resolve_all(reg):
+    # type: (QtWidgetRegistry) -> None
+    model = reg.model()
+    for i in range(model.rowCount()):
+        cat = model.item(i)
+        cat.icon()
+        for j in range(cat.rowCount()):
+            item = cat.child(j)
+            item.icon()
+            item.toolTip()
+            item.whatsThis()
+            item.data(QtWidgetRegistry.WIDGET_ACTION_ROLE)
+
+
+class Populate:
+    """
+    Populate a `WidgetRegistry` with `register_widget` (a sorted insert of
+    every widget) or with `register_widgets` (one sort per category).
+    """
+    params = [[100, 1000], ["single", "bulk"]]
+    param_names = ["widgets", "mode"]
+
+    def setup(self, widgets, mode):
+        self.descs = synthetic_widgets(widgets)
+
+    def time_populate(self, widgets, mode):
+        populate(self.descs, bulk=mode == "bulk")
+
+
+class QtRegistry:
+    params = [[100, 1000]]
+    param_names = ["widgets"]
+
+    def setup(self, widgets):
+        application()
+        self.registry = populate(synthetic_widgets(widgets))
+
+    def time_construct(self, widgets):
+        # The item data is computed on first access
+        QtWidgetRegistry(self.registry)
+
+    def time_resolve_all(self, widgets):
+        # Construct and compute all the deferred item data (icons, tool
+        # tips, what's this and actions)
+        resolve_all(QtWidgetRegistry(self.registry))
+
+    def time_toolbox_set_model(self, widgets):
+        registry = QtWidgetRegistry(self.registry)
+        toolbox = WidgetToolBox()
+        toolbox.setModel(registry.model())
+        toolbox.setModel(None)
+        toolbox.deleteLater()
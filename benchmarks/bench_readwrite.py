@@ -0,0 +1,79 @@
+"""
+Workflow (.ows) serialization benchmarks.
+"""
+import io
+import os
+import shutil
+import tempfile
+
+from orangecanvas.registry.tests import small_testing_registry
+from orangecanvas.scheme import Scheme, readwrite
+
+from .generators import GENERATORS, generate
+
+
+class ReadWrite:
+    params = [[10, 100, 1000, 10000], list(GENERATORS)]
+    param_names = ["nodes", "topology"]
+
+    def setup(self, nodes, topology):
+        self.registry = small_testing_registry()
+        self.workflow = generate(topology, nodes, self.registry)
+        stream = io.BytesIO()
+        readwrite.scheme_to_ows_stream(self.workflow, stream)
+        self.contents = stream.getvalue()
+
+    def time_scheme_to_ows_stream(self, nodes, topology):
+        readwrite.scheme_to_ows_stream(self.workflow, io.BytesIO())
+
+    def time_scheme_load(self, nodes, topology):
+        readwrite.scheme_load(Scheme(), io.BytesIO(self.contents),
+                              registry=self.registry)
+
+
+def node_properties(i):
+    # A typical widget settings dict (nested containers of literals).
+    return {
+        "controlAreaVisible": True,
+        "savedWidgetGeometry": bytes(range(64)),
+        "selection": list(range(i % 50, i % 50 + 100)),
+        "domain_role_hints": {
+            ("feature {}".format(j), j % 3): ("attribute", j)
+            for j in range(40)
+        },
+        "title": "Node {}".format(i),
+        "__version__": 2,
+    }
+
+
+class IncrementalSave:
+    """
+    Save a workflow with large node properties after changing a single
+    node. The serialized properties of the unchanged nodes are reused
+    ('incremental') or the cache is cleared before the save ('full').
+    """
+    params = [[100, 500], ["full", "incremental"]]
+    param_names = ["nodes", "mode"]
+
+    def setup(self, nodes, mode):
+        self.workflow = generate("random", nodes)
+        for i, node in enumerate(self.workflow.nodes):
+            node.properties = node_properties(i)
+        self.node = self.workflow.nodes[nodes // 2]
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, "bench.ows")
+        self.counter = 0
+        self.workflow.save_to(self.filename, pretty=True,
+                              pickle_fallback=True)
+
+    def teardown(self, nodes, mode):
+        shutil.rmtree(self.tmpdir)
+
+    def time_save(self, nodes, mode):
+        self.counter += 1
+        self.node.properties = dict(self.node.properties,
+                                    counter=self.counter)
+        if mode == "full":
+            readwrite._properties_cache.clear()
+        self.workflow.save_to(self.filename, pretty=True,
+                              pickle_fallback=True)
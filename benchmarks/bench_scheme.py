@@ -0,0 +1,52 @@
+"""
+Workflow model benchmarks.
+"""
+from orangecanvas.registry.tests import small_testing_registry
+from orangecanvas.utils.graph import Graph
+
+from .generators import GENERATORS, generate
+
+SIZES = [10, 100, 1000, 10000]
+
+
+class Build:
+    """Build a workflow (`Scheme.new_node`/`Scheme.new_link`)."""
+    params = [SIZES, list(GENERATORS)]
+    param_names = ["nodes", "topology"]
+
+    def setup(self, nodes, topology):
+        self.registry = small_testing_registry()
+
+    def time_build(self, nodes, topology):
+        generate(topology, nodes, self.registry)
+
+
+class Query:
+    """Query the links and the graph of a workflow."""
+    params = [SIZES, list(GENERATORS)]
+    param_names = ["nodes", "topology"]
+
+    def setup(self, nodes, topology):
+        self.workflow = generate(topology, nodes)
+        self.nodes = self.workflow.nodes
+
+    def time_find_links(self, nodes, topology):
+        find_links = self.workflow.find_links
+        for node in self.nodes:
+            find_links(source_node=node)
+            find_links(sink_node=node)
+
+    def time_find_links_channel(self, nodes, topology):
+        find_links = self.workflow.find_links
+        for link in self.workflow.links:
+            find_links(link.source_node, link.source_channel,
+                       link.sink_node, link.sink_channel)
+
+    def time_downstream_nodes(self, nodes, topology):
+        for node in self.nodes[:10]:
+            self.workflow.downstream_nodes(node)
+
+    def time_graph_scc(self, nodes, topology):
+        edges = [(link.source_node, link.sink_node)
+                 for link in self.workflow.links]
+        Graph(self.nodes, edges).strongly_connected_components()
@@ -0,0 +1,107 @@
+"""
+Widget search (toolbox and quick menu filter) benchmarks.
+
+The keystroke benchmarks type a query one character at a time and filter
+all the widgets after every keystroke.
+"""
+from orangecanvas.registry import (
+    WidgetRegistry, WidgetDescription, CategoryDescription
+)
+from orangecanvas.registry.qt import QtWidgetRegistry
+from orangecanvas.registry.search import WidgetSearchIndex
+from orangecanvas.registry.utils import search_filter_query_helper
+
+from . import application
+
+#: The typed queries (a name match, a keyword match and no match)
+QUERIES = ["widget 4217", "clust", "no such widget"]
+
+KEYWORDS = ["data", "clustering", "k-means", "scatter-plot", "regression",
+            "tree", "file", "import", "text-mining", "image"]
+
+
+def synthetic_widgets(n, ncategories=20):
+    return [
+        WidgetDescription(
+            "Widget {}".format(i), "widget-{}".format(i),
+            category="Category {}".format(i % ncategories),
+            qualified_name="{}.widget{}".format(__name__, i),
+            priority=i % 1000,
+            keywords=[KEYWORDS[i % len(KEYWORDS)],
+                      KEYWORDS[(i * 7) % len(KEYWORDS)]],
+        )
+        for i in range(n)
+    ]
+
+
+def registry(descriptions, ncategories=20):
+    reg = WidgetRegistry()
+    for i in range(ncategories):
+        reg.register_category(
+            CategoryDescription("Category {}".format(i), priority=i))
+    reg.register_widgets(descriptions)
+    return reg
+
+
+def keystrokes(query):
+    return [query[:i] for i in range(1, len(query) + 1)]
+
+
+class Filter:
+    """
+    Filter the widget descriptions after every keystroke with the
+    `search_filter_query_helper` ('helper') or the `WidgetSearchIndex`.
+    """
+    params = [[500, 5000], ["helper", "index"]]
+    param_names = ["widgets", "method"]
+
+    def setup(self, widgets, method):
+        self.descriptions = synthetic_widgets(widgets)
+        self.index = WidgetSearchIndex(self.descriptions)
+
+    def time_keystrokes(self, widgets, method):
+        descriptions = self.descriptions
+        for query in QUERIES:
+            for text in keystrokes(query):
+                if method == "helper":
+                    [d for d in descriptions
+                     if search_filter_query_helper(d, text)]
+                else:
+                    match = self.index.predicate(text)
+                    [d for d in descriptions if match(d)]
+
+
+class BuildIndex:
+    """Build the `WidgetSearchIndex`."""
+    params = [500, 5000]
+    param_names = ["widgets"]
+
+    def setup(self, widgets):
+        self.registry = registry(synthetic_widgets(widgets))
+
+    def time_build(self, widgets):
+        WidgetSearchIndex.from_registry(self.registry)
+
+
+class ToolBoxFilter:
+    """Type the queries in the `WidgetToolBox` filter line edit."""
+    params = [500, 5000]
+    param_names = ["widgets"]
+
+    def setup(self, widgets):
+        from orangecanvas.application.widgettoolbox import WidgetToolBox
+        application()
+        self.registry = QtWidgetRegistry(registry(synthetic_widgets(widgets)))
+        self.toolbox = WidgetToolBox()
+        self.toolbox.setModel(self.registry.model())
+
+    def teardown(self, widgets):
+        self.toolbox.setModel(None)
+        self.toolbox.deleteLater()
+
+    def time_keystrokes(self, widgets):
+        edit = self.toolbox.filterLineEdit()
+        for query in QUERIES:
+            for text in keystrokes(query):
+                edit.setText(text)
+            edit.setText("")
@@ -0,0 +1,126 @@
+"""
+Signal propagation benchmarks.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, Future
+
+from typing import Dict
+
+from AnyQt.QtCore import QTimer, QEventLoop
+
+from orangecanvas.scheme import SchemeNode
+from orangecanvas.scheme.signalmanager import SignalManager
+
+from . import application
+from .generators import GENERATORS, generate
+
+
+class PropagatingSignalManager(SignalManager):
+    """Every node immediately sends a value on all its outputs."""
+    def send_to_node(self, node, signals):
+        for channel in node.description.outputs:
+            self.send(node, channel, len(signals))
+
+
+class Propagate:
+    """
+    Send a value from all sources and process the signals until the
+    workflow is quiescent.
+    """
+    params = [[10, 100, 1000], list(GENERATORS)]
+    param_names = ["nodes", "topology"]
+
+    def setup(self, nodes, topology):
+        self.workflow = generate(topology, nodes)
+        self.sources = [node for node in self.workflow.nodes
+                        if not node.description.inputs]
+
+    def time_propagate(self, nodes, topology):
+        manager = PropagatingSignalManager()
+        manager.set_workflow(self.workflow)
+        for node in self.sources:
+            manager.send(node, node.output_channels()[0], 1)
+        while manager.process_next():
+            pass
+        manager.set_workflow(None)
+
+
+def busy(seconds):
+    # type: (float) -> int
+    """Simulated CPU-bound work."""
+    end = time.perf_counter() + seconds
+    count = 0
+    while time.perf_counter() < end:
+        count += 1
+    return count
+
+
+class PoolSignalManager(SignalManager):
+    """
+    Every node (except the sources) runs a busy loop in a process pool and
+    stays active until it completes.
+    """
+    def __init__(self, executor, duration, **kwargs):
+        super().__init__(**kwargs)
+        self.executor = executor
+        self.duration = duration
+        self.tasks = {}  # type: Dict[SchemeNode, Future]
+        self.__poll = QTimer(self, interval=5)
+        self.__poll.timeout.connect(self.__collect)
+
+    def send_to_node(self, node, signals):
+        if not node.description.inputs:
+            return
+        node.set_state_flags(SchemeNode.Running, True)
+        self.tasks[node] = self.executor.submit(busy, self.duration)
+        self.__poll.start()
+
+    def __collect(self):
+        for node, task in list(self.tasks.items()):
+            if task.done():
+                del self.tasks[node]
+                node.set_state_flags(SchemeNode.Running, False)
+        if not self.tasks:
+            self.__poll.stop()
+
+
+class FanOutScheduling:
+    """
+    Schedule a wide fan-out workflow (a source feeding `2 * cpu count`
+    CPU-bound nodes) with different `max_running` capacities.
+    """
+    params = [[1, 2, 4]]
+    param_names = ["max_running"]
+    #: The duration of the work of a single node (in seconds)
+    duration = 0.05
+
+    def setup(self, max_running):
+        application()
+        ncpu = os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=ncpu)
+        # warm up the pool
+        list(self.executor.map(busy, [0.0] * ncpu))
+        self.workflow = generate("fan-out", 2 * ncpu + 1)
+
+    def teardown(self, max_running):
+        self.executor.shutdown()
+
+    def time_fan_out(self, max_running):
+        manager = PoolSignalManager(self.executor, self.duration,
+                                    max_running=max_running)
+        manager.set_workflow(self.workflow)
+        manager.start()
+        loop = QEventLoop()
+
+        def maybe_done():
+            if not manager.tasks and not manager.pending_nodes():
+                loop.quit()
+        poll = QTimer(interval=5)
+        poll.timeout.connect(maybe_done)
+        poll.start()
+        source = self.workflow.nodes[0]
+        manager.send(source, source.output_channels()[0], 1)
+        loop.exec()
+        poll.stop()
+        manager.set_workflow(None)
@@ -0,0 +1,138 @@
+"""
+Synthetic workflow generators.
+
+All workflows use the nodes from
+:func:`orangecanvas.registry.tests.small_testing_registry` ("one" sources,
+"negate" and "add" operators) laid out on a grid.
+"""
+import math
+import random
+
+from typing import Callable, Dict, Optional
+
+from orangecanvas.registry import WidgetRegistry
+from orangecanvas.registry.tests import small_testing_registry
+from orangecanvas.scheme import Scheme, SchemeNode
+
+__all__ = [
+    "chain", "fan_out", "diamond", "random_dag", "GENERATORS", "generate"
+]
+
+#: Node grid spacing
+DX, DY = 150, 100
+
+
+def _registry(registry):
+    # type: (Optional[WidgetRegistry]) -> WidgetRegistry
+    return registry if registry is not None else small_testing_registry()
+
+
+def _node(workflow, registry, name, x, y):
+    # type: (Scheme, WidgetRegistry, str, int, int) -> SchemeNode
+    return workflow.new_node(registry.widget(name), position=(x * DX, y * DY))
+
+
+def chain(n, registry=None):
+    # type: (int, Optional[WidgetRegistry]) -> Scheme
+    """
+    A chain of `n` nodes (a source followed by `n - 1` "negate" nodes).
+    """
+    registry = _registry(registry)
+    workflow = Scheme()
+    prev = _node(workflow, registry, "one", 0, 0)
+    width = max(int(math.sqrt(n)), 1)
+    for i in range(1, n):
+        node = _node(workflow, registry, "negate", i % width, i // width)
+        workflow.new_link(prev, prev.output_channels()[0], node, "value")
+        prev = node
+    return workflow
+
+
+def fan_out(n, registry=None):
+    # type: (int, Optional[WidgetRegistry]) -> Scheme
+    """
+    A single source connected to `n - 1` "negate" nodes.
+    """
+    registry = _registry(registry)
+    workflow = Scheme()
+    source = _node(workflow, registry, "one", 0, 0)
+    width = max(int(math.sqrt(n)), 1)
+    for i in range(n - 1):
+        node = _node(workflow, registry, "negate", 1 + i // width, i % width)
+        workflow.new_link(source, "value", node, "value")
+    return workflow
+
+
+def diamond(n, registry=None):
+    # type: (int, Optional[WidgetRegistry]) -> Scheme
+    """
+    A lattice of diamonds with `n` nodes in about `sqrt(n)` layers.
+
+    Every "add" node is connected to two adjacent nodes in the previous
+    layer (the first layer are "one" sources).
+    """
+    registry = _registry(registry)
+    workflow = Scheme()
+    width = max(int(math.sqrt(n)), 1)
+    layers = []
+    for i in range(n):
+        layer, j = divmod(i, width)
+        if j == 0:
+            layers.append([])
+        if layer == 0:
+            layers[0].append(_node(workflow, registry, "one", 0, j))
+            continue
+        node = _node(workflow, registry, "add", layer, j)
+        layers[layer].append(node)
+        prev = layers[layer - 1]
+        left, right = prev[j], prev[(j + 1) % width]
+        workflow.new_link(left, left.output_channels()[0], node, "left")
+        if right is not left:
+            workflow.new_link(right, right.output_channels()[0], node, "right")
+    return workflow
+
+
+def random_dag(n, registry=None, seed=0):
+    # type: (int, Optional[WidgetRegistry], int) -> Scheme
+    """
+    A random DAG of `n` nodes.
+
+    About a tenth of the nodes are sources, the others are "add" nodes
+    with both inputs connected to random preceding nodes.
+    """
+    registry = _registry(registry)
+    rng = random.Random(seed)
+    workflow = Scheme()
+    nsources = max(n // 10, 1)
+    width = max(int(math.sqrt(n)), 1)
+    nodes = []
+    for i in range(n):
+        x, y = divmod(i, width)
+        if i < nsources:
+            nodes.append(_node(workflow, registry, "one", x, y))
+            continue
+        node = _node(workflow, registry, "add", x, y)
+        for channel in ["left", "right"]:
+            source = nodes[rng.randrange(i)]
+            workflow.new_link(source, source.output_channels()[0],
+                              node, channel)
+        nodes.append(node)
+    return workflow
+
+
+#: Workflow generators by topology name
+GENERATORS = {
+    "chain": chain,
+    "fan-out": fan_out,
+    "diamond": diamond,
+    "random": random_dag,
+}  # type: Dict[str, Callable[..., Scheme]]
+
+
+def generate(topology, n, registry=None):
+    # type: (str, int, Optional[WidgetRegistry]) -> Scheme
+    """
+    Generate a workflow with `n` nodes and the named `topology` (one of
+    :data:`GENERATORS`).
+    """
+    return GENERATORS[topology](n, registry)
@@ -0,0 +1,108 @@
+import io
+import os
+import json
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from orangecanvas.gui.test import QCoreAppTestCase
+from benchmarks.generators import GENERATORS, generate
+from benchmarks.__main__ import main, run, parameters, compare, \
+    results_document
+
+
+class TestGenerators(QCoreAppTestCase):
+    def test_generators(self):
+        for topology in GENERATORS:
+            for n in [1, 2, 10, 101]:
+                workflow = generate(topology, n)
+                self.assertEqual(len(workflow.nodes), n)
+                graph = workflow.graph()
+                # acyclic
+                self.assertTrue(all(
+                    len(c) == 1
+                    for c in graph.strongly_connected_components()
+                ))
+                # all but the source nodes are connected
+                sources = [node for node in workflow.nodes
+                           if not workflow.input_links(node)]
+                self.assertTrue(all(not node.description.inputs
+                                    for node in sources))
+        self.assertEqual(len(generate("chain", 10).links), 9)
+        self.assertEqual(len(generate("fan-out", 10).links), 9)
+        self.assertEqual(len(generate("diamond", 9).links), 12)
+        self.assertEqual(len(generate("random", 10).links), 18)
+
+
+class TestRunner(unittest.TestCase):
+    def test_parameters(self):
+        class A:
+            params = [1, 2]
+            param_names = ["n"]
+
+        class B:
+            params = [[1, 2], ["a"]]
+
+        class C:
+            pass
+
+        self.assertEqual(parameters(A), (["n"], [(1,), (2,)]))
+        self.assertEqual(parameters(B),
+                         (["param1", "param2"], [(1, "a"), (2, "a")]))
+        self.assertEqual(parameters(C), ([], [()]))
+
+    def test_run(self):
+        results = run(r"Query\.time_find_links\[10-(chain|random)\]",
+                      min_time=0, min_rounds=2, max_rounds=2)
+        self.assertEqual(
+            [r["fullname"] for r in results],
+            ["bench_scheme.Query.time_find_links[10-chain]",
+             "bench_scheme.Query.time_find_links[10-random]"])
+        self.assertEqual(results[0]["params"],
+                         {"nodes": 10, "topology": "chain"})
+        self.assertEqual(results[0]["stats"]["rounds"], 2)
+        doc = results_document(results)
+        self.assertEqual(json.loads(json.dumps(doc))["benchmarks"], results)
+
+        results = run(r"SnapshotHistory\.track_memory\[10-100-store\]")
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["extra_info"], {"unit": "MB"})
+        self.assertEqual(results[0]["stats"]["rounds"], 1)
+        self.assertGreater(results[0]["stats"]["median"], 0)
+
+    def test_compare(self):
+        def doc(times):
+            return {"benchmarks": [
+                {"fullname": name, "stats": {"median": t, "min": t}}
+                for name, t in times.items()
+            ]}
+        base = doc({"a": 1.0, "b": 1.0, "c": 1.0, "d": 1.0})
+        current = doc({"a": 1.1, "b": 1.5, "c": 0.5, "e": 1.0})
+        stream = io.StringIO()
+        self.assertEqual(compare(base, current, 1.2, stream=stream), ["b"])
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 6)
+        self.assertIn("SLOWER", lines[2])
+        self.assertIn("faster", lines[3])
+        self.assertIn("(missing)", lines[4])
+        self.assertIn("(new)", lines[5])
+        self.assertEqual(compare(base, current, 1.6, stream=stream), [])
+
+        base["benchmarks"][0]["extra_info"] = {"unit": "MB"}
+        stream = io.StringIO()
+        compare(base, current, 1.2, stream=stream)
+        self.assertIn("1.000 MB", stream.getvalue().splitlines()[1])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fbase = os.path.join(tmpdir, "base.json")
+            fcurrent = os.path.join(tmpdir, "current.json")
+            with open(fbase, "w") as f:
+                json.dump(base, f)
+            with open(fcurrent, "w") as f:
+                json.dump(current, f)
+            argv = ["benchmarks", "compare", fbase, fcurrent]
+            with patch("sys.stdout", io.StringIO()):
+                self.assertEqual(main(argv), 1)
+                self.assertEqual(main(argv + ["--threshold", "2"]), 0)
+                self.assertEqual(main(argv + ["--stat", "min",
+                                              "--threshold", "1.6"]), 0)
@@ -46,7 +46,7 @@ from orangecanvas.application.utils.addons import (
     Installer,
 )
 from orangecanvas.utils import name_lookup, markup, qualified_name, enum_as_int
-from ..utils.pkgmeta import get_dist_meta
+from ..utils.pkgmeta import get_dist_meta, invalidate_distribution_snapshot
 from ..utils.qinvoke import qinvoke
 from ..gui.utils import message_warning, message_critical as message_error
 
@@ -911,6 +911,8 @@ class AddonManagerDialog(QDialog):
             self.accept()
 
     def __on_installer_finished_common(self):
+        # The installed set changed; drop the cached distributions.
+        invalidate_distribution_snapshot()
         if self.__progress is not None:
             self.__progress.close()
             self.__progress = None
@@ -0,0 +1,330 @@
+"""
+Periodic (background) workflow autosave.
+
+The modified workflows are periodically serialized and written to the
+autosave directory. The workflow is snapshotted in the GUI thread (the
+serialized node properties are cached, see
+:func:`.readwrite.node_properties_dumps`) while the file is written,
+synced to disk and atomically renamed in a worker thread.
+"""
+import os
+import time
+import typing
+import hashlib
+import logging
+import itertools
+import threading
+
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Hashable
+
+from AnyQt.QtCore import QObject, QTimer
+from AnyQt.QtCore import pyqtSignal as Signal
+
+from .. import config
+from ..scheme import readwrite
+from ..utils.shtools import backup_name
+from ..utils.qinvoke import qinvoke
+
+if typing.TYPE_CHECKING:
+    from ..document.schemeedit import SchemeEditWidget
+
+log = logging.getLogger(__name__)
+
+__all__ = ["AutoSave", "autosave_dir"]
+
+
+def autosave_dir():
+    # type: () -> str
+    """
+    Return the default autosave directory.
+    """
+    return os.path.join(config.data_dir(), "autosave")
+
+
+_executor = None  # type: Optional[Executor]
+_executor_lock = threading.Lock()
+
+
+def _default_executor() -> Executor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="autosave"
+            )
+        return _executor
+
+
+_untitled_counter = itertools.count(1)
+
+
+class _State:
+    # autosave state of a document
+    def __init__(self):
+        self.key = None       # type: Optional[Hashable]
+        # the number of undo stack changes (undo, redo, new commands)
+        self.edits = 0
+        self.filename = None  # type: Optional[str]
+        self.untitled = "untitled-{}-{}".format(
+            os.getpid(), next(_untitled_counter))
+        self.future = None    # type: Optional[Future]
+
+
+class AutoSave(QObject):
+    """
+    Periodically save modified workflow documents (:class:`SchemeEditWidget`)
+    to the autosave `directory`.
+
+    A document is saved only if it changed (its undo stack was changed or
+    any of its node's properties) since the last autosave. The last `maxBackups`
+    versions are kept as backups (see :func:`.shtools.backup_name`).
+
+    Parameters
+    ----------
+    parent: Optional[QObject]
+    directory: Optional[str]
+        The autosave directory (default :func:`autosave_dir`).
+    interval: float
+        The autosave interval in seconds. If 0 the periodic autosave is
+        disabled.
+    maxBackups: int
+        The number of backups to keep.
+    maxWriteRate: float
+        The maximum average write rate in bytes per second (0 for
+        unlimited). After writing `n` bytes the next autosave is postponed
+        for at least `n / maxWriteRate` seconds.
+    executor: Optional[Executor]
+        The executor in which the files are written.
+    """
+    #: Emitted when a document was saved (document, filename)
+    saved = Signal(object, str)
+    #: Emitted when a document could not be saved (document, filename)
+    failed = Signal(object, str)
+
+    def __init__(self, parent=None, directory=None, interval=300.0,
+                 maxBackups=3, maxWriteRate=0.0, executor=None, **kwargs):
+        # type: (Optional[QObject], Optional[str], float, int, float, Optional[Executor], ...) -> None
+        super().__init__(parent, **kwargs)
+        self.__directory = directory
+        self.__maxBackups = maxBackups
+        self.__maxWriteRate = maxWriteRate
+        self.__executor = executor
+        self.__documents = {}  # type: Dict[SchemeEditWidget, _State]
+        # time.monotonic() before which no new autosave is started
+        self.__nextAllowed = 0.0
+        self.__timer = QTimer(self, singleShot=False)
+        self.__timer.timeout.connect(self.autosave)
+        self.setInterval(interval)
+
+    def setInterval(self, interval):
+        # type: (float) -> None
+        """
+        Set the autosave interval (in seconds). If 0 the periodic autosave
+        is disabled.
+        """
+        self.__interval = interval
+        if interval > 0:
+            self.__timer.start(int(interval * 1000))
+        else:
+            self.__timer.stop()
+
+    def interval(self):
+        # type: () -> float
+        return self.__interval
+
+    def setMaxBackups(self, count):
+        # type: (int) -> None
+        self.__maxBackups = max(count, 0)
+
+    def maxBackups(self):
+        # type: () -> int
+        return self.__maxBackups
+
+    def setMaxWriteRate(self, rate):
+        # type: (float) -> None
+        self.__maxWriteRate = max(rate, 0.0)
+
+    def maxWriteRate(self):
+        # type: () -> float
+        return self.__maxWriteRate
+
+    def directory(self):
+        # type: () -> str
+        return self.__directory if self.__directory is not None \
+            else autosave_dir()
+
+    def addDocument(self, document):
+        # type: (SchemeEditWidget) -> None
+        """
+        Add a `document` to autosave. The current state is not saved.
+        """
+        if document not in self.__documents:
+            state = self.__documents[document] = _State()
+            document.undoStack().indexChanged.connect(
+                self.__onUndoIndexChanged)
+            state.key = self.__stateKey(document)
+
+    def removeDocument(self, document, discard=True):
+        # type: (SchemeEditWidget, bool) -> None
+        """
+        Remove the `document` from autosave. If `discard` is `True` then
+        also remove its autosave file and all the backups.
+        """
+        state = self.__documents.pop(document, None)
+        if state is None:
+            return
+        document.undoStack().indexChanged.disconnect(
+            self.__onUndoIndexChanged)
+        if discard and state.filename is not None:
+            if state.future is not None:
+                # wait for any pending write to finish first
+                try:
+                    state.future.result()
+                except Exception:  # pylint: disable=broad-except
+                    pass
+            self.__discard(state.filename)
+
+    def documents(self):
+        # type: () -> List[SchemeEditWidget]
+        return list(self.__documents)
+
+    def filename(self, document):
+        # type: (SchemeEditWidget) -> str
+        """
+        Return the autosave file name for `document`.
+        """
+        state = self.__documents[document]
+        path = document.path()
+        if path:
+            path = os.path.normpath(os.path.abspath(path))
+            digest = hashlib.sha1(path.encode("utf-8")).hexdigest()[:10]
+            base = os.path.splitext(os.path.basename(path))[0]
+            name = "{}-{}".format(base, digest)
+        else:
+            name = state.untitled
+        return os.path.join(self.directory(), name + ".ows")
+
+    def backups(self, document):
+        # type: (SchemeEditWidget) -> List[str]
+        """
+        Return the existing autosave file and backups for `document`
+        (newest first).
+        """
+        filename = self.filename(document)
+        names = [filename] + [backup_name(filename, i)
+                              for i in range(1, self.__maxBackups + 1)]
+        return [name for name in names if os.path.exists(name)]
+
+    def autosave(self):
+        # type: () -> None
+        """
+        Save all changed documents (subject to the write rate limit).
+        """
+        for document in list(self.__documents):
+            self.save(document)
+
+    def save(self, document, force=False):
+        # type: (SchemeEditWidget, bool) -> Optional[Future]
+        """
+        Save the `document` if it changed since the last autosave.
+
+        Return a future for the pending write or `None` if the document
+        was not saved (it did not change, a previous write is still in
+        progress or the write rate limit applies). If `force` is `True`
+        the document is saved regardless.
+        """
+        state = self.__documents[document]
+        if state.future is not None and not state.future.done():
+            return None
+        if not force and time.monotonic() < self.__nextAllowed:
+            return None
+        scheme = document.scheme()
+        if scheme is None:
+            return None
+        key = self.__stateKey(document)
+        if not force:
+            if key == state.key:
+                return None
+            if state.key is not None and state.key[0] != key[0] \
+                    and not document.isModified():
+                # A new (unmodified) workflow was set on the document
+                state.key = key
+                return None
+        filename = self.filename(document)
+        if state.filename is not None and state.filename != filename:
+            # The document was renamed
+            self.__discard(state.filename)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        executor = self.__executor
+        if executor is None:
+            executor = _default_executor()
+        try:
+            future = readwrite.scheme_to_ows_file(
+                scheme, filename, pretty=False, pickle_fallback=True,
+                executor=executor, backups=self.__maxBackups,
+            )
+        except Exception:  # pylint: disable=broad-except
+            log.error("Could not serialize %r for autosave", scheme,
+                      exc_info=True)
+            return None
+        state.key = key
+        state.filename = filename
+        state.future = future
+        future.add_done_callback(
+            qinvoke(self.__onFinished, context=self)
+        )
+        return future
+
+    def __onFinished(self, future):
+        # type: (Future) -> None
+        document, state = next(((d, s) for d, s in self.__documents.items()
+                                if s.future is future), (None, None))
+        try:
+            future.result()
+        except Exception:  # pylint: disable=broad-except
+            log.error("Autosave failed", exc_info=True)
+            if state is not None:
+                # retry on the next autosave
+                state.key = None
+                self.failed.emit(document, state.filename)
+            return
+        if state is None:
+            return
+        try:
+            size = os.path.getsize(state.filename)
+        except OSError:
+            size = 0
+        if self.__maxWriteRate > 0:
+            self.__nextAllowed = time.monotonic() + size / self.__maxWriteRate
+        self.saved.emit(document, state.filename)
+
+    def __onUndoIndexChanged(self):
+        # type: () -> None
+        # Count every change, the index alone does not change on an undo
+        # followed by a new command.
+        stack = self.sender()
+        for document, state in self.__documents.items():
+            if document.undoStack() is stack:
+                state.edits += 1
+
+    def __stateKey(self, document):
+        # type: (SchemeEditWidget) -> Hashable
+        scheme = document.scheme()
+        if scheme is None:
+            return None
+        scheme.sync_node_properties()
+        return (id(scheme), self.__documents[document].edits,
+                tuple((id(node), node.properties_token())
+                      for node in scheme.nodes))
+
+    def __discard(self, filename):
+        # type: (str) -> None
+        for name in [filename] + [backup_name(filename, i)
+                                  for i in range(1, self.__maxBackups + 1)]:
+            try:
+                os.remove(name)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                log.warning("Could not remove %r", name, exc_info=True)
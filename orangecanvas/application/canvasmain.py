@@ -6,7 +6,6 @@ import os
 import sys
 import logging
 import operator
-import io
 import traceback
 from concurrent import futures
 from contextlib import contextmanager
@@ -86,6 +85,7 @@ from . import addons
 from ..preview import previewdialog, previewmodel
 from .. import config
 from . import examples
+from . import autosave
 from ..resources import load_styled_svg_icon
 from ..canvas import scene
 
@@ -210,6 +210,10 @@ class CanvasMainWindow(QMainWindow):
         # Save crash recovery swap file on changes to workflow
         self.scheme_widget.undoCommandAdded.connect(self.save_swp)
 
+        # Periodic background autosave (configured in __update_from_settings)
+        self.__autosave = autosave.AutoSave(self, interval=0)
+        self.__autosave.addDocument(self.scheme_widget)
+
         dropfilter = UrlDropEventFilter(self)
         dropfilter.urlDropped.connect(self.open_scheme_file)
         self.scheme_widget.setAcceptDrops(True)
@@ -926,6 +930,7 @@ class CanvasMainWindow(QMainWindow):
         self.scheme_widget.quickMenu().setModel(proxy)
 
         self.help.set_registry(widget_registry)
+        self.help.prefetch()
 
         # Restore possibly saved widget toolbox tab states
         settings = QSettings()
@@ -1578,26 +1583,11 @@ class CanvasMainWindow(QMainWindow):
         dirname, basename = os.path.split(filename)
         title = scheme.title or "untitled"
 
-        # First write the scheme to a buffer so we don't truncate an
-        # existing scheme file if `scheme.save_to` raises an error.
-        buffer = io.BytesIO()
+        # The scheme is streamed to a temporary file which replaces an
+        # existing scheme file only if `scheme.save_to` succeeds.
         try:
             scheme.set_runtime_env("basedir", os.path.abspath(dirname))
-            scheme.save_to(buffer, pretty=True, pickle_fallback=True)
-        except Exception:
-            log.error("Error saving %r to %r", scheme, filename, exc_info=True)
-            message_critical(
-                self.tr('An error occurred while trying to save workflow '
-                        '"%s" to "%s"') % (title, basename),
-                title=self.tr("Error saving %s") % basename,
-                exc_info=True,
-                parent=self
-            )
-            return False  # return False here because there is second part
-
-        try:
-            with open(filename, "wb") as f:
-                f.write(buffer.getvalue())
+            scheme.save_to(filename, pretty=True, pickle_fallback=True)
             self.clear_swp()
             return True
         except FileNotFoundError as ex:
@@ -1969,10 +1959,54 @@ class CanvasMainWindow(QMainWindow):
         Returns QDialog.Rejected if the user canceled the dialog else loads
         the selected scheme into the canvas and returns QDialog.Accepted.
         """
-        tutors = examples.workflows(config.default)
-        items = [previewmodel.PreviewItem(path=t.abspath()) for t in tutors]
+        catalog = examples.ExampleCatalog.instance()
+        entries = catalog.entries()
+        if entries is None:
+            # No catalog yet; build it now.
+            entries = catalog.refresh(config.default)
+            refresh = False
+        else:
+            refresh = True
+
+        def preview_item(entry):
+            # type: (examples.CatalogEntry) -> previewmodel.PreviewItem
+            thumbnail = catalog.thumbnail(entry)
+            item = previewmodel.PreviewItem(
+                name=entry.title, description=entry.description,
+                thumbnail=thumbnail or None, path=entry.path
+            )
+            # Items without a stored thumbnail are scanned (and rendered)
+            item.setData(bool(thumbnail), previewmodel.UpToDateRole)
+            return item
+
+        items = [preview_item(e) for e in entries]
         dialog = previewdialog.PreviewDialog(self)
         model = previewmodel.PreviewModel(dialog, items=items)
+
+        def update(f):
+            # type: (futures.Future[List[examples.CatalogEntry]]) -> None
+            try:
+                new_entries = f.result()
+            except Exception:  # pylint: disable=broad-except
+                log.error("Could not refresh the example catalog",
+                          exc_info=True)
+                return
+            if new_entries == entries:
+                return
+            entries[:] = new_entries
+            current = dialog.currentIndex()
+            model.removeRows(0, model.rowCount())
+            for entry in new_entries:
+                model.appendRow(preview_item(entry))
+            dialog.setCurrentIndex(max(current, 0))
+            model.delayedScanUpdate()
+
+        if refresh:
+            # Open from the stored catalog and refresh it in the background
+            executor = futures.ThreadPoolExecutor(max_workers=1)
+            f = executor.submit(catalog.refresh, config.default)
+            f.add_done_callback(qinvoke(update, context=dialog))
+            executor.shutdown(wait=False)
         title = self.tr("Example Workflows")
         dialog.setWindowTitle(title)
         template = ('<h3 style="font-size: 26px">\n'
@@ -1986,6 +2020,15 @@ class CanvasMainWindow(QMainWindow):
         status = dialog.exec()
         index = dialog.currentIndex()
 
+        # Store the thumbnails rendered while scanning
+        thumbnails = {}
+        for i in range(model.rowCount()):
+            item = model.item(i)
+            if not item.data(previewmodel.UpToDateRole) and \
+                    item.thumbnail() != previewmodel.UNKNOWN_SVG:
+                thumbnails[item.path()] = item.thumbnail()
+        catalog.update_thumbnails(thumbnails)
+
         dialog.deleteLater()
 
         if status == QDialog.Accepted:
@@ -2370,6 +2413,7 @@ class CanvasMainWindow(QMainWindow):
                 return
 
         self.clear_swp()
+        self.__autosave.removeDocument(document, discard=True)
 
         old_scheme = document.scheme()
 
@@ -2620,6 +2664,15 @@ class CanvasMainWindow(QMainWindow):
         self.scheme_widget.setNodeAnimationEnabled(node_animations)
         settings.endGroup()
 
+        settings.beginGroup("autosave")
+        self.__autosave.setInterval(
+            settings.value("interval", defaultValue=300, type=int))
+        self.__autosave.setMaxBackups(
+            settings.value("max-backups", defaultValue=3, type=int))
+        self.__autosave.setMaxWriteRate(
+            1024 * settings.value("max-write-rate", defaultValue=0, type=int))
+        settings.endGroup()
+
         settings.beginGroup("network")
         if settings.value("use-certs", defaultValue=False, type=bool):
             import truststore
@@ -2,14 +2,18 @@
 Example workflows discovery.
 """
 import os
+import json
+import hashlib
 import logging
 import pathlib
+import threading
 import types
 
-from typing import List, Optional, IO
+from typing import List, Optional, IO, NamedTuple, Dict, Tuple, Iterable
 
 from orangecanvas import config as _config
 from orangecanvas.utils.pkgmeta import Distribution
+from orangecanvas.utils.shtools import atomic_write
 
 from importlib.resources import files as _files
 
@@ -105,3 +109,230 @@ class ExampleWorkflow:
                 return open(self.resource, "rb")
 
         raise ValueError
+
+
+class CatalogEntry(NamedTuple):
+    """An example workflow entry in the :class:`ExampleCatalog`."""
+    #: Absolute path of the workflow file
+    path: str
+    #: Workflow title
+    title: str
+    #: Workflow description
+    description: str
+    #: The file name of the stored svg thumbnail (relative to the catalog's
+    #: thumbnail directory) or an empty string if there is none.
+    thumbnail: str
+    #: The name of the distribution providing the example
+    distribution: str
+    #: The distribution's version
+    version: str
+
+
+class ExampleCatalog:
+    """
+    A persistent catalog of example workflows.
+
+    The catalog stores the path, title, description and thumbnail of all
+    example workflows, so they can be listed without loading the examples
+    entry points or parsing the workflow files.
+
+    Entries are grouped by their providing distribution and are reused on
+    :func:`refresh` for as long as the distribution's version does not
+    change (and the files still exist).
+
+    Parameters
+    ----------
+    path: str
+        The catalog file path. Thumbnails are stored in a `thumbnails`
+        directory next to it.
+    """
+    #: Catalog file format version (version 1 catalogs can store thumbnails
+    #: with unrendered rich text annotations)
+    VERSION = 2
+
+    _INSTANCE = None  # type: Optional[ExampleCatalog]
+
+    def __init__(self, path):
+        # type: (str) -> None
+        self.__path = path
+        self.__thumbnail_dir = os.path.join(os.path.dirname(path), "thumbnails")
+        self.__lock = threading.RLock()
+        self.__entries = None  # type: Optional[List[CatalogEntry]]
+        self.__loaded = False
+
+    @classmethod
+    def instance(cls):
+        # type: () -> ExampleCatalog
+        """Return the default application wide catalog."""
+        if cls._INSTANCE is None:
+            path = os.path.join(
+                _config.cache_dir(), "example-workflows", "catalog.json"
+            )
+            cls._INSTANCE = cls(path)
+        return cls._INSTANCE
+
+    def path(self):
+        # type: () -> str
+        return self.__path
+
+    def __load(self):
+        # type: () -> Optional[List[CatalogEntry]]
+        try:
+            with open(self.__path, "r", encoding="utf-8") as f:
+                contents = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            log.warning("Could not read the example catalog %r",
+                        self.__path, exc_info=True)
+            return None
+        try:
+            if contents.get("version") != self.VERSION:
+                return None
+            return [CatalogEntry(*entry) for entry in contents["entries"]]
+        except (AttributeError, KeyError, TypeError):
+            log.warning("Malformed example catalog %r", self.__path)
+            return None
+
+    def __save(self, entries):
+        # type: (List[CatalogEntry]) -> None
+        contents = {
+            "version": self.VERSION,
+            "entries": [list(entry) for entry in entries],
+        }
+        try:
+            os.makedirs(os.path.dirname(self.__path), exist_ok=True)
+            with atomic_write(self.__path, "w", encoding="utf-8") as f:
+                json.dump(contents, f)
+        except OSError:
+            log.warning("Could not write the example catalog %r",
+                        self.__path, exc_info=True)
+
+    def entries(self):
+        # type: () -> Optional[List[CatalogEntry]]
+        """
+        Return the catalog entries or None if the catalog was never
+        built (see :func:`refresh`).
+        """
+        with self.__lock:
+            if not self.__loaded:
+                self.__entries = self.__load()
+                self.__loaded = True
+            if self.__entries is None:
+                return None
+            return list(self.__entries)
+
+    def thumbnail(self, entry):
+        # type: (CatalogEntry) -> str
+        """
+        Return the svg thumbnail contents for `entry` (an empty string if
+        not available).
+        """
+        if not entry.thumbnail:
+            return ""
+        fname = os.path.join(self.__thumbnail_dir, entry.thumbnail)
+        try:
+            with open(fname, "r", encoding="utf-8") as f:
+                return f.read()
+        except (OSError, ValueError):
+            return ""
+
+    def __store_thumbnail(self, svg):
+        # type: (str) -> str
+        contents = svg.encode("utf-8")
+        name = hashlib.sha1(contents).hexdigest() + ".svg"
+        fname = os.path.join(self.__thumbnail_dir, name)
+        if not os.path.exists(fname):
+            try:
+                os.makedirs(self.__thumbnail_dir, exist_ok=True)
+                with atomic_write(fname, "wb", fsync=False) as f:
+                    f.write(contents)
+            except OSError:
+                log.warning("Could not store a thumbnail", exc_info=True)
+                return ""
+        return name
+
+    def __prune_thumbnails(self, entries):
+        # type: (Iterable[CatalogEntry]) -> None
+        used = {entry.thumbnail for entry in entries}
+        try:
+            names = os.listdir(self.__thumbnail_dir)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith(".svg") and name not in used:
+                try:
+                    os.remove(os.path.join(self.__thumbnail_dir, name))
+                except OSError:
+                    pass
+
+    def refresh(self, config=None):
+        # type: (Optional[_config.Config]) -> List[CatalogEntry]
+        """
+        Update the catalog from the installed example workflows and
+        return the new entries.
+
+        Only examples from distributions that are new or whose version
+        changed are parsed. This can be called from a worker thread.
+        """
+        from ..preview.scanner import preview_parse
+
+        previous = {}  # type: Dict[Tuple[str, str, str], CatalogEntry]
+        for entry in self.entries() or []:
+            if entry.distribution:
+                key = (entry.distribution, entry.version, entry.path)
+                previous[key] = entry
+
+        entries = []  # type: List[CatalogEntry]
+        for workflow in workflows(config):
+            try:
+                path = workflow.abspath()
+            except ValueError:
+                continue
+            dist = workflow.distribution
+            name, version = "", ""
+            if dist is not None:
+                try:
+                    name, version = dist.name or "", dist.version or ""
+                except Exception:  # broken/missing metadata
+                    pass
+            entry = previous.get((name, version, path))
+            if entry is not None and os.path.isfile(path):
+                entries.append(entry)
+                continue
+            try:
+                title, description, svg = preview_parse(path)
+            except Exception:  # pylint: disable=broad-except
+                log.error("Could not parse example workflow %r", path,
+                          exc_info=True)
+                continue
+            thumbnail = self.__store_thumbnail(svg) if svg else ""
+            entries.append(CatalogEntry(path, title, description, thumbnail,
+                                        name, version))
+        with self.__lock:
+            self.__entries = entries
+            self.__loaded = True
+            self.__save(entries)
+            self.__prune_thumbnails(entries)
+        return list(entries)
+
+    def update_thumbnails(self, thumbnails):
+        # type: (Dict[str, str]) -> None
+        """
+        Store (rendered) svg `thumbnails` for the entries by their path.
+        """
+        with self.__lock:
+            entries = self.entries()
+            if entries is None or not thumbnails:
+                return
+            changed = False
+            for i, entry in enumerate(entries):
+                svg = thumbnails.get(entry.path)
+                if svg:
+                    name = self.__store_thumbnail(svg)
+                    if name and name != entry.thumbnail:
+                        entries[i] = entry._replace(thumbnail=name)
+                        changed = True
+            if changed:
+                self.__entries = entries
+                self.__save(entries)
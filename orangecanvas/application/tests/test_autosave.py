@@ -0,0 +1,188 @@
+import os
+import sys
+import subprocess
+import tempfile
+from unittest.mock import patch
+
+from AnyQt.QtTest import QSignalSpy
+
+import orangecanvas
+from orangecanvas.gui.test import QAppTestCase
+from orangecanvas.document.schemeedit import SchemeEditWidget
+from orangecanvas.registry.tests import small_testing_registry
+from orangecanvas.scheme import Scheme, SchemeNode
+from orangecanvas.utils.shtools import backup_name
+from ..autosave import AutoSave
+
+CRASH_SCRIPT = """
+import os, sys
+from orangecanvas.scheme import Scheme, readwrite
+from orangecanvas.registry.tests import small_testing_registry
+
+reg = small_testing_registry()
+workflow = Scheme()
+for i in range(50):
+    workflow.new_node(reg.widget("one"), position=(i, i))
+
+def crash(fd):
+    os._exit(3)
+
+# 'Crash' after the contents are written, before they are synced and
+# the file is renamed.
+os.fsync = crash
+readwrite.scheme_to_ows_file(workflow, sys.argv[1], backups=2)
+"""
+
+
+def load(filename):
+    workflow = Scheme()
+    workflow.load_from(filename, registry=small_testing_registry())
+    return workflow
+
+
+class TestAutoSave(QAppTestCase):
+    def setUp(self):
+        super().setUp()
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.tmpdir = self._tmpdir.name
+        self.reg = small_testing_registry()
+        self.document = SchemeEditWidget()
+        self.document.setRegistry(self.reg)
+        self.document.setScheme(Scheme())
+        self.autosave = AutoSave(directory=self.tmpdir, interval=0,
+                                 maxBackups=2)
+        self.autosave.addDocument(self.document)
+
+    def tearDown(self):
+        self.autosave.removeDocument(self.document)
+        # delete the Qt objects (and the pending qinvoke callers) from the
+        # event loop, not from the garbage collector
+        self.autosave.deleteLater()
+        self.document.deleteLater()
+        self.qWait(0)
+        del self.autosave
+        del self.document
+        self._tmpdir.cleanup()
+        super().tearDown()
+
+    def add_node(self):
+        self.document.addNode(SchemeNode(self.reg.widget("one")))
+
+    def save(self, **kwargs):
+        spy = QSignalSpy(self.autosave.saved)
+        future = self.autosave.save(self.document, **kwargs)
+        self.assertIsNotNone(future)
+        future.result()
+        self.assertTrue(spy.wait(1000))
+        return spy[0][1]
+
+    def test_autosave(self):
+        # Unchanged document is not saved
+        self.assertIsNone(self.autosave.save(self.document))
+        self.add_node()
+        filename = self.save()
+        self.assertEqual(filename, self.autosave.filename(self.document))
+        self.assertEqual(len(load(filename).nodes), 1)
+        self.assertIsNone(self.autosave.save(self.document))
+
+        # Property changes are detected
+        node = self.document.scheme().nodes[0]
+        node.properties = {"a": 1}
+        self.save()
+        self.assertEqual(load(filename).nodes[0].properties, {"a": 1})
+
+        # Bounded versioned backups
+        for _ in range(3):
+            self.add_node()
+            self.save()
+        backups = self.autosave.backups(self.document)
+        self.assertEqual(backups, [filename, backup_name(filename, 1),
+                                   backup_name(filename, 2)])
+        self.assertEqual([len(load(f).nodes) for f in backups], [4, 3, 2])
+        self.assertFalse(os.path.exists(backup_name(filename, 3)))
+
+        self.autosave.removeDocument(self.document, discard=True)
+        self.assertEqual(os.listdir(self.tmpdir), [])
+
+    def test_autosave_undo_new_edit(self):
+        self.add_node()
+        node = self.document.scheme().nodes[0]
+        self.document.renameNode(node, "a")
+        filename = self.save()
+        # undo and a new edit between two autosaves (the undo stack index
+        # is the same)
+        stack = self.document.undoStack()
+        index = stack.index()
+        stack.undo()
+        self.document.renameNode(node, "b")
+        self.assertEqual(stack.index(), index)
+        self.save()
+        self.assertEqual(load(filename).nodes[0].title, "b")
+
+    def test_autosave_new_workflow(self):
+        self.add_node()
+        self.save()
+        # An unmodified new workflow is not saved
+        self.document.setScheme(Scheme())
+        self.assertIsNone(self.autosave.save(self.document))
+        self.add_node()
+        self.save()
+
+    def test_rename(self):
+        self.add_node()
+        old = self.save()
+        self.document.setPath(os.path.join(self.tmpdir, "a.ows"))
+        new = self.save(force=True)
+        self.assertNotEqual(old, new)
+        self.assertFalse(os.path.exists(old))
+        self.assertTrue(os.path.basename(new).startswith("a-"))
+
+    def test_max_write_rate(self):
+        self.autosave.setMaxWriteRate(1)  # 1 byte per second
+        self.add_node()
+        self.save()
+        self.add_node()
+        self.assertIsNone(self.autosave.save(self.document))
+        self.save(force=True)
+
+    def test_failed_write(self):
+        self.add_node()
+        filename = self.save()
+        with open(filename, "rb") as f:
+            contents = f.read()
+        self.add_node()
+        spy = QSignalSpy(self.autosave.failed)
+        with patch("os.fsync", side_effect=OSError):
+            future = self.autosave.save(self.document)
+            with self.assertRaises(OSError):
+                future.result()
+        self.assertTrue(spy.wait(1000))
+        # The last autosave is intact and no temporary files are left
+        with open(filename, "rb") as f:
+            self.assertEqual(f.read(), contents)
+        self.assertTrue(all(name.endswith(".ows")
+                            for name in os.listdir(self.tmpdir)))
+        # and the document is saved again on the next autosave
+        self.save()
+        self.assertEqual(len(load(filename).nodes), 2)
+
+    def test_crash_mid_write(self):
+        filename = os.path.join(self.tmpdir, "crash.ows")
+        workflow = Scheme()
+        workflow.new_node(self.reg.widget("one"))
+        workflow.save_to(filename)
+        with open(filename, "rb") as f:
+            contents = f.read()
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [os.path.dirname(os.path.dirname(orangecanvas.__file__))] +
+            ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+        )
+        res = subprocess.run([sys.executable, "-c", CRASH_SCRIPT, filename],
+                             env=env, stdout=subprocess.PIPE,
+                             stderr=subprocess.STDOUT)
+        self.assertEqual(res.returncode, 3, res.stdout)
+        # The original file is intact (only a temporary file was left).
+        with open(filename, "rb") as f:
+            self.assertEqual(f.read(), contents)
+        self.assertEqual(len(load(filename).nodes), 1)
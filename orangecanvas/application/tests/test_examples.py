@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from orangecanvas.preview import scanner
+from ..examples import ExampleCatalog, CatalogEntry
+
+OWS = """\
+<?xml version="1.0" encoding="utf-8"?>
+<scheme title="{title}" description="{title} description" version="2.0">
+<nodes /><links />{thumbnail}
+</scheme>
+"""
+SVG = "<svg xmlns='http://www.w3.org/2000/svg'></svg>"
+
+
+class Config:
+    def __init__(self, paths, version="1.0"):
+        self.paths = paths
+        self.version = version
+
+    def examples_entry_points(self):
+        dist = SimpleNamespace(name="foo", version=self.version)
+        return [SimpleNamespace(load=lambda: lambda: self.paths, dist=dist)]
+
+
+class TestExampleCatalog(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.tmpdir = self._tmpdir.name
+        self.paths = []
+        for title, thumbnail in [("A", "<thumbnail>{}</thumbnail>"
+                                       .format(SVG.replace("<", "&lt;"))),
+                                 ("B", "")]:
+            path = os.path.join(self.tmpdir, title + ".ows")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(OWS.format(title=title, thumbnail=thumbnail))
+            self.paths.append(path)
+        self.catalog_path = os.path.join(self.tmpdir, "cache", "catalog.json")
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def test_catalog(self):
+        catalog = ExampleCatalog(self.catalog_path)
+        self.assertIsNone(catalog.entries())
+        config = Config(self.paths)
+        entries = catalog.refresh(config)
+        self.assertEqual([e.title for e in entries], ["A", "B"])
+        self.assertEqual(entries[0].description, "A description")
+        self.assertEqual(entries[0].distribution, "foo")
+        self.assertEqual(entries[0].version, "1.0")
+        self.assertEqual(catalog.thumbnail(entries[0]), SVG)
+        self.assertEqual(catalog.thumbnail(entries[1]), "")
+
+        catalog = ExampleCatalog(self.catalog_path)
+        self.assertEqual(catalog.entries(), entries)
+
+        with patch.object(scanner, "preview_parse",
+                          wraps=scanner.preview_parse) as preview_parse:
+            # unchanged distribution version; nothing is parsed
+            self.assertEqual(catalog.refresh(config), entries)
+            preview_parse.assert_not_called()
+            # a new version invalidates its entries
+            config.version = "1.1"
+            entries = catalog.refresh(config)
+            self.assertEqual(preview_parse.call_count, 2)
+            self.assertEqual({e.version for e in entries}, {"1.1"})
+
+        # removed example
+        config.paths = self.paths[1:]
+        entries = catalog.refresh(config)
+        self.assertEqual([e.title for e in entries], ["B"])
+        self.assertEqual(
+            os.listdir(os.path.join(self.tmpdir, "cache", "thumbnails")), []
+        )
+
+        catalog.update_thumbnails({self.paths[1]: SVG})
+        entries = ExampleCatalog(self.catalog_path).entries()
+        self.assertEqual(catalog.thumbnail(entries[0]), SVG)
+
+    def test_invalid_catalog(self):
+        os.makedirs(os.path.dirname(self.catalog_path))
+        with open(self.catalog_path, "w") as f:
+            f.write("{")
+        catalog = ExampleCatalog(self.catalog_path)
+        self.assertIsNone(catalog.entries())
+        entry = CatalogEntry("a", "a", "", "missing.svg", "", "")
+        self.assertEqual(catalog.thumbnail(entry), "")
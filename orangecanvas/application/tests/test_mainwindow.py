@@ -13,6 +13,7 @@ from ..outputview import TextStream
 from ..utils.addons import _QueryResult, Installable
 from ...scheme import SchemeTextAnnotation, SchemeLink
 from ...gui.quickhelp import QuickHelpTipEvent, QuickHelp
+from ...document import commands
 from ...utils.shtools import temp_named_file
 from ...utils.pickle import swp_name
 from ...gui.test import QAppTestCase
@@ -104,6 +105,9 @@ class TestMainWindow(TestMainWindowBase):
         toolbox = w.findChild(WidgetToolBox)
         assert isinstance(toolbox, WidgetToolBox)
         wf = w.current_document().scheme()
+        # the grid's buttons are created when it is first shown
+        toolbox.tabButton(0).defaultAction().setChecked(True)
+        w.show()
         grid = toolbox.widget(0)
 
         button = grid.findChild(QToolButton)  # type: QToolButton
@@ -294,6 +298,17 @@ class TestMainWindowLoad(TestMainWindowBase):
         test(lambda:
              self.assertFalse(w2.scheme_widget.scheme().links))
 
+        # test (multiple) node move
+        doc = w.current_document()
+        doc.undoStack().push(commands.MoveNodesCommand(
+            doc.scheme(), [node, node2], [node.position, node2.position],
+            [(10, 20), (30.5, 40)]
+        ))
+        test(lambda:
+             self.assertEqual(
+                 [n.position for n in w2.scheme_widget.scheme().nodes],
+                 [(10, 20), (30.5, 40)]))
+
         # test widget remove
         w.scheme_widget.removeNode(node)
         w.scheme_widget.removeNode(node2)
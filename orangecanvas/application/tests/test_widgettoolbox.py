@@ -3,13 +3,14 @@ Tests for WidgetsToolBox.
 
 """
 from typing import cast
+from unittest.mock import patch
 
 from AnyQt.QtWidgets import QWidget, QHBoxLayout
-from AnyQt.QtGui import QStandardItemModel
+from AnyQt.QtGui import QStandardItemModel, QStandardItem
 from AnyQt.QtCore import QSize
 from AnyQt.QtTest import QTest
 
-from ...registry import tests as registry_tests
+from ...registry import tests as registry_tests, WidgetDescription
 from ...registry.qt import QtWidgetRegistry
 
 
@@ -100,6 +101,26 @@ class TestWidgetToolBox(test.QAppTestCase):
         self.assertEqual(box.count(), model.rowCount())
         self.qWait()
 
+    def test_toolbox_deferred_actions(self):
+        model = self.reg.model()
+        with patch.object(QtWidgetRegistry, "create_action_for_item",
+                          autospec=True,
+                          side_effect=QtWidgetRegistry.create_action_for_item
+                          ) as create:
+            box = WidgetToolBox()
+            box.setModel(model)
+            # no actions are created until a tab is shown
+            create.assert_not_called()
+            self.assertEqual(box.widget(0).actions(), [])
+            box.show()
+            box.tabButton(0).defaultAction().setChecked(True)
+            self.qWait()
+            grid = box.widget(0)
+            self.assertEqual(len(grid.actions()), model.item(0).rowCount())
+            self.assertEqual(create.call_count, model.item(0).rowCount())
+            self.assertEqual(box.widget(1).actions(), [])
+        box.deleteLater()
+
     def test_filter(self):
         w = WidgetToolBox()
         w.setModel(self.reg.model())
@@ -110,3 +131,22 @@ class TestWidgetToolBox(test.QAppTestCase):
         self.assertEqual(g0.model().rowCount(g0.rootIndex()), 1)
         QTest.keyClicks(edit, "\b\b\b\b")
         self.assertEqual(g0.model().rowCount(g0.rootIndex()), 3)
+
+    def test_filter_model_changed(self):
+        w = WidgetToolBox()
+        model = self.reg.model()
+        w.setModel(model)
+        edit = w.filterLineEdit()
+        g0 = cast(WidgetToolGrid, w.widget(0))
+        edit.setText("zero")
+        self.assertEqual(g0.model().rowCount(g0.rootIndex()), 1)
+        edit.setText("")
+        item = QStandardItem("Zero Two")
+        item.setData(WidgetDescription("Zero Two", "zero-two",
+                                       qualified_name="test.zerotwo"),
+                     QtWidgetRegistry.WIDGET_DESC_ROLE)
+        model.item(0).appendRow(item)
+        edit.setText("zero")
+        self.assertEqual(g0.model().rowCount(g0.rootIndex()), 2)
+        edit.setText("zerot")
+        self.assertEqual(g0.model().rowCount(g0.rootIndex()), 1)
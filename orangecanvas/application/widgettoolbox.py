@@ -14,7 +14,7 @@ from AnyQt.QtWidgets import (
 )
 from AnyQt.QtGui import (
     QDrag, QPalette, QBrush, QIcon, QColor, QGradient, QActionEvent,
-    QMouseEvent
+    QMouseEvent, QShowEvent
 )
 from AnyQt.QtCore import (
     Qt, QObject, QAbstractItemModel, QModelIndex, QSize, QEvent, QMimeData,
@@ -29,7 +29,7 @@ from ..gui.quickhelp import StatusTipPromoter
 from ..gui.utils import create_gradient_brush
 from ..registry import WidgetDescription
 from ..registry.qt import QtWidgetRegistry
-from ..registry.utils import search_filter_query_helper
+from ..registry.search import WidgetSearchIndex
 from ..resources import load_styled_svg_icon
 
 
@@ -88,6 +88,8 @@ class WidgetToolGrid(ToolGrid):
         self.__model = None               # type: Optional[QAbstractItemModel]
         self.__rootIndex = QPersistentModelIndex()  # type: QPersistentModelIndex
         self.__actionRole = QtWidgetRegistry.WIDGET_ACTION_ROLE  # type: int
+        self.__deferredInit = False
+        self.__initPending = False
 
         self.__dragListener = DragStartEventListener(self)
         self.__dragListener.dragStartOperationRequested.connect(
@@ -119,7 +121,10 @@ class WidgetToolGrid(ToolGrid):
             self.__model.rowsRemoved.connect(self.__on_rowsRemoved)
             self.__model.modelReset.connect(self.__on_modelReset)
 
-        self.__initFromModel(model, rootIndex)
+        if self.__deferredInit and not self.isVisible():
+            self.__initPending = True
+        else:
+            self.__initFromModel(model, rootIndex)
 
     def model(self):  # type: () -> Optional[QAbstractItemModel]
         """
@@ -150,6 +155,26 @@ class WidgetToolGrid(ToolGrid):
         """
         return self.__actionRole
 
+    def setDeferredInit(self, deferred):
+        # type: (bool) -> None
+        """
+        If `True` the actions are created from the model (the action role
+        is queried) when the grid is first shown instead of in
+        :func:`setModel`.
+        """
+        self.__deferredInit = deferred
+
+    def deferredInit(self):  # type: () -> bool
+        return self.__deferredInit
+
+    def showEvent(self, event):  # type: (QShowEvent) -> None
+        if self.__initPending:
+            self.__initPending = False
+            if self.__model is not None:
+                self.__initFromModel(self.__model,
+                                     QModelIndex(self.__rootIndex))
+        super().showEvent(event)
+
     def actionEvent(self, event):  # type: (QActionEvent) -> None
         if event.type() == QEvent.ActionAdded:
             # Creates and inserts the button instance.
@@ -195,7 +220,7 @@ class WidgetToolGrid(ToolGrid):
 
     def __update(self):  # type: () -> None
         self.clear()
-        if self.__model is not None:
+        if self.__model is not None and not self.__initPending:
             self.__initFromModel(self.__model, QModelIndex(self.__rootIndex))
 
     def __on_rowsInserted(self, parent, start, end):
@@ -203,7 +228,8 @@ class WidgetToolGrid(ToolGrid):
         """
         Insert items from range start:end into the grid.
         """
-        if parent == QModelIndex(self.__rootIndex):
+        if parent == QModelIndex(self.__rootIndex) and \
+                not self.__initPending:
             for i in range(start, end + 1):
                 item = self.__model.index(i, 0, parent)
                 self.__insertItem(i, item)
@@ -213,7 +239,8 @@ class WidgetToolGrid(ToolGrid):
         """
         Remove items from range start:end from the grid.
         """
-        if parent == QModelIndex(self.__rootIndex):
+        if parent == QModelIndex(self.__rootIndex) and \
+                not self.__initPending:
             actions = self.actions()
             actions = actions[start: end + 1]
             self.__removeActions(actions)
@@ -301,6 +328,8 @@ class WidgetToolBox(ToolBox):
         # type: (Optional[QWidget]) -> None
         super().__init__(parent)
         self.__model = None  # type: Optional[QAbstractItemModel]
+        # search index of the model's widgets (built on first filter)
+        self.__searchIndex = None  # type: Optional[WidgetSearchIndex]
         self.__proxyModel = FilterProxyModel()
         self.__proxyModel.dataChanged.connect(self.__on_dataChanged)
         self.__proxyModel.rowsInserted.connect(self.__on_rowsInserted)
@@ -418,7 +447,16 @@ class WidgetToolBox(ToolBox):
         Set the widget registry model (:class:`QAbstractItemModel`) for
         this toolbox.
         """
+        if self.__model is not None:
+            self.__model.rowsInserted.disconnect(self.__invalidateSearchIndex)
+            self.__model.rowsRemoved.disconnect(self.__invalidateSearchIndex)
+            self.__model.modelReset.disconnect(self.__invalidateSearchIndex)
         self.__model = model
+        self.__searchIndex = None
+        if model is not None:
+            model.rowsInserted.connect(self.__invalidateSearchIndex)
+            model.rowsRemoved.connect(self.__invalidateSearchIndex)
+            model.modelReset.connect(self.__invalidateSearchIndex)
         rows = self.__proxyModel.rowCount()
         if rows:
             self.__on_rowsRemoved(QModelIndex(), 0, rows - 1)
@@ -436,6 +474,8 @@ class WidgetToolBox(ToolBox):
         Insert category item  (`QModelIndex`) at index.
         """
         grid = WidgetToolGrid()
+        # Create the widget actions when the tab is first opened
+        grid.setDeferredInit(True)
         grid.setModel(item.model(), item)
         grid.actionTriggered.connect(self.triggered)
         grid.actionHovered.connect(self.hovered)
@@ -513,10 +553,33 @@ class WidgetToolBox(ToolBox):
         for i in reversed(range(self.count())):
             self.removeItem(i)
 
+    def __invalidateSearchIndex(self, *_):
+        self.__searchIndex = None
+
+    def __widgetSearchIndex(self) -> WidgetSearchIndex:
+        if self.__searchIndex is None:
+            descriptions = []
+            model = self.__model
+            if model is not None:
+                parents = [QModelIndex()]
+                while parents:
+                    parent = parents.pop()
+                    for row in range(model.rowCount(parent)):
+                        index = model.index(row, 0, parent)
+                        desc = index.data(QtWidgetRegistry.WIDGET_DESC_ROLE)
+                        if isinstance(desc, WidgetDescription):
+                            descriptions.append(desc)
+                        parents.append(index)
+            self.__searchIndex = WidgetSearchIndex(descriptions)
+        return self.__searchIndex
+
     def __on_filterTextChanged(self, text: str) -> None:
+        # resolve the query once; the filter only tests the membership
+        match = self.__widgetSearchIndex().predicate(text.strip())
+
         def acceptable(desc: Optional[WidgetDescription]) -> bool:
             if desc is not None:
-                return search_filter_query_helper(desc, text.strip().lower())
+                return match(desc)
             else:
                 return True  # accept other (category, ...)
 
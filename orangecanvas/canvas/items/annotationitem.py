@@ -1,4 +1,6 @@
-from typing import Optional, Union, Any, Tuple
+import logging
+from concurrent.futures import Future
+from typing import Optional, Union, Any, Tuple, Callable
 
 from AnyQt.QtWidgets import (
     QGraphicsItem, QGraphicsPathItem, QGraphicsWidget,
@@ -19,9 +21,12 @@ from AnyQt.QtCore import (
 )
 
 from orangecanvas.utils import markup
+from orangecanvas.utils.qinvoke import qinvoke
 from .graphicspathobject import GraphicsPathObject
 from .graphicstextitem import GraphicsTextEdit
 
+log = logging.getLogger(__name__)
+
 
 class Annotation(QGraphicsWidget):
     """
@@ -115,6 +120,10 @@ class TextAnnotation(Annotation):
 
         self.__contentType = "text/plain"
         self.__content = ""
+        # Pending asynchronous rich text render
+        self.__asyncRenderEnabled = True
+        self.__renderFuture = None  # type: Optional[Future[str]]
+        self.__renderFinished = None  # type: Optional[Callable[[Future], None]]
 
         self.__textMargins = (2, 2, 2, 2)
         self.__textInteractionFlags = Qt.NoTextInteraction
@@ -223,6 +232,24 @@ class TextAnnotation(Annotation):
         # type: () -> str
         return self.__content
 
+    def setAsyncRenderEnabled(self, enabled):
+        # type: (bool) -> None
+        """
+        Set the asynchronous rich text render enabled state.
+
+        If enabled (the default) the rich text content (e.g. Markdown) is
+        rendered in a worker thread and the plain text is shown until it
+        is done. Otherwise it is rendered immediately in `setContent`.
+        """
+        if self.__asyncRenderEnabled != enabled:
+            self.__asyncRenderEnabled = enabled
+            if not enabled and self.__renderFuture is not None:
+                self.__updateRenderedContent()
+
+    def asyncRenderEnabled(self):
+        # type: () -> bool
+        return self.__asyncRenderEnabled
+
     def setPlainText(self, text):
         # type: (str) -> None
         """Set the annotation text as plain text.
@@ -309,6 +336,8 @@ class TextAnnotation(Annotation):
         # type: () -> None
         """Start the annotation text edit process.
         """
+        # Discard any pending render
+        self.__renderFuture = None
         self.__textItem.setPlainText(self.__content)
         self.__textItem.setTextInteractionFlags(self.__textInteractionFlags)
         self.__textItem.setFocus(Qt.MouseFocusReason)
@@ -394,9 +423,44 @@ class TextAnnotation(Annotation):
     @Slot()
     def __updateRenderedContent(self):
         # type: () -> None
-        self.__textItem.setHtml(
-            markup.render_as_rich_text(self.__content, self.__contentType)
+        self.__renderFuture = None
+        if not self.__asyncRenderEnabled:
+            try:
+                html = markup.render_as_rich_text(
+                    self.__content, self.__contentType
+                )
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Error rendering %r content",
+                              self.__contentType)
+                html = markup.render_plain(self.__content)
+            self.__textItem.setHtml(html)
+            return
+        future = markup.render_as_rich_text_async(
+            self.__content, self.__contentType
         )
+        if future.done():
+            self.__textItem.setHtml(future.result())
+            return
+        # Show the plain text until the rich text is rendered.
+        self.__textItem.setHtml(markup.render_plain(self.__content))
+        self.__renderFuture = future
+        if self.__renderFinished is None:
+            self.__renderFinished = qinvoke(
+                self.__onRenderFinished, context=self
+            )
+        future.add_done_callback(self.__renderFinished)
+
+    def __onRenderFinished(self, future):
+        # type: (Future[str]) -> None
+        if future is not self.__renderFuture:
+            return  # content changed or editing started in the meantime
+        self.__renderFuture = None
+        try:
+            html = future.result()
+        except Exception:  # pylint: disable=broad-except
+            log.exception("Error rendering %r content", self.__contentType)
+        else:
+            self.__textItem.setHtml(html)
 
     def contextMenuEvent(self, event):
         # type: (QGraphicsSceneContextMenuEvent) -> None
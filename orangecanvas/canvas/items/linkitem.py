@@ -8,7 +8,7 @@ import math
 from xml.sax.saxutils import escape
 
 import typing
-from typing import Optional, Any
+from typing import Optional, Any, Dict, Tuple
 
 from AnyQt.QtWidgets import (
     QGraphicsItem, QGraphicsPathItem, QGraphicsWidget,
@@ -31,6 +31,12 @@ if typing.TYPE_CHECKING:
     from . import NodeItem, AnchorPoint
 
 
+#: Ideal (unconstrained) widths of the link label documents keyed by the
+#: (html, font key). Links with the same channel names share the entry.
+_label_width_cache = {}  # type: Dict[Tuple[str, str], float]
+_LABEL_WIDTH_CACHE_SIZE = 512
+
+
 class LinkCurveItem(QGraphicsPathItem):
     """
     Link curve item. The main component of a :class:`LinkItem`.
@@ -271,9 +277,15 @@ class LinkItem(QGraphicsWidget):
         self.linkTextItem.setAcceptHoverEvents(False)
         self.__sourceName = ""
         self.__sinkName = ""
+        # The current label html and its ideal width (None if not yet
+        # measured)
+        self.__labelHtml = None     # type: Optional[str]
+        self.__labelIdealWidth = None  # type: Optional[float]
 
         self.__dynamic = False
         self.__dynamicEnabled = False
+        self.__curveUpdatesEnabled = True
+        self.__curveDirty = False
         self.__state = LinkItem.NoState
         self.__channelNamesVisible = True
         self.hover = False
@@ -442,6 +454,24 @@ class LinkItem(QGraphicsWidget):
             self.__animationEnabled = enabled
         self.curveItem.setAnimationEnabled(enabled)
 
+    def setCurveUpdatesEnabled(self, enabled):
+        # type: (bool) -> None
+        """
+        Enable/disable the curve updates on anchor position changes.
+
+        While disabled the curve is not updated when the anchors move
+        (e.g. while moving many nodes at once); it is updated once when
+        re-enabled.
+        """
+        if self.__curveUpdatesEnabled != enabled:
+            self.__curveUpdatesEnabled = enabled
+            if enabled and self.__curveDirty:
+                self.__updateCurve()
+
+    def curveUpdatesEnabled(self):
+        # type: () -> bool
+        return self.__curveUpdatesEnabled
+
     def _sinkPosChanged(self, *arg):
         self.__updateCurve()
 
@@ -450,6 +480,10 @@ class LinkItem(QGraphicsWidget):
 
     def __updateCurve(self):
         # type: () -> None
+        if not self.__curveUpdatesEnabled:
+            self.__curveDirty = True
+            return
+        self.__curveDirty = False
         self.prepareGeometryChange()
         self.__boundingRect = None
         if self.sourceAnchor and self.sinkAnchor:
@@ -473,16 +507,14 @@ class LinkItem(QGraphicsWidget):
                          sink_pos)
 
             self.curveItem.setCurvePath(path)
-            self.__updateText()
+            self.__updateTextLayout()
         else:
             self.setHoverState(False)
             self.curveItem.setPath(QPainterPath())
 
     def __updateText(self):
         # type: () -> None
-        self.prepareGeometryChange()
-        self.__boundingRect = None
-
+        # Update the label contents and layout.
         if self.__sourceName or self.__sinkName:
             if self.__sourceName != self.__sinkName:
                 text = ("<nobr>{0}</nobr> \u2192 <nobr>{1}</nobr>"
@@ -497,9 +529,37 @@ class LinkItem(QGraphicsWidget):
         else:
             text = ""
 
-        self.linkTextItem.setHtml(
-            '<div align="center" style="font-size: small" >{0}</div>'
-            .format(text))
+        html = ('<div align="center" style="font-size: small" >{0}</div>'
+                .format(text))
+        if html != self.__labelHtml:
+            self.__labelHtml = html
+            self.__labelIdealWidth = None
+            self.linkTextItem.setHtml(html)
+        self.__updateTextLayout()
+
+    def __labelWidth(self):
+        # type: () -> float
+        # Return the ideal (unconstrained) label text width.
+        if self.__labelIdealWidth is None:
+            key = (self.__labelHtml or "", self.linkTextItem.font().key())
+            width = _label_width_cache.get(key)
+            if width is None:
+                doc = self.linkTextItem.document().clone(self)
+                doc.setTextWidth(-1)
+                width = doc.idealWidth()
+                doc.deleteLater()
+                if len(_label_width_cache) >= _LABEL_WIDTH_CACHE_SIZE:
+                    _label_width_cache.clear()
+                _label_width_cache[key] = width
+            self.__labelIdealWidth = width
+        return self.__labelIdealWidth
+
+    def __updateTextLayout(self):
+        # type: () -> None
+        # Update the label geometry (width and position) for the current
+        # curve path. The text is only laid out again if its width changes.
+        self.prepareGeometryChange()
+        self.__boundingRect = None
         path = self.curveItem.curvePath()
 
         # Constrain the text width if it is too long to fit on a single line
@@ -509,17 +569,16 @@ class LinkItem(QGraphicsWidget):
             # available space
             diff = path.pointAtPercent(0.0) - path.pointAtPercent(1.0)
             available_width = math.sqrt(diff.x() ** 2 + diff.y() ** 2)
-            # Get the ideal text width if it was unconstrained
-            doc = self.linkTextItem.document().clone(self)
-            doc.setTextWidth(-1)
-            idealwidth = doc.idealWidth()
-            doc.deleteLater()
+            idealwidth = self.__labelWidth()
 
             # Constrain the text width but not below a certain min width
             minwidth = 100
             textwidth = max(minwidth, min(available_width, idealwidth))
-            self.linkTextItem.setTextWidth(textwidth)
-        else:
+            # Whole pixels only; avoids a new layout on every sub pixel move
+            textwidth = math.ceil(textwidth)
+            if textwidth != self.linkTextItem.textWidth():
+                self.linkTextItem.setTextWidth(textwidth)
+        elif self.linkTextItem.textWidth() != -1:
             # Reset the fixed width
             self.linkTextItem.setTextWidth(-1)
 
@@ -771,6 +830,8 @@ class LinkItem(QGraphicsWidget):
         # (DirectWrite engine) vertical hinting is still performed.
         font.setHintingPreference(QFont.PreferNoHinting)
         self.linkTextItem.setFont(font)
+        self.__labelIdealWidth = None
+        self.__updateTextLayout()
 
     def __updateAnchors(self):
         state = QStyle.State(0)
@@ -39,6 +39,7 @@ from .utils import (
 )
 from ... import styles
 from ...gui.iconengine import StyledIconEngine
+from ...gui.dropshadow import drop_shadow_pixmap
 from ...gui.utils import disconnected
 
 from ...scheme.node import UserMessage
@@ -96,6 +97,119 @@ SHADOW_COLOR = "#9CACB4"
 SELECTED_SHADOW_COLOR = "#609ED7"
 
 
+class ShadowShapeItem(GraphicsPathObject):
+    """
+    An item painting its path with a drop shadow as described by `effect`.
+
+    The `effect` (its color, blur radius and enabled state) is not installed
+    on any item; by default the item paints a shared pre-rendered shadow
+    pixmap (see :func:`.dropshadow.drop_shadow_pixmap`), otherwise (see
+    :func:`setCachedShadowsEnabled`) an equivalent
+    :class:`QGraphicsDropShadowEffect` is installed on this item.
+    """
+    def __init__(self, parent=None, effect=None, **kwargs):
+        # type: (Optional[QGraphicsItem], Optional[QGraphicsDropShadowEffect], Any) -> None
+        super().__init__(parent, **kwargs)
+        if effect is None:
+            effect = QGraphicsDropShadowEffect(blurRadius=0)
+        self.__effect = effect
+        self.__cached = True
+        # The effect actually installed on this item when not cached.
+        self.__installed = None  # type: Optional[QGraphicsDropShadowEffect]
+        # The last used (key, pixmap, position) from drop_shadow_pixmap
+        self.__pixmap = None  # type: Optional[Tuple[Tuple, QPixmap, QPointF]]
+        effect.blurRadiusChanged.connect(self.__onEffectChanged)
+        effect.colorChanged.connect(self.__onEffectChanged)
+        effect.enabledChanged.connect(self.__onEffectChanged)
+
+    def setCachedShadowsEnabled(self, enabled):
+        # type: (bool) -> None
+        """
+        Paint the shadow from a shared pixmap cache (`True`) or using a
+        :class:`QGraphicsDropShadowEffect` (`False`).
+        """
+        if self.__cached != enabled:
+            self.prepareGeometryChange()
+            self.__cached = enabled
+            if enabled:
+                # the installed effect is deleted
+                self.setGraphicsEffect(None)
+                self.__installed = None
+            else:
+                self.__installed = QGraphicsDropShadowEffect()
+                self.__syncInstalled()
+                self.setGraphicsEffect(self.__installed)
+            self.update()
+
+    def cachedShadowsEnabled(self):
+        # type: () -> bool
+        return self.__cached
+
+    def __shadowRadius(self):
+        # type: () -> float
+        effect = self.__effect
+        if self.__cached and effect.isEnabled():
+            return max(effect.blurRadius(), 0)
+        else:
+            return 0
+
+    def __onEffectChanged(self):
+        # type: () -> None
+        if self.__cached:
+            self.prepareGeometryChange()
+            self.update()
+        else:
+            self.__syncInstalled()
+
+    def __syncInstalled(self):
+        # type: () -> None
+        effect, installed = self.__effect, self.__installed
+        if installed is not None:
+            installed.setColor(effect.color())
+            installed.setOffset(effect.offset())
+            installed.setBlurRadius(effect.blurRadius())
+            installed.setEnabled(effect.isEnabled())
+
+    def setPath(self, path):
+        # type: (QPainterPath) -> None
+        self.__pixmap = None
+        super().setPath(path)
+
+    def setBrush(self, brush):
+        # type: (Union[QBrush, QColor, Qt.GlobalColor, Qt.BrushStyle]) -> None
+        self.__pixmap = None
+        super().setBrush(brush)
+
+    def boundingRect(self):
+        # type: () -> QRectF
+        rect = super().boundingRect()
+        radius = self.__shadowRadius()
+        if radius > 0:
+            margin = round(radius) + 1
+            rect = rect.adjusted(-margin, -margin, margin, margin)
+        return rect
+
+    def paint(self, painter, option, widget=None):
+        # type: (QPainter, QStyleOptionGraphicsItem, Optional[QWidget]) -> None
+        radius = self.__shadowRadius()
+        if radius <= 0 or self.path().isEmpty():
+            super().paint(painter, option, widget)
+            return
+        transform = painter.worldTransform()
+        scale = (abs(transform.determinant()) ** 0.5) * \
+            painter.device().devicePixelRatioF()
+        color = self.__effect.color()
+        key = (round(radius), color.rgba(), round(scale, 3))
+        if self.__pixmap is not None and self.__pixmap[0] == key:
+            _, pixmap, pos = self.__pixmap
+        else:
+            pixmap, pos = drop_shadow_pixmap(
+                self.path(), self.brush(), color, radius, scale
+            )
+            self.__pixmap = key, pixmap, pos
+        painter.drawPixmap(pos, pixmap)
+
+
 class NodeBodyItem(GraphicsPathObject):
     """
     The central part (body) of the `NodeItem`.
@@ -130,13 +244,13 @@ class NodeBodyItem(GraphicsPathObject):
         self.shadow.setEnabled(False)
 
         # An item with the same shape as this object, stacked behind this
-        # item as a source for QGraphicsDropShadowEffect. Cannot attach
-        # the effect to this item directly as QGraphicsEffect makes the item
-        # non devicePixelRatio aware.
-        shadowitem = GraphicsPathObject(self, objectName="shadow-shape-item")
+        # item painting the shadow. Cannot paint the shadow on this item
+        # directly as QGraphicsEffect makes the item non devicePixelRatio
+        # aware.
+        shadowitem = ShadowShapeItem(self, self.shadow,
+                                     objectName="shadow-shape-item")
         shadowitem.setPen(Qt.NoPen)
         shadowitem.setBrush(QBrush(QColor(SHADOW_COLOR).lighter()))
-        shadowitem.setGraphicsEffect(self.shadow)
         shadowitem.setFlag(QGraphicsItem.ItemStacksBehindParent)
         self.__shadow = shadowitem
         self.__blurAnimation = QPropertyAnimation(
@@ -188,6 +302,14 @@ class NodeBodyItem(GraphicsPathObject):
         if self.__animationEnabled != enabled:
             self.__animationEnabled = enabled
 
+    def setCachedShadowsEnabled(self, enabled):
+        # type: (bool) -> None
+        """
+        Paint the shadow from a shared pixmap cache (the default) instead
+        of a per item :class:`QGraphicsDropShadowEffect`.
+        """
+        self.__shadow.setCachedShadowsEnabled(enabled)
+
     def setProcessingState(self, state):
         # type: (int) -> None
         """
@@ -499,6 +621,11 @@ class AnchorPoint(QGraphicsObject):
 ANCHOR_TEXT_MARGIN = 4
 
 
+# Cache of the subdivided channel anchor paths. All the node items
+# (usually) share the same anchor path so there are only a few entries.
+_channel_anchors_paths = {}  # type: Dict[Tuple[tuple, int, float], QPainterPath]
+
+
 def make_channel_anchors_path(
         path: QPainterPath,  #: The full uninterrupted anchor path
         anchors: int,        #: Number of anchors
@@ -507,6 +634,22 @@ def make_channel_anchors_path(
     """Create a subdivided channel anchors path."""
     if path.isEmpty() or anchors <= 1:
         return QPainterPath(path)
+    elements = tuple(
+        (e.type, e.x, e.y)
+        for e in map(path.elementAt, range(path.elementCount()))
+    )
+    key = (elements, anchors, spacing)
+    cached = _channel_anchors_paths.get(key)
+    if cached is None:
+        if len(_channel_anchors_paths) > 256:
+            _channel_anchors_paths.clear()
+        cached = _make_channel_anchors_path(path, anchors, spacing)
+        _channel_anchors_paths[key] = cached
+    return QPainterPath(cached)
+
+
+def _make_channel_anchors_path(path, anchors, spacing):
+    # type: (QPainterPath, int, float) -> QPainterPath
     pathlen = path.length()
     spacing = min(spacing, pathlen / anchors)
     delta = (spacing / 2) / pathlen  # half of inner spacing
@@ -560,6 +703,11 @@ class NodeAnchorItem(GraphicsPathObject):
         self.__channelPointPositions = []  # type: List[float]
         self.__incompatible = False  # type: bool
         self.__signals = []  # type: List[Union[InputSignal, OutputSignal]]
+        # Cached channel percentages/positions (in local coordinates) on
+        # the anchor path keyed by signal id; invalidated when signals/anchor
+        # path change.
+        self.__channelPercents = None  # type: Optional[Dict[int, float]]
+        self.__channelPositions = None  # type: Optional[Dict[int, QPointF]]
         self.__signalLabels = []  # type: List[GraphicsTextItem]
         self.__signalLabelAnims = []  # type: List[QPropertyAnimation]
 
@@ -576,10 +724,10 @@ class NodeAnchorItem(GraphicsPathObject):
         # self.setGraphicsEffect(self.shadow)
         self.shadow.setEnabled(False)
 
-        shadowitem = GraphicsPathObject(self, objectName="shadow-shape-item")
+        shadowitem = ShadowShapeItem(self, self.shadow,
+                                     objectName="shadow-shape-item")
         shadowitem.setPen(Qt.NoPen)
         shadowitem.setBrush(QBrush(QColor(SHADOW_COLOR)))
-        shadowitem.setGraphicsEffect(self.shadow)
         shadowitem.setFlag(QGraphicsItem.ItemStacksBehindParent)
         self.__shadow = shadowitem
         self.__blurAnimation = QPropertyAnimation(self.shadow, b"blurRadius",
@@ -590,6 +738,8 @@ class NodeAnchorItem(GraphicsPathObject):
 
     def setSignals(self, signals):
         self.__signals = signals
+        self.__channelPercents = None
+        self.__channelPositions = None
         self.setAnchorPath(self.__anchorPath)  # (re)instantiate anchor paths
 
         # TODO this is ugly
@@ -655,6 +805,7 @@ class NodeAnchorItem(GraphicsPathObject):
         Set the anchor's curve path as a :class:`QPainterPath`.
         """
         self.__anchorPath = QPainterPath(path)
+        self.__channelPositions = None
         # Create a stroke of the path.
         stroke_path = QPainterPathStroker()
         stroke_path.setCapStyle(Qt.RoundCap)
@@ -904,18 +1055,39 @@ class NodeAnchorItem(GraphicsPathObject):
         if self.__animationEnabled != enabled:
             self.__animationEnabled = enabled
 
+    def setCachedShadowsEnabled(self, enabled):
+        # type: (bool) -> None
+        """
+        Paint the shadow from a shared pixmap cache (the default) instead
+        of a per item :class:`QGraphicsDropShadowEffect`.
+        """
+        self.__shadow.setCachedShadowsEnabled(enabled)
+
     def signalAtPos(self, scenePos, signalsToFind=None):
         if signalsToFind is None:
             signalsToFind = self.__signals
         pos = self.mapFromScene(scenePos)
 
         def signalLengthToPos(s):
-            perc = self.__getChannelPercent(s)
-            p = self.__anchorPath.pointAtPercent(perc)
-            return (p - pos).manhattanLength()
+            return (self.__getChannelPosition(s) - pos).manhattanLength()
 
         return min(signalsToFind, key=signalLengthToPos)
 
+    def __getChannelPosition(self, signal):
+        # type: (Any) -> QPointF
+        # Return the (cached) channel position on the anchor path.
+        if self.__channelPositions is None:
+            self.__channelPositions = {}
+        key = id(signal)
+        try:
+            return self.__channelPositions[key]
+        except KeyError:
+            pass
+        perc = self.__getChannelPercent(signal)
+        pos = self.__anchorPath.pointAtPercent(perc)
+        self.__channelPositions[key] = pos
+        return pos
+
     def __updateHoverState(self):
         self.__updateShadowState()
         self.__updatePositions()
@@ -926,12 +1098,23 @@ class NodeAnchorItem(GraphicsPathObject):
     def __getChannelPercent(self, signal):
         if signal is None:
             return 0.5
-        signals = self.__signals
-
-        ci = signals.index(signal)
-        gap_perc = 1 / 8
-        seg_perc = (1 - (gap_perc * (len(signals) - 1))) / len(signals)
-        return clip((ci * (gap_perc + seg_perc)) + seg_perc / 2, 0.0, 1.0)
+        if self.__channelPercents is None:
+            signals = self.__signals
+            gap_perc = 1 / 8
+            seg_perc = (1 - (gap_perc * (len(signals) - 1))) / len(signals) \
+                if signals else 0.0
+            percents = {}  # type: Dict[int, float]
+            for ci, s in enumerate(signals):
+                percents.setdefault(
+                    id(s),
+                    clip((ci * (gap_perc + seg_perc)) + seg_perc / 2, 0.0, 1.0)
+                )
+            self.__channelPercents = percents
+        try:
+            return self.__channelPercents[id(signal)]
+        except KeyError:
+            raise ValueError("{!r} is not in signals".format(signal)) \
+                from None
 
     def __updateShadowState(self):
         # type: () -> None
@@ -1213,6 +1396,7 @@ class NodeItem(QGraphicsWidget):
         self.__messages = {}  # type: Dict[Any, UserMessage]
         self.__anchorLayout = None
         self.__animationEnabled = False
+        self.__cachedShadowsEnabled = True
 
         self.setZValue(self.Z_VALUE)
 
@@ -1452,6 +1636,22 @@ class NodeItem(QGraphicsWidget):
         """
         return self.__animationEnabled
 
+    def setCachedShadowsEnabled(self, enabled):
+        # type: (bool) -> None
+        """
+        Paint the node (selection/hover) shadows from a shared pixmap cache
+        (the default) or using per item :class:`QGraphicsDropShadowEffect`.
+        """
+        if self.__cachedShadowsEnabled != enabled:
+            self.__cachedShadowsEnabled = enabled
+            self.shapeItem.setCachedShadowsEnabled(enabled)
+            self.outputAnchorItem.setCachedShadowsEnabled(enabled)
+            self.inputAnchorItem.setCachedShadowsEnabled(enabled)
+
+    def cachedShadowsEnabled(self):
+        # type: () -> bool
+        return self.__cachedShadowsEnabled
+
     def setProcessingState(self, state):
         # type: (int) -> None
         """
@@ -38,6 +38,42 @@ class TestAnnotationItem(TestItems):
         self.scene.addItem(annot3)
         self.qWait()
 
+    def test_textannotation_rich_text(self):
+        annot = TextAnnotation()
+        self.scene.addItem(annot)
+        content = "Title {}\n{}\n\n* aaa".format(time.time(), "-" * 40)
+        annot.setContent(content, "text/rst")
+        # plain text is shown until the rich text is rendered
+        self.assertEqual(annot.toPlainText(), content)
+        for _ in range(100):
+            if "---" not in annot.toPlainText():
+                break
+            self.qWait(50)
+        self.assertNotIn("---", annot.toPlainText())
+        self.assertIn("aaa", annot.toPlainText())
+        # a second annotation with the same content renders from the cache
+        annot2 = TextAnnotation()
+        annot2.setContent(content, "text/rst")
+        self.assertEqual(annot2.toPlainText(), annot.toPlainText())
+
+    def test_textannotation_sync_render(self):
+        annot = TextAnnotation()
+        annot.setAsyncRenderEnabled(False)
+        self.assertFalse(annot.asyncRenderEnabled())
+        content = "Title {}\n{}\n\n* aaa".format(time.time(), "-" * 40)
+        annot.setContent(content, "text/rst")
+        # rendered immediately
+        self.assertNotIn("---", annot.toPlainText())
+        self.assertIn("aaa", annot.toPlainText())
+
+        # disabling the async render finishes a pending render
+        annot = TextAnnotation()
+        content = "Title {}\n{}\n\n* bbb".format(time.time(), "-" * 40)
+        annot.setContent(content, "text/rst")
+        self.assertEqual(annot.toPlainText(), content)
+        annot.setAsyncRenderEnabled(False)
+        self.assertNotIn("---", annot.toPlainText())
+
     def test_arrowannotation(self):
         item = ArrowItem()
         self.scene.addItem(item)
@@ -1,8 +1,10 @@
 import time
+from unittest import mock
 
 from AnyQt.QtCore import QTimer
 
 from ..linkitem import LinkItem
+from ..graphicstextitem import GraphicsTextItem
 
 from .. import NodeItem, AnchorPoint
 
@@ -98,6 +100,38 @@ class TestLinkItem(TestItems):
 
         self.qWait()
 
+    def test_link_label_layout(self):
+        one_item, negate_item = self.one_item, self.negate_item
+        one_item.setPos(0, 100)
+        negate_item.setPos(300, 100)
+        self.scene.addItem(one_item)
+        self.scene.addItem(negate_item)
+        link = LinkItem()
+        link.setSourceItem(one_item)
+        link.setSinkItem(negate_item)
+        link.setSourceName("value")
+        link.setSinkName("value")
+        self.scene.addItem(link)
+        text = link.linkTextItem
+        width = text.textWidth()
+        with mock.patch.object(GraphicsTextItem, "setHtml", autospec=True,
+                               side_effect=GraphicsTextItem.setHtml) \
+                as setHtml:
+            # Moving a node only moves the label
+            transform = text.transform()
+            negate_item.setPos(300, 150)
+            self.assertNotEqual(text.transform(), transform)
+            self.assertEqual(text.textWidth(), width)
+            setHtml.assert_not_called()
+            # but a new label is set when the names change
+            link.setSinkName("input")
+            setHtml.assert_called_once()
+        self.assertIn("input", text.toPlainText())
+        # The label width is constrained by the link length
+        negate_item.setPos(130, 100)
+        self.assertLess(text.textWidth(), width + 1)
+        self.assertGreaterEqual(text.textWidth(), 100)
+
     def test_dynamic_link(self):
         link = LinkItem()
         anchor1 = self.one_item.newOutputAnchor()
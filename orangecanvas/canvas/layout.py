@@ -5,7 +5,7 @@ Node/Link layout.
 from operator import attrgetter
 
 import typing
-from typing import Optional, Any, List
+from typing import Optional, Any, Dict
 
 from AnyQt.QtWidgets import QGraphicsObject, QApplication, QGraphicsItem
 from AnyQt.QtCore import QRectF, QLineF, QEvent, QPointF
@@ -30,7 +30,9 @@ class AnchorLayout(QGraphicsObject):
 
         self.__layoutPending = False
         self.__isActive = False
-        self.__invalidatedAnchors = []  # type: List[NodeAnchorItem]
+        # Invalidated anchors (an ordered set); moving many nodes at once
+        # invalidates the same anchors repeatedly.
+        self.__invalidatedAnchors = {}  # type: Dict[NodeAnchorItem, None]
         self.__enabled = True
 
     def boundingRect(self):  # type: () -> QRectF
@@ -68,7 +70,7 @@ class AnchorLayout(QGraphicsObject):
         point_pairs += [(a, b) for b, a in point_pairs]
         to_other = dict(point_pairs)
 
-        anchors = set(self.__invalidatedAnchors)
+        anchors = list(self.__invalidatedAnchors)
 
         for anchor_item in anchors:
             if sip.isdeleted(anchor_item):
@@ -93,7 +95,7 @@ class AnchorLayout(QGraphicsObject):
             positions = [positions[i] for i in indices]
             anchor_item.setAnchorPositions(positions)
 
-        self.__invalidatedAnchors = []
+        self.__invalidatedAnchors = {}
 
     def invalidateLink(self, link):
         # type: (LinkItem) -> None
@@ -132,7 +134,7 @@ class AnchorLayout(QGraphicsObject):
         ----------
         anchor : NodeAnchorItem
         """
-        self.__invalidatedAnchors.append(anchor)
+        self.__invalidatedAnchors[anchor] = None
 
         scene = self.scene()  # type: CanvasScene
         node = anchor.parentNodeItem()
@@ -149,7 +151,9 @@ class AnchorLayout(QGraphicsObject):
         else:
             raise TypeError(type(anchor))
 
-        self.__invalidatedAnchors.extend(map(getter, links))
+        self.__invalidatedAnchors.update(
+            dict.fromkeys(map(getter, links))
+        )
 
         self.scheduleDelayedActivate()
 
@@ -0,0 +1,387 @@
+"""
+Canvas Overview
+===============
+
+A minimap of a :class:`QGraphicsView`'s scene.
+
+The scene is rendered at a low resolution into a cached image which is
+updated incrementally (only the regions reported by
+:func:`QGraphicsScene.changed`) and at most once per
+:func:`CanvasOverview.updateInterval` milliseconds. The view's visible
+area is drawn over the image and can be moved by clicking/dragging.
+
+"""
+import math
+from typing import List, Optional
+
+from AnyQt.QtWidgets import (
+    QWidget, QGraphicsView, QGraphicsScene, QSizePolicy
+)
+from AnyQt.QtGui import (
+    QImage, QPainter, QTransform, QColor, QPen, QPalette, QMouseEvent,
+    QPaintEvent, QResizeEvent
+)
+from AnyQt.QtCore import (
+    Qt, QRect, QRectF, QPoint, QPointF, QSize, QTimer, QEvent, QObject
+)
+
+__all__ = ["CanvasOverview"]
+
+
+class CanvasOverview(QWidget):
+    """
+    An overview (minimap) of a :class:`QGraphicsView`.
+
+    Parameters
+    ----------
+    parent : Optional[QWidget]
+        The parent widget.
+    view : Optional[QGraphicsView]
+        The displayed view.
+
+    .. note:: Only the existing items are rendered, i.e. with a virtualized
+        :class:`.CanvasScene` only the nodes and links near the view's
+        visible area.
+    """
+    #: The default maximum update rate of the cached render (in ms).
+    UpdateInterval = 100
+
+    #: Render the whole image when the changed regions cover more than this
+    #: fraction of it.
+    FullRenderThreshold = 0.5
+
+    def __init__(self, parent=None, view=None, **kwargs):
+        # type: (Optional[QWidget], Optional[QGraphicsView], ...) -> None
+        super().__init__(parent, **kwargs)
+        self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.__view = None  # type: Optional[QGraphicsView]
+        self.__scene = None  # type: Optional[QGraphicsScene]
+        # The cached render and its scene -> image transform (in device
+        # independent pixels)
+        self.__image = QImage()
+        self.__transform = QTransform()
+        # Changed image rects (in device independent pixels) waiting to
+        # be rendered; None when the whole image must be rendered.
+        self.__pending = []  # type: Optional[List[QRect]]
+        self.__updateTimer = QTimer(
+            self, singleShot=True, interval=self.UpdateInterval,
+            timeout=self.renderPending
+        )
+        # Offset of the press position from the visible area center.
+        self.__dragOffset = None  # type: Optional[QPointF]
+        if view is not None:
+            self.setView(view)
+
+    def setView(self, view):
+        # type: (Optional[QGraphicsView]) -> None
+        """
+        Set the displayed view.
+        """
+        if self.__view is view:
+            return
+        if self.__view is not None:
+            self.__connectView(self.__view, False)
+            self.__setScene(None)
+        self.__view = view
+        if view is not None:
+            self.__connectView(view, True)
+            self.__setScene(view.scene())
+        self.__invalidate()
+
+    def view(self):
+        # type: () -> Optional[QGraphicsView]
+        """
+        Return the displayed view.
+        """
+        return self.__view
+
+    def __connectView(self, view, connect):
+        # type: (QGraphicsView, bool) -> None
+        # Repaint the visible area rect when the view is scrolled, resized
+        # or zoomed.
+        signals = []
+        for bar in [view.horizontalScrollBar(), view.verticalScrollBar()]:
+            signals += [bar.valueChanged, bar.rangeChanged]
+        zoomLevelChanged = getattr(view, "zoomLevelChanged", None)
+        if zoomLevelChanged is not None:
+            signals.append(zoomLevelChanged)
+        for signal in signals:
+            if connect:
+                signal.connect(self.__onViewChanged)
+            else:
+                signal.disconnect(self.__onViewChanged)
+        if connect:
+            view.viewport().installEventFilter(self)
+            view.destroyed.connect(self.__onViewDestroyed)
+        else:
+            view.viewport().removeEventFilter(self)
+            view.destroyed.disconnect(self.__onViewDestroyed)
+
+    def __onViewDestroyed(self):
+        self.__view = None
+        self.__setScene(None)
+
+    def __onViewChanged(self, *args):
+        self.update()
+
+    def __setScene(self, scene):
+        # type: (Optional[QGraphicsScene]) -> None
+        if self.__scene is scene:
+            return
+        if self.__scene is not None:
+            self.__scene.changed.disconnect(self.__onSceneChanged)
+            self.__scene.sceneRectChanged.disconnect(self.__invalidate)
+        self.__scene = scene
+        if scene is not None:
+            scene.changed.connect(self.__onSceneChanged)
+            scene.sceneRectChanged.connect(self.__invalidate)
+        self.__invalidate()
+
+    def setUpdateInterval(self, interval):
+        # type: (int) -> None
+        """
+        Set the minimum interval (in ms) between the updates of the cached
+        scene render.
+        """
+        self.__updateTimer.setInterval(interval)
+
+    def updateInterval(self):
+        # type: () -> int
+        return self.__updateTimer.interval()
+
+    def sizeHint(self):
+        # type: () -> QSize
+        return QSize(200, 150)
+
+    def renderPending(self):
+        # type: () -> None
+        """
+        Immediately render the pending scene changes into the cached image.
+        """
+        self.__updateTimer.stop()
+        scene = self.__scene
+        if scene is None or not self.isVisible() or self.__pending == []:
+            return
+        if self.__pending is None or self.__image.isNull():
+            self.__pending = None
+            self.__resetImage()
+            rects = [QRect(QPoint(0, 0), self.__imageSize())]
+        else:
+            rects = self.__pending
+        self.__pending = []
+        if self.__image.isNull():
+            return
+        inverted, _ = self.__transform.inverted()
+        painter = QPainter(self.__image)
+        painter.setRenderHints(QPainter.Antialiasing |
+                               QPainter.SmoothPixmapTransform)
+        background = self.palette().color(QPalette.Base)
+        for rect in rects:
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
+            painter.fillRect(rect, background)
+            painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+            scene.render(painter, QRectF(rect),
+                         inverted.mapRect(QRectF(rect)),
+                         Qt.IgnoreAspectRatio)
+        painter.end()
+        self.update()
+
+    def __onSceneChanged(self, regions):
+        # type: (List[QRectF]) -> None
+        if self.__pending is None or self.__image.isNull():
+            self.__scheduleRender()
+            return
+        bounds = QRect(QPoint(0, 0), self.__imageSize())
+        pending = self.__pending
+        for region in regions:
+            # cover the antialiased edges
+            rect = self.__transform.mapRect(region).toAlignedRect()
+            rect = rect.adjusted(-1, -1, 1, 1) & bounds
+            if not rect.isEmpty():
+                pending = merge_rect(pending, rect)
+        area = sum(r.width() * r.height() for r in pending)
+        if area > self.FullRenderThreshold * bounds.width() * bounds.height():
+            self.__pending = None
+        else:
+            self.__pending = pending
+        if self.__pending != []:
+            self.__scheduleRender()
+
+    def __invalidate(self):
+        # type: () -> None
+        # The whole render (and the transform) must be updated.
+        self.__pending = None
+        self.__scheduleRender()
+        self.update()
+
+    def __scheduleRender(self):
+        # type: () -> None
+        # Throttle; do not restart an already running timer.
+        if not self.__updateTimer.isActive():
+            self.__updateTimer.start()
+
+    def __imageSize(self):
+        # type: () -> QSize
+        image = self.__image
+        ratio = image.devicePixelRatio()
+        return QSize(int(image.width() / ratio), int(image.height() / ratio))
+
+    def __resetImage(self):
+        # type: () -> None
+        # Fit the scene rect into the widget (keeping the aspect ratio).
+        scene = self.__scene
+        assert scene is not None
+        rect = QRectF(scene.sceneRect())
+        size = self.contentsRect().size()
+        if rect.isEmpty() or size.isEmpty():
+            self.__image = QImage()
+            self.__transform = QTransform()
+            return
+        scale = min(size.width() / rect.width(),
+                    size.height() / rect.height())
+        width = max(int(math.ceil(rect.width() * scale)), 1)
+        height = max(int(math.ceil(rect.height() * scale)), 1)
+        ratio = self.devicePixelRatioF()
+        image = QImage(int(width * ratio), int(height * ratio),
+                       QImage.Format_ARGB32_Premultiplied)
+        image.setDevicePixelRatio(ratio)
+        self.__image = image
+        transform = QTransform()
+        transform.scale(scale, scale)
+        transform.translate(-rect.x(), -rect.y())
+        self.__transform = transform
+
+    def __imageOffset(self):
+        # type: () -> QPointF
+        # The image is centered in the contents rect
+        rect = self.contentsRect()
+        size = self.__imageSize()
+        return QPointF(rect.x() + (rect.width() - size.width()) / 2,
+                       rect.y() + (rect.height() - size.height()) / 2)
+
+    def mapToScene(self, pos):
+        # type: (QPointF) -> QPointF
+        """
+        Map a point in widget coordinates to the scene.
+        """
+        inverted, _ = self.__transform.inverted()
+        return inverted.map(QPointF(pos) - self.__imageOffset())
+
+    def mapFromScene(self, point):
+        # type: (QPointF) -> QPointF
+        """
+        Map a point in the scene to the widget coordinates.
+        """
+        return self.__transform.map(QPointF(point)) + self.__imageOffset()
+
+    def visibleSceneRect(self):
+        # type: () -> QRectF
+        """
+        Return the view's visible area in the scene.
+        """
+        view = self.__view
+        if view is None:
+            return QRectF()
+        return view.mapToScene(view.viewport().rect()).boundingRect()
+
+    def __visibleRect(self):
+        # type: () -> QRectF
+        # The view's visible area in widget coordinates.
+        rect = self.__transform.mapRect(self.visibleSceneRect())
+        return rect.translated(self.__imageOffset())
+
+    def paintEvent(self, event):
+        # type: (QPaintEvent) -> None
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), self.palette().color(QPalette.Window))
+        if not self.__image.isNull():
+            painter.drawImage(self.__imageOffset(), self.__image)
+            rect = self.__visibleRect()
+            if not rect.isEmpty():
+                color = QColor(self.palette().color(QPalette.Highlight))
+                painter.setPen(QPen(color, 1))
+                color.setAlpha(40)
+                painter.setBrush(color)
+                painter.drawRect(rect.adjusted(0.5, 0.5, -0.5, -0.5))
+        painter.end()
+
+    def resizeEvent(self, event):
+        # type: (QResizeEvent) -> None
+        super().resizeEvent(event)
+        self.__invalidate()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # scene changes are not rendered while hidden
+        self.__invalidate()
+
+    def mousePressEvent(self, event):
+        # type: (QMouseEvent) -> None
+        if event.button() == Qt.LeftButton and self.__view is not None \
+                and not self.__image.isNull():
+            pos = QPointF(event.pos())
+            rect = self.__visibleRect()
+            if rect.contains(pos):
+                # drag the visible area without recentering it first
+                self.__dragOffset = rect.center() - pos
+            else:
+                self.__dragOffset = QPointF()
+            self.__centerOn(pos + self.__dragOffset)
+            event.accept()
+        else:
+            super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        # type: (QMouseEvent) -> None
+        if event.buttons() & Qt.LeftButton and self.__dragOffset is not None:
+            self.__centerOn(QPointF(event.pos()) + self.__dragOffset)
+            event.accept()
+        else:
+            super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        # type: (QMouseEvent) -> None
+        if event.button() == Qt.LeftButton and self.__dragOffset is not None:
+            self.__dragOffset = None
+            event.accept()
+        else:
+            super().mouseReleaseEvent(event)
+
+    def __centerOn(self, pos):
+        # type: (QPointF) -> None
+        assert self.__view is not None
+        self.__view.centerOn(self.mapToScene(pos))
+
+    def eventFilter(self, obj, event):
+        # type: (QObject, QEvent) -> bool
+        view = self.__view
+        etype = event.type()
+        if etype in (QEvent.Resize, QEvent.Paint) and view is not None \
+                and obj is view.viewport():
+            if etype == QEvent.Resize:
+                self.update()
+            elif view.scene() is not self.__scene:
+                # QGraphicsView.setScene has no notifier signal
+                self.__setScene(view.scene())
+        return super().eventFilter(obj, event)
+
+
+def merge_rect(rects, rect):
+    # type: (List[QRect], QRect) -> List[QRect]
+    """
+    Add `rect` to a list of disjoint rects, merging it with (replacing by
+    bounding rect) all the rects it intersects.
+    """
+    rects = list(rects)
+    merged = True
+    while merged:
+        merged = False
+        for i, other in enumerate(rects):
+            if other.intersects(rect):
+                rect = rect | other
+                del rects[i]
+                merged = True
+                break
+    rects.append(rect)
+    return rects
@@ -5,7 +5,7 @@ Canvas Graphics Scene
 
 """
 import typing
-from typing import Dict, List, Optional, Any, Type, Tuple, Union
+from typing import Dict, List, Optional, Any, Type, Tuple, Union, Iterable
 
 import logging
 import itertools
@@ -15,13 +15,14 @@ from operator import attrgetter
 from xml.sax.saxutils import escape
 
 from AnyQt.QtWidgets import QGraphicsScene, QGraphicsItem
-from AnyQt.QtGui import QPainter, QColor, QFont
+from AnyQt.QtGui import QPainter, QColor, QFont, QPainterPath
 from AnyQt.QtCore import (
     Qt, QPointF, QRectF, QSizeF, QLineF, QBuffer, QObject, QSignalMapper,
     QParallelAnimationGroup, QT_VERSION
 )
 from AnyQt.QtSvg import QSvgGenerator
 from AnyQt.QtCore import pyqtSignal as Signal
+from AnyQt import sip
 
 from ..registry import (
     WidgetRegistry, WidgetDescription, CategoryDescription,
@@ -34,6 +35,7 @@ from .items import NodeItem, LinkItem
 from .items.annotationitem import Annotation
 
 from .layout import AnchorLayout
+from .spatialindex import GridIndex
 
 if typing.TYPE_CHECKING:
     from ..document.interactions import UserInteraction
@@ -46,6 +48,10 @@ __all__ = [
 
 log = logging.getLogger(__name__)
 
+#: The (approximate) extent of a node item relative to the node's position
+#: used for the node records in the virtualized mode.
+NODE_RECORD_RECT = QRectF(-80, -40, 160, 100)
+
 
 class CanvasScene(QGraphicsScene):
     """
@@ -101,15 +107,37 @@ class CanvasScene(QGraphicsScene):
         self.__node_items = []  # type: List[NodeItem]
         # Mapping from SchemeNodes to canvas items
         self.__item_for_node = {}  # type: Dict[SchemeNode, NodeItem]
+        # Reverse mapping from canvas items to SchemeNodes
+        self.__node_for_item = {}  # type: Dict[NodeItem, SchemeNode]
         # All link items
         self.__link_items = []  # type: List[LinkItem]
         # Mapping from SchemeLinks to canvas items.
         self.__item_for_link = {}  # type: Dict[SchemeLink, LinkItem]
+        # Reverse mapping from canvas items to SchemeLinks
+        self.__link_for_item = {}  # type: Dict[LinkItem, SchemeLink]
+        # Link items with deferred curve updates (while moving many nodes)
+        self.__deferred_links = []  # type: List[LinkItem]
 
         # All annotation items
         self.__annotation_items = []  # type: List[Annotation]
         # Mapping from SchemeAnnotations to canvas items.
         self.__item_for_annotation = {}  # type: Dict[BaseSchemeAnnotation, Annotation]
+        # Reverse mapping from canvas items to SchemeAnnotations
+        self.__annotation_for_item = {}  # type: Dict[Annotation, BaseSchemeAnnotation]
+
+        # Spatial index of the (selectable) node and annotation items.
+        # Built lazily on first query; moved items are only marked as dirty
+        # and reindexed on the next query.
+        self.__item_index = None  # type: Optional[GridIndex[QGraphicsItem]]
+        self.__item_index_dirty = {}  # type: Dict[QGraphicsItem, None]
+
+        # Virtualized mode. All nodes and links have a record (a scene rect)
+        # in a spatial index but the items are only created for the records
+        # near the visible area of the views.
+        self.__virtualized = False
+        self.__virtualization_margin = 0.5
+        self.__node_records = None  # type: Optional[GridIndex[SchemeNode]]
+        self.__link_records = None  # type: Optional[GridIndex[SchemeLink]]
 
         # Is the scene editable
         self.editable = True
@@ -121,6 +149,8 @@ class CanvasScene(QGraphicsScene):
         self.__channel_names_visible = True
         self.__node_animation_enabled = True
         self.__animations_temporarily_disabled = False
+        self.__cached_shadows_enabled = True
+        self.__async_annotation_render_enabled = True
 
         self.user_interaction_handler = None  # type: Optional[UserInteraction]
 
@@ -150,6 +180,10 @@ class CanvasScene(QGraphicsScene):
         if self.scheme is not None:
             self.scheme.node_added.disconnect(self.add_node)
             self.scheme.node_removed.disconnect(self.remove_node)
+            self.scheme.node_positions_about_to_change.disconnect(
+                self.__on_node_positions_about_to_change)
+            self.scheme.node_positions_changed.disconnect(
+                self.__on_node_positions_changed)
 
             self.scheme.link_added.disconnect(self.add_link)
             self.scheme.link_removed.disconnect(self.remove_link)
@@ -169,16 +203,25 @@ class CanvasScene(QGraphicsScene):
                     self.remove_link(link)
 
             for node in self.scheme.nodes:
-                if node in self.__item_for_node:
+                if node in self.__item_for_node or \
+                        self.__has_record(self.__node_records, node):
                     self.remove_node(node)
 
         self.scheme = None
+        if self.__virtualized:
+            self.__node_records = GridIndex(cellSize=400)
+            self.__link_records = GridIndex(cellSize=1000)
         self.__node_items = []
         self.__item_for_node = {}
+        self.__node_for_item = {}
         self.__link_items = []
         self.__item_for_link = {}
+        self.__link_for_item = {}
         self.__annotation_items = []
         self.__item_for_annotation = {}
+        self.__annotation_for_item = {}
+        self.__item_index = None
+        self.__item_index_dirty = {}
 
         self.__anchor_layout.deleteLater()
 
@@ -206,6 +249,10 @@ class CanvasScene(QGraphicsScene):
         if self.scheme is not None:
             self.scheme.node_added.connect(self.add_node)
             self.scheme.node_removed.connect(self.remove_node)
+            self.scheme.node_positions_about_to_change.connect(
+                self.__on_node_positions_about_to_change)
+            self.scheme.node_positions_changed.connect(
+                self.__on_node_positions_changed)
 
             self.scheme.link_added.connect(self.add_link)
             self.scheme.link_removed.connect(self.remove_link)
@@ -213,17 +260,258 @@ class CanvasScene(QGraphicsScene):
             self.scheme.annotation_added.connect(self.add_annotation)
             self.scheme.annotation_removed.connect(self.remove_annotation)
 
-        for node in scheme.nodes:
-            self.add_node(node)
+        if self.__virtualized:
+            for node in scheme.nodes:
+                self.__insert_node_record(node)
+            for link in scheme.links:
+                self.__insert_link_record(link)
+            self.__update_records_scene_rect()
+        else:
+            for node in scheme.nodes:
+                self.add_node(node)
 
-        for link in scheme.links:
-            self.add_link(link)
+            for link in scheme.links:
+                self.add_link(link)
 
         for annot in scheme.annotations:
             self.add_annotation(annot)
 
+        if self.__virtualized:
+            self.update_visible_items()
+
         self.__anchor_layout.activate()
 
+    def set_virtualized(self, virtualized):
+        # type: (bool) -> None
+        """
+        Set the virtualized mode.
+
+        In the virtualized mode the node and link items are only created
+        for the nodes and links near the visible area of the attached
+        views (see :func:`update_visible_items`) and are removed when they
+        are scrolled away (unless they are selected). The other nodes and
+        links are tracked by lightweight records in a spatial index.
+
+        :func:`item_for_node` and :func:`item_for_link` create the items on
+        demand, while :func:`node_items` and :func:`link_items` only return
+        the currently existing items.
+        """
+        if self.__virtualized == virtualized:
+            return
+        self.__virtualized = virtualized
+        scheme = self.scheme
+        if virtualized:
+            self.__node_records = GridIndex(cellSize=400)
+            self.__link_records = GridIndex(cellSize=1000)
+            if scheme is not None:
+                for node in scheme.nodes:
+                    self.__insert_node_record(node)
+                for link in scheme.links:
+                    self.__insert_link_record(link)
+                self.__update_records_scene_rect()
+                self.update_visible_items()
+        else:
+            if scheme is not None:
+                for node in scheme.nodes:
+                    if node not in self.__item_for_node:
+                        self.__materialize_node(node)
+                for link in scheme.links:
+                    if link not in self.__item_for_link:
+                        self.__materialize_link(link)
+                for node in scheme.nodes:
+                    node.position_changed.disconnect(
+                        self.__on_node_record_pos_changed)
+            self.__node_records = self.__link_records = None
+            # restore the default (growing items bounding rect) scene rect
+            self.setSceneRect(QRectF())
+
+    def is_virtualized(self):
+        # type: () -> bool
+        """
+        Is the scene in the virtualized mode.
+        """
+        return self.__virtualized
+
+    def set_virtualization_margin(self, margin):
+        # type: (float) -> None
+        """
+        Set the margin (as a fraction of the view size) around the visible
+        area in which the items are created in the virtualized mode.
+
+        The items are removed only when they are more than twice the
+        margin away.
+        """
+        self.__virtualization_margin = margin
+        self.update_visible_items()
+
+    def virtualization_margin(self):
+        # type: () -> float
+        return self.__virtualization_margin
+
+    def update_visible_items(self):
+        # type: () -> None
+        """
+        Create the items for the nodes and links near the visible area of
+        the attached views and remove the ones that are far from it (in
+        the virtualized mode).
+
+        This is called by :class:`.CanvasView` when its visible area
+        changes.
+        """
+        if not self.__virtualized or self.scheme is None:
+            return
+        node_records, link_records = self.__node_records, self.__link_records
+        assert node_records is not None and link_records is not None
+        margin = self.__virtualization_margin
+        for rect in self.__visible_rects(margin):
+            for node in node_records.intersecting(rect):
+                if node not in self.__item_for_node:
+                    self.__materialize_node(node)
+            for link in link_records.intersecting(rect):
+                if link not in self.__item_for_link:
+                    self.__materialize_link(link)
+
+        if self.user_interaction_handler is not None:
+            # never remove items in the middle of an interaction
+            return
+        rects = self.__visible_rects(2 * margin)
+
+        def visible(records, key):
+            rect = records.rect(key)
+            return any(rect.intersects(r) for r in rects)
+
+        pinned = {self.mouseGrabberItem(), self.focusItem()}
+        keep_links = set()
+        for link, item in list(self.__item_for_link.items()):
+            if item.isSelected() or item in pinned or \
+                    visible(link_records, link):
+                keep_links.add(link)
+            else:
+                self.__release_link(link)
+        keep_nodes = {node for link in keep_links
+                      for node in (link.source_node, link.sink_node)}
+        for node, item in list(self.__item_for_node.items()):
+            if node in keep_nodes or item.isSelected() or item in pinned or \
+                    visible(node_records, node):
+                continue
+            self.__release_node(node)
+
+    def __visible_rects(self, margin):
+        # type: (float) -> List[QRectF]
+        rects = []
+        for view in self.views():
+            rect = view.mapToScene(view.viewport().rect()).boundingRect()
+            dx, dy = rect.width() * margin, rect.height() * margin
+            rects.append(rect.adjusted(-dx, -dy, dx, dy))
+        return rects
+
+    @staticmethod
+    def __has_record(records, key):
+        # type: (Optional[GridIndex], Any) -> bool
+        return records is not None and key in records
+
+    def __node_record_rect(self, node):
+        # type: (SchemeNode) -> QRectF
+        item = self.__item_for_node.get(node)
+        if item is not None:
+            pos = item.pos()
+        else:
+            pos = QPointF(*node.position) if node.position else QPointF()
+        return NODE_RECORD_RECT.translated(pos)
+
+    def __link_record_rect(self, link):
+        # type: (SchemeLink) -> QRectF
+        records = self.__node_records
+        assert records is not None
+        rect = records.rect(link.source_node) | records.rect(link.sink_node)
+        # the link curve can extend past the anchors
+        return rect.adjusted(-50, -50, 50, 50)
+
+    def __insert_node_record(self, node):
+        # type: (SchemeNode) -> None
+        assert self.__node_records is not None
+        self.__node_records.insert(node, self.__node_record_rect(node))
+        node.position_changed.connect(self.__on_node_record_pos_changed)
+
+    def __insert_link_record(self, link):
+        # type: (SchemeLink) -> None
+        assert self.__link_records is not None
+        self.__link_records.insert(link, self.__link_record_rect(link))
+
+    def __update_node_record(self, node):
+        # type: (SchemeNode) -> None
+        node_records, link_records = self.__node_records, self.__link_records
+        if node_records is None or link_records is None or \
+                node not in node_records:
+            return
+        rect = self.__node_record_rect(node)
+        node_records.update(node, rect)
+        self.__grow_scene_rect(rect)
+        if self.scheme is not None:
+            links = self.scheme.find_links(source_node=node) + \
+                    self.scheme.find_links(sink_node=node)
+            for link in links:
+                if link in link_records:
+                    link_records.update(link, self.__link_record_rect(link))
+
+    def __on_node_record_pos_changed(self, pos):
+        # type: (Tuple[float, float]) -> None
+        self.__update_node_record(self.sender())
+
+    def __update_records_scene_rect(self):
+        # type: () -> None
+        records = self.__node_records
+        assert records is not None
+        rect = QRectF()
+        for node in records.keys():
+            rect |= records.rect(node)
+        self.__grow_scene_rect(rect)
+
+    def __grow_scene_rect(self, rect):
+        # type: (QRectF) -> None
+        # The scene rect (scroll range) must cover the items that do not
+        # (yet) exist.
+        current = self.sceneRect()
+        if not current.contains(rect):
+            self.setSceneRect(current | rect)
+
+    def __materialize_node(self, node):
+        # type: (SchemeNode) -> NodeItem
+        item = self.__new_item_for_node(node)
+        self.__add_node_item(item, select=False)
+        return item
+
+    def __materialize_link(self, link):
+        # type: (SchemeLink) -> LinkItem
+        item = self.__new_item_for_link(link)
+        self.add_link_item(item)
+        return item
+
+    def __release_node(self, node):
+        # type: (SchemeNode) -> None
+        item = self.__item_for_node.pop(node)
+        del self.__node_for_item[item]
+
+        node.position_changed.disconnect(self.__on_node_pos_changed)
+        node.title_changed.disconnect(item.setTitle)
+        node.progress_changed.disconnect(item.setProgress)
+        node.processing_state_changed.disconnect(item.setProcessingState)
+        node.state_message_changed.disconnect(item.setStateMessage)
+        node.status_message_changed.disconnect(item.setStatusMessage)
+
+        self.remove_node_item(item)
+
+    def __release_link(self, link):
+        # type: (SchemeLink) -> None
+        item = self.__item_for_link.pop(link)
+        del self.__link_for_item[item]
+        link.enabled_changed.disconnect(item.setEnabled)
+
+        if link.is_dynamic():
+            link.dynamic_enabled_changed.disconnect(item.setDynamicEnabled)
+        link.state_changed.disconnect(item.setRuntimeState)
+        self.remove_link_item(item)
+
     def set_registry(self, registry):
         # type: (WidgetRegistry) -> None
         """
@@ -280,11 +568,56 @@ class CanvasScene(QGraphicsScene):
             for link in self.__link_items:
                 link.setAnimationEnabled(enabled)
 
+    def set_cached_shadows_enabled(self, enabled):
+        # type: (bool) -> None
+        """
+        Paint the node shadows from a shared pre-rendered pixmap cache
+        (the default) instead of using a `QGraphicsDropShadowEffect` for
+        every node item.
+        """
+        if self.__cached_shadows_enabled != enabled:
+            self.__cached_shadows_enabled = enabled
+            for node in self.__node_items:
+                node.setCachedShadowsEnabled(enabled)
+
+    def cached_shadows_enabled(self):
+        # type: () -> bool
+        """
+        Return the cached shadows enabled state.
+        """
+        return self.__cached_shadows_enabled
+
+    def set_async_annotation_render_enabled(self, enabled):
+        # type: (bool) -> None
+        """
+        Render the rich text annotations (e.g. Markdown) in a worker thread
+        (the default) or immediately when they are added or changed.
+
+        Disable this when the scene is rendered immediately after it is
+        populated (e.g. for a thumbnail).
+        """
+        if self.__async_annotation_render_enabled != enabled:
+            self.__async_annotation_render_enabled = enabled
+            for item in self.__annotation_items:
+                if isinstance(item, items.TextAnnotation):
+                    item.setAsyncRenderEnabled(enabled)
+
+    def async_annotation_render_enabled(self):
+        # type: () -> bool
+        """
+        Return the asynchronous annotation render enabled state.
+        """
+        return self.__async_annotation_render_enabled
+
     def add_node_item(self, item):
         # type: (NodeItem) -> NodeItem
         """
         Add a :class:`.NodeItem` instance to the scene.
         """
+        return self.__add_node_item(item)
+
+    def __add_node_item(self, item, select=True):
+        # type: (NodeItem, bool) -> NodeItem
         if item in self.__node_items:
             raise ValueError("%r is already in the scene." % item)
 
@@ -297,6 +630,7 @@ class CanvasScene(QGraphicsScene):
             item.setPos(pos)
 
         item.setFont(self.font())
+        item.setCachedShadowsEnabled(self.__cached_shadows_enabled)
 
         # Set signal mappings
         self.activated_mapper.setMapping(item, item)
@@ -311,9 +645,11 @@ class CanvasScene(QGraphicsScene):
         self.addItem(item)
 
         self.__node_items.append(item)
+        self.__index_invalidate(item)
 
-        self.clearSelection()
-        item.setSelected(True)
+        if select:
+            self.clearSelection()
+            item.setSelected(True)
 
         self.node_item_added.emit(item)
 
@@ -331,6 +667,14 @@ class CanvasScene(QGraphicsScene):
             # Already added
             return self.__item_for_node[node]
 
+        if self.__virtualized and node not in self.__node_records:
+            self.__insert_node_record(node)
+            self.__grow_scene_rect(self.__node_records.rect(node))
+
+        return self.add_node_item(self.__new_item_for_node(node))
+
+    def __new_item_for_node(self, node):
+        # type: (SchemeNode) -> NodeItem
         item = self.new_node_item(node.description)
 
         if node.position:
@@ -349,6 +693,7 @@ class CanvasScene(QGraphicsScene):
         item.setStatusMessage(node.status_message())
 
         self.__item_for_node[node] = item
+        self.__node_for_item[item] = node
 
         node.position_changed.connect(self.__on_node_pos_changed)
         node.title_changed.connect(item.setTitle)
@@ -356,8 +701,7 @@ class CanvasScene(QGraphicsScene):
         node.processing_state_changed.connect(item.setProcessingState)
         node.state_message_changed.connect(item.setStateMessage)
         node.status_message_changed.connect(item.setStatusMessage)
-
-        return self.add_node_item(item)
+        return item
 
     def new_node_item(self, widget_desc, category_desc=None):
         # type: (WidgetDescription, Optional[CategoryDescription]) -> NodeItem
@@ -399,6 +743,7 @@ class CanvasScene(QGraphicsScene):
         item.hide()
         self.removeItem(item)
         self.__node_items.remove(item)
+        self.__index_remove(item)
 
         self.node_item_removed.emit(item)
 
@@ -410,20 +755,20 @@ class CanvasScene(QGraphicsScene):
         method.
 
         """
-        item = self.__item_for_node.pop(node)
-
-        node.position_changed.disconnect(self.__on_node_pos_changed)
-        node.title_changed.disconnect(item.setTitle)
-        node.progress_changed.disconnect(item.setProgress)
-        node.processing_state_changed.disconnect(item.setProcessingState)
-        node.state_message_changed.disconnect(item.setStateMessage)
-
-        self.remove_node_item(item)
+        if self.__has_record(self.__node_records, node):
+            self.__node_records.remove(node)
+            node.position_changed.disconnect(self.__on_node_record_pos_changed)
+            if node not in self.__item_for_node:
+                return
+        self.__release_node(node)
 
     def node_items(self):
         # type: () -> List[NodeItem]
         """
         Return all :class:`.NodeItem` instances in the scene.
+
+        In the virtualized mode only the currently existing items are
+        returned.
         """
         return list(self.__node_items)
 
@@ -458,8 +803,14 @@ class CanvasScene(QGraphicsScene):
         if scheme_link in self.__item_for_link:
             return self.__item_for_link[scheme_link]
 
-        source = self.__item_for_node[scheme_link.source_node]
-        sink = self.__item_for_node[scheme_link.sink_node]
+        if self.__virtualized and scheme_link not in self.__link_records:
+            self.__insert_link_record(scheme_link)
+        return self.__materialize_link(scheme_link)
+
+    def __new_item_for_link(self, scheme_link):
+        # type: (SchemeLink) -> LinkItem
+        source = self.item_for_node(scheme_link.source_node)
+        sink = self.item_for_node(scheme_link.sink_node)
 
         item = self.new_link_item(source, scheme_link.source_channel,
                                   sink, scheme_link.sink_channel)
@@ -475,8 +826,8 @@ class CanvasScene(QGraphicsScene):
         item.setRuntimeState(scheme_link.runtime_state())
         scheme_link.state_changed.connect(item.setRuntimeState)
 
-        self.add_link_item(item)
         self.__item_for_link[scheme_link] = item
+        self.__link_for_item[item] = scheme_link
         return item
 
     def new_link_item(self, source_item, source_channel,
@@ -532,20 +883,19 @@ class CanvasScene(QGraphicsScene):
         for a :class:`SchemeLink` instance `link` using the `add_link` method.
 
         """
-        item = self.__item_for_link.pop(scheme_link)
-        scheme_link.enabled_changed.disconnect(item.setEnabled)
-
-        if scheme_link.is_dynamic():
-            scheme_link.dynamic_enabled_changed.disconnect(
-                item.setDynamicEnabled
-            )
-        scheme_link.state_changed.disconnect(item.setRuntimeState)
-        self.remove_link_item(item)
+        if self.__has_record(self.__link_records, scheme_link):
+            self.__link_records.remove(scheme_link)
+            if scheme_link not in self.__item_for_link:
+                return
+        self.__release_link(scheme_link)
 
     def link_items(self):
         # type: () -> List[LinkItem]
         """
         Return all :class:`.LinkItem` s in the scene.
+
+        In the virtualized mode only the currently existing items are
+        returned.
         """
         return list(self.__link_items)
 
@@ -556,6 +906,10 @@ class CanvasScene(QGraphicsScene):
         """
         self.__annotation_items.append(annotation)
         self.addItem(annotation)
+        annotation.geometryChanged.connect(
+            self.__on_annotation_geometry_changed
+        )
+        self.__index_invalidate(annotation)
         self.annotation_added.emit(annotation)
         return annotation
 
@@ -577,6 +931,7 @@ class CanvasScene(QGraphicsScene):
             item.setPos(x, y)
             item.resize(w, h)
             item.setTextInteractionFlags(Qt.TextEditorInteraction)
+            item.setAsyncRenderEnabled(self.__async_annotation_render_enabled)
 
             font = font_from_dict(scheme_annot.font, item.font())
             item.setFont(font)
@@ -594,6 +949,7 @@ class CanvasScene(QGraphicsScene):
 
         self.add_annotation_item(item)
         self.__item_for_annotation[scheme_annot] = item
+        self.__annotation_for_item[item] = scheme_annot
 
         return item
 
@@ -604,6 +960,10 @@ class CanvasScene(QGraphicsScene):
 
         """
         self.__annotation_items.remove(annotation)
+        annotation.geometryChanged.disconnect(
+            self.__on_annotation_geometry_changed
+        )
+        self.__index_remove(annotation)
         self.removeItem(annotation)
         self.annotation_removed.emit(annotation)
 
@@ -615,6 +975,7 @@ class CanvasScene(QGraphicsScene):
 
         """
         item = self.__item_for_annotation.pop(scheme_annotation)
+        del self.__annotation_for_item[item]
 
         scheme_annotation.geometry_changed.disconnect(
             self.__on_scheme_annot_geometry_change
@@ -637,8 +998,7 @@ class CanvasScene(QGraphicsScene):
 
     def annotation_for_item(self, item):
         # type: (Annotation) -> BaseSchemeAnnotation
-        rev = {v: k for k, v in self.__item_for_annotation.items()}
-        return rev[item]
+        return self.__annotation_for_item[item]
 
     def commit_scheme_node(self, node):
         """
@@ -683,14 +1043,18 @@ class CanvasScene(QGraphicsScene):
         """
         Return the `SchemeNode` for the `item`.
         """
-        rev = dict([(v, k) for k, v in self.__item_for_node.items()])
-        return rev[item]
+        return self.__node_for_item[item]
 
     def item_for_node(self, node):
         # type: (SchemeNode) -> NodeItem
         """
         Return the :class:`NodeItem` instance for a :class:`SchemeNode`.
+
+        In the virtualized mode the item is created if it does not exist.
         """
+        if node not in self.__item_for_node and \
+                self.__has_record(self.__node_records, node):
+            return self.__materialize_node(node)
         return self.__item_for_node[node]
 
     def link_for_item(self, item):
@@ -698,14 +1062,18 @@ class CanvasScene(QGraphicsScene):
         """
         Return the `SchemeLink for `item` (:class:`LinkItem`).
         """
-        rev = dict([(v, k) for k, v in self.__item_for_link.items()])
-        return rev[item]
+        return self.__link_for_item[item]
 
     def item_for_link(self, link):
         # type: (SchemeLink) -> LinkItem
         """
         Return the :class:`LinkItem` for a :class:`SchemeLink`
+
+        In the virtualized mode the item is created if it does not exist.
         """
+        if link not in self.__item_for_link and \
+                self.__has_record(self.__link_records, link):
+            return self.__materialize_link(link)
         return self.__item_for_link[link]
 
     def selected_node_items(self):
@@ -726,6 +1094,94 @@ class CanvasScene(QGraphicsScene):
         """
         return [item for item in self.__annotation_items if item.isSelected()]
 
+    def selectable_items_in(self, rect, mode=Qt.IntersectsItemShape):
+        # type: (QRectF, Qt.ItemSelectionMode) -> List[QGraphicsItem]
+        """
+        Return the selectable node and annotation items in the scene `rect`.
+
+        This is equivalent to filtering `self.items(rect, mode)` for
+        top level selectable items but uses a dedicated spatial index
+        of the node and annotation items (i.e. it does not need to visit
+        all their child items).
+
+        The items are returned in the order they were added to the scene.
+        In the virtualized mode the node items in `rect` are created if
+        they do not exist.
+        """
+        if self.__virtualized:
+            for node in self.__node_records.intersecting(rect):
+                if node not in self.__item_for_node:
+                    self.__materialize_node(node)
+        index = self.__ensure_item_index()
+        path = QPainterPath()
+        path.addRect(rect)
+        if mode in (Qt.ContainsItemShape, Qt.ContainsItemBoundingRect):
+            candidates = index.contained(rect)
+        else:
+            candidates = index.intersecting(rect)
+        return [item for item in candidates
+                if item.flags() & QGraphicsItem.ItemIsSelectable
+                and item.isVisible()
+                and item.collidesWithPath(item.mapFromScene(path), mode)]
+
+    def update_selection(self, selected=(), deselected=()):
+        # type: (Iterable[QGraphicsItem], Iterable[QGraphicsItem]) -> None
+        """
+        Select the `selected` and deselect the `deselected` items.
+
+        Unlike calling `setSelected` on every item this emits (at most)
+        a single `selectionChanged` signal.
+        """
+        changed = False
+        blocked = self.blockSignals(True)
+        try:
+            for item in deselected:
+                if item.isSelected():
+                    item.setSelected(False)
+                    changed = True
+            for item in selected:
+                if not item.isSelected():
+                    item.setSelected(True)
+                    changed = True
+        finally:
+            self.blockSignals(blocked)
+        if changed and not blocked:
+            self.selectionChanged.emit()
+
+    def __ensure_item_index(self):
+        # type: () -> GridIndex[QGraphicsItem]
+        index = self.__item_index
+        if index is None:
+            index = self.__item_index = GridIndex(cellSize=200)
+            self.__item_index_dirty = dict.fromkeys(
+                self.__node_items + self.__annotation_items
+            )
+        if self.__item_index_dirty:
+            for item in self.__item_index_dirty:
+                # The (whole) bounding rect always contains the shape
+                # which is used for the precise test.
+                index.update(item, item.sceneBoundingRect())
+            self.__item_index_dirty = {}
+        return index
+
+    def __index_invalidate(self, item):
+        # type: (QGraphicsItem) -> None
+        if self.__item_index is not None:
+            self.__item_index_dirty[item] = None
+
+    def __index_remove(self, item):
+        # type: (QGraphicsItem) -> None
+        if self.__item_index is not None:
+            self.__item_index_dirty.pop(item, None)
+            if item in self.__item_index:
+                self.__item_index.remove(item)
+
+    def __on_annotation_geometry_changed(self):
+        # type: () -> None
+        self.__index_invalidate(self.sender())
+        if self.__virtualized:
+            self.__grow_scene_rect(self.sender().sceneBoundingRect())
+
     def node_links(self, node_item):
         # type: (NodeItem) -> List[LinkItem]
         """
@@ -775,8 +1231,35 @@ class CanvasScene(QGraphicsScene):
         # type: (NodeItem) -> None
         # Invalidate the anchor point layout for the node and schedule a layout.
         self.__anchor_layout.invalidateNode(item)
+        self.__index_invalidate(item)
+        if self.__virtualized:
+            node = self.__node_for_item.get(item)
+            if node is not None:
+                self.__update_node_record(node)
         self.node_item_position_changed.emit(item, item.pos())
 
+    def __on_node_positions_about_to_change(self, nodes):
+        # type: (List[SchemeNode]) -> None
+        # Defer the link curve updates until all the nodes are moved (links
+        # between the moved nodes are updated once instead of twice)
+        moved = {self.__item_for_node[node] for node in nodes
+                 if node in self.__item_for_node}
+        links = [link for link in self.__link_items
+                 if link.sourceItem in moved or link.sinkItem in moved]
+        for link in links:
+            link.setCurveUpdatesEnabled(False)
+        self.__deferred_links.extend(links)
+
+    def __on_node_positions_changed(self, nodes):
+        # type: (List[SchemeNode]) -> None
+        links, self.__deferred_links = self.__deferred_links, []
+        for link in links:
+            if not sip.isdeleted(link):
+                link.setCurveUpdatesEnabled(True)
+        if self.__anchor_layout is not None:
+            # Layout the anchors once for the whole batch
+            self.__anchor_layout.activate()
+
     def __on_node_pos_changed(self, pos):
         # type: (Tuple[float, float]) -> None
         node = self.sender()
@@ -0,0 +1,187 @@
+"""
+Spatial index for fast rectangle/point queries on scene items.
+
+"""
+import math
+from typing import Dict, List, Tuple, Iterable, Generic, TypeVar, Set
+
+from AnyQt.QtCore import QRectF, QPointF
+
+K = TypeVar("K")
+
+Cell = Tuple[int, int]
+
+
+class GridIndex(Generic[K]):
+    """
+    A uniform grid (spatial hash) index of rectangles.
+
+    Every key is associated with a (scene) rectangle and registered in all
+    grid cells the rectangle overlaps. A query only needs to inspect the
+    cells overlapping the query rect.
+
+    Parameters
+    ----------
+    cellSize: float
+        The grid cell size. Should be in the order of the size of the
+        indexed rects.
+    """
+    def __init__(self, cellSize=100.0):
+        # type: (float) -> None
+        if cellSize <= 0:
+            raise ValueError("cellSize must be positive")
+        self.__cellSize = float(cellSize)
+        # key -> rect (ordered by insertion)
+        self.__rects = {}  # type: Dict[K, QRectF]
+        # key -> insertion order (used to return results in a stable order)
+        self.__order = {}  # type: Dict[K, int]
+        self.__counter = 0
+        self.__cells = {}  # type: Dict[Cell, Dict[K, None]]
+
+    def cellSize(self):
+        # type: () -> float
+        return self.__cellSize
+
+    def __cellRange(self, rect):
+        # type: (QRectF) -> Iterable[Cell]
+        size = self.__cellSize
+        x0 = math.floor(rect.left() / size)
+        x1 = math.floor(rect.right() / size)
+        y0 = math.floor(rect.top() / size)
+        y1 = math.floor(rect.bottom() / size)
+        for i in range(x0, x1 + 1):
+            for j in range(y0, y1 + 1):
+                yield i, j
+
+    def insert(self, key, rect):
+        # type: (K, QRectF) -> None
+        """
+        Insert `key` with the associated `rect` (replacing any previous rect).
+        """
+        if key in self.__rects:
+            self.remove(key)
+        rect = QRectF(rect)
+        self.__rects[key] = rect
+        self.__order[key] = self.__counter
+        self.__counter += 1
+        cells = self.__cells
+        for cell in self.__cellRange(rect):
+            cells.setdefault(cell, {})[key] = None
+
+    def update(self, key, rect):
+        # type: (K, QRectF) -> None
+        """
+        Update the rect associated with an existing `key`.
+        """
+        old = self.__rects.get(key)
+        if old is None:
+            self.insert(key, rect)
+            return
+        rect = QRectF(rect)
+        oldcells = set(self.__cellRange(old))
+        newcells = set(self.__cellRange(rect))
+        cells = self.__cells
+        for cell in oldcells - newcells:
+            bucket = cells[cell]
+            del bucket[key]
+            if not bucket:
+                del cells[cell]
+        for cell in newcells - oldcells:
+            cells.setdefault(cell, {})[key] = None
+        self.__rects[key] = rect
+
+    def remove(self, key):
+        # type: (K) -> None
+        """
+        Remove `key` from the index.
+        """
+        rect = self.__rects.pop(key)
+        del self.__order[key]
+        cells = self.__cells
+        for cell in self.__cellRange(rect):
+            bucket = cells.get(cell)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del cells[cell]
+
+    def clear(self):
+        # type: () -> None
+        self.__rects.clear()
+        self.__order.clear()
+        self.__cells.clear()
+
+    def rect(self, key):
+        # type: (K) -> QRectF
+        """
+        Return the rect associated with `key`.
+        """
+        return QRectF(self.__rects[key])
+
+    def keys(self):
+        # type: () -> List[K]
+        return list(self.__rects)
+
+    def __contains__(self, key):
+        return key in self.__rects
+
+    def __len__(self):
+        return len(self.__rects)
+
+    def __candidates(self, rect):
+        # type: (QRectF) -> Set[K]
+        cells = self.__cells
+        size = self.__cellSize
+        ncells = (math.floor(rect.right() / size) -
+                  math.floor(rect.left() / size) + 1) * \
+                 (math.floor(rect.bottom() / size) -
+                  math.floor(rect.top() / size) + 1)
+        if ncells > len(cells):
+            # Query covers more cells than are occupied; scan the occupied
+            # cells instead.
+            return set(self.__rects)
+        candidates = set()  # type: Set[K]
+        for cell in self.__cellRange(rect):
+            bucket = cells.get(cell)
+            if bucket:
+                candidates.update(bucket)
+        return candidates
+
+    def intersecting(self, rect):
+        # type: (QRectF) -> List[K]
+        """
+        Return all keys whose rects intersect `rect` (in insertion order).
+        """
+        rects = self.__rects
+        res = [key for key in self.__candidates(rect)
+               if rects[key].intersects(rect)]
+        res.sort(key=self.__order.__getitem__)
+        return res
+
+    def contained(self, rect):
+        # type: (QRectF) -> List[K]
+        """
+        Return all keys whose rects are contained in `rect` (in insertion
+        order).
+        """
+        rects = self.__rects
+        res = [key for key in self.__candidates(rect)
+               if rect.contains(rects[key])]
+        res.sort(key=self.__order.__getitem__)
+        return res
+
+    def at(self, pos):
+        # type: (QPointF) -> List[K]
+        """
+        Return all keys whose rects contain the point `pos` (in insertion
+        order).
+        """
+        size = self.__cellSize
+        cell = (math.floor(pos.x() / size), math.floor(pos.y() / size))
+        bucket = self.__cells.get(cell)
+        if not bucket:
+            return []
+        rects = self.__rects
+        res = [key for key in bucket if rects[key].contains(pos)]
+        res.sort(key=self.__order.__getitem__)
+        return res
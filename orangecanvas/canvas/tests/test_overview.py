@@ -0,0 +1,155 @@
+from unittest import mock
+
+from AnyQt.QtCore import Qt, QPoint, QPointF, QRectF
+from AnyQt.QtTest import QTest
+
+from orangecanvas.gui.test import QAppTestCase, mouseMove
+from orangecanvas.canvas import view, scene
+from orangecanvas.canvas.overview import CanvasOverview, merge_rect
+from orangecanvas.registry.tests import small_testing_registry
+from orangecanvas import scheme
+
+
+class TestCanvasOverview(QAppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.reg = small_testing_registry()
+        self.scene = scene.CanvasScene()
+        self.scene.set_registry(self.reg)
+        # no hover/selection animations in the changed regions
+        self.scene.set_node_animation_enabled(False)
+        self.view = view.CanvasView(self.scene)
+        self.view.resize(400, 300)
+        self.view.show()
+        self.scheme = scheme.Scheme()
+        self.nodes = [
+            self.scheme.new_node(self.reg.widget("one"),
+                                 position=(300 * i, 200 * j))
+            for i in range(5) for j in range(5)
+        ]
+        self.scene.set_scheme(self.scheme)
+        self.overview = CanvasOverview(view=self.view)
+        self.overview.resize(200, 150)
+        self.overview.show()
+        self.overview.renderPending()
+
+    def tearDown(self):
+        self.overview.setView(None)
+        self.overview.deleteLater()
+        self.scene.clear_scene()
+        self.view.deleteLater()
+        self.scene.deleteLater()
+        del self.overview
+        del self.view
+        del self.scene
+        super().tearDown()
+
+    def render_spy(self):
+        return mock.patch.object(self.scene, "render", wraps=self.scene.render)
+
+    def test_incremental_render(self):
+        overview = self.overview
+        # flush any changes from the initial layout
+        self.qWait()
+        overview.renderPending()
+        with self.render_spy() as render:
+            self.nodes[12].position = (620, 410)
+            self.qWait()
+            overview.renderPending()
+            self.assertEqual(render.call_count, 1)
+            target = render.call_args[0][1]
+            size = overview.sizeHint()
+            self.assertLess(target.width() * target.height(),
+                            size.width() * size.height() / 4)
+            # the rendered source region covers the node
+            source = render.call_args[0][2]
+            self.assertTrue(source.contains(620, 410))
+
+            # no changes, no render
+            render.reset_mock()
+            self.qWait()
+            overview.renderPending()
+            render.assert_not_called()
+
+            # two distant nodes are rendered separately
+            self.nodes[0].position = (10, 10)
+            self.nodes[-1].position = (1190, 790)
+            self.qWait()
+            overview.renderPending()
+            self.assertGreaterEqual(render.call_count, 2)
+            area = sum(call[0][1].width() * call[0][1].height()
+                       for call in render.call_args_list)
+            self.assertLess(area, size.width() * size.height() / 4)
+            sources = [call[0][2] for call in render.call_args_list]
+            self.assertTrue(any(r.contains(10, 10) for r in sources))
+            self.assertTrue(any(r.contains(1190, 790) for r in sources))
+
+    def test_throttled_render(self):
+        overview = self.overview
+        overview.setUpdateInterval(20)
+        self.assertEqual(overview.updateInterval(), 20)
+        self.qWait()
+        overview.renderPending()
+        with self.render_spy() as render:
+            # many changes are rendered in one pass
+            for i in range(10):
+                self.nodes[12].position = (600 + i, 400)
+                QTest.qWait(1)
+            self.qWait(100)
+            self.assertEqual(render.call_count, 1)
+
+    def test_full_render(self):
+        overview = self.overview
+        with self.render_spy() as render:
+            # scene rect change invalidates the whole image
+            self.scene.setSceneRect(QRectF(-100, -100, 2000, 1500))
+            overview.renderPending()
+            self.assertEqual(render.call_count, 1)
+            self.assertEqual(render.call_args[0][2].toAlignedRect(),
+                             QRectF(-100, -100, 2000, 1500).toRect())
+
+    def test_mapping(self):
+        overview = self.overview
+        point = overview.mapFromScene(QRectF(self.scene.sceneRect()).center())
+        self.assertTrue(overview.rect().contains(point.toPoint()))
+        mapped = overview.mapToScene(point)
+        center = self.scene.sceneRect().center()
+        self.assertAlmostEqual(mapped.x(), center.x(), places=3)
+        self.assertAlmostEqual(mapped.y(), center.y(), places=3)
+
+    def test_navigation(self):
+        overview, view_ = self.overview, self.view
+        view_.centerOn(0, 0)
+        target = overview.mapFromScene(QPointF(*self.nodes[12].position))
+        QTest.mousePress(overview, Qt.LeftButton, pos=target.toPoint())
+        visible = overview.visibleSceneRect()
+        # centered on the point (bounded by the scroll range)
+        self.assertTrue(visible.contains(overview.mapToScene(target)))
+
+        # drag the visible area
+        rect = overview.visibleSceneRect()
+        mouseMove(overview, Qt.LeftButton, pos=target.toPoint() - QPoint(20, 10))
+        QTest.mouseRelease(overview, Qt.LeftButton,
+                           pos=target.toPoint() - QPoint(20, 10))
+        moved = overview.visibleSceneRect()
+        self.assertLess(moved.center().x(), rect.center().x())
+        self.assertLess(moved.center().y(), rect.center().y())
+
+    def test_set_view(self):
+        overview = self.overview
+        self.assertIs(overview.view(), self.view)
+        overview.setView(None)
+        self.assertIsNone(overview.view())
+        self.assertTrue(overview.visibleSceneRect().isEmpty())
+        with self.render_spy() as render:
+            self.nodes[0].position = (10, 10)
+            self.qWait()
+            overview.renderPending()
+            render.assert_not_called()
+
+    def test_merge_rect(self):
+        rects = merge_rect([], QRectF(0, 0, 10, 10).toRect())
+        rects = merge_rect(rects, QRectF(20, 20, 10, 10).toRect())
+        self.assertEqual(len(rects), 2)
+        rects = merge_rect(rects, QRectF(5, 5, 20, 20).toRect())
+        self.assertEqual(rects, [QRectF(0, 0, 30, 30).toRect()])
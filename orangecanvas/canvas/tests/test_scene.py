@@ -1,7 +1,15 @@
+from contextlib import ExitStack
+from unittest import mock
+
+import numpy as np
+
+from AnyQt.QtCore import Qt, QRectF
 from AnyQt.QtWidgets import QGraphicsView
-from AnyQt.QtGui import QPainter
+from AnyQt.QtGui import QPainter, QImage
+from AnyQt.QtTest import QSignalSpy
 
 from ..scene import CanvasScene
+from ..view import CanvasView
 from .. import items
 from ... import scheme
 from ...registry.tests import small_testing_registry
@@ -94,6 +102,100 @@ class TestScene(QAppTestCase):
 
         self.qWait()
 
+    def test_selectable_items_in(self):
+        one_desc, negate_desc, cons_desc = self.widget_desc()
+        node_items = []
+        for i, desc in enumerate([one_desc, negate_desc, cons_desc] * 3):
+            item = items.NodeItem(desc)
+            item.setPos(100 + 150 * (i % 3), 100 + 150 * (i // 3))
+            node_items.append(self.scene.add_node_item(item))
+        annot = items.TextAnnotation()
+        annot.setGeometry(QRectF(500, 0, 100, 40))
+        self.scene.add_annotation_item(annot)
+
+        def expected(rect):
+            return [item for item in self.scene.node_items() +
+                    self.scene.annotation_items()
+                    if item in self.scene.items(rect, Qt.IntersectsItemShape)]
+
+        rects = [QRectF(0, 0, 1000, 1000), QRectF(80, 80, 40, 40),
+                 QRectF(110, 110, 300, 10), QRectF(520, 10, 10, 10),
+                 QRectF(0, 0, 10, 10)]
+        for rect in rects:
+            self.assertEqual(self.scene.selectable_items_in(rect),
+                             expected(rect))
+        # Moved, removed and resized items are reindexed
+        node_items[0].setPos(1000, 1000)
+        self.scene.remove_node_item(node_items[1])
+        annot.setGeometry(QRectF(0, 0, 30, 30))
+        for rect in rects + [QRectF(990, 990, 20, 20)]:
+            self.assertEqual(self.scene.selectable_items_in(rect),
+                             expected(rect))
+        self.assertEqual(
+            self.scene.selectable_items_in(QRectF(0, 0, 10, 10)), [annot])
+
+    def test_update_selection(self):
+        one_desc, negate_desc, _ = self.widget_desc()
+        a = self.scene.add_node_item(items.NodeItem(one_desc))
+        b = self.scene.add_node_item(items.NodeItem(negate_desc))
+        self.scene.clearSelection()
+        spy = QSignalSpy(self.scene.selectionChanged)
+        self.scene.update_selection(selected=[a, b])
+        self.assertEqual(len(spy), 1)
+        self.assertEqual(self.scene.selected_node_items(), [a, b])
+        self.scene.update_selection(selected=[a], deselected=[b])
+        self.assertEqual(len(spy), 2)
+        self.assertEqual(self.scene.selected_node_items(), [a])
+        # No change, no signal
+        self.scene.update_selection(selected=[a], deselected=[b])
+        self.assertEqual(len(spy), 2)
+
+    def test_cached_shadows(self):
+        one_desc, negate_desc, _ = self.widget_desc()
+        self.scene.set_node_animation_enabled(False)
+        node_items = []
+        for i in range(500):
+            item = items.NodeItem([one_desc, negate_desc][i % 2])
+            item.setPos(50 + 80 * (i % 25), 50 + 80 * (i // 25))
+            node_items.append(self.scene.add_node_item(item))
+            if i % 3 == 0:
+                item.outputAnchorItem.show()
+                item.outputAnchorItem.setHovered(True)
+        self.scene.update_selection(selected=node_items[::2],
+                                    deselected=node_items[1::2])
+
+        def render():
+            rect = QRectF(0, 0, 2100, 1700)
+            image = QImage(2100, 1700, QImage.Format_ARGB32)
+            image.fill(Qt.white)
+            painter = QPainter(image)
+            painter.setRenderHints(QPainter.Antialiasing)
+            self.scene.render(painter, QRectF(image.rect()), rect)
+            painter.end()
+            ptr = image.constBits()
+            ptr.setsize(image.sizeInBytes())
+            return np.frombuffer(ptr, np.uint8).reshape(1700, 2100, 4) \
+                     .astype(int)
+
+        def effects():
+            return [item.graphicsEffect() for item in self.scene.items()
+                    if item.objectName() == "shadow-shape-item"]
+
+        self.assertTrue(self.scene.cached_shadows_enabled())
+        self.assertTrue(all(effect is None for effect in effects()))
+        cached = render()
+        self.scene.set_cached_shadows_enabled(False)
+        self.assertTrue(all(effect is not None for effect in effects()))
+        effect = render()
+        self.scene.set_cached_shadows_enabled(True)
+        self.assertTrue(all(effect is None for effect in effects()))
+
+        # The shadows were drawn
+        self.assertGreater(np.count_nonzero(cached != 255), 10 ** 5)
+        diff = np.abs(cached - effect).max(axis=2)
+        self.assertLess(diff.mean(), 0.5)
+        self.assertLess(np.count_nonzero(diff > 16) / diff.size, 0.005)
+
     def test_scene_with_scheme(self):
         """Test scene through modifying the scheme.
         """
@@ -152,6 +254,35 @@ class TestScene(QAppTestCase):
         self.assertSequenceEqual(self.scene.link_items(), link_items)
         self.qWait()
 
+    def test_set_node_positions(self):
+        test_scheme = scheme.Scheme()
+        self.scene.set_scheme(test_scheme)
+        one_desc, negate_desc, cons_desc = self.widget_desc()
+        nodes = [test_scheme.new_node(desc, position=(150 * i, 0))
+                 for i, desc in enumerate([one_desc, negate_desc, cons_desc])]
+        test_scheme.new_link(nodes[0], "value", nodes[1], "value")
+        test_scheme.new_link(nodes[1], "result", nodes[2], "first")
+        self.qWait()
+        links = self.scene.link_items()
+        with ExitStack() as stack:
+            updates = [
+                stack.enter_context(mock.patch.object(
+                    link.curveItem, "setCurvePath",
+                    wraps=link.curveItem.setCurvePath))
+                for link in links
+            ]
+            test_scheme.set_node_positions(
+                nodes, [(150 * i, 100) for i in range(3)])
+            # each link's curve is updated once for the whole batch
+            self.assertEqual([m.call_count for m in updates], [1, 1])
+        self.assertTrue(all(link.curveUpdatesEnabled() for link in links))
+        for node in nodes:
+            item = self.scene.item_for_node(node)
+            self.assertEqual((item.pos().x(), item.pos().y()), node.position)
+        source = links[0].sourceAnchor.anchorScenePos()
+        self.assertTrue(links[0].curveItem.mapToScene(
+            links[0].curveItem.path().pointAtPercent(0)) == source)
+
     def test_scheme_construction(self):
         """Test construction (editing) of the scheme through the scene.
         """
@@ -238,3 +369,165 @@ class TestScene(QAppTestCase):
         negate_desc = reg.widget("negate")
         cons_desc = reg.widget("cons")
         return one_desc, negate_desc, cons_desc
+
+
+class TestVirtualizedScene(QAppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.reg = small_testing_registry()
+        self.scene = CanvasScene()
+        self.scene.set_registry(self.reg)
+        self.scene.set_virtualized(True)
+        self.view = CanvasView(self.scene)
+        self.view.resize(400, 300)
+        self.view.show()
+
+        # a chain of 100 nodes on a 10 x 10 grid
+        self.scheme = scheme.Scheme()
+        self.nodes = []
+        prev = None
+        for i in range(100):
+            desc = self.reg.widget("one" if prev is None else "negate")
+            node = self.scheme.new_node(
+                desc, position=(300 * (i % 10), 200 * (i // 10)))
+            if prev is not None:
+                self.scheme.new_link(
+                    prev, prev.output_channels()[0], node, "value")
+            self.nodes.append(node)
+            prev = node
+
+    def tearDown(self):
+        self.scene.clear_scene()
+        self.view.deleteLater()
+        self.scene.deleteLater()
+        del self.view
+        del self.scene
+        super().tearDown()
+
+    def assertItemsVisible(self):
+        scene, view = self.scene, self.view
+        visible = view.mapToScene(view.viewport().rect()).boundingRect()
+        for node in self.nodes:
+            rect = QRectF(-40, -40, 80, 80).translated(*node.position)
+            if visible.intersects(rect):
+                self.assertIn(scene.item_for_node(node), scene.node_items())
+        for link in self.scheme.links:
+            item = scene.item_for_link(link)
+            self.assertIs(item.sourceItem, scene.item_for_node(link.source_node))
+            self.assertIs(item.sinkItem, scene.item_for_node(link.sink_node))
+
+    def test_set_scheme(self):
+        scene = self.scene
+        scene.set_scheme(self.scheme)
+        self.assertTrue(0 < len(scene.node_items()) < 20)
+        self.assertTrue(0 < len(scene.link_items()) < 20)
+        self.assertTrue(scene.sceneRect().contains(QRectF(0, 0, 2700, 1800)))
+        self.assertItemsVisible()
+
+        # scroll to the other corner
+        self.view.centerOn(2700, 1800)
+        self.assertIn(scene.item_for_node(self.nodes[-1]),
+                      scene.node_items())
+        self.assertTrue(len(scene.node_items()) < 20)
+
+    def test_scroll(self):
+        scene, view = self.scene, self.view
+        scene.set_scheme(self.scheme)
+        first = self.nodes[0]
+        view.centerOn(0, 0)
+        first_item = scene.item_for_node(first)
+        self.assertIn(first_item, scene.node_items())
+
+        view.centerOn(2700, 1800)
+        self.assertNotIn(first_item, scene.node_items())
+        self.assertIsNone(first_item.scene())
+        self.assertTrue(len(scene.node_items()) < 20)
+
+        view.centerOn(0, 0)
+        item = scene.item_for_node(first)
+        self.assertIn(item, scene.node_items())
+        self.assertIs(scene.node_for_item(item), first)
+
+    def test_item_for_node(self):
+        scene = self.scene
+        scene.set_scheme(self.scheme)
+        last = self.nodes[-1]
+        count = len(scene.node_items())
+        item = scene.item_for_node(last)
+        self.assertIs(item.scene(), scene)
+        self.assertIs(scene.node_for_item(item), last)
+        self.assertEqual(len(scene.node_items()), count + 1)
+        link = self.scheme.find_links(sink_node=last)[0]
+        link_item = scene.item_for_link(link)
+        self.assertIs(link_item.sinkItem, item)
+        self.assertIs(scene.link_for_item(link_item), link)
+
+        # a model change while the item does not exist
+        self.view.centerOn(2700, 1800)
+        self.view.centerOn(0, 0)
+        self.assertNotIn(item, scene.node_items())
+        last.set_title("Last")
+        self.assertEqual(scene.item_for_node(last).title(), "Last")
+
+    def test_selected_items_are_kept(self):
+        scene, view = self.scene, self.view
+        scene.set_scheme(self.scheme)
+        view.centerOn(0, 0)
+        item = scene.item_for_node(self.nodes[0])
+        item.setSelected(True)
+        view.centerOn(2700, 1800)
+        self.assertIn(item, scene.node_items())
+        self.assertEqual(scene.selected_node_items(), [item])
+
+        item.setSelected(False)
+        scene.update_visible_items()
+        self.assertNotIn(item, scene.node_items())
+
+    def test_node_position(self):
+        scene, view = self.scene, self.view
+        scene.set_scheme(self.scheme)
+        view.centerOn(0, 0)
+        last = self.nodes[-1]
+        self.assertNotIn(last, [scene.node_for_item(item)
+                                for item in scene.node_items()])
+        last.position = (0, 0)
+        scene.update_visible_items()
+        self.assertIn(last, [scene.node_for_item(item)
+                             for item in scene.node_items()])
+
+    def test_edit(self):
+        scene, view = self.scene, self.view
+        scene.set_scheme(self.scheme)
+        view.centerOn(0, 0)
+        last = self.nodes[-1]
+        # remove a node (and its link) that have no items
+        self.scheme.remove_node(last)
+        self.assertNotIn(last, [scene.node_for_item(item)
+                                for item in scene.node_items()])
+        # add a new node and link far from the visible area
+        node = self.scheme.new_node(self.reg.widget("negate"),
+                                    position=(2700, 1800))
+        self.assertIn(scene.item_for_node(node), scene.node_items())
+        link = self.scheme.new_link(self.nodes[-2], "result", node, "value")
+        item = scene.item_for_link(link)
+        self.assertIn(item, scene.link_items())
+        self.scheme.remove_link(link)
+        self.assertNotIn(item, scene.link_items())
+        self.nodes[-1] = node
+        self.assertItemsVisible()
+
+    def test_set_virtualized(self):
+        scene = self.scene
+        scene.set_scheme(self.scheme)
+        self.assertTrue(len(scene.node_items()) < 100)
+        scene.set_virtualized(False)
+        self.assertFalse(scene.is_virtualized())
+        self.assertEqual(len(scene.node_items()), 100)
+        self.assertEqual(len(scene.link_items()), 99)
+        self.view.centerOn(0, 0)
+        self.assertEqual(len(scene.node_items()), 100)
+        self.nodes[-1].position = (5000, 5000)
+
+        scene.set_virtualized(True)
+        self.assertTrue(len(scene.node_items()) < 100)
+        self.assertItemsVisible()
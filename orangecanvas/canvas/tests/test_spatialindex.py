@@ -0,0 +1,38 @@
+import unittest
+
+from AnyQt.QtCore import QRectF, QPointF
+
+from ..spatialindex import GridIndex
+
+
+class TestGridIndex(unittest.TestCase):
+    def test_index(self):
+        index = GridIndex(cellSize=10)
+        index.insert("a", QRectF(0, 0, 5, 5))
+        index.insert("b", QRectF(8, 8, 15, 15))
+        index.insert("c", QRectF(-50, -50, 5, 5))
+        self.assertEqual(len(index), 3)
+        self.assertIn("a", index)
+        self.assertEqual(index.at(QPointF(1, 1)), ["a"])
+        self.assertEqual(index.at(QPointF(20, 20)), ["b"])
+        self.assertEqual(index.at(QPointF(-48, -48)), ["c"])
+        self.assertEqual(index.at(QPointF(100, 100)), [])
+        self.assertEqual(index.intersecting(QRectF(0, 0, 10, 10)), ["a", "b"])
+        self.assertEqual(index.intersecting(QRectF(-100, -100, 200, 200)),
+                         ["a", "b", "c"])
+        self.assertEqual(index.contained(QRectF(-1, -1, 10, 10)), ["a"])
+
+        index.update("a", QRectF(30, 30, 5, 5))
+        self.assertEqual(index.at(QPointF(1, 1)), [])
+        self.assertEqual(index.at(QPointF(31, 31)), ["a"])
+        self.assertEqual(index.rect("a"), QRectF(30, 30, 5, 5))
+        self.assertEqual(index.intersecting(QRectF(0, 0, 40, 40)), ["a", "b"])
+
+        index.remove("b")
+        self.assertNotIn("b", index)
+        self.assertEqual(index.intersecting(QRectF(0, 0, 40, 40)), ["a"])
+        with self.assertRaises(KeyError):
+            index.remove("b")
+        index.clear()
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.intersecting(QRectF(-100, -100, 200, 200)), [])
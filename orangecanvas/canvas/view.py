@@ -13,6 +13,7 @@ from AnyQt.QtCore import (
 from AnyQt.QtCore import Property, pyqtSignal as Signal
 
 from orangecanvas.gui.utils import is_event_source_mouse
+from orangecanvas.canvas.scene import CanvasScene
 
 log = logging.getLogger(__name__)
 
@@ -60,6 +61,22 @@ class CanvasView(QGraphicsView):
     def setScene(self, scene):
         super().setScene(scene)
         self._ensureSceneRect(scene)
+        self.__visibleAreaChanged()
+
+    def __visibleAreaChanged(self):
+        # Let a (virtualized) CanvasScene create the items that scrolled
+        # into view.
+        scene = self.scene()
+        if isinstance(scene, CanvasScene):
+            scene.update_visible_items()
+
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+        self.__visibleAreaChanged()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.__visibleAreaChanged()
 
     def _ensureSceneRect(self, scene):
         r = scene.addRect(QRectF(0, 0, 400, 400))
@@ -197,6 +214,7 @@ class CanvasView(QGraphicsView):
                 center = self.viewport().rect().center()
                 diff = self.mapToScene(center) - self.mapToScene(anchor)
                 self.centerOn(QPointF(anchor) + diff)
+            self.__visibleAreaChanged()
             self.zoomLevelChanged.emit(scale)
 
     zoomLevelChanged = Signal(float)
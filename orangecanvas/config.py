@@ -417,6 +417,15 @@ spec = \
      ("schemeedit/freeze-on-load", bool, False,
       "Freeze signal propagation when loading a workflow."),
 
+     ("autosave/interval", int, 300,
+      "Autosave interval in seconds (0 disables autosave)."),
+
+     ("autosave/max-backups", int, 3,
+      "Number of previous autosave versions to keep."),
+
+     ("autosave/max-write-rate", int, 0,
+      "Maximum average autosave write rate in kB/s (0 for unlimited)."),
+
      ("quickmenu/trigger-on-double-click", bool, True,
       "Show quick menu on double click."),
 
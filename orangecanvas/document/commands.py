@@ -3,7 +3,10 @@ Undo/Redo Commands
 
 """
 import typing
-from typing import Callable, Optional, Tuple, List, Any
+from typing import Callable, Optional, Tuple, List, Any, Sequence
+
+from array import array
+from itertools import chain
 
 from AnyQt.QtWidgets import QUndoCommand
 
@@ -216,6 +219,45 @@ class MoveNodeCommand(UndoCommand):
         self.node.position = self.old
 
 
+class MoveNodesCommand(UndoCommand):
+    """
+    Move multiple nodes at once.
+
+    The `old` and `new` positions are sequences parallel to `nodes`.
+    """
+    def __init__(self, scheme, nodes, old, new, parent=None):
+        # type: (Scheme, Sequence[SchemeNode], Sequence[Pos], Sequence[Pos], Optional[UndoCommand]) -> None
+        super().__init__("Move", parent)
+        if not len(nodes) == len(old) == len(new):
+            raise ValueError("'nodes', 'old' and 'new' must have the same "
+                             "length")
+        self.scheme = scheme
+        self.nodes = list(nodes)
+        self.old = [tuple(p) for p in old]  # type: List[Pos]
+        self.new = [tuple(p) for p in new]  # type: List[Pos]
+
+    def redo(self):
+        self.scheme.set_node_positions(self.nodes, self.new)
+
+    def undo(self):
+        self.scheme.set_node_positions(self.nodes, self.old)
+
+    def __getstate__(self):
+        # Store the positions as flat packed coordinate arrays
+        state = super().__getstate__()
+        state["old"] = array("d", chain.from_iterable(self.old))
+        state["new"] = array("d", chain.from_iterable(self.new))
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        for key in ("old", "new"):
+            coords = state[key]
+            if isinstance(coords, array):
+                state[key] = list(zip(coords[::2], coords[1::2]))
+        super().__setstate__(state)
+
+
 class ResizeCommand(UndoCommand):
     def __init__(self, scheme, item, new_geom, parent=None):
         # type: (Scheme, SchemeTextAnnotation, Rect, Optional[UndoCommand]) -> None
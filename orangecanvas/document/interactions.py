@@ -13,7 +13,8 @@ All interactions are subclasses of :class:`UserInteraction`.
 
 """
 import typing
-from typing import Optional, Any, Tuple, List, Set, Iterable, Sequence, Dict
+from typing import Optional, Any, Tuple, List, Set, Iterable, Sequence, Dict, \
+    Callable
 
 import abc
 import logging
@@ -24,7 +25,9 @@ from AnyQt.QtWidgets import (
     QGraphicsSceneContextMenuEvent, QWidget, QGraphicsItem,
     QGraphicsSceneDragDropEvent, QMenu, QAction, QWidgetAction, QLabel
 )
-from AnyQt.QtGui import QPen, QBrush, QColor, QFontMetrics, QKeyEvent, QFont
+from AnyQt.QtGui import (
+    QPen, QBrush, QColor, QFontMetrics, QKeyEvent, QFont, QPainterPath
+)
 from AnyQt.QtCore import (
     Qt, QObject, QCoreApplication, QSizeF, QPointF, QRect, QRectF, QLineF,
     QPoint, QMimeData,
@@ -42,6 +45,7 @@ from ..scheme import (
 )
 from ..canvas import items
 from ..canvas.items import controlpoints
+from ..canvas.spatialindex import GridIndex
 from ..gui.quickhelp import QuickHelpTipEvent
 from . import commands
 from .editlinksdialog import EditLinksDialog
@@ -340,6 +344,14 @@ class NewLinkAction(UserInteraction):
 
         # Cache viable signals of currently hovered node
         self.__target_compatible_signals: Sequence[Tuple[OutputSignal, InputSignal]] = []
+        # Candidate target node items (computed when the drag starts)
+        # mapped to their (lazily computed) possible signal pairs.
+        self.__candidates: Optional[Dict[items.NodeItem, Optional[Sequence[Tuple[OutputSignal, InputSignal]]]]] = None
+        # Spatial index of node items (and their target anchors) for hit
+        # testing during the drag.
+        self.__target_index: Optional[GridIndex[items.NodeItem]] = None
+        # Is a node a possible link target (computed when the drag starts)
+        self.__is_target_node: Optional[Callable[[Node], bool]] = None
 
         self.cancelOnEsc = True
 
@@ -396,6 +408,19 @@ class NewLinkAction(UserInteraction):
         """
         if self.from_item is None:
             return []
+        if self.__candidates is not None:
+            if target_item not in self.__candidates:
+                return []
+            pairs = self.__candidates[target_item]
+            if pairs is None:
+                pairs = self.__propose_signal_pairs(target_item)
+                self.__candidates[target_item] = pairs
+            return pairs
+        return self.__propose_signal_pairs(target_item)
+
+    def __propose_signal_pairs(
+            self, target_item: items.NodeItem
+    ) -> Sequence[Tuple[OutputSignal, InputSignal]]:
         node1 = self.scene.node_for_item(self.from_item)
         node2 = self.scene.node_for_item(target_item)
 
@@ -415,6 +440,85 @@ class NewLinkAction(UserInteraction):
         """
         return bool(self.__possible_connection_signal_pairs(target_item))
 
+    def __init_drag_targets(self):
+        # type: () -> None
+        """
+        Precompute the candidate target node items and a spatial index of
+        all node items for hit testing during the drag.
+
+        Node items created during the drag (e.g. when the view is scrolled
+        in the virtualized mode) are added as they appear.
+        """
+        scheme = self.scheme
+        from_node = self.scene.node_for_item(self.from_item)
+        if scheme.loop_flags() & Scheme.AllowLoops:
+            excluded = set()  # type: Set[Node]
+        elif self.direction == self.FROM_SOURCE:
+            # linking to any upstream node would create a cycle
+            excluded = scheme.upstream_nodes(from_node)
+        else:
+            excluded = scheme.downstream_nodes(from_node)
+
+        if self.direction == self.FROM_SOURCE:
+            from_channels = [self.from_signal] if self.from_signal \
+                else from_node.output_channels()
+        else:
+            from_channels = [self.from_signal] if self.from_signal \
+                else from_node.input_channels()
+
+        def compatible(node):
+            # type: (Node) -> bool
+            if self.direction == self.FROM_SOURCE:
+                pairs = ((out, in_) for out in from_channels
+                         for in_ in node.input_channels())
+            else:
+                pairs = ((out, in_) for out in node.output_channels()
+                         for in_ in from_channels)
+            return any(compatible_channels(out, in_) for out, in_ in pairs)
+
+        def is_target_node(node):
+            # type: (Node) -> bool
+            return node is not from_node and node not in excluded and \
+                compatible(node)
+
+        self.__candidates = {}
+        self.__target_index = GridIndex()
+        self.__is_target_node = is_target_node
+        for item in self.scene.node_items():
+            self.__add_drag_target(item)
+        self.scene.node_item_added.connect(self.__add_drag_target)
+        self.scene.node_item_removed.connect(self.__remove_drag_target)
+
+    def __add_drag_target(self, item):
+        # type: (items.NodeItem) -> None
+        assert self.__target_index is not None
+        assert self.__candidates is not None
+        assert self.__is_target_node is not None
+        self.__target_index.insert(item, self.__target_hit_rect(item))
+        if self.__is_target_node(self.scene.node_for_item(item)):
+            self.__candidates[item] = None
+
+    def __remove_drag_target(self, item):
+        # type: (items.NodeItem) -> None
+        assert self.__target_index is not None
+        assert self.__candidates is not None
+        if item in self.__target_index:
+            self.__target_index.remove(item)
+        self.__candidates.pop(item, None)
+
+    def __target_anchor(self, item):
+        # type: (items.NodeItem) -> items.NodeAnchorItem
+        if self.direction == self.FROM_SOURCE:
+            return item.inputAnchorItem
+        else:
+            return item.outputAnchorItem
+
+    def __target_hit_rect(self, item):
+        # type: (items.NodeItem) -> QRectF
+        return item.sceneBoundingRect().united(
+            self.__target_anchor(item).sceneBoundingRect()
+        )
+
     def set_link_target_anchor(self, anchor):
         # type: (items.AnchorPoint) -> None
         """
@@ -432,6 +536,8 @@ class NewLinkAction(UserInteraction):
         Return a suitable :class:`NodeItem` at position `pos` on which
         a link can be dropped.
         """
+        if self.__target_index is not None:
+            return self.__target_node_item_at_indexed(pos)
         # Test for a suitable `NodeAnchorItem` or `NodeItem` at pos.
         if self.direction == self.FROM_SOURCE:
             anchor_type = items.SinkAnchorItem
@@ -447,6 +553,25 @@ class NewLinkAction(UserInteraction):
         else:
             return None
 
+    def __target_node_item_at_indexed(self, pos):
+        # type: (QPointF) -> Optional[items.NodeItem]
+        assert self.__target_index is not None
+        rect = QRectF(pos, QSizeF(1, 1))
+        path = QPainterPath()
+        path.addRect(rect)
+
+        def hit(item):
+            # type: (QGraphicsItem) -> bool
+            return item.isVisible() and \
+                item.collidesWithPath(item.mapFromScene(path))
+
+        hits = [item for item in self.__target_index.intersecting(rect)
+                if hit(item) or hit(self.__target_anchor(item))]
+        if not hits:
+            return None
+        # The topmost item (later added items are stacked on top)
+        return max(reversed(hits), key=lambda item: item.zValue())
+
     def mousePressEvent(self, event):
         # type: (QGraphicsSceneMouseEvent) -> bool
         anchor_item = self.scene.item_at(
@@ -511,6 +636,7 @@ class NewLinkAction(UserInteraction):
 
             self.set_link_target_anchor(self.cursor_anchor_point)
             self.scene.addItem(self.tmp_link_item)
+            self.__init_drag_targets()
 
         assert self.cursor_anchor_point is not None
 
@@ -920,6 +1046,13 @@ class NewLinkAction(UserInteraction):
 
             self.current_target_item = None
 
+        if self.__target_index is not None:
+            self.scene.node_item_added.disconnect(self.__add_drag_target)
+            self.scene.node_item_removed.disconnect(self.__remove_drag_target)
+        self.__candidates = None
+        self.__target_index = None
+        self.__is_target_node = None
+
         if self.cursor_anchor_point and self.cursor_anchor_point.scene():
             self.scene.removeItem(self.cursor_anchor_point)
             self.cursor_anchor_point = None
@@ -1182,24 +1315,22 @@ class RectangleSelectionAction(UserInteraction):
 
         self.rect_item.setRect(rect.adjusted(pw, pw, -pw, -pw))
 
-        selected = self.scene.items(self.selection_rect.normalized(),
-                                    Qt.IntersectsItemShape,
-                                    Qt.AscendingOrder)
-
-        selected = set([item for item in selected if
-                        item.flags() & QGraphicsItem.ItemIsSelectable])
+        selected = set(self.scene.selectable_items_in(
+            self.selection_rect.normalized(), Qt.IntersectsItemShape
+        ))
 
         if self.modifiers & Qt.ControlModifier:
-            for item in selected | self.last_selection | \
-                    self.initial_selection:
-                item.setSelected(
-                    (item in selected) ^ (item in self.initial_selection)
-                )
+            selection = selected ^ self.initial_selection
         else:
-            for item in selected.union(self.last_selection):
-                item.setSelected(item in selected)
+            selection = selected
 
-        self.last_selection = set(self.scene.selectedItems())
+        # Only (de)select the items that entered or left the selection
+        # and notify the change once.
+        self.scene.update_selection(
+            selected=selection - self.last_selection,
+            deselected=self.last_selection - selection,
+        )
+        self.last_selection = selection
 
     def end(self):
         # type: () -> None
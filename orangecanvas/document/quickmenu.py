@@ -41,8 +41,9 @@ from ..gui.lineedit import LineEdit
 from ..gui.iconengine import StyledIconEngine
 from ..gui.tooltree import ToolTree, FlattenedTreeItemModel
 from ..gui.utils import StyledWidget_paintEvent, innerGlowBackgroundPixmap, innerShadowPixmap
+from ..registry import WidgetDescription
 from ..registry.qt import QtWidgetRegistry
-from ..registry.utils import search_filter_query_helper
+from ..registry.search import WidgetSearchIndex
 
 from ..resources import icon_loader, load_styled_svg_icon
 
@@ -453,6 +454,47 @@ class SortFilterProxyModel(QSortFilterProxyModel):
         self.__sortingFunc = None
 
         self.__query = ''
+        # search index of the source model's widgets (built on demand)
+        self.__index = None  # type: Optional[WidgetSearchIndex]
+        self.__match = None  # type: Optional[Callable[[WidgetDescription], bool]]
+
+    def setSourceModel(self, model):
+        # type: (QAbstractItemModel) -> None
+        source = self.sourceModel()
+        if source is not None:
+            source.rowsInserted.disconnect(self.__invalidateIndex)
+            source.rowsRemoved.disconnect(self.__invalidateIndex)
+            source.dataChanged.disconnect(self.__on_sourceDataChanged)
+            source.modelReset.disconnect(self.__invalidateIndex)
+        self.__invalidateIndex()
+        super().setSourceModel(model)
+        if model is not None:
+            model.rowsInserted.connect(self.__invalidateIndex)
+            model.rowsRemoved.connect(self.__invalidateIndex)
+            model.dataChanged.connect(self.__on_sourceDataChanged)
+            model.modelReset.connect(self.__invalidateIndex)
+
+    def __invalidateIndex(self, *_):
+        self.__index = None
+        self.__match = None
+
+    def __on_sourceDataChanged(self, topLeft, bottomRight, roles=()):
+        if not roles or QtWidgetRegistry.WIDGET_DESC_ROLE in roles:
+            self.__invalidateIndex()
+
+    def __searchIndex(self):
+        # type: () -> WidgetSearchIndex
+        if self.__index is None:
+            model = self.sourceModel()
+            descriptions = []
+            if model is not None:
+                for row in range(model.rowCount()):
+                    desc = model.data(model.index(row, 0),
+                                      QtWidgetRegistry.WIDGET_DESC_ROLE)
+                    if isinstance(desc, WidgetDescription):
+                        descriptions.append(desc)
+            self.__index = WidgetSearchIndex(descriptions)
+        return self.__index
 
     def setSearchQuery(self, text):
         """
@@ -462,6 +504,7 @@ class SortFilterProxyModel(QSortFilterProxyModel):
         :type text: str
         """
         self.__query = text.lstrip().lower()
+        self.__match = None
 
     def setFilterFunc(self, func):
         """
@@ -489,7 +532,10 @@ class SortFilterProxyModel(QSortFilterProxyModel):
         if description is None:
             return False
 
-        accepted = search_filter_query_helper(description, self.__query)
+        if self.__match is None:
+            # resolve the query to the accepted set once for all rows
+            self.__match = self.__searchIndex().predicate(self.__query)
+        accepted = self.__match(description)
 
         # if matches query, apply filter function (compatibility with paired widget)
         if accepted and self.__filterFunc is not None:
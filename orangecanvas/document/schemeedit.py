@@ -50,10 +50,12 @@ from ..gui.utils import (
     message_information, disabled, clipboard_has_format, clipboard_data
 )
 from ..scheme import (
-    scheme, signalmanager, Scheme, SchemeNode, SchemeLink,
+    scheme, signalmanager, readwrite, Scheme, SchemeNode, SchemeLink,
     BaseSchemeAnnotation, SchemeTextAnnotation, WorkflowEvent, SchemeArrowAnnotation
 )
 from ..scheme.widgetmanager import WidgetManager
+from ..scheme import propertystore
+from ..scheme.propertystore import PropertiesSnapshot
 from ..canvas.scene import CanvasScene
 from ..canvas.view import CanvasView
 from ..canvas import items
@@ -69,6 +71,10 @@ RuntimeState = signalmanager.SignalManager.State
 
 # Private MIME type for clipboard contents
 MimeTypeWorkflowFragment = "application/vnd.{}-ows-fragment+xml".format(__name__)
+# Private MIME type for the compact binary clipboard contents
+# (see `readwrite.fragment_dumps`)
+MimeTypeWorkflowFragmentBinary = \
+    "application/vnd.{}-ows-fragment+octet-stream".format(__name__)
 
 log = logging.getLogger(__name__)
 
@@ -193,8 +199,8 @@ class SchemeEditWidget(QWidget):
         # press and copy operation.
         self.__pasteOrigin = QPointF(20, 20)
 
-        # scheme node properties when set to a clean state
-        self.__cleanProperties = {}
+        # scheme node properties (snapshots) when set to a clean state
+        self.__cleanProperties = {}  # type: Dict[SchemeNode, PropertiesSnapshot]
 
         # list of links when set to a clean state
         self.__cleanLinks = []
@@ -452,7 +458,8 @@ class SchemeEditWidget(QWidget):
         self.__pasteAction = QAction(
             self.tr("Paste"), self,
             objectName="paste-action",
-            enabled=clipboard_has_format(MimeTypeWorkflowFragment),
+            enabled=clipboard_has_format(MimeTypeWorkflowFragment) or
+                    clipboard_has_format(MimeTypeWorkflowFragmentBinary),
             shortcut=QKeySequence("Ctrl+V"),
             triggered=self.__pasteFromClipboard,
         )
@@ -696,18 +703,18 @@ class SchemeEditWidget(QWidget):
         """
 
         currentProperties = node_properties(self.__scheme)
-        # ignore diff for newly created nodes
-        cleanNodes = self.cleanNodes()
-        currentCleanNodeProperties = {k: v
-                                      for k, v in currentProperties.items()
-                                      if k in cleanNodes}
-
         cleanProperties = self.__cleanProperties
-        # ignore diff for deleted nodes
-        currentNodes = self.__scheme.nodes
-        cleanCurrentNodeProperties = {k: v
-                                      for k, v in cleanProperties.items()
-                                      if k in currentNodes}
+        # ignore diff for newly created and deleted nodes, and only
+        # deserialize the snapshots of the changed nodes
+        changed = [node for node, props in currentProperties.items()
+                   if node in cleanProperties
+                   and cleanProperties[node] != props]
+        currentCleanNodeProperties = {
+            node: currentProperties[node].to_dict() for node in changed
+        }
+        cleanCurrentNodeProperties = {
+            node: cleanProperties[node].to_dict() for node in changed
+        }
 
         # ignore contexts
         ignore = set((node, "context_settings")
@@ -1200,7 +1207,13 @@ class SchemeEditWidget(QWidget):
         """
         Select all selectable items in the scheme.
         """
-        for item in self.__scene.items():
+        scene = self.__scene
+        if scene.is_virtualized() and self.__scheme is not None:
+            # Create the items for the nodes that are (only) tracked by
+            # records. Selected items are kept until they are deselected.
+            for node in self.__scheme.nodes:
+                scene.item_for_node(node)
+        for item in scene.items():
             if item.flags() & QGraphicsItem.ItemIsSelectable:
                 item.setSelected(True)
 
@@ -1218,24 +1231,22 @@ class SchemeEditWidget(QWidget):
         nodes = sorted(self.__scheme.nodes, key=attrgetter("position"))
 
         if nodes:
-            self.__undoStack.beginMacro(self.tr("Align To Grid"))
-
+            positions = []  # type: List[Tuple[int, int]]
             for node in nodes:
                 x, y = node.position
                 x = int(round(float(x) / tile_size) * tile_size)
                 y = int(round(float(y) / tile_size) * tile_size)
                 while (x, y) in tiles:
                     x += tile_size
-
-                self.__undoStack.push(
-                    commands.MoveNodeCommand(self.__scheme, node,
-                                             node.position, (x, y))
-                )
-
                 tiles[x, y] = node
-                self.__scene.item_for_node(node).setPos(x, y)
+                positions.append((x, y))
 
-            self.__undoStack.endMacro()
+            command = commands.MoveNodesCommand(
+                self.__scheme, nodes, [node.position for node in nodes],
+                positions
+            )
+            command.setText(self.tr("Align To Grid"))
+            self.__undoStack.push(command)
 
     def focusNode(self):
         # type: () -> Optional[SchemeNode]
@@ -1538,21 +1549,27 @@ class SchemeEditWidget(QWidget):
                 scheme = self.__scheme
                 assert scheme is not None
                 stack = self.undoStack()
-                stack.beginMacro(self.tr("Move"))
-                for scheme_item, (old, new) in self.__itemsMoving.items():
-                    if isinstance(scheme_item, SchemeNode):
-                        command = commands.MoveNodeCommand(
-                            scheme, scheme_item, old, new
-                        )
-                    elif isinstance(scheme_item, BaseSchemeAnnotation):
-                        command = commands.AnnotationGeometryChange(
-                            scheme, scheme_item, old, new
-                        )
-                    else:
-                        continue
-
-                    stack.push(command)
-                stack.endMacro()
+                moved = [(item, old, new) for item, (old, new)
+                         in self.__itemsMoving.items()
+                         if isinstance(item, SchemeNode)]
+                cmds = []  # type: List[commands.UndoCommand]
+                if moved:
+                    # All nodes are moved with a single command
+                    nodes, old, new = zip(*moved)
+                    cmds.append(
+                        commands.MoveNodesCommand(scheme, nodes, old, new))
+                cmds.extend(
+                    commands.AnnotationGeometryChange(scheme, item, old, new)
+                    for item, (old, new) in self.__itemsMoving.items()
+                    if isinstance(item, BaseSchemeAnnotation)
+                )
+                if len(cmds) == 1:
+                    stack.push(cmds[0])
+                elif cmds:
+                    stack.beginMacro(self.tr("Move"))
+                    for command in cmds:
+                        stack.push(command)
+                    stack.endMacro()
 
                 self.__itemsMoving.clear()
                 return True
@@ -2150,48 +2167,63 @@ class SchemeEditWidget(QWidget):
         Copy currently selected nodes to system clipboard.
         """
         cb = QApplication.clipboard()
-        selected = self.__copySelected()
-        nodes, links = selected
+        nodes, links = self.__selectedSubgraph()
         if not nodes:
             return
-        s = Scheme()
-        for n in nodes:
-            s.add_node(n)
-        for e in links:
-            s.add_link(e)
         buff = io.BytesIO()
         try:
-            s.save_to(buff, pickle_fallback=True)
+            readwrite.fragment_to_ows_stream(
+                nodes, links, buff, pickle_fallback=True)
         except Exception:
             log.error("copyToClipboard:", exc_info=True)
             QApplication.beep()
             return
+        try:
+            # no pickle fallback; the xml fragment is used if the node
+            # properties can not be stored as literals
+            binary = readwrite.fragment_dumps(nodes, links)
+        except (ValueError, TypeError):
+            log.info("copyToClipboard: no binary fragment", exc_info=True)
+            binary = None
         mime = QMimeData()
         mime.setData(MimeTypeWorkflowFragment, buff.getvalue())
+        if binary is not None:
+            mime.setData(MimeTypeWorkflowFragmentBinary, binary)
         cb.setMimeData(mime)
         self.__pasteOrigin = nodes_top_left(nodes) + DuplicateOffset
 
     def __updatePasteActionState(self):
         self.__pasteAction.setEnabled(
-            clipboard_has_format(MimeTypeWorkflowFragment)
+            clipboard_has_format(MimeTypeWorkflowFragment) or
+            clipboard_has_format(MimeTypeWorkflowFragmentBinary)
         )
 
-    def __copySelected(self):
+    def __selectedSubgraph(self):
+        # type: () -> Tuple[List[SchemeNode], List[SchemeLink]]
         """
-        Return a deep copy of currently selected nodes and links between them.
+        Return the currently selected nodes and links between them (with
+        their properties synced).
         """
         scheme = self.scheme()
         if scheme is None:
             return [], []
-
+        nodes = self.selectedNodes()
+        if not nodes:
+            return [], []
         # ensure up to date node properties (settings)
-        scheme.sync_node_properties()
+        scheme.sync_node_properties_for(nodes)
+        nodeset = set(nodes)
+        links = [link for link in scheme.links
+                 if link.source_node in nodeset and
+                 link.sink_node in nodeset]
+        return nodes, links
 
+    def __copySelected(self):
+        """
+        Return a deep copy of currently selected nodes and links between them.
+        """
         # original nodes and links
-        nodes = self.selectedNodes()
-        links = [link for link in scheme.links
-                 if link.source_node in nodes and
-                 link.sink_node in nodes]
+        nodes, links = self.__selectedSubgraph()
 
         # deepcopied nodes and links
         nodedups = [copy_node(node) for node in nodes]
@@ -2204,12 +2236,16 @@ class SchemeEditWidget(QWidget):
 
     def __pasteFromClipboard(self):
         """Paste a workflow part from system clipboard."""
+        binary = clipboard_data(MimeTypeWorkflowFragmentBinary)
         buff = clipboard_data(MimeTypeWorkflowFragment)
-        if buff is None:
+        if binary is None and buff is None:
             return
         sch = Scheme()
         try:
-            sch.load_from(io.BytesIO(buff), registry=self.__registry, )
+            if binary is not None:
+                readwrite.fragment_load(sch, binary, registry=self.__registry)
+            else:
+                sch.load_from(io.BytesIO(buff), registry=self.__registry, )
         except Exception:
             log.error("pasteFromClipboard:", exc_info=True)
             QApplication.beep()
@@ -2596,10 +2632,11 @@ def is_printable(unichar):
 
 
 def node_properties(scheme):
-    # type: (Scheme) -> Dict[str, Dict[str, Any]]
+    # type: (Scheme) -> Dict[SchemeNode, PropertiesSnapshot]
     scheme.sync_node_properties()
+    store = propertystore.default_store()
     return {
-        node: dict(node.properties) for node in scheme.nodes
+        node: store.snapshot(node.properties) for node in scheme.nodes
     }
 
 
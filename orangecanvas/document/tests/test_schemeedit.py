@@ -15,7 +15,11 @@ from AnyQt.QtWidgets import (
 from AnyQt.QtTest import QSignalSpy, QTest
 
 from .. import commands
-from ..schemeedit import SchemeEditWidget, SaveWindowGroup
+from ..schemeedit import (
+    SchemeEditWidget, SaveWindowGroup, MimeTypeWorkflowFragment,
+    MimeTypeWorkflowFragmentBinary
+)
+from .. import interactions
 from ..interactions import (
     DropHandler, PluginDropHandler, NodeFromMimeDataDropHandler, EntryPoint
 )
@@ -362,6 +366,30 @@ class TestSchemeEdit(QAppTestCase):
         self.assertEqual(w.scheme().annotations, [])
         self.assertEqual(w.scheme().links, [])
 
+    def test_select_virtualized(self):
+        w = self.w
+        workflow = self.setup_test_workflow()
+        far = workflow.new_node(self.reg.widget("one"),
+                                position=(10000, 10000))
+        w.setScheme(workflow)
+        w.show()
+        w.view().centerOn(0, 0)
+        scene = w.scene()
+        scene.clearSelection()
+        scene.set_virtualized(True)
+        self.qWait()
+        # the node outside the viewport has no item
+        self.assertNotIn(far, [scene.node_for_item(item)
+                               for item in scene.node_items()])
+        w.selectAll()
+        self.assertSequenceEqual(w.selectedNodes(), workflow.nodes)
+        # selected items are not released when the view scrolls
+        scene.update_visible_items()
+        self.assertSequenceEqual(w.selectedNodes(), workflow.nodes)
+        w.removeSelected()
+        self.assertEqual(workflow.nodes, [])
+        self.assertEqual(workflow.links, [])
+
     def test_select_remove_link(self):
         def link_curve(link: SchemeLink) -> QPainterPath:
             item = scene.item_for_link(link)  # type: items.LinkItem
@@ -380,6 +408,38 @@ class TestSchemeEdit(QAppTestCase):
         self.assertSequenceEqual(w.selectedLinks(), [])
         self.assertTrue(link not in workflow.links)
 
+    def test_rectangle_selection(self):
+        w = self.w
+        workflow = w.scheme()
+        view, scene = w.view(), w.scene()
+        nodes = [SchemeNode(self.reg.widget("one"), position=(x, 100))
+                 for x in (100, 200, 300)]
+        for node in nodes:
+            workflow.add_node(node)
+        w.show()
+        QApplication.processEvents()
+        spy = QSignalSpy(scene.selectionChanged)
+
+        def drag(start, points, modifiers=Qt.NoModifier):
+            start = view.mapFromScene(*start)
+            QTest.mousePress(view.viewport(), Qt.LeftButton, modifiers,
+                             start)
+            for p in points:
+                count = len(spy)
+                mouseMove(view.viewport(), Qt.LeftButton, modifiers,
+                          view.mapFromScene(*p))
+                self.assertLessEqual(len(spy), count + 1)
+            QTest.mouseRelease(view.viewport(), Qt.LeftButton, modifiers,
+                               view.mapFromScene(*points[-1]))
+
+        drag((50, 50), [(150, 150), (250, 150), (150, 150)])
+        self.assertSequenceEqual(w.selectedNodes(), nodes[:1])
+        drag((50, 50), [(250, 150)])
+        self.assertSequenceEqual(w.selectedNodes(), nodes[:2])
+        # Control modifier toggles the selection
+        drag((150, 50), [(350, 150)], Qt.ControlModifier)
+        self.assertSequenceEqual(w.selectedNodes(), [nodes[0], nodes[2]])
+
     def test_open_selected(self):
         w = self.w
         w.setScheme(self.setup_test_workflow())
@@ -400,10 +460,107 @@ class TestSchemeEdit(QAppTestCase):
         self.assertEqual(len(spyadd), 2)
         w.undoStack().undo()
 
+    def test_new_link_drag(self):
+        w = self.w
+        workflow = w.scheme()
+        view, scene = w.view(), w.scene()
+        one = SchemeNode(self.reg.widget("one"), position=(20, 20))
+        neg = SchemeNode(self.reg.widget("negate"), position=(220, 20))
+        cons = SchemeNode(self.reg.widget("decons"), position=(220, 170))
+        for node in (one, neg, cons):
+            workflow.add_node(node)
+        w.show()
+        QApplication.processEvents()
+
+        def anchor_pos(anchor):
+            # type: (items.NodeAnchorItem) -> QPoint
+            pos = anchor.anchorPath().pointAtPercent(0.5)
+            return view.mapFromScene(anchor.mapToScene(pos))
+
+        def drag_link(source, sink):
+            # type: (SchemeNode, SchemeNode) -> None
+            start = anchor_pos(scene.item_for_node(source).outputAnchorItem)
+            end = anchor_pos(scene.item_for_node(sink).inputAnchorItem)
+            QTest.mousePress(view.viewport(), Qt.LeftButton, pos=start)
+            mid = (start + end) / 2
+            mouseMove(view.viewport(), Qt.LeftButton, pos=mid)
+            mouseMove(view.viewport(), Qt.LeftButton, pos=end)
+            handler = scene.user_interaction_handler
+            self.assertIsInstance(handler, interactions.NewLinkAction)
+            target = scene.item_for_node(sink)
+            self.assertIs(handler.target_node_item_at(
+                view.mapToScene(end)), target)
+            self.assertIs(handler.target_node_item_at(
+                view.mapToScene(mid)), None)
+            QTest.mouseRelease(view.viewport(), Qt.LeftButton, pos=end)
+
+        # 'int' output to an incompatible 'tuple' input.
+        drag_link(one, cons)
+        self.assertEqual(workflow.links, [])
+        self.assertIsNone(scene.user_interaction_handler)
+
+        drag_link(one, neg)
+        self.assertEqual(len(workflow.links), 1)
+        link = workflow.links[0]
+        self.assertIs(link.source_node, one)
+        self.assertIs(link.sink_node, neg)
+
+    def test_new_link_drag_virtualized(self):
+        w = self.w
+        workflow = w.scheme()
+        view, scene = w.view(), w.scene()
+        one = SchemeNode(self.reg.widget("one"), position=(20, 20))
+        neg = SchemeNode(self.reg.widget("negate"), position=(3000, 20))
+        workflow.add_node(one)
+        workflow.add_node(neg)
+        w.show()
+        view.centerOn(20, 20)
+        scene.clearSelection()
+        scene.set_virtualized(True)
+        QApplication.processEvents()
+        self.assertNotIn(neg, [scene.node_for_item(item)
+                               for item in scene.node_items()])
+
+        anchor = scene.item_for_node(one).outputAnchorItem
+        start = view.mapFromScene(
+            anchor.mapToScene(anchor.anchorPath().pointAtPercent(0.5)))
+        QTest.mousePress(view.viewport(), Qt.LeftButton, pos=start)
+        mouseMove(view.viewport(), Qt.LeftButton, pos=start + QPoint(30, 0))
+        handler = scene.user_interaction_handler
+        self.assertIsInstance(handler, interactions.NewLinkAction)
+
+        # scroll to the sink node (its item is created)
+        view.centerOn(3000, 20)
+        QApplication.processEvents()
+        scene.update_visible_items()
+        self.assertIn(neg, [scene.node_for_item(item)
+                            for item in scene.node_items()])
+        target = scene.item_for_node(neg)
+        anchor = target.inputAnchorItem
+        end = anchor.mapToScene(anchor.anchorPath().pointAtPercent(0.5))
+        self.assertIs(handler.target_node_item_at(end), target)
+        mouseMove(view.viewport(), Qt.LeftButton, pos=view.mapFromScene(end))
+        QTest.mouseRelease(view.viewport(), Qt.LeftButton,
+                           pos=view.mapFromScene(end))
+        self.assertEqual(len(workflow.links), 1)
+        self.assertIs(workflow.links[0].sink_node, neg)
+
     def test_align_to_grid(self):
         w = self.w
-        self.setup_test_workflow(w.scheme())
+        workflow = self.setup_test_workflow(w.scheme())
+        positions = [node.position for node in workflow.nodes]
+        stack = w.undoStack()
+        count = stack.count()
         w.alignToGrid()
+        # A single (undo) command moves all nodes
+        self.assertEqual(stack.count(), count + 1)
+        self.assertIsInstance(stack.command(count), commands.MoveNodesCommand)
+        for node in workflow.nodes:
+            x, y = node.position
+            self.assertEqual((x % 150, y % 150), (0, 0))
+        stack.undo()
+        self.assertEqual([node.position for node in workflow.nodes],
+                         positions)
 
     def test_activate_node(self):
         w = self.w
@@ -452,6 +609,8 @@ class TestSchemeEdit(QAppTestCase):
         if not len(spy):
             self.assertTrue(spy.wait())
         self.assertEqual(len(spy), 1)
+        mime = cb.mimeData()
+        self.assertTrue(mime.hasFormat(MimeTypeWorkflowFragmentBinary))
         cp.trigger()
         self.assertEqual(len(workflow.nodes), 2 * nnodes)
         self.assertEqual(len(workflow.links), 2 * nlinks)
@@ -466,6 +625,29 @@ class TestSchemeEdit(QAppTestCase):
         self.assertEqual(len(wf1.nodes), nnodes)
         self.assertEqual(len(wf1.links), nlinks)
 
+        # paste from the xml fragment only
+        mime = QMimeData()
+        mime.setData(MimeTypeWorkflowFragment,
+                     cb.mimeData().data(MimeTypeWorkflowFragment))
+        cb.setMimeData(mime)
+        cp.trigger()
+        self.assertEqual(len(wf1.nodes), 2 * nnodes)
+        self.assertEqual(len(wf1.links), 2 * nlinks)
+
+        # node properties requiring pickle are only copied as xml
+        for node in workflow.nodes:
+            node.properties = {"a": 1j}
+        spy = QSignalSpy(cb.dataChanged)
+        ca.trigger()
+        if not len(spy):
+            self.assertTrue(spy.wait())
+        mime = cb.mimeData()
+        self.assertTrue(mime.hasFormat(MimeTypeWorkflowFragment))
+        self.assertFalse(mime.hasFormat(MimeTypeWorkflowFragmentBinary))
+        cp.trigger()
+        self.assertEqual(len(wf1.nodes), 3 * nnodes)
+        self.assertEqual(wf1.nodes[-nnodes].properties, {"a": 1j})
+
     def test_redo_remove_preserves_order(self):
         w = self.w
         workflow = self.setup_test_workflow()
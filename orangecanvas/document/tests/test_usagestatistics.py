@@ -18,6 +18,9 @@ class TestUsageStatistics(TestMainWindowBase):
         self.descs = [reg.action_for_widget(desc).data() for desc in data_descriptions]
 
         toolbox = self.w.findChild(WidgetToolBox)
+        # the grid's buttons are created when it is first shown
+        toolbox.tabButton(0).defaultAction().setChecked(True)
+        self.w.show()
         widget = toolbox.widget(0)
         self.buttons = widget.findChildren(QToolButton)
 
@@ -6,15 +6,23 @@ Drop Shadow Frame
 A widget providing a drop shadow (gaussian blur effect) around another
 widget.
 
+Also provides :func:`drop_shadow_pixmap`, a cache of pre-rendered drop
+shadows of arbitrary shapes (used to paint graphics item shadows without a
+:class:`QGraphicsDropShadowEffect` per item).
+
 """
-from typing import Optional, Any, Union, List
+import math
+import hashlib
+
+from typing import Optional, Any, Union, List, Tuple
 
 from AnyQt.QtWidgets import (
-    QWidget, QGraphicsScene, QGraphicsRectItem, QGraphicsDropShadowEffect,
+    QWidget, QGraphicsScene, QGraphicsPathItem, QGraphicsDropShadowEffect,
     QStyleOption, QAbstractScrollArea, QToolBar
 )
 from AnyQt.QtGui import (
-    QPainter, QPixmap, QColor, QPen, QPalette, QRegion, QPaintEvent
+    QPainter, QPixmap, QColor, QPen, QBrush, QPalette, QRegion, QPaintEvent,
+    QPainterPath, QPixmapCache
 )
 from AnyQt.QtCore import (
     Qt, QPoint, QPointF, QRect, QRectF, QSize, QSizeF, QEvent, QObject
@@ -22,29 +30,90 @@ from AnyQt.QtCore import (
 from AnyQt.QtCore import pyqtProperty as Property
 
 
-def render_drop_shadow_frame(pixmap, shadow_rect, shadow_color,
-                             offset, radius, rect_fill_color):
-    # type: (QPixmap, QRectF, QColor, QPointF, float, QColor) -> QPixmap
+def render_drop_shadow(pixmap, path, fill, shadow_color, offset, radius,
+                       source=None):
+    # type: (QPixmap, QPainterPath, QBrush, QColor, QPointF, float, Optional[QRectF]) -> QPixmap
+    """
+    Render the `path` filled with `fill` and its drop shadow into `pixmap`.
+
+    The `source` rect (in `path` coordinates) is mapped onto the whole
+    pixmap (by default the `source` is the pixmap's rect). The `radius` and
+    `offset` are in pixmap (device) pixels.
+    """
     pixmap.fill(Qt.transparent)
     scene = QGraphicsScene()
-    rect = QGraphicsRectItem(shadow_rect)
-    rect.setBrush(QColor(rect_fill_color))
-    rect.setPen(QPen(Qt.NoPen))
-    scene.addItem(rect)
+    item = QGraphicsPathItem(path)
+    item.setBrush(QBrush(fill))
+    item.setPen(QPen(Qt.NoPen))
+    scene.addItem(item)
     effect = QGraphicsDropShadowEffect(color=shadow_color,
                                        blurRadius=radius,
                                        offset=offset)
-
-    rect.setGraphicsEffect(effect)
-    scene.setSceneRect(QRectF(QPointF(0, 0), QSizeF(pixmap.size())))
+    item.setGraphicsEffect(effect)
+    target = QRectF(QPointF(0, 0), QSizeF(pixmap.size()))
+    if source is None:
+        source = target
+    scene.setSceneRect(source)
     painter = QPainter(pixmap)
-    scene.render(painter)
+    scene.render(painter, target, source, Qt.IgnoreAspectRatio)
     painter.end()
     scene.clear()
     scene.deleteLater()
     return pixmap
 
 
+def render_drop_shadow_frame(pixmap, shadow_rect, shadow_color,
+                             offset, radius, rect_fill_color):
+    # type: (QPixmap, QRectF, QColor, QPointF, float, QColor) -> QPixmap
+    path = QPainterPath()
+    path.addRect(shadow_rect)
+    return render_drop_shadow(pixmap, path, QBrush(QColor(rect_fill_color)),
+                              shadow_color, offset, radius)
+
+
+def _path_key(path):
+    # type: (QPainterPath) -> str
+    elements = (path.elementAt(i) for i in range(path.elementCount()))
+    data = ";".join("{} {:.2f} {:.2f}".format(el.type, el.x, el.y)
+                    for el in elements)
+    return hashlib.sha1(data.encode("ascii")).hexdigest()
+
+
+def drop_shadow_pixmap(path, fill, color, radius, scale=1.0):
+    # type: (QPainterPath, QBrush, QColor, float, float) -> Tuple[QPixmap, QPointF]
+    """
+    Return a pixmap of the `path` filled with `fill` and its drop shadow
+    (blurred with `radius`, in `path` coordinates), as well as the position
+    of the pixmap's top left corner (in `path` coordinates).
+
+    The pixmap is rendered at `scale` device pixels per unit (its
+    `devicePixelRatio` is `scale`), and is cached (in the process wide
+    :class:`QPixmapCache`) keyed by the path, fill and shadow color,
+    `radius` (rounded to a whole number) and `scale`.
+    """
+    radius = int(round(radius))
+    scale = round(scale, 3)
+    fill = QBrush(fill)
+    margin = radius + 1
+    rect = path.boundingRect().adjusted(-margin, -margin, margin, margin)
+    key = "DropShadow {} {} {} {} {} {}".format(
+        _path_key(path), QColor(fill.color()).name(QColor.HexArgb),
+        QColor(color).name(QColor.HexArgb), radius, scale, int(fill.style())
+    )
+    pixmap = QPixmapCache.find(key)
+    if pixmap is None or pixmap.isNull():
+        size = QSize(int(math.ceil(rect.width() * scale)),
+                     int(math.ceil(rect.height() * scale)))
+        source = QRectF(rect.topLeft(),
+                        QSizeF(size.width() / scale, size.height() / scale))
+        pixmap = QPixmap(size)
+        render_drop_shadow(pixmap, path, fill, color, QPointF(0, 0),
+                           radius * scale, source=source)
+        pixmap.setDevicePixelRatio(scale)
+        QPixmapCache.insert(key, pixmap)
+    return pixmap, rect.topLeft()
+
+
 class DropShadowFrame(QWidget):
     """
     A widget drawing a drop shadow effect around the geometry of
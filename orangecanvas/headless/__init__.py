@@ -0,0 +1,15 @@
+"""
+========
+Headless
+========
+
+The headless package executes workflows without a GUI (no widgets, no
+main window). Nodes are backed by *node runtimes*, plain callables created
+by factories registered in a :class:`.NodeRuntimeRegistry`.
+
+Run a workflow from the command line with::
+
+    python -m orangecanvas.headless run workflow.ows --runtimes module:name
+
+"""
+from .engine import NodeRuntimeRegistry, HeadlessSignalManager, load_workflow
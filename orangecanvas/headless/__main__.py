@@ -0,0 +1,204 @@
+"""
+Command line workflow runner.
+
+Usage::
+
+    python -m orangecanvas.headless run workflow.ows \\
+        --runtimes package.module:runtimes [--registry package.module:name] \\
+        [--set "Node Title.property=value" ...] [--timeout SECONDS]
+
+The progress is reported on stdout as JSON objects (one per line) with an
+`event` key:
+
+* ``{"event": "start", "workflow": ..., "nodes": ...}``
+* ``{"event": "node", "node": ..., "index": ..., "status": "ok",
+  "elapsed": ..., "outputs": {...}}`` after every node execution
+  (``"status": "error"`` and an ``"error"`` message if the node failed)
+* ``{"event": "finish", "status": ..., "elapsed": ..., "errors": ...}``
+  where status is one of "ok", "error" or "timeout".
+
+The exit status is 0 on success, 1 if any node failed, 2 if the workflow
+could not be loaded or the arguments are invalid and 3 on timeout.
+"""
+import sys
+import json
+import time
+import argparse
+import importlib
+
+from typing import Any, List, Optional, TextIO, Tuple
+
+from AnyQt.QtCore import QCoreApplication
+
+from ..registry import WidgetRegistry, global_registry
+from ..scheme import Scheme, SchemeNode, readwrite
+from .engine import NodeRuntimeRegistry, HeadlessSignalManager, load_workflow
+
+EXIT_OK, EXIT_NODE_ERROR, EXIT_INVALID, EXIT_TIMEOUT = 0, 1, 2, 3
+
+
+def resolve(spec):
+    # type: (str) -> Any
+    """
+    Resolve a 'package.module:name' `spec` to an object.
+    """
+    modname, _, attr = spec.partition(":")
+    obj = importlib.import_module(modname)
+    for name in filter(None, attr.split(".")):
+        obj = getattr(obj, name)
+    return obj
+
+
+def parse_assignment(assignment):
+    # type: (str) -> Tuple[str, str, Any]
+    """
+    Parse a 'node.property=value' `assignment`.
+
+    The value is parsed as a Python literal (if that fails it is used as
+    a string).
+    """
+    target, sep, value = assignment.partition("=")
+    node, _, prop = target.rpartition(".")
+    if not (sep and node and prop):
+        raise ValueError("Invalid assignment {!r} (expected "
+                         "'node.property=value')".format(assignment))
+    try:
+        value = readwrite.literal_loads(value)
+    except (ValueError, SyntaxError):
+        pass
+    return node, prop, value
+
+
+def find_node(workflow, name):
+    # type: (Scheme, str) -> SchemeNode
+    """
+    Find a node in `workflow` by its title (or by its index).
+    """
+    nodes = [node for node in workflow.nodes if node.title == name]
+    if len(nodes) == 1:
+        return nodes[0]
+    elif nodes:
+        raise ValueError("Ambiguous node title {!r}".format(name))
+    elif name.isdigit() and int(name) < len(workflow.nodes):
+        return workflow.nodes[int(name)]
+    else:
+        raise ValueError("No node {!r}".format(name))
+
+
+def arg_parser():
+    # type: () -> argparse.ArgumentParser
+    parser = argparse.ArgumentParser(
+        prog="python -m orangecanvas.headless",
+        description="Execute workflows without a GUI."
+    )
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+    run = commands.add_parser("run", help="Run a workflow")
+    run.add_argument("workflow", help="The workflow (.ows) file")
+    run.add_argument(
+        "--runtimes", required=True, metavar="MODULE:NAME",
+        help="The node runtimes (a NodeRuntimeRegistry, a mapping of "
+             "factories or a callable returning one of these)"
+    )
+    run.add_argument(
+        "--registry", default=None, metavar="MODULE:NAME",
+        help="The widget registry (or a callable returning one). By "
+             "default the installed widgets are discovered."
+    )
+    run.add_argument(
+        "--set", action="append", default=[], dest="assignments",
+        metavar="NODE.PROPERTY=VALUE",
+        help="Set a node property (the node is specified by its title or "
+             "index)"
+    )
+    run.add_argument(
+        "--timeout", type=float, default=None, metavar="SECONDS",
+        help="Stop after the timeout (checked between node executions)"
+    )
+    return parser
+
+
+def run(options, stdout):
+    # type: (argparse.Namespace, TextIO) -> int
+    def report(event, **kwargs):
+        json.dump(dict(event=event, **kwargs), stdout, default=repr)
+        stdout.write("\n")
+        stdout.flush()
+
+    start = time.perf_counter()
+
+    def finish(status, **kwargs):
+        report("finish", status=status,
+               elapsed=time.perf_counter() - start, **kwargs)
+
+    try:
+        if options.registry is not None:
+            registry = resolve(options.registry)
+            if not isinstance(registry, WidgetRegistry):
+                registry = registry()
+        else:
+            registry = global_registry()
+        runtimes = resolve(options.runtimes)
+        if callable(runtimes) and not isinstance(runtimes, NodeRuntimeRegistry):
+            runtimes = runtimes()
+        if not isinstance(runtimes, NodeRuntimeRegistry):
+            runtimes = NodeRuntimeRegistry(runtimes)
+        workflow = load_workflow(options.workflow, registry)
+        for name, prop, value in map(parse_assignment, options.assignments):
+            node = find_node(workflow, name)
+            node.properties = dict(node.properties, **{prop: value})
+        missing = sorted({node.description.qualified_name
+                          for node in workflow.nodes
+                          if node.description.qualified_name not in runtimes})
+        if missing:
+            raise ValueError("No runtime for {}".format(", ".join(missing)))
+    except Exception as err:  # pylint: disable=broad-except
+        finish("error", error="{}: {}".format(type(err).__name__, err))
+        return EXIT_INVALID
+
+    report("start", workflow=options.workflow, nodes=len(workflow.nodes))
+    manager = HeadlessSignalManager(runtimes)
+    manager.set_workflow(workflow)
+    index = workflow.nodes.index
+
+    def on_executed(node, elapsed):
+        # type: (SchemeNode, float) -> None
+        report("node", node=node.title, index=index(node), status="ok",
+               elapsed=elapsed, outputs=manager.outputs(node))
+
+    def on_failed(node, message):
+        # type: (SchemeNode, str) -> None
+        report("node", node=node.title, index=index(node), status="error",
+               error=message)
+
+    manager.nodeExecuted.connect(on_executed)
+    manager.nodeFailed.connect(on_failed)
+    completed = manager.run(timeout=options.timeout)
+    errors = len(manager.errors())
+    manager.set_workflow(None)
+    if not completed:
+        finish("timeout", errors=errors)
+        return EXIT_TIMEOUT
+    elif errors:
+        finish("error", errors=errors)
+        return EXIT_NODE_ERROR
+    else:
+        finish("ok", errors=0)
+        return EXIT_OK
+
+
+def main(argv=None, stdout=None):
+    # type: (Optional[List[str]], Optional[TextIO]) -> int
+    if argv is None:
+        argv = sys.argv
+    if stdout is None:
+        stdout = sys.stdout
+    options = arg_parser().parse_args(argv[1:])
+    app = QCoreApplication.instance()
+    if app is None:
+        app = QCoreApplication(argv[:1])
+    return run(options, stdout)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
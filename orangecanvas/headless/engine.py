@@ -0,0 +1,280 @@
+"""
+Headless workflow execution.
+
+A workflow is executed without any widgets. Instead, every node is backed
+by a *node runtime*, a plain callable created by a factory registered (in
+a :class:`NodeRuntimeRegistry`) for the node's
+:attr:`WidgetDescription.qualified_name`.
+
+A runtime is called with a dict mapping the node's input channel names to
+the current input values (`None` if there is no input, a list of values
+for channels accepting multiple inputs) and returns a dict mapping the
+output channel names to the new output values (or `None` if there are no
+outputs to send).
+
+.. code-block:: python
+
+    runtimes = NodeRuntimeRegistry()
+
+    @runtimes.register("add")
+    def add(node):
+        def run(inputs):
+            return {"result": inputs["left"] + inputs["right"]}
+        return run
+
+"""
+import time
+import logging
+import traceback
+
+from typing import Any, Optional, Dict, List, Callable, Mapping
+
+from AnyQt.QtCore import pyqtSignal
+
+from ..registry import WidgetRegistry, InputSignal
+from ..scheme import Scheme, SchemeNode, readwrite
+from ..scheme.node import UserMessage
+from ..scheme.signalmanager import (
+    SignalManager, Signal, compress_signals
+)
+
+__all__ = [
+    "NodeRuntimeRegistry", "HeadlessSignalManager", "load_workflow"
+]
+
+log = logging.getLogger(__name__)
+
+#: A node runtime; called with the node's input values, returns its
+#: outputs
+NodeRuntime = Callable[[Dict[str, Any]], Optional[Mapping[str, Any]]]
+#: A factory creating a node runtime for a node
+NodeRuntimeFactory = Callable[[SchemeNode], NodeRuntime]
+
+
+class NodeRuntimeRegistry:
+    """
+    A registry of node runtime factories keyed by the widget description's
+    `qualified_name`.
+
+    Parameters
+    ----------
+    factories : Mapping[str, NodeRuntimeFactory]
+        Initial factories.
+    """
+    def __init__(self, factories=None):
+        # type: (Optional[Mapping[str, NodeRuntimeFactory]]) -> None
+        self.__factories = dict(factories or {})  # type: Dict[str, NodeRuntimeFactory]
+
+    def register(self, qualified_name, factory=None):
+        """
+        Register a runtime `factory` for `qualified_name`.
+
+        Can also be used as a decorator if `factory` is omitted.
+        """
+        if factory is None:
+            def decorator(factory):
+                self.register(qualified_name, factory)
+                return factory
+            return decorator
+        self.__factories[qualified_name] = factory
+        return factory
+
+    def factory(self, qualified_name):
+        # type: (str) -> NodeRuntimeFactory
+        """
+        Return the runtime factory for `qualified_name`.
+
+        Raises a `KeyError` if no factory is registered.
+        """
+        return self.__factories[qualified_name]
+
+    def __contains__(self, qualified_name):
+        # type: (str) -> bool
+        return qualified_name in self.__factories
+
+    def create(self, node):
+        # type: (SchemeNode) -> NodeRuntime
+        """
+        Create and return a runtime for `node`.
+        """
+        return self.factory(node.description.qualified_name)(node)
+
+
+class _NodeInputs:
+    """Current input values of a node."""
+    __slots__ = ("values",)
+
+    def __init__(self):
+        # channel name -> {link: (index, value)}
+        self.values = {}  # type: Dict[str, Dict[Any, Any]]
+
+    def update(self, signals):
+        # type: (List[Signal]) -> None
+        for sig in signals:
+            values = self.values.setdefault(sig.channel.name, {})
+            if isinstance(sig, Signal.Close):
+                values.pop(sig.link, None)
+            else:
+                values[sig.link] = (sig.index, sig.value)
+
+    def inputs(self, channels):
+        # type: (List[InputSignal]) -> Dict[str, Any]
+        res = {}
+        for channel in channels:
+            values = sorted(self.values.get(channel.name, {}).values(),
+                            key=lambda item: item[0])
+            values = [v for _, v in values]
+            if channel.single:
+                res[channel.name] = values[-1] if values else None
+            else:
+                res[channel.name] = values
+        return res
+
+
+class HeadlessSignalManager(SignalManager):
+    """
+    A signal manager delivering signals to node runtimes (see
+    :class:`NodeRuntimeRegistry`).
+
+    The workflow is executed by :func:`run` (without an event loop).
+
+    Parameters
+    ----------
+    runtimes : NodeRuntimeRegistry
+        The node runtime factories.
+    """
+    #: Emitted after a node's runtime was executed (node, elapsed seconds)
+    nodeExecuted = pyqtSignal(SchemeNode, float)
+    #: Emitted when a node's runtime failed (node, error message)
+    nodeFailed = pyqtSignal(SchemeNode, str)
+
+    #: The state message id for runtime errors
+    ErrorMessageId = "orangecanvas.headless.error"
+
+    def __init__(self, runtimes, parent=None, **kwargs):
+        # type: (NodeRuntimeRegistry, Any, Any) -> None
+        self.__runtimes = runtimes
+        self.__instances = {}  # type: Dict[SchemeNode, NodeRuntime]
+        self.__inputs = {}  # type: Dict[SchemeNode, _NodeInputs]
+        self.__outputs = {}  # type: Dict[SchemeNode, Dict[str, Any]]
+        self.__errors = {}  # type: Dict[SchemeNode, str]
+        super().__init__(parent, **kwargs)
+
+    def set_workflow(self, workflow):
+        # type: (Optional[Scheme]) -> None
+        if workflow is not self.workflow():
+            self.__instances.clear()
+            self.__inputs.clear()
+            self.__outputs.clear()
+            self.__errors.clear()
+        super().set_workflow(workflow)
+
+    def runtime_for_node(self, node):
+        # type: (SchemeNode) -> NodeRuntime
+        """
+        Return the runtime for `node` (created on first use).
+        """
+        runtime = self.__instances.get(node)
+        if runtime is None:
+            runtime = self.__instances[node] = self.__runtimes.create(node)
+        return runtime
+
+    def compress_signals(self, signals):
+        # type: (List[Signal]) -> List[Signal]
+        return compress_signals(signals)
+
+    def send_to_node(self, node, signals):
+        # type: (SchemeNode, List[Signal]) -> None
+        self.__inputs.setdefault(node, _NodeInputs()).update(signals)
+        self.execute(node)
+
+    def execute(self, node):
+        # type: (SchemeNode) -> bool
+        """
+        Execute the `node`'s runtime with its current inputs and send the
+        outputs. Return `False` if the runtime failed.
+        """
+        inputs = self.__inputs.get(node, _NodeInputs()).inputs(
+            node.description.inputs
+        )
+        node.clear_state_message(self.ErrorMessageId)
+        self.__errors.pop(node, None)
+        start = time.perf_counter()
+        try:
+            runtime = self.runtime_for_node(node)
+            outputs = runtime(inputs)
+        except Exception:  # pylint: disable=broad-except
+            log.error("Error executing %r", node.title, exc_info=True)
+            message = traceback.format_exc()
+            self.__errors[node] = message
+            node.set_state_message(UserMessage(
+                message, UserMessage.Error, self.ErrorMessageId
+            ))
+            self.nodeFailed.emit(node, message)
+            return False
+        elapsed = time.perf_counter() - start
+        outputs = dict(outputs or {})
+        self.__outputs.setdefault(node, {}).update(outputs)
+        for name, value in outputs.items():
+            self.send(node, node.output_channel(name), value)
+        self.nodeExecuted.emit(node, elapsed)
+        return True
+
+    def outputs(self, node):
+        # type: (SchemeNode) -> Dict[str, Any]
+        """
+        Return the last outputs sent by the `node`'s runtime.
+        """
+        return dict(self.__outputs.get(node, {}))
+
+    def errors(self):
+        # type: () -> Dict[SchemeNode, str]
+        """
+        Return the errors (formatted tracebacks) of the nodes whose runtime
+        failed on its last execution.
+        """
+        return dict(self.__errors)
+
+    def run(self, timeout=None):
+        # type: (Optional[float]) -> bool
+        """
+        Execute the workflow until there are no more pending signals.
+
+        First all nodes without input links are executed and then the
+        signals are processed until the workflow is quiescent. Return
+        `False` if `timeout` (in seconds) elapsed first. The timeout is only
+        checked between node executions.
+        """
+        workflow = self.workflow()
+        if workflow is None:
+            raise RuntimeError("'run' called with no workflow!")
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def expired():
+            return deadline is not None and time.monotonic() >= deadline
+
+        for node in workflow.nodes:
+            if not workflow.find_links(sink_node=node):
+                if expired():
+                    return False
+                self.execute(node)
+        while self.pending_nodes():
+            if expired():
+                return False
+            if not self.process_next():
+                # Remaining pending nodes are not ready (blocked).
+                log.warning("Nodes %s are pending but not ready",
+                            [n.title for n in self.pending_nodes()])
+                break
+        return True
+
+
+def load_workflow(filename, registry=None):
+    # type: (str, Optional[WidgetRegistry]) -> Scheme
+    """
+    Load and return a workflow from an .ows `filename`.
+    """
+    workflow = Scheme()
+    with open(filename, "rb") as f:
+        readwrite.scheme_load(workflow, f, registry=registry)
+    return workflow
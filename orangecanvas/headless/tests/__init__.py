@@ -0,0 +1,47 @@
+"""
+Toy node runtimes for the arithmetic nodes of
+:func:`orangecanvas.registry.tests.small_testing_registry`.
+"""
+import operator
+
+from ..engine import NodeRuntimeRegistry
+
+
+def constant(default):
+    def factory(node):
+        def run(inputs):
+            return {"value": node.properties.get("value", default)}
+        return run
+    return factory
+
+
+def binary(op):
+    def factory(node):
+        def run(inputs):
+            left, right = inputs["left"], inputs["right"]
+            if left is None or right is None:
+                return {"result": None}
+            return {"result": op(left, right)}
+        return run
+    return factory
+
+
+def negate(node):
+    def run(inputs):
+        value = inputs["value"]
+        return {"result": None if value is None else -value}
+    return run
+
+
+def arithmetic_runtimes():
+    # type: () -> NodeRuntimeRegistry
+    """Return the node runtimes for the arithmetic testing nodes."""
+    return NodeRuntimeRegistry({
+        "zero": constant(0),
+        "one": constant(1),
+        "add": binary(operator.add),
+        "sub": binary(operator.sub),
+        "mult": binary(operator.mul),
+        "div": binary(operator.floordiv),
+        "negate": negate,
+    })
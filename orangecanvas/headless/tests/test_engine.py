@@ -0,0 +1,129 @@
+import os
+import tempfile
+
+from orangecanvas.gui.test import QCoreAppTestCase
+from orangecanvas.registry.tests import small_testing_registry
+from orangecanvas.scheme import Scheme, SchemeNode
+from orangecanvas.scheme.node import UserMessage
+from ..engine import NodeRuntimeRegistry, HeadlessSignalManager, load_workflow
+from . import arithmetic_runtimes
+
+
+def arithmetic_workflow(registry):
+    # (a + b) * b, -(a + b) where a = 1, b = 3
+    workflow = Scheme()
+    a = workflow.new_node(registry.widget("one"), title="a")
+    b = workflow.new_node(registry.widget("one"), title="b",
+                          properties={"value": 3})
+    add = workflow.new_node(registry.widget("add"), title="add")
+    mult = workflow.new_node(registry.widget("mult"), title="mult")
+    neg = workflow.new_node(registry.widget("negate"), title="neg")
+    workflow.new_link(a, "value", add, "left")
+    workflow.new_link(b, "value", add, "right")
+    workflow.new_link(add, "result", mult, "left")
+    workflow.new_link(b, "value", mult, "right")
+    workflow.new_link(add, "result", neg, "value")
+    return workflow
+
+
+class TestNodeRuntimeRegistry(QCoreAppTestCase):
+    def test_registry(self):
+        runtimes = NodeRuntimeRegistry()
+
+        @runtimes.register("one")
+        def one(node):
+            return lambda inputs: {"value": 1}
+
+        self.assertIn("one", runtimes)
+        self.assertNotIn("zero", runtimes)
+        self.assertIs(runtimes.factory("one"), one)
+        with self.assertRaises(KeyError):
+            runtimes.factory("zero")
+        node = SchemeNode(small_testing_registry().widget("one"))
+        self.assertEqual(runtimes.create(node)({}), {"value": 1})
+
+
+class TestHeadlessSignalManager(QCoreAppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.reg = small_testing_registry()
+        self.workflow = arithmetic_workflow(self.reg)
+        self.manager = HeadlessSignalManager(arithmetic_runtimes())
+        self.manager.set_workflow(self.workflow)
+
+    def tearDown(self):
+        self.manager.set_workflow(None)
+        del self.manager
+        del self.workflow
+        super().tearDown()
+
+    def test_run(self):
+        manager = self.manager
+        a, b, add, mult, neg = self.workflow.nodes
+        executed = []
+        manager.nodeExecuted.connect(lambda node, _: executed.append(node))
+        self.assertTrue(manager.run())
+        self.assertEqual(manager.outputs(add), {"result": 4})
+        self.assertEqual(manager.outputs(mult), {"result": 12})
+        self.assertEqual(manager.outputs(neg), {"result": -4})
+        self.assertEqual(manager.errors(), {})
+        self.assertFalse(manager.has_pending())
+        # every node is executed once (a and b are sources)
+        self.assertEqual(executed[:2], [a, b])
+        self.assertCountEqual(executed, [a, b, add, mult, neg])
+
+        # Changed source is propagated
+        b.properties = {"value": -1}
+        manager.execute(b)
+        self.assertTrue(manager.run())
+        self.assertEqual(manager.outputs(mult), {"result": 0})
+        self.assertEqual(manager.outputs(neg), {"result": 0})
+
+    def test_error(self):
+        workflow = self.workflow
+        a, b, add, _, _ = workflow.nodes
+        zero = workflow.new_node(self.reg.widget("zero"), title="zero")
+        div = workflow.new_node(self.reg.widget("div"), title="div")
+        workflow.new_link(add, "result", div, "left")
+        workflow.new_link(zero, "value", div, "right")
+        failed = []
+        self.manager.nodeFailed.connect(
+            lambda node, message: failed.append(node))
+        self.assertTrue(self.manager.run())
+        self.assertEqual(failed, [div])
+        errors = self.manager.errors()
+        self.assertEqual(list(errors), [div])
+        self.assertIn("ZeroDivisionError", errors[div])
+        self.assertEqual(self.manager.outputs(div), {})
+        messages = div.state_messages()
+        self.assertTrue(any(m.severity == UserMessage.Error
+                            for m in messages))
+        # The error is cleared on successful execution
+        zero.properties = {"value": 2}
+        self.manager.execute(zero)
+        self.assertTrue(self.manager.run())
+        self.assertEqual(self.manager.errors(), {})
+        self.assertEqual(self.manager.outputs(div), {"result": 2})
+
+    def test_missing_runtime(self):
+        manager = HeadlessSignalManager(NodeRuntimeRegistry())
+        manager.set_workflow(self.workflow)
+        self.assertTrue(manager.run())
+        self.assertEqual(len(manager.errors()), 2)
+        manager.set_workflow(None)
+
+    def test_timeout(self):
+        self.assertFalse(self.manager.run(timeout=0))
+        self.assertFalse(self.manager.errors())
+        self.assertTrue(self.manager.run())
+
+    def test_load_workflow(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "arithmetic.ows")
+            with open(filename, "wb") as f:
+                self.workflow.save_to(f)
+            workflow = load_workflow(filename, self.reg)
+        self.assertEqual([n.title for n in workflow.nodes],
+                         ["a", "b", "add", "mult", "neg"])
+        self.assertEqual(len(workflow.links), 5)
+        self.assertEqual(workflow.nodes[1].properties, {"value": 3})
@@ -0,0 +1,104 @@
+import io
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+import orangecanvas
+from orangecanvas.gui.test import QCoreAppTestCase
+from orangecanvas.registry.tests import small_testing_registry
+from ..__main__ import main, parse_assignment
+from .test_engine import arithmetic_workflow
+
+RUNTIMES = "orangecanvas.headless.tests:arithmetic_runtimes"
+REGISTRY = "orangecanvas.registry.tests:small_testing_registry"
+
+
+class TestMain(QCoreAppTestCase):
+    def setUp(self):
+        super().setUp()
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self._tmpdir.name, "arithmetic.ows")
+        workflow = arithmetic_workflow(small_testing_registry())
+        with open(self.filename, "wb") as f:
+            workflow.save_to(f)
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+        super().tearDown()
+
+    def run_main(self, *args):
+        stdout = io.StringIO()
+        status = main(["headless", "run", self.filename,
+                       "--registry", REGISTRY] + list(args), stdout=stdout)
+        return status, [json.loads(line)
+                        for line in stdout.getvalue().splitlines()]
+
+    def test_parse_assignment(self):
+        self.assertEqual(parse_assignment("a.value=3"), ("a", "value", 3))
+        self.assertEqual(parse_assignment("a.b.c=[1, 'x']"),
+                         ("a.b", "c", [1, "x"]))
+        self.assertEqual(parse_assignment("a.c=x=y"), ("a", "c", "x=y"))
+        with self.assertRaises(ValueError):
+            parse_assignment("a=1")
+
+    def test_run(self):
+        status, events = self.run_main("--runtimes", RUNTIMES,
+                                       "--set", "a.value=2")
+        self.assertEqual(status, 0)
+        self.assertEqual(events[0]["event"], "start")
+        self.assertEqual(events[0]["nodes"], 5)
+        self.assertEqual(events[-1]["event"], "finish")
+        self.assertEqual(events[-1]["status"], "ok")
+        nodes = {e["node"]: e for e in events if e["event"] == "node"}
+        self.assertEqual(nodes["mult"]["outputs"], {"result": 15})
+        self.assertEqual(nodes["neg"]["outputs"], {"result": -5})
+        self.assertEqual(nodes["mult"]["index"], 3)
+        # by node index
+        _, events = self.run_main("--runtimes", RUNTIMES, "--set", "0.value=0")
+        nodes = {e["node"]: e for e in events if e["event"] == "node"}
+        self.assertEqual(nodes["mult"]["outputs"], {"result": 9})
+
+    def test_errors(self):
+        # node error
+        status, events = self.run_main("--runtimes", RUNTIMES,
+                                       "--set", "b.value='x'")
+        self.assertEqual(status, 1)
+        self.assertEqual(events[-1]["status"], "error")
+        self.assertEqual(events[-1]["errors"], 1)
+        errors = [e for e in events if e.get("status") == "error"
+                  and e["event"] == "node"]
+        self.assertEqual(errors[0]["node"], "add")
+        self.assertIn("TypeError", errors[0]["error"])
+        # invalid arguments
+        status, events = self.run_main("--runtimes", RUNTIMES,
+                                       "--set", "c.value=1")
+        self.assertEqual(status, 2)
+        self.assertEqual(len(events), 1)
+        self.assertIn("No node 'c'", events[0]["error"])
+        # missing runtimes
+        status, events = self.run_main(
+            "--runtimes", "orangecanvas.headless:NodeRuntimeRegistry")
+        self.assertEqual(status, 2)
+        self.assertIn("No runtime for add", events[0]["error"])
+        # timeout
+        status, events = self.run_main("--runtimes", RUNTIMES,
+                                       "--timeout", "0")
+        self.assertEqual(status, 3)
+        self.assertEqual(events[-1]["status"], "timeout")
+
+    def test_module(self):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [os.path.dirname(os.path.dirname(orangecanvas.__file__))] +
+            ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+        )
+        res = subprocess.run(
+            [sys.executable, "-m", "orangecanvas.headless", "run",
+             self.filename, "--registry", REGISTRY, "--runtimes", RUNTIMES],
+            env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+        self.assertEqual(res.returncode, 0, res.stderr)
+        events = [json.loads(line) for line in res.stdout.splitlines()]
+        self.assertEqual(events[-1]["status"], "ok")
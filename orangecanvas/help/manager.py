@@ -7,15 +7,19 @@ import itertools
 import logging
 import urllib.parse
 import warnings
+from collections import deque
 from sysconfig import get_path
 
 import typing
 from typing import Dict, Optional, List, Tuple, Union, Callable, Sequence
 
 
-from AnyQt.QtCore import QObject, QUrl, QDir
+from AnyQt.QtCore import QObject, QUrl, QDir, QTimer
 
-from ..utils.pkgmeta import get_dist_url, get_distribution, develop_root
+from ..utils import unique
+from ..utils.pkgmeta import (
+    get_dist_url, get_distribution, develop_root, entry_points
+)
 from . import provider
 
 if typing.TYPE_CHECKING:
@@ -30,6 +34,9 @@ class HelpManager(QObject):
         super().__init__(parent, **kwargs)
         self._registry = None  # type: Optional[WidgetRegistry]
         self._providers = {}  # type: Dict[str, provider.HelpProvider]
+        self.__prefetch_queue = deque()  # type: deque[str]
+        self.__prefetch_timer = QTimer(self, singleShot=True, interval=0)
+        self.__prefetch_timer.timeout.connect(self.__prefetch_next)
 
     def set_registry(self, registry):
         # type: (Optional[WidgetRegistry]) -> None
@@ -74,6 +81,34 @@ class HelpManager(QObject):
             self._providers[project] = provider
         return provider
 
+    def prefetch(self) -> None:
+        """
+        Create help providers (and thereby start fetching their
+        inventories) for all installed distributions defining help entry
+        points.
+
+        The providers are created one per event loop iteration so as not
+        to block the event loop.
+        """
+        eps = itertools.chain(
+            entry_points(group="orange.canvas.help"),
+            entry_points(group="orangecanvas.help"),
+        )
+        projects = unique(ep.dist.name for ep in eps if ep.dist is not None)
+        self.__prefetch_queue.extend(
+            p for p in projects if p not in self._providers
+        )
+        if self.__prefetch_queue:
+            self.__prefetch_timer.start()
+
+    def __prefetch_next(self) -> None:
+        if self.__prefetch_queue:
+            project = self.__prefetch_queue.popleft()
+            if project not in self._providers:
+                self.get_provider(project)
+        if self.__prefetch_queue:
+            self.__prefetch_timer.start()
+
     def get_help(self, url):
         # type: (QUrl) -> QUrl
         """
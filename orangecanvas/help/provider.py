@@ -8,6 +8,9 @@ import logging
 import io
 import codecs
 import asyncio
+import json
+import time
+import sqlite3
 from urllib.parse import urljoin
 from html import parser
 from xml.etree.ElementTree import TreeBuilder, Element
@@ -31,6 +34,175 @@ if TYPE_CHECKING:
 log = logging.getLogger(__name__)
 
 
+class InventoryCache:
+    """
+    A persistent store of parsed help inventories.
+
+    Each inventory is stored as a flat `key -> url` mapping under a `key`
+    (the inventory url plus any parser parameters) together with a
+    `validator` string (the source's ETag/Last-Modified header or the
+    local file's mtime/size). An entry is only returned if the validator
+    still matches, so a changed inventory is re-parsed.
+
+    The cache is bounded; entries not used for `max_age` seconds are
+    removed and at most `max_entries` most recently used entries are kept.
+
+    Parameters
+    ----------
+    path: str
+        The sqlite database file path. Use ':memory:' for a
+        non-persistent cache.
+    max_entries: int
+        The maximum number of stored inventories.
+    max_age: float
+        The maximum time (in seconds) since an entry was last used.
+    """
+    _INSTANCE = None  # type: Optional[InventoryCache]
+
+    #: The default maximum number of entries
+    MaxEntries = 200
+    #: The default maximum age of unused entries (30 days)
+    MaxAge = 30 * 24 * 3600.
+
+    def __init__(self, path, max_entries=MaxEntries, max_age=MaxAge):
+        # type: (str, int, float) -> None
+        self.__path = path
+        self.__conn = None  # type: Optional[sqlite3.Connection]
+        self.__max_entries = max_entries
+        self.__max_age = max_age
+
+    @classmethod
+    def instance(cls):
+        # type: () -> InventoryCache
+        """Return the default application wide inventory cache."""
+        if cls._INSTANCE is None:
+            cache_dir = os.path.join(config.cache_dir(), "help")
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+            except OSError:
+                pass
+            cls._INSTANCE = cls(os.path.join(cache_dir, "inventories.sqlite"))
+        return cls._INSTANCE
+
+    def _connection(self):
+        # type: () -> Optional[sqlite3.Connection]
+        if self.__conn is None:
+            try:
+                conn = sqlite3.connect(self.__path)
+                columns = [row[1] for row in
+                           conn.execute("PRAGMA table_info(inventory)")]
+                if columns and "atime" not in columns:
+                    # an older cache format; it is only a cache
+                    conn.execute("DROP TABLE inventory")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS inventory ("
+                    "  key TEXT PRIMARY KEY,"
+                    "  validator TEXT NOT NULL,"
+                    "  items TEXT NOT NULL,"
+                    "  atime REAL NOT NULL"
+                    ")"
+                )
+                conn.commit()
+            except sqlite3.Error:
+                log.exception("Could not open help inventory cache '%s'",
+                              self.__path)
+                return None
+            self.__conn = conn
+        return self.__conn
+
+    def get(self, key, validator):
+        # type: (str, str) -> Optional[Dict[str, str]]
+        """
+        Return the stored items for `key` if stored with `validator`.
+        """
+        conn = self._connection()
+        if conn is None:
+            return None
+        try:
+            with conn:
+                row = conn.execute(
+                    "SELECT items FROM inventory "
+                    "WHERE key = ? AND validator = ?",
+                    (key, validator)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE inventory SET atime = ? WHERE key = ?",
+                        (time.time(), key)
+                    )
+        except sqlite3.Error:
+            log.exception("Error reading help inventory cache")
+            return None
+        if row is None:
+            return None
+        try:
+            items = json.loads(row[0])
+        except ValueError:
+            return None
+        return items if isinstance(items, dict) else None
+
+    def validator(self, key):
+        # type: (str) -> Optional[str]
+        """
+        Return the validator with which the entry for `key` is stored.
+        """
+        conn = self._connection()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT validator FROM inventory WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            log.exception("Error reading help inventory cache")
+            return None
+        return row[0] if row is not None else None
+
+    def put(self, key, validator, items):
+        # type: (str, str, Dict[str, str]) -> None
+        """
+        Store `items` for `key` with `validator`, replacing any previous
+        entry.
+        """
+        conn = self._connection()
+        if conn is None:
+            return
+        now = time.time()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO inventory "
+                    "(key, validator, items, atime) VALUES (?, ?, ?, ?)",
+                    (key, validator,
+                     json.dumps(items, separators=(",", ":")), now)
+                )
+                conn.execute(
+                    "DELETE FROM inventory WHERE atime < ?",
+                    (now - self.__max_age,)
+                )
+                conn.execute(
+                    "DELETE FROM inventory WHERE key NOT IN ("
+                    "  SELECT key FROM inventory"
+                    "  ORDER BY atime DESC LIMIT ?"
+                    ")", (self.__max_entries,)
+                )
+        except sqlite3.Error:
+            log.exception("Error writing help inventory cache")
+
+    def clear(self):
+        # type: () -> None
+        conn = self._connection()
+        if conn is not None:
+            with conn:
+                conn.execute("DELETE FROM inventory")
+
+    def close(self):
+        # type: () -> None
+        if self.__conn is not None:
+            self.__conn.close()
+            self.__conn = None
+
+
 class HelpProvider(QObject):
     _NETMANAGER_REF = None  # type: Optional[ref[QNetworkAccessManager]]
 
@@ -65,7 +237,16 @@ class HelpProvider(QObject):
 
 
 class BaseInventoryProvider(HelpProvider):
-    def __init__(self, inventory, parent=None):
+    """
+    Base class for help providers backed by an inventory file.
+
+    The parsed inventory (a flat `key -> url` mapping) can be persisted
+    in an :class:`InventoryCache` and reused for as long as the source
+    inventory does not change. This is opt-in; subclasses implement
+    :func:`_index` and :func:`_set_index` to enable it.
+    """
+    def __init__(self, inventory, parent=None, cache=None):
+        # type: (QUrl, Optional[QObject], Optional[InventoryCache]) -> None
         super().__init__(parent)
         self.inventory = QUrl(inventory)
 
@@ -73,30 +254,103 @@ class BaseInventoryProvider(HelpProvider):
             self.inventory.setScheme("file")
 
         self._error = None
+        self._cache = cache
+        self._validator = None  # type: Optional[str]
         self._reply_f = Future()  # type: Future[None]
         self._fetch_inventory(self.inventory)
 
+    def _inventory_cache(self):
+        # type: () -> InventoryCache
+        if self._cache is None:
+            self._cache = InventoryCache.instance()
+        return self._cache
+
+    def _cache_key(self):
+        # type: () -> str
+        """Return the key under which the parsed inventory is cached."""
+        return "{}:{}".format(type(self).__name__, self.inventory.toString())
+
+    def _load_cached(self, validator):
+        # type: (Optional[str]) -> bool
+        """
+        Load the parsed inventory from the persistent cache if present and
+        still valid. Return True on success.
+        """
+        if not validator:
+            return False
+        items = self._inventory_cache().get(self._cache_key(), validator)
+        if items is None:
+            return False
+        self._set_index(items)
+        return True
+
+    def _store_cached(self, validator):
+        # type: (Optional[str]) -> None
+        index = self._index()
+        if validator and index is not None:
+            self._inventory_cache().put(self._cache_key(), validator, index)
+
+    def _index(self):
+        # type: () -> Optional[Dict[str, str]]
+        """
+        Return the current parsed `key -> url` index to store in the
+        cache. The default implementation returns `None` (nothing is
+        cached).
+        """
+        return None
+
+    def _set_index(self, index):
+        # type: (Dict[str, str]) -> None
+        """
+        Set the parsed `key -> url` index (restored from the cache). The
+        default implementation does nothing.
+        """
+
     def _fetch_inventory(self, url: QUrl) -> None:
         self._reply_f.set_running_or_notify_cancel()
         if not url.isLocalFile():
-            # fetch and cache the inventory file.
-            self._manager = manager = self._networkAccessManagerInstance()
-            req = QNetworkRequest(url)
-            req.setAttribute(
-                QNetworkRequest.CacheLoadControlAttribute,
-                QNetworkRequest.PreferCache
-            )
-            req.setAttribute(
-                QNetworkRequest.RedirectPolicyAttribute,
-                QNetworkRequest.NoLessSafeRedirectPolicy
-            )
-            req.setMaximumRedirectsAllowed(5)
-            self._reply = manager.get(req)
-            self._reply.finished.connect(self._on_finished)
+            # Revalidate the inventory stored in the cache (if any) with a
+            # conditional request.
+            validator = self._inventory_cache().validator(self._cache_key())
+            self._request(url, validator)
         else:
-            with open(url.toLocalFile(), "rb") as f:
-                self._load_inventory(f)
-                self._reply_f.set_result(None)
+            path = url.toLocalFile()
+            try:
+                st = os.stat(path)
+            except OSError:
+                validator = None
+            else:
+                validator = "{}:{}".format(st.st_mtime_ns, st.st_size)
+            if not self._load_cached(validator):
+                with open(path, "rb") as f:
+                    self._load_inventory(f)
+                self._store_cached(validator)
+            self._reply_f.set_result(None)
+
+    def _request(self, url, validator=None):
+        # type: (QUrl, Optional[str]) -> None
+        # fetch and cache the inventory file.
+        self._manager = manager = self._networkAccessManagerInstance()
+        req = QNetworkRequest(url)
+        req.setAttribute(
+            QNetworkRequest.CacheLoadControlAttribute,
+            QNetworkRequest.PreferCache
+        )
+        req.setAttribute(
+            QNetworkRequest.RedirectPolicyAttribute,
+            QNetworkRequest.NoLessSafeRedirectPolicy
+        )
+        req.setMaximumRedirectsAllowed(5)
+        self._validator = validator
+        if validator is not None:
+            header, _, value = validator.partition(": ")
+            if header == "ETag":
+                req.setRawHeader(b"If-None-Match", value.encode("latin-1"))
+            elif header == "Last-Modified":
+                req.setRawHeader(b"If-Modified-Since",
+                                 value.encode("latin-1"))
+        self._reply = manager.get(req)
+        self._reply.finished.connect(self._on_finished)
 
     @pyqtSlot()
     def _on_finished(self):
@@ -117,9 +371,20 @@ class BaseInventoryProvider(HelpProvider):
             log.error("An error occurred while fetching "
                       "help inventory '{0}'".format(self.inventory))
             self._error = reply.error(), reply.errorString()
+        elif reply.attribute(QNetworkRequest.HttpStatusCodeAttribute) == 304:
+            # Not Modified; the cached inventory is still valid
+            if not self._load_cached(self._validator):
+                # ... but was removed from the cache in the meantime
+                self._reply = None
+                reply.deleteLater()
+                self._request(self.inventory)
+                return
         else:
-            contents = bytes(reply.readAll())
-            self._load_inventory(io.BytesIO(contents))
+            validator = reply_validator(reply)
+            if not self._load_cached(validator):
+                contents = bytes(reply.readAll())
+                self._load_inventory(io.BytesIO(contents))
+                self._store_cached(validator)
         self._reply = None
         self._reply_f.set_result(None)
         reply.deleteLater()
@@ -134,11 +399,36 @@ class BaseInventoryProvider(HelpProvider):
         return self.search(description)
 
 
+def reply_validator(reply):
+    # type: (QNetworkReply) -> Optional[str]
+    """
+    Return a cache validator (ETag or Last-Modified header) for the reply.
+    """
+    for header in (b"ETag", b"Last-Modified"):
+        if reply.hasRawHeader(header):
+            value = bytes(reply.rawHeader(header)).decode("latin-1")
+            if value:
+                return "{}: {}".format(header.decode("ascii"), value)
+    return None
+
+
 class IntersphinxHelpProvider(BaseInventoryProvider):
-    def __init__(self, inventory, target=None, parent=None):
+    def __init__(self, inventory, target=None, parent=None, cache=None):
         self.target = target
+        #: The full parsed inventory (only when not restored from cache)
         self.items = None
-        super().__init__(inventory, parent)
+        #: The 'std:label' -> url index used for lookup
+        self.labels = None  # type: Optional[Dict[str, str]]
+        super().__init__(inventory, parent, cache=cache)
+
+    def _cache_key(self):
+        return "{}#{}".format(super()._cache_key(), self.target)
+
+    def _index(self):
+        return self.labels
+
+    def _set_index(self, index):
+        self.labels = index
 
     def search(self, description):
         if description.help_ref:
@@ -146,13 +436,9 @@ class IntersphinxHelpProvider(BaseInventoryProvider):
         else:
             ref = description.name
 
-        if self.items is None:
-            labels = {}
-        else:
-            labels = self.items.get("std:label", {})
-        entry = labels.get(ref.lower(), None)
-        if entry is not None:
-            _, _, url, _ = entry
+        labels = self.labels if self.labels is not None else {}
+        url = labels.get(ref.lower(), None)
+        if url is not None:
             return QUrl(url)
         else:
             raise KeyError(ref)
@@ -176,6 +462,11 @@ class IntersphinxHelpProvider(BaseInventoryProvider):
             items = None
 
         self.items = items
+        if items is not None:
+            self.labels = {name: entry[2] for name, entry
+                           in items.get("std:label", {}).items()}
+        else:
+            self.labels = None
 
 
 class SimpleHelpProvider(HelpProvider):
@@ -234,12 +525,21 @@ class HtmlIndexProvider(BaseInventoryProvider):
         def handle_data(self, data):
             self.builder.data(data)
 
-    def __init__(self, inventory, parent=None, xpathquery=None):
+    def __init__(self, inventory, parent=None, xpathquery=None, cache=None):
         self.root = None
         self.items = {}  # type: Dict[str, str]
         self.xpathquery = xpathquery  # type: Optional[str]
 
-        super().__init__(inventory, parent)
+        super().__init__(inventory, parent, cache=cache)
+
+    def _cache_key(self):
+        return "{}#{}".format(super()._cache_key(), self.xpathquery or "")
+
+    def _index(self):
+        return self.items or None
+
+    def _set_index(self, index):
+        self.items = index
 
     def _load_inventory(self, stream):
         # type: (IO[bytes]) -> None
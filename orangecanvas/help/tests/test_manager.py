@@ -2,6 +2,8 @@ import os.path
 from unittest.mock import patch
 from types import SimpleNamespace as ns
 
+from AnyQt.QtTest import QTest
+
 from orangecanvas.gui.test import QCoreAppTestCase
 from orangecanvas.help import HelpManager
 from orangecanvas.help.provider import HtmlIndexProvider
@@ -55,3 +57,24 @@ class TestHelpManager(QCoreAppTestCase):
         with patch("orangecanvas.help.manager.get_distribution", lambda *_: dist):
             provider = manager.get_provider("foobar")
             self.assertIsInstance(provider, HtmlIndexProvider)
+
+    def test_prefetch(self):
+        manager = HelpManager()
+        ep = pkgmeta.EntryPoint("html-index", f"{__name__}:HELP_PATHS",
+                                "orange.canvas.help")
+        eps = ns(select=lambda *_, **__: [ep])
+        dist = FakeDistribution("foo", "0.0", eps)
+        vars(ep).update(dist=dist)
+
+        def entry_points(group):
+            return [ep] if group == "orange.canvas.help" else []
+
+        with patch("orangecanvas.help.manager.entry_points", entry_points), \
+             patch("orangecanvas.help.manager.get_distribution",
+                   lambda *_: dist), \
+             patch("orangecanvas.help.manager"
+                   ".get_help_provider_for_distribution") as m:
+            manager.prefetch()
+            m.assert_not_called()
+            QTest.qWait(0)
+            m.assert_called_once_with(dist)
@@ -1,13 +1,22 @@
 import base64
 import codecs
+import os
+import tempfile
+import zlib
 
 import unittest
+from unittest.mock import patch
 
-from AnyQt.QtCore import QUrl
+from AnyQt.QtCore import QObject, QUrl, pyqtSignal
+from AnyQt.QtNetwork import QNetworkReply, QNetworkRequest
 
 from orangecanvas.gui.test import QCoreAppTestCase
 
-from orangecanvas.help.provider import sniff_html_charset, HtmlIndexProvider
+from orangecanvas.help import provider
+from orangecanvas.help.provider import (
+    sniff_html_charset, HtmlIndexProvider, IntersphinxHelpProvider,
+    InventoryCache
+)
 from orangecanvas.registry import WidgetDescription
 from orangecanvas.utils.asyncutils import get_event_loop
 from orangecanvas.utils.shtools import temp_named_file
@@ -83,9 +92,201 @@ class TestHtmlIndexProvider(QCoreAppTestCase):
         for tag in (b"section", b"div"):
             with temp_named_file((contents % tag).decode("ascii"),) as fname:
                 url = QUrl.fromLocalFile(fname)
-                p = HtmlIndexProvider(url)
+                cache = InventoryCache(":memory:")
+                p = HtmlIndexProvider(url, cache=cache)
                 loop = get_event_loop()
                 desc = WidgetDescription(name="aa", id="aa", qualified_name="aa")
                 res = loop.run_until_complete(p.search_async(desc))
                 self.assertEqual(res, url.resolved(QUrl("a.html")))
                 self.assertEqual(p.items, {"aa": "a.html"})
+                with patch.object(HtmlIndexProvider, "_parse") as m:
+                    p = HtmlIndexProvider(url, cache=cache)
+                    m.assert_not_called()
+                self.assertEqual(p.items, {"aa": "a.html"})
+                self.assertEqual(p.search(desc), res)
+
+
+class TestInventoryCache(unittest.TestCase):
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "inv.sqlite")
+            cache = InventoryCache(path)
+            self.assertIsNone(cache.get("a", "1"))
+            cache.put("a", "1", {"x": "x.html"})
+            self.assertEqual(cache.get("a", "1"), {"x": "x.html"})
+            self.assertIsNone(cache.get("a", "2"))
+            cache.close()
+            cache = InventoryCache(path)
+            self.assertEqual(cache.get("a", "1"), {"x": "x.html"})
+            cache.put("a", "2", {"y": "y.html"})
+            self.assertIsNone(cache.get("a", "1"))
+            self.assertEqual(cache.get("a", "2"), {"y": "y.html"})
+            cache.clear()
+            self.assertIsNone(cache.get("a", "2"))
+            cache.close()
+
+    def test_bounded(self):
+        cache = InventoryCache(":memory:", max_entries=2, max_age=100)
+        with patch.object(provider.time, "time") as time:
+            time.return_value = 0
+            cache.put("a", "1", {})
+            time.return_value = 1
+            cache.put("b", "1", {})
+            time.return_value = 2
+            self.assertEqual(cache.get("a", "1"), {})
+            # least recently used entry is removed
+            time.return_value = 3
+            cache.put("c", "1", {})
+            self.assertEqual(cache.get("a", "1"), {})
+            self.assertIsNone(cache.get("b", "1"))
+            self.assertEqual(cache.get("c", "1"), {})
+            # entries unused for max_age are removed
+            time.return_value = 104
+            cache.put("d", "1", {})
+            self.assertIsNone(cache.get("a", "1"))
+            self.assertIsNone(cache.get("c", "1"))
+            self.assertEqual(cache.get("d", "1"), {})
+        cache.close()
+
+
+def intersphinx_inventory(entries):
+    header = (
+        b"# Sphinx inventory version 2\n"
+        b"# Project: Foo\n"
+        b"# Version: 1.0\n"
+        b"# The remainder of this file is compressed using zlib.\n"
+    )
+    body = "".join(
+        "{} std:label -1 {} {}\n".format(name, location, name.upper())
+        for name, location in entries
+    )
+    return header + zlib.compress(body.encode("utf-8"))
+
+
+class TestIntersphinxHelpProvider(QCoreAppTestCase):
+    def test_cached(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            fname = os.path.join(tmp, "objects.inv")
+            with open(fname, "wb") as f:
+                f.write(intersphinx_inventory([
+                    ("aa", "widgets/aa.html#$"), ("bb", "widgets/bb.html")
+                ]))
+            cache = InventoryCache(":memory:")
+            url = QUrl.fromLocalFile(fname)
+            tmp = tmp + "/"
+            p = IntersphinxHelpProvider(url, target=tmp, cache=cache)
+            target = QUrl.fromLocalFile(tmp).toString()
+            desc = WidgetDescription(name="AA", id="aa", qualified_name="aa")
+            res = p.search(desc)
+            self.assertEqual(res, QUrl(target + "widgets/aa.html#aa"))
+            with self.assertRaises(KeyError):
+                p.search(WidgetDescription(name="cc", id="c",
+                                           qualified_name="c"))
+
+            # A new provider for the same (unchanged) inventory is restored
+            # from the cache without parsing.
+            with patch.object(provider, "read_inventory_v2") as m:
+                p = IntersphinxHelpProvider(url, target=tmp, cache=cache)
+                m.assert_not_called()
+            self.assertEqual(p.search(desc), res)
+            desc = WidgetDescription(name="BB", id="bb", qualified_name="bb")
+            self.assertEqual(p.search(desc),
+                             QUrl(target + "widgets/bb.html"))
+
+            # Changed inventory is re-parsed.
+            with open(fname, "wb") as f:
+                f.write(intersphinx_inventory([("bb", "b.html")]))
+            st = os.stat(fname)
+            os.utime(fname, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+            p = IntersphinxHelpProvider(url, target=tmp, cache=cache)
+            self.assertEqual(p.search(desc), QUrl(target + "b.html"))
+
+
+class FakeReply(QObject):
+    finished = pyqtSignal()
+
+    def __init__(self, request, status, headers, contents=b"", **kwargs):
+        super().__init__(**kwargs)
+        self.request = request
+        self.__status = status
+        self.__headers = headers
+        self.__contents = contents
+
+    def isFinished(self):
+        return True
+
+    def error(self):
+        return QNetworkReply.NoError
+
+    def url(self):
+        return self.request.url()
+
+    def attribute(self, attr):
+        if attr == QNetworkRequest.HttpStatusCodeAttribute:
+            return self.__status
+        return None
+
+    def hasRawHeader(self, name):
+        return bytes(name) in self.__headers
+
+    def rawHeader(self, name):
+        return self.__headers.get(bytes(name), b"")
+
+    def rawHeaderPairs(self):
+        return list(self.__headers.items())
+
+    def readAll(self):
+        return self.__contents
+
+
+class FakeManager:
+    def __init__(self, contents, etag):
+        self.contents = contents
+        self.etag = etag
+        self.requests = []
+
+    def get(self, request):
+        self.requests.append(request)
+        headers = {b"ETag": self.etag}
+        if bytes(request.rawHeader(b"If-None-Match")) == self.etag:
+            return FakeReply(request, 304, headers)
+        return FakeReply(request, 200, headers, self.contents)
+
+
+class TestConditionalRequest(QCoreAppTestCase):
+    def test_not_modified(self):
+        cache = InventoryCache(":memory:")
+        manager = FakeManager(
+            intersphinx_inventory([("aa", "aa.html")]), b'"1"'
+        )
+        url = QUrl("http://example.com/objects.inv")
+        target = "http://example.com/"
+        desc = WidgetDescription(name="AA", id="aa", qualified_name="aa")
+        with patch.object(IntersphinxHelpProvider,
+                          "_networkAccessManagerInstance",
+                          return_value=manager):
+            p = IntersphinxHelpProvider(url, target=target, cache=cache)
+            p._reply.finished.emit()
+            self.assertEqual(p.search(desc),
+                             QUrl("http://example.com/aa.html"))
+            self.assertFalse(manager.requests[0].hasRawHeader(b"If-None-Match"))
+            # The stored ETag is revalidated; on 304 the cached index is used
+            with patch.object(provider, "read_inventory_v2") as m:
+                p = IntersphinxHelpProvider(url, target=target, cache=cache)
+                p._reply.finished.emit()
+                m.assert_not_called()
+            self.assertEqual(
+                bytes(manager.requests[1].rawHeader(b"If-None-Match")), b'"1"'
+            )
+            self.assertEqual(p.search(desc),
+                             QUrl("http://example.com/aa.html"))
+            # A 304 for an entry removed from the cache is re-requested
+            with patch.object(cache, "get", return_value=None):
+                p = IntersphinxHelpProvider(url, target=target, cache=cache)
+                p._reply.finished.emit()
+                self.assertEqual(len(manager.requests), 4)
+                self.assertFalse(
+                    manager.requests[3].hasRawHeader(b"If-None-Match"))
+                p._reply.finished.emit()
+            self.assertEqual(p.search(desc),
+                             QUrl("http://example.com/aa.html"))
@@ -31,6 +31,10 @@ PathRole = Qt.UserRole + 2
 # Items preview SVG contents string
 ThumbnailSVGRole = Qt.UserRole + 3
 
+# Items contents are up to date and need not be rescanned
+# (see `PreviewModel.delayedScanUpdate`)
+UpToDateRole = Qt.UserRole + 4
+
 
 UNKNOWN_SVG = \
 """<?xml version="1.0" encoding="UTF-8" standalone="no"?>
@@ -56,6 +60,8 @@ class PreviewModel(QStandardItemModel):
 
     def delayedScanUpdate(self, delay=10):
         """Run a delayed preview item scan update.
+
+        Items marked as up to date (`UpToDateRole`) are skipped.
         """
         self.__preview_index = -1
         self.__timer.start(delay)
@@ -74,6 +80,8 @@ class PreviewModel(QStandardItemModel):
 
         assert 0 <= index < self.rowCount()
         item = self.item(index)
+        if item.data(UpToDateRole):
+            return
         if os.path.isfile(item.path()):
             try:
                 scanner.scan_update(item)
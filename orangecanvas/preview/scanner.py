@@ -141,6 +141,8 @@ def scheme_svg_thumbnail(scheme_file):
     tmp_scene.set_channel_names_visible(False)
     tmp_scene.set_registry(global_registry())
     tmp_scene.set_node_animation_enabled(False)
+    # The svg is grabbed immediately; do not wait for the rich text render.
+    tmp_scene.set_async_annotation_render_enabled(False)
     tmp_scene.set_scheme(scheme)
 
     # Force the anchor point layout.
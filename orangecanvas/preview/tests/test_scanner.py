@@ -1,7 +1,11 @@
-import unittest
+import os
 import io
+import tempfile
+import unittest
 
-from ..scanner import preview_parse, filter_properties
+from ...gui.test import QAppTestCase
+from ...scheme import Scheme, SchemeTextAnnotation
+from ..scanner import preview_parse, filter_properties, scheme_svg_thumbnail
 
 test_ows = b"""\
 <?xml version="1.0" encoding="utf-8"?>
@@ -38,3 +42,21 @@ class TestPreviewParse(unittest.TestCase):
         assert a == "Football"
         assert b == "On this sunday"
         assert c == ""
+
+
+class TestSchemeSvgThumbnail(QAppTestCase):
+    def test_markdown_annotation(self):
+        workflow = Scheme()
+        workflow.add_annotation(SchemeTextAnnotation(
+            (0, 0, 300, 200), "# Heading\n\nSome **bold** text",
+            content_type="text/markdown"
+        ))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "markdown.ows")
+            workflow.save_to(filename)
+            svg = scheme_svg_thumbnail(filename)
+        # the rich text is rendered, not the markdown source
+        self.assertIn("Heading", svg)
+        self.assertIn("bold", svg)
+        self.assertNotIn("**", svg)
+        self.assertNotIn("# Heading", svg)
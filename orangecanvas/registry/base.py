@@ -11,7 +11,7 @@ import bisect
 from operator import attrgetter
 
 import typing
-from typing import Optional, List, Tuple, Dict, Union
+from typing import Optional, List, Tuple, Dict, Union, Iterable
 
 from . description import CategoryDescription, WidgetDescription
 from . import description
@@ -174,6 +174,43 @@ class WidgetRegistry(object):
 
         self._insert_widget(cat_desc, desc)
 
+    def register_widgets(self, descs):
+        # type: (Iterable[WidgetDescription]) -> None
+        """
+        Register multiple :class:`WidgetDescription` instances.
+
+        This is equivalent to calling :func:`register_widget` for every
+        description, but each category's widgets are sorted only once
+        (instead of a sorted insertion of every description).
+        """
+        descs = list(descs)
+        qualified_names = set()
+        for desc in descs:
+            if not isinstance(desc, description.WidgetDescription):
+                raise TypeError("Expected a 'WidgetDescription' got %r." \
+                                % type(desc).__name__)
+            if self.has_widget(desc.qualified_name) or \
+                    desc.qualified_name in qualified_names:
+                raise ValueError("%r already exists in the registry." \
+                                 % desc.qualified_name)
+            qualified_names.add(desc.qualified_name)
+
+        by_category = {}  # type: Dict[str, List[WidgetDescription]]
+        for desc in descs:
+            category = desc.category
+            if category is None:
+                category = "Unspecified"
+            by_category.setdefault(category, []).append(desc)
+
+        for category, cat_descs in by_category.items():
+            if self.has_category(category):
+                cat_desc = self.category(category)
+            else:
+                log.warning("Creating a default category %r.", category)
+                cat_desc = description.CategoryDescription(name=category)
+                self.register_category(cat_desc)
+            self._insert_widgets(cat_desc, cat_descs)
+
     def register_category(self, desc):
         # type: (CategoryDescription) -> None
         """
@@ -219,8 +256,22 @@ class WidgetRegistry(object):
         assert isinstance(category, description.CategoryDescription)
         _, widgets = self._categories_dict[category.name]
 
-        priority = desc.priority
-        priorities = [w.priority for w in widgets]
-        insertion_i = bisect.bisect_right(priorities, priority)
+        insertion_i = bisect.bisect_right(
+            widgets, desc.priority, key=attrgetter("priority"))
         widgets.insert(insertion_i, desc)
         self._widgets_dict[desc.qualified_name] = desc
+
+    def _insert_widgets(self, category, descs):
+        # type: (CategoryDescription, List[WidgetDescription]) -> None
+        """
+        Insert widget descriptions `descs` into `category`.
+
+        The result is the same as inserting them one by one with
+        :func:`_insert_widget`.
+        """
+        assert isinstance(category, description.CategoryDescription)
+        _, widgets = self._categories_dict[category.name]
+        widgets.extend(descs)
+        # Stable sort keeps the insertion order of equal priority widgets
+        widgets.sort(key=attrgetter("priority"))
+        self._widgets_dict.update((d.qualified_name, d) for d in descs)
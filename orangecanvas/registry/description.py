@@ -337,6 +337,12 @@ class WidgetDescription(object):
         A list of ids this widget replaces (optional).
     short_name: str, optional
         Short name for display where text would otherwise elide.
+    resource_weight: int, optional
+        The number of execution slots (cores) a node of this widget is
+        expected to occupy while it is active (executing a task). The
+        signal manager admits new active nodes only while the sum of their
+        weights fits in its `max_active` capacity. Use 0 for widgets that
+        do not run any significant background work.
     """
     name = ""  # type: str
     id = ""    # type: str
@@ -353,6 +359,8 @@ class WidgetDescription(object):
     replaces = []  # type: Sequence[str]
     keywords = []  # type: Sequence[str]
 
+    resource_weight = 1  # type: int
+
     def __init__(self, name, id, category=None, version=None,
                  description=None, long_description=None,
                  qualified_name=None, package=None, project_name=None,
@@ -362,7 +370,7 @@ class WidgetDescription(object):
                  help=None, help_ref=None, url=None, keywords=None,
                  priority=sys.maxsize,
                  icon=None, background=None,
-                 replaces=None, short_name=None,
+                 replaces=None, short_name=None, resource_weight=1,
                  ):
         if inputs is None:
             inputs = []
@@ -376,6 +384,8 @@ class WidgetDescription(object):
         if not qualified_name:
             # TODO: Should also check that the name is real.
             raise ValueError("'qualified_name' must be supplied.")
+        if resource_weight < 0:
+            raise ValueError("'resource_weight' must be non-negative.")
 
         self.name = name
         self.id = id
@@ -416,6 +426,7 @@ class WidgetDescription(object):
         self.icon = icon
         self.background = background
         self.replaces = list(replaces)
+        self.resource_weight = resource_weight
 
     def __str__(self):
         return ("WidgetDescription(name=%(name)r, id=%(id)r), "
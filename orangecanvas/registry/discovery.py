@@ -14,7 +14,7 @@ import logging
 import types
 import pkgutil
 from collections import namedtuple
-from typing import Union
+from typing import Union, List
 
 from .description import (
     WidgetDescription, CategoryDescription,
@@ -80,6 +80,14 @@ class WidgetDiscovery(object):
         @abc.abstractmethod
         def handle_widget(self, widget: WidgetDescription): pass
 
+        def handle_widgets(self, widgets: List[WidgetDescription]) -> None:
+            """
+            Handle multiple widgets (of one category). The default
+            implementation calls `handle_widget` for each.
+            """
+            for widget in widgets:
+                self.handle_widget(widget)
+
     class RegistryHandler(Handler):
         def __init__(self, registry: WidgetRegistry, **kwargs):
             super().__init__(**kwargs)
@@ -91,6 +99,15 @@ class WidgetDiscovery(object):
         def handle_widget(self, desc: WidgetDescription) -> None:
             self.registry.register_widget(desc)
 
+        def handle_widgets(self, descs: List[WidgetDescription]) -> None:
+            try:
+                self.registry.register_widgets(descs)
+            except (TypeError, ValueError):
+                # Nothing was registered; register the valid descriptions
+                # up to the invalid one (and raise) as `handle_widget` would.
+                for desc in descs:
+                    self.registry.register_widget(desc)
+
     def __init__(
             self,
             registry: Union[WidgetRegistry, Handler, None] = None,
@@ -120,7 +137,7 @@ class WidgetDiscovery(object):
         (yielding :class:`importlib.metadata.EntryPoint` instances).
 
         As a convenience, if `entry_points_iter` is a string it will be used
-        to retrieve the iterator using `importlib.metadata.entry_points`.
+        to retrieve the iterator using :func:`.pkgmeta.entry_points`.
 
         """
         if isinstance(entry_points_iter, str):
@@ -214,14 +231,12 @@ class WidgetDiscovery(object):
 
         self.handle_category(cat_desc)
 
-        desc_iter = self.iter_widget_descriptions(
-                        category,
-                        category_name=cat_desc.name,
-                        distribution=distribution
-                        )
-
-        for desc in desc_iter:
-            self.handle_widget(desc)
+        descs = self.iter_widget_descriptions(
+                    category,
+                    category_name=cat_desc.name,
+                    distribution=distribution
+                    )
+        self.handle_widgets(list(descs))
 
     def process_loader(self, callable):
         """
@@ -234,15 +249,22 @@ class WidgetDiscovery(object):
 
     def process_iter(self, iter):
         """
+        Process an iterator of category and widget descriptions.
         """
+        widgets = []  # type: List[WidgetDescription]
         for desc in iter:
             if isinstance(desc, CategoryDescription):
+                if widgets:
+                    self.handle_widgets(widgets)
+                    widgets = []
                 self.handle_category(desc)
             elif isinstance(desc, WidgetDescription):
-                self.handle_widget(desc)
+                widgets.append(desc)
             else:
                 log.error("Category or Widget Description instance "
                           "expected. Got %r.", desc)
+        if widgets:
+            self.handle_widgets(widgets)
 
     def handle_widget(self, desc):
         """
@@ -255,6 +277,22 @@ class WidgetDiscovery(object):
         if self.handler:
             self.handler.handle_widget(desc)
 
+    def handle_widgets(self, descs):
+        """
+        Handle multiple found widget descriptions (of one category).
+
+        Base implementation passes them to the handler (i.e. registers
+        them in the registry supplied in the constructor at once). If a
+        subclass reimplements :func:`handle_widget` it is called for each
+        description instead.
+
+        """
+        if type(self).handle_widget is not WidgetDiscovery.handle_widget:
+            for desc in descs:
+                self.handle_widget(desc)
+        elif self.handler and descs:
+            self.handler.handle_widgets(descs)
+
     def handle_category(self, desc):
         """
         Handle a found category description.
@@ -4,8 +4,10 @@ Qt Model classes for widget registry.
 """
 import bisect
 import warnings
+import weakref
+from operator import attrgetter
 
-from typing import Union
+from typing import Union, Dict, List, Callable, Any
 
 from xml.sax.saxutils import escape
 from urllib.parse import urlencode
@@ -70,6 +72,16 @@ class QtRegistryHandler(QObject, WidgetDiscovery.RegistryHandler):
         super().handle_widget(desc)
         self.found_widget.emit(desc)
 
+    def handle_widgets(self, descs):
+        try:
+            super().handle_widgets(descs)
+        finally:
+            registry = self.registry
+            for desc in descs:
+                if registry.has_widget(desc.qualified_name) and \
+                        registry.widget(desc.qualified_name) is desc:
+                    self.found_widget.emit(desc)
+
 
 class QtWidgetRegistry(QObject, WidgetRegistry):
     """
@@ -120,14 +132,17 @@ class QtWidgetRegistry(QObject, WidgetRegistry):
 
         # Should  the QStandardItemModel be subclassed?
         self.__item_model = QStandardItemModel(self)
+        # Widget items by qualified name
+        self.__widget_items = {}  # type: Dict[str, QStandardItem]
 
-        for i, desc in enumerate(self.categories()):
+        for desc in self.categories():
             cat_item = self._cat_desc_to_std_item(desc)
-            self.__item_model.insertRow(i, cat_item)
-
-            for j, wdesc in enumerate(self.widgets(desc.name)):
-                widget_item = self._widget_desc_to_std_item(wdesc, desc)
-                cat_item.insertRow(j, widget_item)
+            widget_items = [self.__widget_item(wdesc, desc)
+                            for wdesc in self.widgets(desc.name)]
+            if widget_items:
+                cat_item.appendRows(widget_items)
+            # Note: appendRows does not propagate the model to grandchildren
+            self.__item_model.appendRow(cat_item)
 
     def model(self):
         # type: () -> QStandardItemModel
@@ -146,11 +161,7 @@ class QtWidgetRegistry(QObject, WidgetRegistry):
         """
         if isinstance(widget, str):
             widget = self.widget(widget)
-        cat = self.category(widget.category or "Unspecified")
-        cat_ind = self.categories().index(cat)
-        cat_item = self.model().item(cat_ind)
-        widget_ind = self.widgets(cat).index(widget)
-        return cat_item.child(widget_ind)
+        return self.__widget_items[widget.qualified_name]
 
     def action_for_widget(self, widget):
         # type: (Union[str, WidgetDescription]) -> QAction
@@ -205,33 +216,74 @@ class QtWidgetRegistry(QObject, WidgetRegistry):
         categories = self.categories()
         cat_i = categories.index(category)
         _, widgets = self._categories_dict[category.name]
-        priorities = [w.priority for w in widgets]
-        insertion_i = bisect.bisect_right(priorities, desc.priority)
+        insertion_i = bisect.bisect_right(
+            widgets, desc.priority, key=attrgetter("priority"))
 
         WidgetRegistry._insert_widget(self, category, desc)
 
         cat_item = self.__item_model.item(cat_i)
-        widget_item = self._widget_desc_to_std_item(desc, category)
+        widget_item = self.__widget_item(desc, category)
 
         cat_item.insertRow(insertion_i, widget_item)
 
         self.widget_added.emit(category.name, desc.name, desc)
 
+    def _insert_widgets(self, category, descs):
+        # type: (CategoryDescription, List[WidgetDescription]) -> None
+        """
+        Override to update the item model (inserting contiguous runs of
+        rows at once) and emit the signals.
+        """
+        assert isinstance(category, CategoryDescription)
+        cat_i = self.categories().index(category)
+
+        WidgetRegistry._insert_widgets(self, category, descs)
+
+        _, widgets = self._categories_dict[category.name]
+        new = {id(desc) for desc in descs}
+        cat_item = self.__item_model.item(cat_i)
+        # Insert the new items in order of their final position so the
+        # positions of the preceding (existing and new) items are final.
+        run_start, run = -1, []  # type: int, List[QStandardItem]
+        for i, desc in enumerate(widgets):
+            if id(desc) in new:
+                if not run:
+                    run_start = i
+                run.append(self.__widget_item(desc, category))
+            elif run:
+                cat_item.insertRows(run_start, run)
+                run = []
+        if run:
+            cat_item.insertRows(run_start, run)
+
+        for desc in widgets:
+            if id(desc) in new:
+                self.widget_added.emit(category.name, desc.name, desc)
+
+    def __widget_item(self, desc, category):
+        # type: (WidgetDescription, CategoryDescription) -> QStandardItem
+        item = self._widget_desc_to_std_item(desc, category)
+        self.__widget_items[desc.qualified_name] = item
+        return item
+
     def _cat_desc_to_std_item(self, desc):
         # type: (CategoryDescription) -> QStandardItem
         """
         Create a QStandardItem for the category description.
+
+        The icon is loaded on first access.
         """
-        item = QStandardItem()
-        item.setText(desc.name)
+        item = _DeferredDataItem(desc.name)
 
         if desc.icon:
             icon = desc.icon
         else:
             icon = "icons/default-category.svg"
 
-        icon = icon_loader.from_description(desc).get(icon)
-        item.setIcon(icon)
+        item.setDeferredData(
+            lambda: icon_loader.from_description(desc).get(icon),
+            Qt.DecorationRole
+        )
 
         if desc.background:
             background = desc.background
@@ -254,17 +306,21 @@ class QtWidgetRegistry(QObject, WidgetRegistry):
         # type: (WidgetDescription, CategoryDescription) -> QStandardItem
         """
         Create a QStandardItem for the widget description.
+
+        The icon, tool tip, what's this text and the action
+        (`WIDGET_ACTION_ROLE`) are computed on first access.
         """
-        item = QStandardItem(desc.name)
-        item.setText(desc.name)
+        item = _DeferredDataItem(desc.name)
 
         if desc.icon:
             icon = desc.icon
         else:
             icon = "icons/default-widget.svg"
 
-        icon = icon_loader.from_description(desc).get(icon)
-        item.setIcon(icon)
+        item.setDeferredData(
+            lambda: icon_loader.from_description(desc).get(icon),
+            Qt.DecorationRole
+        )
 
         # This should be inherited from the category.
         background = None
@@ -280,20 +336,74 @@ class QtWidgetRegistry(QObject, WidgetRegistry):
             brush = QBrush(QColor(background))
             item.setData(brush, self.BACKGROUND_ROLE)
 
-        tooltip = tooltip_helper(desc)
-        style = "ul { margin-top: 1px; margin-bottom: 1px; }"
-        tooltip = TOOLTIP_TEMPLATE.format(style=style, tooltip=tooltip)
-        item.setToolTip(tooltip)
-        item.setWhatsThis(whats_this_helper(desc))
+        def tooltip():
+            style = "ul { margin-top: 1px; margin-bottom: 1px; }"
+            return TOOLTIP_TEMPLATE.format(
+                style=style, tooltip=tooltip_helper(desc))
+
+        item.setDeferredData(tooltip, Qt.ToolTipRole)
+        item.setDeferredData(lambda: whats_this_helper(desc),
+                             Qt.WhatsThisRole)
         item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable)
         item.setData(desc, self.WIDGET_DESC_ROLE)
 
-        # Create the action for the widget_item
-        action = self.create_action_for_item(item)
-        item.setData(action, self.WIDGET_ACTION_ROLE)
+        # Create the action for the widget_item (on first access). The
+        # item is owned by the registry's model; do not reference the
+        # registry from it.
+        registry = weakref.ref(self)
+        itemref = weakref.ref(item)
+
+        def action():
+            reg, item_ = registry(), itemref()
+            if reg is None or item_ is None:
+                return None
+            return reg.create_action_for_item(item_)
+
+        item.setDeferredData(action, self.WIDGET_ACTION_ROLE)
         return item
 
 
+class _DeferredDataItem(QStandardItem):
+    """
+    A QStandardItem where the data for some roles is computed on first
+    access (:func:`data`).
+
+    Setting the data for a role with :func:`setData` replaces the deferred
+    value.
+
+    .. note:: Deferred values are not reported by the model's `itemData`.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__deferred = {}  # type: Dict[int, Callable[[], Any]]
+        self.__values = {}    # type: Dict[int, Any]
+
+    def setDeferredData(self, func, role):
+        # type: (Callable[[], Any], int) -> None
+        """
+        Set a function computing the value for `role` on first access.
+        """
+        self.__values.pop(role, None)
+        self.__deferred[role] = func
+
+    def data(self, role=Qt.UserRole + 1):
+        # type: (int) -> Any
+        if role in self.__deferred:
+            try:
+                return self.__values[role]
+            except KeyError:
+                value = self.__values[role] = self.__deferred[role]()
+                return value
+        return super().data(role)
+
+    def setData(self, value, role=Qt.UserRole + 1):
+        # type: (Any, int) -> None
+        if role in self.__deferred:
+            del self.__deferred[role]
+            self.__values.pop(role, None)
+        super().setData(value, role)
+
+
 TOOLTIP_TEMPLATE = """\
 <html>
 <head>
@@ -0,0 +1,241 @@
+"""
+Widget Search Index
+===================
+
+A precomputed index for filtering widget descriptions by a user supplied
+text query with the same semantics as
+:func:`~orangecanvas.registry.utils.search_filter_query_helper`.
+
+"""
+from operator import itemgetter
+
+from typing import (
+    Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set
+)
+
+from .base import WidgetRegistry
+from .description import WidgetDescription
+from .utils import search_filter_query_helper
+
+#: The longest n-grams stored in the postings. Queries up to this length
+#: are answered directly, longer ones by intersecting the postings of all
+#: their n-grams and verifying the candidates.
+NGRAM = 3
+
+
+def normalize_query(query):
+    # type: (str) -> str
+    return query.lstrip().lower()
+
+
+def name_variants(desc):
+    # type: (WidgetDescription) -> List[str]
+    """
+    Return the normalized strings in which the query is searched for as a
+    substring (the name with and without spaces).
+    """
+    name = desc.name.lower()
+    return [name, name.replace(" ", "")]
+
+
+def keyword_variants(desc):
+    # type: (WidgetDescription) -> List[str]
+    """
+    Return the normalized strings which the query must be a prefix of
+    (the keywords and the variants of hyphenated keywords).
+    """
+    keywords = [k.lower() for k in desc.keywords]
+    for k in keywords[:]:
+        if "-" in k:
+            keywords.append(k.replace("-", ""))
+            keywords.append(k.replace("-", " "))
+    return keywords
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        # type: () -> None
+        self.children = {}  # type: Dict[str, _TrieNode]
+        # ids of all the entries with a string passing through this node
+        self.ids = set()  # type: Set[int]
+
+
+class WidgetSearchIndex:
+    """
+    A search index over widget descriptions.
+
+    The normalized names are split into n-grams (up to :data:`NGRAM`
+    characters long) with postings lists of the entries containing them
+    and the normalized keywords are stored in a prefix trie. A query is
+    thus resolved to the set of matching entries without scanning all
+    the descriptions.
+
+    Parameters
+    ----------
+    descriptions : Iterable[WidgetDescription]
+        The indexed descriptions.
+    frequencies : Optional[Mapping[str, int]]
+        Usage frequencies of the widgets (by qualified name) used to rank
+        the :func:`search` results.
+    """
+    def __init__(self, descriptions=(), frequencies=None):
+        # type: (Iterable[WidgetDescription], Optional[Mapping[str, int]]) -> None
+        self.__descriptions = []  # type: List[WidgetDescription]
+        self.__ids = {}  # type: Dict[str, int]
+        self.__names = []  # type: List[List[str]]
+        self.__postings = {}  # type: Dict[str, Set[int]]
+        self.__trie = _TrieNode()
+        self.__frequencies = dict(frequencies or {})  # type: Dict[str, int]
+        for desc in descriptions:
+            self.add(desc)
+
+    @classmethod
+    def from_registry(cls, registry, frequencies=None):
+        # type: (WidgetRegistry, Optional[Mapping[str, int]]) -> WidgetSearchIndex
+        """
+        Create an index of all the widgets in a
+        :class:`~orangecanvas.registry.WidgetRegistry`.
+        """
+        return cls(registry.widgets(), frequencies)
+
+    def add(self, desc):
+        # type: (WidgetDescription) -> None
+        """
+        Add a widget description to the index.
+
+        A description with an already indexed qualified name replaces the
+        existing entry.
+        """
+        if desc.qualified_name in self.__ids:
+            self.__remove(self.__ids[desc.qualified_name])
+        i = len(self.__descriptions)
+        self.__descriptions.append(desc)
+        self.__ids[desc.qualified_name] = i
+        names = name_variants(desc)
+        self.__names.append(names)
+        for name in names:
+            for n in range(1, NGRAM + 1):
+                for j in range(len(name) - n + 1):
+                    self.__postings.setdefault(name[j: j + n], set()).add(i)
+        for keyword in keyword_variants(desc):
+            node = self.__trie
+            for char in keyword:
+                node = node.children.setdefault(char, _TrieNode())
+                node.ids.add(i)
+
+    def __remove(self, i):
+        # type: (int) -> None
+        # Entries are never reused; the id is only dropped from all the
+        # postings and the trie.
+        for ids in self.__postings.values():
+            ids.discard(i)
+        stack = [self.__trie]
+        while stack:
+            node = stack.pop()
+            node.ids.discard(i)
+            stack.extend(node.children.values())
+        del self.__ids[self.__descriptions[i].qualified_name]
+
+    def __len__(self):
+        # type: () -> int
+        return len(self.__ids)
+
+    def __contains__(self, desc):
+        # type: (WidgetDescription) -> bool
+        i = self.__ids.get(desc.qualified_name)
+        return i is not None and self.__descriptions[i] is desc
+
+    def set_frequencies(self, frequencies):
+        # type: (Mapping[str, int]) -> None
+        """
+        Set the usage frequencies (by qualified name) used for ranking.
+        """
+        self.__frequencies = dict(frequencies)
+
+    def frequencies(self):
+        # type: () -> Dict[str, int]
+        return dict(self.__frequencies)
+
+    def accepted(self, query):
+        # type: (str) -> FrozenSet[int]
+        """
+        Return the ids of the entries matching the `query`.
+        """
+        query = normalize_query(query)
+        if not query:
+            return frozenset(self.__ids.values())
+        return frozenset(self.__match_names(query) |
+                         self.__match_keywords(query))
+
+    def __match_names(self, query):
+        # type: (str) -> Set[int]
+        postings = self.__postings
+        if len(query) <= NGRAM:
+            return set(postings.get(query, ()))
+        grams = {query[j: j + NGRAM] for j in range(len(query) - NGRAM + 1)}
+        lists = sorted((postings.get(g, set()) for g in grams), key=len)
+        candidates = set(lists[0])
+        for ids in lists[1:]:
+            candidates &= ids
+            if not candidates:
+                break
+        names = self.__names
+        return {i for i in candidates
+                if any(query in name for name in names[i])}
+
+    def __match_keywords(self, query):
+        # type: (str) -> Set[int]
+        node = self.__trie
+        for char in query:
+            node = node.children.get(char)
+            if node is None:
+                return set()
+        return node.ids
+
+    def matches(self, desc, query):
+        # type: (WidgetDescription, str) -> bool
+        """
+        Does the `desc` match the `query`.
+
+        Same as :func:`search_filter_query_helper` (which is also used
+        for descriptions not in the index).
+        """
+        return self.predicate(query)(desc)
+
+    def predicate(self, query):
+        # type: (str) -> Callable[[WidgetDescription], bool]
+        """
+        Return a predicate accepting the descriptions matching `query`.
+
+        The query is resolved once; the returned predicate only tests the
+        membership in the accepted set.
+        """
+        accepted = self.accepted(query)
+        ids, descriptions = self.__ids, self.__descriptions
+
+        def match(desc):
+            # type: (WidgetDescription) -> bool
+            i = ids.get(desc.qualified_name)
+            if i is not None and descriptions[i] is desc:
+                return i in accepted
+            else:
+                return search_filter_query_helper(desc, query)
+        return match
+
+    def search(self, query):
+        # type: (str) -> List[WidgetDescription]
+        """
+        Return the descriptions matching the `query`.
+
+        The results are ordered by the usage frequency (most frequently
+        used first) and then by the order in which they were added.
+        """
+        frequencies = self.__frequencies
+        descriptions = self.__descriptions
+        ranked = sorted(
+            ((-frequencies.get(descriptions[i].qualified_name, 0), i)
+             for i in self.accepted(query))
+        )
+        return [descriptions[i] for i in map(itemgetter(1), ranked)]
@@ -99,6 +99,37 @@ class TestRegistry(unittest.TestCase):
                                          add_desc])
                         )
 
+    def test_register_widgets(self):
+        def desc(name, priority, category="A"):
+            return description.WidgetDescription(
+                name, name, category, qualified_name=name, priority=priority)
+        descs = [desc("a", 2), desc("b", 1), desc("c", 2), desc("d", 1, "B"),
+                 desc("e", 0)]
+        reg, reg_1 = WidgetRegistry(), WidgetRegistry()
+        for r in [reg, reg_1]:
+            r.register_category(description.CategoryDescription("A"))
+            r.register_widget(desc("f", 1))
+        for d in descs:
+            reg.register_widget(d)
+        reg_1.register_widgets(descs)
+        self.assertEqual([c.name for c in reg_1.categories()], ["A", "B"])
+        for cat in ["A", "B"]:
+            self.assertSequenceEqual(
+                [d.name for d in reg_1.widgets(cat)],
+                [d.name for d in reg.widgets(cat)]
+            )
+        self.assertEqual([d.name for d in reg_1.widgets("A")],
+                         ["e", "f", "b", "a", "c"])
+        self.assertIs(reg_1.widget("d"), descs[3])
+
+        with self.assertRaises(ValueError):
+            reg_1.register_widgets([desc("g", 0), desc("a", 0)])
+        self.assertFalse(reg_1.has_widget("g"))
+        with self.assertRaises(ValueError):
+            reg_1.register_widgets([desc("g", 0), desc("g", 0)])
+        with self.assertRaises(TypeError):
+            reg_1.register_widgets([object()])
+
     def test_input_signal(self):
         isig_1 = InputSignal("A", str, "aa", id="sig-a")
         isig_2 = InputSignal("A", 'builtins.str', "aa", id="sig-a")
@@ -0,0 +1,109 @@
+"""
+Test QtWidgetRegistry.
+"""
+from unittest.mock import patch
+
+from AnyQt.QtWidgets import QAction
+from AnyQt.QtCore import Qt
+from AnyQt.QtTest import QSignalSpy
+
+from ...gui.test import QAppTestCase
+from ..base import WidgetRegistry
+from ..discovery import WidgetDiscovery
+from ..qt import QtWidgetRegistry, QtRegistryHandler
+from ..description import WidgetDescription
+from . import small_testing_registry
+
+
+class TestQtWidgetRegistry(QAppTestCase):
+    def test_model(self):
+        reg = QtWidgetRegistry(small_testing_registry())
+        model = reg.model()
+        self.assertEqual(
+            [model.item(i).text() for i in range(model.rowCount())],
+            [c.name for c in reg.categories()]
+        )
+        for i, cat in enumerate(reg.categories()):
+            cat_item = model.item(i)
+            self.assertIs(cat_item.data(reg.CATEGORY_DESC_ROLE), cat)
+            self.assertFalse(cat_item.icon().isNull())
+            widgets = reg.widgets(cat)
+            self.assertEqual(cat_item.rowCount(), len(widgets))
+            for j, desc in enumerate(widgets):
+                item = cat_item.child(j)
+                self.assertIs(reg.item_for_widget(desc), item)
+                self.assertIs(item.data(reg.WIDGET_DESC_ROLE), desc)
+
+    def test_deferred_data(self):
+        reg = QtWidgetRegistry(small_testing_registry())
+        model = reg.model()
+        item = reg.item_for_widget("add")
+        index = item.index()
+        self.assertIn("<b>add</b>", model.data(index, Qt.ToolTipRole))
+        self.assertIn("<h3>add</h3>", model.data(index, Qt.WhatsThisRole))
+        self.assertFalse(item.icon().isNull())
+        action = reg.action_for_widget("add")
+        self.assertIsInstance(action, QAction)
+        self.assertIs(action, item.data(reg.WIDGET_ACTION_ROLE))
+        self.assertIs(action.data(), reg.widget("add"))
+        self.assertEqual(action.toolTip(), item.toolTip())
+
+        spy = QSignalSpy(model.dataChanged)
+        item.setToolTip("Add")
+        self.assertEqual(len(spy), 1)
+        self.assertEqual(model.data(index, Qt.ToolTipRole), "Add")
+
+    def test_deferred_action_registry_deleted(self):
+        reg = QtWidgetRegistry(small_testing_registry())
+        cat_item = reg.model().item(0)
+        item = cat_item.takeChild(0)
+        del cat_item
+        reg.deleteLater()
+        del reg
+        self.qWait()
+        self.assertIsNone(item.data(QtWidgetRegistry.WIDGET_ACTION_ROLE))
+
+    def test_register_widgets(self):
+        reg = QtWidgetRegistry(small_testing_registry())
+        spy = QSignalSpy(reg.widget_added)
+        descs = [
+            WidgetDescription(name, name, "Operators", qualified_name=name,
+                              priority=priority)
+            for name, priority in [("a", 100), ("c", -1)]
+        ] + [
+            WidgetDescription("b", "b", "New", qualified_name="b")
+        ]
+        reg.register_widgets(descs)
+        self.assertEqual([args[1] for args in spy], ["c", "a", "b"])
+        model = reg.model()
+        for i, cat in enumerate(reg.categories()):
+            cat_item = model.item(i)
+            self.assertIs(cat_item.data(reg.CATEGORY_DESC_ROLE), cat)
+            self.assertEqual(
+                [cat_item.child(j).data(reg.WIDGET_DESC_ROLE)
+                 for j in range(cat_item.rowCount())],
+                reg.widgets(cat)
+            )
+        for desc in descs:
+            self.assertIs(reg.item_for_widget(desc).data(reg.WIDGET_DESC_ROLE),
+                          desc)
+
+    def test_registry_handler(self):
+        reg = WidgetRegistry(small_testing_registry())
+        handler = QtRegistryHandler(registry=reg)
+        spy = QSignalSpy(handler.found_widget)
+        descs = [WidgetDescription(name, name, "Operators", qualified_name=name)
+                 for name in ["a", "b"]]
+        with patch.object(reg, "register_widgets",
+                          wraps=reg.register_widgets) as register_widgets:
+            WidgetDiscovery(handler).process_iter(descs)
+            register_widgets.assert_called_once_with(descs)
+        self.assertEqual([args[0] for args in spy], descs)
+        # a duplicate only stops the registration at the duplicate
+        descs = [WidgetDescription(name, name, "Operators", qualified_name=name)
+                 for name in ["c", "a", "d"]]
+        with self.assertRaises(ValueError):
+            handler.handle_widgets(descs)
+        self.assertTrue(reg.has_widget("c"))
+        self.assertFalse(reg.has_widget("d"))
+        self.assertEqual(spy[-1][0], descs[0])
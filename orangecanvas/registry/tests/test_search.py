@@ -0,0 +1,113 @@
+"""
+Test WidgetSearchIndex.
+"""
+import random
+import unittest
+
+from ..description import WidgetDescription
+from ..search import WidgetSearchIndex
+from ..utils import search_filter_query_helper
+from . import small_testing_registry
+
+
+def desc(name, keywords=(), qualified_name=None):
+    return WidgetDescription(
+        name, name.lower(), qualified_name=qualified_name or "test." + name,
+        keywords=list(keywords)
+    )
+
+
+DESCRIPTIONS = [
+    desc("File"),
+    desc("CSV File Import", ["csv", "comma-separated-values", "import"]),
+    desc("Data Table", ["spreadsheet"]),
+    desc("Scatter Plot", ["scatter-plot", "chart", "2-d"]),
+    desc("k-Means", ["kmeans", "clustering"]),
+    desc("t-SNE", ["tsne", "t-distributed"]),
+    desc("Select Rows", ["filter"]),
+    desc("Python Script", ["programming", "code"]),
+    desc("Ünicode Widget", ["straße", "İstanbul"]),
+]
+
+
+class TestWidgetSearchIndex(unittest.TestCase):
+    def assertConforms(self, index, descriptions, queries):
+        for query in queries:
+            expected = [d for d in descriptions
+                        if search_filter_query_helper(d, query)]
+            match = index.predicate(query)
+            self.assertEqual([d for d in descriptions if match(d)], expected,
+                             "query {!r}".format(query))
+            found = sorted(index.search(query), key=descriptions.index)
+            self.assertEqual(found, expected, "query {!r}".format(query))
+
+    def test_conformance(self):
+        index = WidgetSearchIndex(DESCRIPTIONS)
+        # all substrings of the names and keywords, their variations and
+        # some non-matching queries
+        queries = {"", " ", "  sc", "xyz", "plot ", "scatterplot", "commasep",
+                   "comma separated", "2d", "2 d", "-", " - ", "k-m", "kmea",
+                   "STRASSE", "straße", "i̇st"}
+        for d in DESCRIPTIONS:
+            for text in [d.name] + d.keywords:
+                for i in range(len(text)):
+                    for j in range(i + 1, len(text) + 1):
+                        queries.add(text[i:j])
+                        queries.add(text[i:j].upper())
+        self.assertConforms(index, DESCRIPTIONS, sorted(queries))
+
+    def test_conformance_random(self):
+        rng = random.Random(42)
+        alphabet = "ab c-d"
+
+        def word():
+            return "".join(rng.choice(alphabet)
+                           for _ in range(rng.randint(1, 8)))
+
+        descriptions = [
+            desc(word(), [word() for _ in range(rng.randint(0, 3))],
+                 qualified_name="test.w{}".format(i))
+            for i in range(200)
+        ]
+        index = WidgetSearchIndex(descriptions)
+        queries = {word() for _ in range(500)}
+        self.assertConforms(index, descriptions, sorted(queries))
+
+    def test_registry(self):
+        reg = small_testing_registry()
+        index = WidgetSearchIndex.from_registry(reg)
+        self.assertEqual(len(index), len(reg.widgets()))
+        for d in reg.widgets():
+            self.assertIn(d, index)
+        self.assertEqual([d.name for d in index.search("neg")], ["negate"])
+
+    def test_not_indexed(self):
+        index = WidgetSearchIndex(DESCRIPTIONS[:2])
+        other = desc("Data Table")
+        self.assertNotIn(other, index)
+        self.assertTrue(index.matches(other, "tab"))
+        self.assertFalse(index.matches(other, "csv"))
+        # same qualified name, different description
+        replaced = desc("Zoo", qualified_name=DESCRIPTIONS[0].qualified_name)
+        self.assertNotIn(replaced, index)
+        self.assertFalse(index.matches(replaced, "file"))
+
+    def test_add_replace(self):
+        index = WidgetSearchIndex(DESCRIPTIONS)
+        self.assertEqual(index.search("file"), DESCRIPTIONS[:2])
+        replaced = desc("Zoo", ["animals"],
+                        qualified_name=DESCRIPTIONS[0].qualified_name)
+        index.add(replaced)
+        self.assertEqual(len(index), len(DESCRIPTIONS))
+        self.assertEqual(index.search("file"), [DESCRIPTIONS[1]])
+        self.assertEqual(index.search("ani"), [replaced])
+        self.assertNotIn(DESCRIPTIONS[0], index)
+
+    def test_ranking(self):
+        index = WidgetSearchIndex(DESCRIPTIONS)
+        self.assertEqual([d.name for d in index.search("t")][:3],
+                         ["CSV File Import", "Data Table", "Scatter Plot"])
+        index.set_frequencies({"test.Select Rows": 10,
+                               "test.Data Table": 3})
+        self.assertEqual([d.name for d in index.search("t")][:3],
+                         ["Select Rows", "Data Table", "CSV File Import"])
@@ -74,6 +74,7 @@ def widget_from_module_globals(module):
     keywords = getattr(module, "KEYWORDS", None)
     background = getattr(module, "BACKGROUND", None)
     replaces = getattr(module, "REPLACES", None)
+    resource_weight = getattr(module, "RESOURCE_WEIGHT", 1)
 
     inputs = list(map(input_channel_from_args, inputs))
     outputs = list(map(output_channel_from_args, outputs))
@@ -100,7 +101,8 @@ def widget_from_module_globals(module):
         priority=priority,
         icon=icon,
         background=background,
-        replaces=replaces)
+        replaces=replaces,
+        resource_weight=resource_weight)
 
 
 def category_from_package_globals(package):
@@ -189,7 +189,8 @@ class icon_loader(resource_loader):
             path = None
 
         if path is None:
-            path = self.find(self.DEFAULT_ICON if default is None else default)
+            name = self.DEFAULT_ICON if default is None else default
+            path = self.find(name)
         if path is None:
             return QIcon()
 
@@ -205,11 +206,13 @@ class icon_loader(resource_loader):
 
         if len(icons) == 1 and icons[0].lower().endswith(".svg"):
             if self.package is not None:
+                # The icon can be loaded lazily (e.g. from a model's data);
+                # do not raise on unreadable package data.
                 try:
                     contents = pkgutil.get_data(self.package, name)
-                except FileNotFoundError:
-                    pass
-                else:
+                except (OSError, ImportError):
+                    contents = None
+                if contents is not None:
                     if b'current-color-scheme' in contents:
                         icon = QIcon(StyledSvgIconEngine(contents))
                         self._icon_cache[cache_key] = icon
@@ -58,6 +58,10 @@ class SchemeNode(QObject):
     parent : :class:`QObject`
         Parent object.
 
+    Note
+    ----
+    `properties` should not be modified in place; assign a new dict
+    instead (see :func:`properties_token`).
     """
     class State(enum.IntEnum):
         """
@@ -111,7 +115,31 @@ class SchemeNode(QObject):
         self.__status_message = ""
         self.__state_messages = {}  # type: Dict[str, UserMessage]
         self.__state = SchemeNode.NoState  # type: Union[SchemeNode.State, int]
-        self.properties = properties or {}
+        self.__properties_token = 0
+        self.__properties = properties or {}  # type: dict
+
+    @property
+    def properties(self):
+        # type: () -> dict
+        return self.__properties
+
+    @properties.setter
+    def properties(self, properties):
+        # type: (dict) -> None
+        if properties is not self.__properties:
+            self.__properties = properties
+            self.__properties_token += 1
+
+    def properties_token(self):
+        # type: () -> int
+        """
+        Return a token that changes whenever a new `properties` dict is
+        assigned to the node.
+
+        This can be used to cache values derived from the properties
+        (e.g. their serialized representation).
+        """
+        return self.__properties_token
 
     def input_channels(self):
         # type: () -> List[InputSignal]
@@ -390,4 +418,8 @@ class SchemeNode(QObject):
                self.parent()
 
     def __setstate__(self, state):
-        self.__init__(*state)
+        description, title, position, properties, parent = state
+        if properties is not None and not isinstance(properties, dict):
+            # A properties snapshot (see utils.pickle.Pickler)
+            properties = dict(properties)
+        self.__init__(description, title, position, properties, parent)
@@ -0,0 +1,192 @@
+"""
+==============
+Property Store
+==============
+
+Immutable, content addressed snapshots of node properties.
+
+A :class:`PropertiesSnapshot` stores every top level property value as a
+separately serialized chunk. Chunks are interned in a :class:`PropertyStore`
+by their content hash, so snapshots of (mostly) unchanged properties share
+the storage of the unchanged values.
+
+"""
+import pickle
+import hashlib
+import weakref
+
+from typing import Any, Dict, Iterator, Mapping, Tuple
+
+__all__ = [
+    "PropertyStore", "PropertiesSnapshot", "default_store"
+]
+
+
+class _Chunk:
+    """
+    An immutable serialized value.
+    """
+    __slots__ = ("digest", "data", "__weakref__")
+
+    def __init__(self, digest, data):
+        # type: (bytes, bytes) -> None
+        self.digest = digest
+        self.data = data
+
+    def value(self):
+        # type: () -> Any
+        return pickle.loads(self.data)
+
+    def __reduce__(self):
+        return _intern_chunk, (self.digest, self.data)
+
+
+class _ValueChunk:
+    """
+    A value which could not be serialized (it is referenced not copied).
+    """
+    __slots__ = ("obj",)
+    digest = None
+
+    def __init__(self, obj):
+        # type: (Any) -> None
+        self.obj = obj
+
+    def value(self):
+        # type: () -> Any
+        return self.obj
+
+
+def _intern_chunk(digest, data):
+    # type: (bytes, bytes) -> _Chunk
+    return _default_store._intern(digest, data)
+
+
+class PropertiesSnapshot(Mapping[str, Any]):
+    """
+    An immutable snapshot of a node's properties.
+
+    Accessing a value returns a new (deserialized) copy.
+
+    Two snapshots compare equal when the properties they were created
+    from compare equal. Identical chunks are compared by their digest
+    without deserializing them.
+    """
+    __slots__ = ("__chunks",)
+
+    def __init__(self, chunks):
+        # type: (Tuple[Tuple[str, Any], ...]) -> None
+        self.__chunks = dict(chunks)  # type: Dict[str, Any]
+
+    def __getitem__(self, key):
+        # type: (str) -> Any
+        return self.__chunks[key].value()
+
+    def __iter__(self):
+        # type: () -> Iterator[str]
+        return iter(self.__chunks)
+
+    def __len__(self):
+        # type: () -> int
+        return len(self.__chunks)
+
+    def to_dict(self):
+        # type: () -> Dict[str, Any]
+        """
+        Return the properties as a new dict.
+        """
+        return {key: chunk.value() for key, chunk in self.__chunks.items()}
+
+    def nbytes(self):
+        # type: () -> int
+        """
+        Return the total size of the serialized values (including any
+        shared chunks).
+        """
+        return sum(len(chunk.data) for chunk in self.__chunks.values()
+                   if chunk.digest is not None)
+
+    def __eq__(self, other):
+        if not isinstance(other, PropertiesSnapshot):
+            return NotImplemented
+        this, other = self.__chunks, other.__chunks
+        if this.keys() != other.keys():
+            return False
+        for key, chunk in this.items():
+            ochunk = other[key]
+            if chunk is ochunk or (chunk.digest is not None and
+                                   chunk.digest == ochunk.digest):
+                continue
+            if chunk.value() != ochunk.value():
+                return False
+        return True
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    __hash__ = None  # type: ignore
+
+    def __reduce__(self):
+        return PropertiesSnapshot, (tuple(self.__chunks.items()),)
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, self.to_dict())
+
+
+class PropertyStore:
+    """
+    A store of interned (content hashed) property value chunks.
+
+    Chunks are kept alive only as long as some snapshot references them.
+    """
+    def __init__(self):
+        self.__chunks = weakref.WeakValueDictionary()  # type: weakref.WeakValueDictionary[bytes, _Chunk]
+
+    def _intern(self, digest, data):
+        # type: (bytes, bytes) -> _Chunk
+        chunk = self.__chunks.get(digest)
+        if chunk is None:
+            chunk = _Chunk(digest, data)
+            self.__chunks[digest] = chunk
+        return chunk
+
+    def chunk(self, value):
+        # type: (Any) -> Any
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:  # pylint: disable=broad-except
+            return _ValueChunk(value)
+        digest = hashlib.sha1(data).digest()
+        return self._intern(digest, data)
+
+    def snapshot(self, properties):
+        # type: (Mapping[str, Any]) -> PropertiesSnapshot
+        """
+        Return an immutable snapshot of `properties`.
+        """
+        return PropertiesSnapshot(
+            tuple((key, self.chunk(value))
+                  for key, value in properties.items())
+        )
+
+    def __len__(self):
+        # type: () -> int
+        """Return the number of (live) chunks in the store."""
+        return len(self.__chunks)
+
+    def nbytes(self):
+        # type: () -> int
+        """Return the total size of all (live) chunks in the store."""
+        return sum(len(chunk.data) for chunk in list(self.__chunks.values()))
+
+
+_default_store = PropertyStore()
+
+
+def default_store():
+    # type: () -> PropertyStore
+    """
+    Return the default (shared) property store.
+    """
+    return _default_store
@@ -2,20 +2,26 @@
 Scheme save/load routines.
 
 """
+import io
 import numbers
 import base64
 import binascii
 import itertools
 import math
+import weakref
+import zlib
 
 from xml.etree.ElementTree import TreeBuilder, Element, ElementTree, parse
+from xml.etree.ElementTree import (  # type: ignore
+    _escape_attrib, _escape_cdata
+)
+from concurrent.futures import Executor, Future
 
 from collections import defaultdict
-from itertools import chain
 
+import re
 import pickle
 import json
-import pprint
 
 import ast
 from ast import literal_eval
@@ -23,18 +29,22 @@ from ast import literal_eval
 import logging
 
 from typing import (
-    NamedTuple, Dict, Tuple, List, Union, Any, Optional, AnyStr, IO
+    NamedTuple, Dict, Tuple, List, Union, Any, Optional, AnyStr, IO,
+    Iterable, Callable, Set, Sequence
 )
 
 from typing_extensions import TypeGuard
 
 from . import SchemeNode, SchemeLink
-from .annotations import SchemeTextAnnotation, SchemeArrowAnnotation
+from .annotations import (
+    SchemeTextAnnotation, SchemeArrowAnnotation, BaseSchemeAnnotation
+)
 from .errors import IncompatibleChannelTypeError
 
 from ..registry import global_registry, WidgetRegistry
 from ..registry import WidgetDescription, InputSignal, OutputSignal
 from ..utils import findf
+from ..utils.shtools import atomic_write, rotate_backups
 
 log = logging.getLogger(__name__)
 
@@ -417,7 +427,11 @@ def resolve_replaced(scheme_desc: _scheme, registry: WidgetRegistry) -> _scheme:
 
 def scheme_load(scheme, stream, registry=None, error_handler=None):
     desc = parse_ows_stream(stream)  # type: _scheme
+    return _scheme_load_desc(scheme, desc, registry, error_handler)
+
 
+def _scheme_load_desc(scheme, desc, registry=None, error_handler=None):
+    # type: (Scheme, _scheme, Optional[WidgetRegistry], Optional[Callable[[Exception], None]]) -> Scheme
     if registry is None:
         registry = global_registry()
 
@@ -562,6 +576,43 @@ def scheme_to_etree(scheme, data_format="literal", pickle_fallback=False):
     Return an `xml.etree.ElementTree` representation of the `scheme`.
     """
     builder = TreeBuilder(element_factory=Element)
+    _scheme_to_builder(scheme, builder, data_format, pickle_fallback)
+    root = builder.close()
+    tree = ElementTree(root)
+    return tree
+
+
+#: Cached serialized node properties (node -> (key, (data, format)))
+_properties_cache = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
+
+
+def node_properties_dumps(node, data_format="literal", pickle_fallback=False):
+    # type: (SchemeNode, str, bool) -> Tuple[str, str]
+    """
+    Serialize the `node.properties` using :func:`dumps`.
+
+    The result is cached until a new properties dict is assigned to the
+    node (see :func:`SchemeNode.properties_token`).
+    """
+    key = (node.properties_token(), data_format, pickle_fallback)
+    cached = _properties_cache.get(node)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    res = dumps(node.properties, format=data_format,
+                pickle_fallback=pickle_fallback)
+    _properties_cache[node] = (key, res)
+    return res
+
+
+def _scheme_to_builder(scheme, builder, data_format="literal",
+                       pickle_fallback=False):
+    # type: (Scheme, TreeBuilder, str, bool) -> None
+    """
+    Generate the `scheme`'s xml representation as `builder` events.
+
+    `builder` is a `TreeBuilder` or a compatible (start, data, end)
+    event target.
+    """
     builder.start("scheme", {"version": "2.0",
                              "title": scheme.title or "",
                              "description": scheme.description or ""})
@@ -658,8 +709,10 @@ def scheme_to_etree(scheme, data_format="literal", pickle_fallback=False):
         data = None
         if node.properties:
             try:
-                data, format = dumps(node.properties, format=data_format,
-                                     pickle_fallback=pickle_fallback)
+                data, format = node_properties_dumps(
+                    node, data_format=data_format,
+                    pickle_fallback=pickle_fallback
+                )
             except Exception:
                 log.error("Error serializing properties for node %r",
                           node.title, exc_info=True)
@@ -688,9 +741,92 @@ def scheme_to_etree(scheme, data_format="literal", pickle_fallback=False):
     builder.end("window_group")
     builder.end("session_state")
     builder.end("scheme")
-    root = builder.close()
-    tree = ElementTree(root)
-    return tree
+
+
+class _XMLStreamWriter:
+    """
+    A `TreeBuilder` like event target writing the xml directly to a
+    (binary) stream.
+
+    The output is the same as `ElementTree.write` of the equivalent tree
+    (optionally indented with :func:`indent`).
+    """
+    def __init__(self, stream, pretty=False, indent="\t"):
+        # type: (IO[bytes], bool, str) -> None
+        self.__wrapper = io.TextIOWrapper(
+            stream, encoding="utf-8", errors="xmlcharrefreplace",
+            newline="\n", write_through=True
+        )
+        self.__write = self.__wrapper.write
+        self.__pretty = pretty
+        self.__indent = indent
+        # [tag, has children, start tag is open]
+        self.__stack = []  # type: List[list]
+        self.__write("<?xml version='1.0' encoding='utf-8'?>\n")
+
+    def __close_start(self):
+        top = self.__stack[-1] if self.__stack else None
+        if top is not None and top[2]:
+            self.__write(">")
+            top[2] = False
+
+    def start(self, tag, attrs):
+        # type: (str, Dict[str, str]) -> None
+        stack = self.__stack
+        if stack:
+            self.__close_start()
+            if self.__pretty:
+                self.__write("\n" + self.__indent * len(stack))
+            stack[-1][1] = True
+        self.__write("<" + tag)
+        for key, value in attrs.items():
+            self.__write(' {}="{}"'.format(key, _escape_attrib(value)))
+        stack.append([tag, False, True])
+
+    def data(self, data):
+        # type: (str) -> None
+        if data:
+            self.__close_start()
+            self.__write(_escape_cdata(data))
+
+    def end(self, tag):
+        # type: (str) -> None
+        # Like TreeBuilder, close the current element regardless of `tag`
+        tag, has_children, open_ = self.__stack.pop()
+        if open_:
+            self.__write(" />")
+        else:
+            if has_children and self.__pretty:
+                self.__write("\n" + self.__indent * len(self.__stack))
+            self.__write("</" + tag + ">")
+        if not self.__stack and self.__pretty:
+            self.__write("\n")
+
+    def close(self):
+        # type: () -> None
+        self.__wrapper.flush()
+        self.__wrapper.detach()
+
+
+class _EventRecorder:
+    """
+    Record `TreeBuilder` events for a later replay.
+    """
+    def __init__(self):
+        self.events = []  # type: List[Tuple[str, tuple]]
+
+    def start(self, tag, attrs):
+        self.events.append(("start", (tag, attrs)))
+
+    def data(self, data):
+        self.events.append(("data", (data,)))
+
+    def end(self, tag):
+        self.events.append(("end", (tag,)))
+
+    def replay(self, builder):
+        for method, args in self.events:
+            getattr(builder, method)(*args)
 
 
 def scheme_to_ows_stream(scheme, stream, pretty=False, pickle_fallback=False):
@@ -711,11 +847,206 @@ def scheme_to_ows_stream(scheme, stream, pretty=False, pickle_fallback=False):
         notation.
 
     """
-    tree = scheme_to_etree(scheme, data_format="literal",
-                           pickle_fallback=pickle_fallback)
-    if pretty:
-        indent(tree.getroot(), 0)
-    tree.write(stream, encoding="utf-8", xml_declaration=True)
+    writer = _XMLStreamWriter(stream, pretty=pretty)
+    _scheme_to_builder(scheme, writer, data_format="literal",
+                       pickle_fallback=pickle_fallback)
+    writer.close()
+
+
+def scheme_to_ows_file(scheme, filename, pretty=False, pickle_fallback=False,
+                       executor=None, backups=0):
+    # type: (Scheme, str, bool, bool, Optional[Executor], int) -> Future[None]
+    """
+    Write `scheme` to `filename` in Orange Scheme .ows (v 2.0) format.
+
+    The contents are streamed to a temporary file which then atomically
+    replaces `filename`, i.e. `filename` is never left truncated or only
+    partially written.
+
+    If an `executor` is supplied, the workflow is serialized in the calling
+    thread, but the file is written (and synced to disk) in the executor.
+    Otherwise everything is done synchronously.
+
+    Parameters
+    ----------
+    scheme : :class:`.Scheme`
+        A :class:`.Scheme` instance to serialize.
+    filename : str
+        The target file name.
+    pretty : bool, optional
+        If `True` the output xml will be pretty printed (indented).
+    pickle_fallback : bool, optional
+        See :func:`scheme_to_ows_stream`.
+    executor : Optional[Executor]
+        An optional executor in which to write the file.
+    backups : int
+        The number of previous versions of `filename` to keep (see
+        :func:`.shtools.rotate_backups`). The backups are rotated only
+        after the new contents were completely written and synced to disk,
+        immediately before `filename` is replaced; a failed write leaves
+        them untouched.
+
+    Returns
+    -------
+    future: Future[None]
+        A future that completes when the file was written. In the
+        synchronous case it is already completed; any errors are raised
+        directly and not stored in the future.
+    """
+    def rotate():
+        rotate_backups(filename, backups)
+
+    if executor is None:
+        with atomic_write(filename, "wb", before_replace=rotate) as f:
+            scheme_to_ows_stream(scheme, f, pretty, pickle_fallback)
+        done = Future()  # type: Future[None]
+        done.set_result(None)
+        return done
+
+    recorder = _EventRecorder()
+    _scheme_to_builder(scheme, recorder, data_format="literal",
+                       pickle_fallback=pickle_fallback)
+
+    def write():
+        with atomic_write(filename, "wb", before_replace=rotate) as f:
+            writer = _XMLStreamWriter(f, pretty=pretty)
+            recorder.replay(writer)
+            writer.close()
+    return executor.submit(write)
+
+
+class _Fragment:
+    """
+    A workflow fragment (a subgraph of a workflow) with the interface
+    of a `Scheme` as used by `_scheme_to_builder`.
+    """
+    title = ""
+    description = ""
+    annotations = ()  # type: Sequence[BaseSchemeAnnotation]
+
+    def __init__(self, nodes, links):
+        # type: (Sequence[SchemeNode], Sequence[SchemeLink]) -> None
+        self.nodes = nodes
+        self.links = links
+
+    def window_group_presets(self):
+        return []
+
+
+def _fragment_check(nodes, links):
+    # type: (Sequence[SchemeNode], Sequence[SchemeLink]) -> None
+    nodeset = set(nodes)
+    if any(link.source_node not in nodeset or link.sink_node not in nodeset
+           for link in links):
+        raise ValueError("links must only connect the fragment's nodes")
+
+
+def fragment_to_ows_stream(nodes, links, stream, pickle_fallback=False):
+    # type: (Sequence[SchemeNode], Sequence[SchemeLink], IO[bytes], bool) -> None
+    """
+    Write a workflow fragment (`nodes` and the `links` between them) to
+    a stream in the .ows format.
+
+    The nodes and links are not copied or validated (other than that
+    the links only connect the `nodes`) as they would be when adding
+    them to a temporary `Scheme`.
+
+    The fragment can be loaded with :func:`scheme_load`.
+    """
+    _fragment_check(nodes, links)
+    scheme_to_ows_stream(_Fragment(nodes, links), stream, pretty=False,
+                         pickle_fallback=pickle_fallback)
+
+
+#: Header of the binary fragment format (magic and version)
+FRAGMENT_MAGIC = b"OWSF\x01"
+
+
+def fragment_dumps(nodes, links):
+    # type: (Sequence[SchemeNode], Sequence[SchemeLink]) -> bytes
+    """
+    Serialize a workflow fragment (`nodes` and the `links` between them)
+    to a compact binary format.
+
+    This is a compressed python literal with the same contents as the
+    .ows format. It is meant for short term exchange (e.g. the clipboard).
+
+    Node properties are serialized as python literals without the pickle
+    fallback (a `ValueError` or `TypeError` is raised if they can not be)
+    and :func:`parse_fragment` rejects pickled properties.
+
+    See Also
+    --------
+    fragment_load
+    """
+    _fragment_check(nodes, links)
+    node_ids = {node: i for i, node in enumerate(nodes)}
+    nodes_ = []
+    for node in nodes:
+        desc = node.description
+        data = None
+        if node.properties:
+            data = node_properties_dumps(node)
+        nodes_.append((desc.name, desc.qualified_name, desc.project_name or "",
+                       desc.version or "", node.title,
+                       tuple(map(float, node.position)), data))
+    links_ = [
+        (node_ids[link.source_node], link.source_channel.name,
+         link.source_channel.id or "",
+         node_ids[link.sink_node], link.sink_channel.name,
+         link.sink_channel.id or "", link.enabled)
+        for link in links
+    ]
+    payload = literal_dumps((nodes_, links_), relaxed_types=False)
+    return FRAGMENT_MAGIC + zlib.compress(payload.encode("utf-8"))
+
+
+def parse_fragment(data):
+    # type: (bytes) -> _scheme
+    """
+    Parse the binary fragment format as written by :func:`fragment_dumps`.
+    """
+    if not data.startswith(FRAGMENT_MAGIC):
+        raise InvalidFormatError("Invalid workflow fragment")
+    try:
+        payload = zlib.decompress(data[len(FRAGMENT_MAGIC):]).decode("utf-8")
+        nodes_, links_ = literal_loads(payload)
+        nodes = [
+            _node(str(i), title, name, (float(x), float(y)), project_name,
+                  qualified_name, version,
+                  _data(props[1], props[0]) if props is not None else None)
+            for i, (name, qualified_name, project_name, version, title,
+                    (x, y), props) in enumerate(nodes_)
+        ]
+        links = [
+            _link(str(i), str(source_id), str(sink_id), source_channel,
+                  source_channel_id, sink_channel, sink_channel_id,
+                  bool(enabled))
+            for i, (source_id, source_channel, source_channel_id,
+                    sink_id, sink_channel, sink_channel_id, enabled)
+            in enumerate(links_)
+        ]
+    except (zlib.error, UnicodeDecodeError, SyntaxError, ValueError,
+            TypeError, IndexError) as err:
+        raise InvalidFormatError("Invalid workflow fragment") from err
+    if not all(node.data is None or node.data.format in ("literal", "json")
+               for node in nodes):
+        raise InvalidFormatError("Invalid workflow fragment "
+                                 "(unsupported properties format)")
+    if not all(0 <= int(link.source_node_id) < len(nodes) and
+               0 <= int(link.sink_node_id) < len(nodes) for link in links):
+        raise InvalidFormatError("Invalid workflow fragment")
+    return _scheme("", "2.0", "", nodes, links, [], _session_data([]))
+
+
+def fragment_load(scheme, data, registry=None, error_handler=None):
+    # type: (Scheme, bytes, Optional[WidgetRegistry], Optional[Callable[[Exception], None]]) -> Scheme
+    """
+    Load a binary workflow fragment (see :func:`fragment_dumps`) into
+    `scheme`.
+    """
+    desc = parse_fragment(data)
+    return _scheme_load_desc(scheme, desc, registry, error_handler)
 
 
 def indent(element, level=0, indent="\t"):
@@ -796,7 +1127,7 @@ def dumps(obj, format="literal", prettyprint=False, pickle_fallback=False):
 
 def loads(string, format):
     if format == "literal":
-        return literal_eval(string)
+        return literal_loads(string)
     elif format == "json":
         return json.loads(string)
     elif format == "pickle":
@@ -805,6 +1136,201 @@ def loads(string, format):
         raise ValueError("Unknown format")
 
 
+#: Scalar types allowed in a literal
+_LITERAL_SCALARS = frozenset({int, float, bool, type(None), str, bytes})
+#: Scalar types for which repr(list_of_them) is the literal without further
+#: checks
+_LITERAL_NON_FLOAT_SCALARS = _LITERAL_SCALARS - {float}
+
+
+def _all_finite(values, types):
+    # type: (Iterable[Any], Set[type]) -> bool
+    if types <= {int, float, bool}:
+        try:
+            return all(map(math.isfinite, values))
+        except OverflowError:  # int too large to convert to float
+            pass
+    return all(math.isfinite(v) for v in values if type(v) is float)
+
+
+def _literal_encode(obj, write, relaxed_types=True):
+    # type: (Any, Optional[Callable[[str], Any]], bool) -> None
+    """
+    Validate and write `obj` as a python literal (the same as `repr(obj)`)
+    in a single pass using `write`.
+
+    If `write` is None the `obj` is only validated.
+    """
+    if write is None:
+        def write(_):
+            pass
+        repr_ = type
+    else:
+        repr_ = repr
+    # ids of containers currently being encoded (for cycle detection)
+    active = set()  # type: Set[int]
+    scalars = _LITERAL_SCALARS
+
+    def fast_path(values):
+        # Can `values` be written with a single repr call
+        types = set(map(type, values))
+        if types <= _LITERAL_NON_FLOAT_SCALARS:
+            return True
+        elif types <= scalars:
+            return _all_finite(values, types)
+        return False
+
+    def enter(obj):
+        if id(obj) in active:
+            raise ValueError("{0} is a recursive structure".format(obj))
+        active.add(id(obj))
+
+    def encode(obj):
+        type_ = type(obj)
+        if type_ is float:
+            if not math.isfinite(obj):
+                raise TypeError("Non-finite values can not be "
+                                "serialized as a python literal")
+            write(repr_(obj))
+        elif type_ in scalars:
+            write(repr_(obj))
+        elif type_ is list or type_ is tuple:
+            if fast_path(obj):
+                write(repr_(obj))
+                return
+            enter(obj)
+            write("[" if type_ is list else "(")
+            for i, item in enumerate(obj):
+                if i:
+                    write(", ")
+                encode(item)
+            if type_ is list:
+                write("]")
+            else:
+                write(",)" if len(obj) == 1 else ")")
+            active.discard(id(obj))
+        elif type_ is dict:
+            if fast_path(obj.keys()) and fast_path(obj.values()):
+                write(repr_(obj))
+                return
+            enter(obj)
+            write("{")
+            for i, (key, value) in enumerate(obj.items()):
+                if i:
+                    write(", ")
+                encode(key)
+                write(": ")
+                encode(value)
+            write("}")
+            active.discard(id(obj))
+        elif relaxed_types and isinstance(obj, numbers.Real):
+            if not math.isfinite(obj):
+                raise TypeError("Non-finite values can not be "
+                                "serialized as a python literal")
+            r = repr(obj)
+            # numpy.int, uint, ...; numpy.float, ...
+            if isinstance(obj, numbers.Integral):
+                if r == repr(int(obj)):
+                    write(r)
+                    return
+            elif r == repr(float(obj)):
+                write(r)
+                return
+            raise TypeError("{0} can not be serialized as a python "
+                            "literal".format(type(obj)))
+        else:
+            raise TypeError("{0} can not be serialized as a python "
+                            "literal".format(type(obj)))
+    encode(obj)
+
+
+def _literal_pformat(obj, indent=1, width=160):
+    # type: (Any, int, int) -> str
+    """
+    Pretty format `obj` (which must already be validated as a literal)
+    breaking the containers that do not fit into `width`.
+    """
+    # For a validated literal repr is the same as _literal_encode
+    _literal_repr = repr
+    parts = []  # type: List[str]
+    write = parts.append
+    brackets = {list: ("[", "]"), tuple: ("(", ")"), dict: ("{", "}")}
+
+    def pformat(obj, column):
+        # type: (Any, int) -> None
+        # `column` is the current column at which `obj` starts
+        type_ = type(obj)
+        if type_ not in brackets or not obj:
+            write(_literal_repr(obj))
+            return
+        # Every item takes at least 3 characters (including ', ')
+        if column + 3 * len(obj) <= width:
+            r = _literal_repr(obj)
+            if column + len(r) <= width:
+                write(r)
+                return
+        open_, close = brackets[type_]
+        if type_ is tuple and len(obj) == 1:
+            close = ",)"
+        write(open_ + " " * (indent - 1))
+        item_column = column + indent
+        line_column = item_column
+        if type_ is not dict and \
+                set(map(type, obj)).isdisjoint(brackets):
+            # Only scalars; pack them into lines
+            reprs = list(map(repr, obj))
+            reprs[-1] += close
+            separator = ",\n" + " " * item_column
+            line = []  # type: List[str]
+            for r in reprs:
+                if line and line_column + 2 + len(r) > width:
+                    write(", ".join(line))
+                    write(separator)
+                    line = []
+                    line_column = item_column
+                line.append(r)
+                line_column += len(r) + 2
+            write(", ".join(line))
+            return
+        if type_ is dict:
+            items = [(_literal_repr(k), v) for k, v in obj.items()]
+        else:
+            items = [(None, v) for v in obj]
+        last = len(items) - 1
+        for i, (key, value) in enumerate(items):
+            # Pack short scalars compactly; break before everything else
+            if key is None and type(value) not in brackets:
+                r = _literal_repr(value)
+            else:
+                r = None
+            tail = len(close) if i == last else 1
+            if i:
+                if r is not None and \
+                        line_column + 1 + len(r) + tail <= width:
+                    write(" ")
+                    line_column += 1
+                else:
+                    write("\n" + " " * item_column)
+                    line_column = item_column
+            if r is not None:
+                write(r)
+                line_column += len(r)
+            else:
+                if key is not None:
+                    write(key + ": ")
+                    line_column += len(key) + 2
+                pformat(value, line_column)
+                # the next item always starts on a new line
+                line_column = width
+            if i != last:
+                write(",")
+                line_column += 1
+        write(close)
+
+    pformat(obj, 0)
+    return "".join(parts)
+
+
 # This is a subset of PyON serialization.
 def literal_dumps(obj, indent=None, relaxed_types=True):
     """
@@ -845,76 +1371,195 @@ def literal_dumps(obj, indent=None, relaxed_types=True):
     ValueError
         If obj is a recursive structure.
     """
-    memo = {}
-    # non compounds
-    builtins = {int, float, bool, type(None), str, bytes}
-    # sequences
-    builtins_seq = {list, tuple}
-    # mappings
-    builtins_mapping = {dict}
-
-    def check(obj):
-        if type(obj) == float and not math.isfinite(obj):
-            raise TypeError("Non-finite values can not be "
-                            "serialized as a python literal")
-
-        if type(obj) in builtins:
-            return True
-
-        if id(obj) in memo:
-            raise ValueError("{0} is a recursive structure".format(obj))
-
-        memo[id(obj)] = obj
-
-        if type(obj) in builtins_seq:
-            return all(map(check, obj))
-        elif type(obj) in builtins_mapping:
-            return all(map(check, chain(obj.keys(), obj.values())))
-        else:
-            raise TypeError("{0} can not be serialized as a python "
-                            "literal".format(type(obj)))
+    if indent is not None:
+        _literal_encode(obj, None, relaxed_types)
+        return _literal_pformat(obj, indent=indent, width=80 * 2)
+    else:
+        parts = []  # type: List[str]
+        _literal_encode(obj, parts.append, relaxed_types)
+        return "".join(parts)
+
+
+_LITERAL_TOKEN = re.compile(r"""
+  [ \t\n]*(?:
+    (?P<number>-?(?:0|[1-9][0-9]*)(?P<float>\.[0-9]*)?(?P<exp>[eE][-+]?[0-9]+)?
+     (?![0-9A-Za-z_.]))
+   |(?P<string>b?(?:'[^'\\\n]*(?:\\.[^'\\\n]*)*'|"[^"\\\n]*(?:\\.[^"\\\n]*)*"))
+   |(?P<name>(?:True|False|None)(?![0-9A-Za-z_]))
+   |(?P<open>[\[({])
+   |(?P<close>[\])}])
+   |(?P<comma>,)
+   |(?P<colon>:)
+  )
+""", re.VERBOSE)
+
+_LITERAL_NUMBER = r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]*)?(?:[eE][-+]?[0-9]+)?"
+
+#: A flat list of numbers as written by repr
+_LITERAL_NUMBER_LIST = re.compile(
+    r"\[({0}(?:, {0})*)\]".format(_LITERAL_NUMBER)
+)
 
-    def check_relaxed(obj):
-        if isinstance(obj, numbers.Real) and not math.isfinite(obj):
-            raise TypeError("Non-finite values can not be "
-                            "serialized as a python literal")
+_LITERAL_NAMES = {"True": True, "False": False, "None": None}
 
-        if type(obj) in builtins:
-            return True
+_LITERAL_CLOSE = {"[": "]", "(": ")", "{": "}"}
 
-        if id(obj) in memo:
-            raise ValueError("{0} is a recursive structure".format(obj))
 
-        memo[id(obj)] = obj
+class _LiteralParseError(ValueError):
+    pass
 
-        if type(obj) in builtins_seq:
-            return all(map(check_relaxed, obj))
-        elif type(obj) in builtins_mapping:
-            return all(map(check_relaxed, chain(obj.keys(), obj.values())))
 
-        # numpy.int, uint, ...
-        elif isinstance(obj, numbers.Integral):
-            if repr(obj) == repr(int(obj)):
-                return True
-        # numpy.float, ...
-        elif isinstance(obj, numbers.Real):
-            if repr(obj) == repr(float(obj)):
-                return True
+def _literal_parse(string):
+    # type: (str) -> Any
+    """
+    Parse a python literal as written by :func:`literal_dumps`.
 
-        raise TypeError("{0} can not be serialized as a python "
-                        "literal".format(type(obj)))
+    This only supports the subset of the literal syntax produced by
+    `repr` (and the pretty printer) and raises a `_LiteralParseError` on
+    anything else.
+    """
+    match = _LITERAL_TOKEN.match
+    number_list = _LITERAL_NUMBER_LIST.match
+    names = _LITERAL_NAMES
+    end = len(string)
+    # A stack of open containers [open bracket, items, expect value,
+    # has comma]; for dicts the items alternate between keys and values.
+    stack = []  # type: List[list]
+    result = []  # type: List[Any]
+    pos = 0
+    top = None  # type: Optional[list]
+
+    def error(pos):
+        return _LiteralParseError("Invalid literal at {}".format(pos))
+
+    while True:
+        m = match(string, pos)
+        if m is None:
+            if pos < end and not string[pos:].isspace():
+                raise error(pos)
+            break
+        pos = m.end()
+        kind = m.lastgroup
+        if kind in ("number", "string", "name", "open"):
+            # A value
+            if top is not None and not top[2]:
+                raise error(m.start())
+            if kind == "number":
+                token = m.group(kind)
+                if m.group("float") is None and m.group("exp") is None:
+                    value = int(token)
+                else:
+                    value = float(token)
+            elif kind == "string":
+                token = m.group(kind)
+                if "\\" in token:
+                    value = literal_eval(token)
+                elif token[0] == "b":
+                    try:
+                        value = token[2:-1].encode("ascii")
+                    except UnicodeEncodeError:
+                        raise error(m.start()) from None
+                else:
+                    value = token[1:-1]
+            elif kind == "name":
+                value = names[m.group(kind)]
+            else:
+                bracket = m.group(kind)
+                if bracket == "[":
+                    # flat numeric list fast path
+                    nm = number_list(string, m.start(kind))
+                    if nm is not None:
+                        pos = nm.end()
+                        tokens = nm.group(1).split(", ")
+                        body = nm.group(1)
+                        if "." in body or "e" in body or "E" in body:
+                            value = [
+                                float(t) if ("." in t or "e" in t or
+                                             "E" in t) else int(t)
+                                for t in tokens
+                            ]
+                        else:
+                            value = list(map(int, tokens))
+                    else:
+                        top = [bracket, [], True, False]
+                        stack.append(top)
+                        continue
+                else:
+                    top = [bracket, [], True, False]
+                    stack.append(top)
+                    continue
+            if top is None:
+                if result:
+                    raise error(m.start())
+                result.append(value)
+            else:
+                top[1].append(value)
+                top[2] = False
+        elif kind == "comma" or kind == "colon":
+            if top is None or top[2]:
+                raise error(m.start())
+            items = top[1]
+            if top[0] == "{":
+                # keys are at even, values at odd positions
+                expect_colon = len(items) % 2 == 1
+                if (kind == "colon") != expect_colon:
+                    raise error(m.start())
+            elif kind == "colon":
+                raise error(m.start())
+            if kind == "comma":
+                top[3] = True
+            top[2] = True
+        else:  # close
+            bracket = m.group(kind)
+            if top is None or _LITERAL_CLOSE[top[0]] != bracket:
+                raise error(m.start())
+            open_, items, expect_value, has_comma = stack.pop()
+            if expect_value and items and not has_comma:
+                raise error(m.start())
+            if open_ == "[":
+                value = items
+            elif open_ == "(":
+                if len(items) == 1 and not has_comma:
+                    # A parenthesized expression
+                    value = items[0]
+                else:
+                    value = tuple(items)
+            else:
+                if len(items) % 2:
+                    # a set or a dangling key
+                    raise error(m.start())
+                value = dict(zip(items[::2], items[1::2]))
+            top = stack[-1] if stack else None
+            if top is None:
+                if result:
+                    raise error(m.start())
+                result.append(value)
+            else:
+                top[1].append(value)
+                top[2] = False
+    if stack or not result:
+        raise error(pos)
+    return result[0]
 
-    if relaxed_types:
-        check_relaxed(obj)
-    else:
-        check(obj)
 
-    if indent is not None:
-        return pprint.pformat(obj, width=80 * 2, indent=indent, compact=True)
-    else:
-        return repr(obj)
+def literal_loads(string):
+    # type: (str) -> Any
+    """
+    Evaluate a python literal `string` (as written by :func:`literal_dumps`).
 
+    This is equivalent to `ast.literal_eval` for the literals written by
+    `literal_dumps`, but avoids building the full syntax tree for large
+    payloads.
 
-literal_loads = literal_eval
+    See Also
+    --------
+    ast.literal_eval
+    """
+    if len(string) > 2048:
+        try:
+            return _literal_parse(string)
+        except (_LiteralParseError, RecursionError):
+            pass
+    return literal_eval(string)
 
 from .scheme import Scheme  # pylint: disable=all
@@ -10,10 +10,11 @@ import types
 import logging
 from contextlib import ExitStack
 from operator import itemgetter
-from collections import deque
 
 import typing
-from typing import List, Tuple, Optional, Set, Dict, Any, Mapping
+from typing import (
+    List, Tuple, Optional, Set, Dict, Any, Mapping, Iterable, Sequence
+)
 
 from AnyQt.QtCore import QObject, QCoreApplication
 from AnyQt.QtCore import pyqtSignal as Signal, pyqtProperty as Property
@@ -21,7 +22,9 @@ from AnyQt.QtCore import pyqtSignal as Signal, pyqtProperty as Property
 from .node import SchemeNode
 from .link import SchemeLink, compatible_channels, _classify_connection
 from .annotations import BaseSchemeAnnotation
-from ..utils import check_arg, findf
+from ..utils import check_arg
+from ..utils.graph import Graph, traverse_bf
+from ..utils.shtools import atomic_write
 
 from .errors import (
     SchemeCycleError, IncompatibleChannelTypeError, SinkChannelError,
@@ -69,6 +72,13 @@ class Scheme(QObject):
     # Signal emitted when a `node` is removed from the scheme.
     node_removed = Signal(SchemeNode)
 
+    # Signal emitted before the positions of multiple `nodes` are changed
+    # (see `set_node_positions`).
+    node_positions_about_to_change = Signal(list)
+
+    # Signal emitted after the positions of multiple `nodes` were changed.
+    node_positions_changed = Signal(list)
+
     # Signal emitted when a `link` is added to the scheme.
     link_added = Signal(SchemeLink)
 
@@ -110,8 +120,14 @@ class Scheme(QObject):
         self.__annotations = []  # type: List[BaseSchemeAnnotation]
         self.__nodes = []        # type: List[SchemeNode]
         self.__links = []        # type: List[SchemeLink]
+        # Links indexed by their source and sink nodes (in `__links` order)
+        self.__links_by_source = {}  # type: Dict[SchemeNode, List[SchemeLink]]
+        self.__links_by_sink = {}    # type: Dict[SchemeNode, List[SchemeLink]]
         self.__loop_flags = Scheme.NoLoops
         self.__env = dict(env)   # type: Dict[str, Any]
+        # Cached node graphs (over all and over enabled links); cleared when
+        # the topology changes.
+        self.__graphs = {}  # type: Dict[bool, Graph[SchemeNode]]
 
     @property
     def nodes(self):
@@ -202,6 +218,7 @@ class Scheme(QObject):
         check_arg(node not in self.__nodes,
                   "Node already in scheme.")
         self.__nodes.insert(index, node)
+        self.__graphs.clear()
 
         ev = NodeEvent(NodeEvent.NodeAdded, node, index)
         QCoreApplication.sendEvent(self, ev)
@@ -266,24 +283,48 @@ class Scheme(QObject):
         self.__remove_node_links(node)
         index = self.__nodes.index(node)
         self.__nodes.pop(index)
+        self.__graphs.clear()
         ev = NodeEvent(NodeEvent.NodeRemoved, node, index)
         QCoreApplication.sendEvent(self, ev)
         log.info("Removed node %r from scheme %r." % (node.title, self.title))
         self.node_removed.emit(node)
         return node
 
+    def set_node_positions(self, nodes, positions):
+        # type: (Sequence[SchemeNode], Sequence[Tuple[float, float]]) -> None
+        """
+        Set the positions of multiple `nodes` at once.
+
+        Each node emits its `position_changed` signal as with
+        :attr:`SchemeNode.position`, but the changes are enclosed by the
+        `node_positions_about_to_change` and `node_positions_changed`
+        signals so views can update once for the whole batch.
+
+        Parameters
+        ----------
+        nodes : Sequence[SchemeNode]
+        positions : Sequence[Tuple[float, float]]
+            The new positions (parallel to `nodes`).
+        """
+        nodes = list(nodes)
+        positions = list(positions)
+        check_arg(len(nodes) == len(positions),
+                  "'nodes' and 'positions' must have the same length")
+        self.node_positions_about_to_change.emit(nodes)
+        try:
+            for node, pos in zip(nodes, positions):
+                node.position = pos
+        finally:
+            self.node_positions_changed.emit(nodes)
+
     def __remove_node_links(self, node):
         # type: (SchemeNode) -> None
         """
         Remove all links for node.
         """
-        links_in, links_out = [], []
-        for link in self.__links:
-            if link.source_node is node:
-                links_out.append(link)
-            elif link.sink_node is node:
-                links_in.append(link)
-
+        links_out = self.__links_by_source.get(node, [])
+        links_in = [link for link in self.__links_by_sink.get(node, [])
+                    if link.source_node is not node]
         for link in links_out + links_in:
             self.remove_link(link)
 
@@ -293,18 +334,20 @@ class Scheme(QObject):
         """
         assert isinstance(link, SchemeLink)
         self.check_connect(link)
+        append = index >= len(self.__links)
         self.__links.insert(index, link)
-        source_index, _ = findf(
-            enumerate(self.find_links(source_node=link.source_node)),
-            lambda t: t[1] == link,
-            default=(-1, None)
-        )
-        sink_index, _ = findf(
-            enumerate(self.find_links(sink_node=link.sink_node)),
-            lambda t: t[1] == link,
-            default=(-1, None)
-        )
-        assert sink_index != -1 and source_index != -1
+        for node, links_index, key in [
+                (link.source_node, self.__links_by_source, "source_node"),
+                (link.sink_node, self.__links_by_sink, "sink_node")]:
+            if append or node not in links_index:
+                links_index.setdefault(node, []).append(link)
+            else:
+                links_index[node] = [other for other in self.__links
+                                     if getattr(other, key) is node]
+        self.__graphs.clear()
+        link.enabled_changed.connect(self.__on_link_enabled_changed)
+        source_index = self.__links_by_source[link.source_node].index(link)
+        sink_index = self.__links_by_sink[link.sink_node].index(link)
         QCoreApplication.sendEvent(
             link.source_node,
             LinkEvent(LinkEvent.OutputLinkAdded, link, source_index)
@@ -380,19 +423,18 @@ class Scheme(QObject):
         """
         check_arg(link in self.__links,
                   "Link is not in the scheme.")
-        source_index, _ = findf(
-            enumerate(self.find_links(source_node=link.source_node)),
-            lambda t: t[1] == link,
-            default=(-1, None)
-        )
-        sink_index, _ = findf(
-            enumerate(self.find_links(sink_node=link.sink_node)),
-            lambda t: t[1] == link,
-            default=(-1, None)
-        )
-        assert sink_index != -1 and source_index != -1
+        source_index = self.__links_by_source[link.source_node].index(link)
+        sink_index = self.__links_by_sink[link.sink_node].index(link)
         index = self.__links.index(link)
         self.__links.pop(index)
+        for node, links_index in [(link.source_node, self.__links_by_source),
+                                  (link.sink_node, self.__links_by_sink)]:
+            links = links_index[node]
+            links.remove(link)
+            if not links:
+                del links_index[node]
+        self.__graphs.clear()
+        link.enabled_changed.disconnect(self.__on_link_enabled_changed)
         QCoreApplication.sendEvent(
             link.sink_node,
             LinkEvent(LinkEvent.InputLinkRemoved, link, sink_index)
@@ -472,9 +514,15 @@ class Scheme(QObject):
         """
         assert isinstance(link, SchemeLink)
         source_node, sink_node = link.source_node, link.sink_node
-        upstream = self.upstream_nodes(source_node)
-        upstream.add(source_node)
-        return sink_node in upstream
+
+        def children(node):
+            # type: (SchemeNode) -> List[SchemeNode]
+            return [out.sink_node
+                    for out in self.__links_by_source.get(node, [])]
+        # Is the source reachable from the sink (usually the sink has few
+        # or no descendants when the link is being added)
+        return any(node is source_node
+                   for node in traverse_bf(sink_node, children))
 
     def compatible_channels(self, link):
         # type: (SchemeLink) -> bool
@@ -506,6 +554,33 @@ class Scheme(QObject):
                 SinkChannelError, DuplicatedLinkError):
             return False
 
+    def graph(self, enabled_only=False):
+        # type: (bool) -> Graph[SchemeNode]
+        """
+        Return the workflow's node graph (with an edge for every link, in
+        the order of :attr:`links`).
+
+        The graph is cached until the workflow's nodes or links (or, if
+        `enabled_only` is `True`, the links' enabled state) change.
+
+        Parameters
+        ----------
+        enabled_only : bool
+            Only include the enabled links.
+        """
+        graph = self.__graphs.get(enabled_only)
+        if graph is None:
+            graph = Graph(
+                self.__nodes,
+                ((link.source_node, link.sink_node) for link in self.__links
+                 if link.enabled or not enabled_only)
+            )
+            self.__graphs[enabled_only] = graph
+        return graph
+
+    def __on_link_enabled_changed(self):
+        self.__graphs.pop(True, None)
+
     def upstream_nodes(self, start_node):
         # type: (SchemeNode) -> Set[SchemeNode]
         """
@@ -517,16 +592,10 @@ class Scheme(QObject):
         start_node : :class:`.SchemeNode`
 
         """
-        visited = set()  # type: Set[SchemeNode]
-        queue = deque([start_node])
-        while queue:
-            node = queue.popleft()
-            snodes = [link.source_node for link in self.input_links(node)]
-            for source_node in snodes:
-                if source_node not in visited:
-                    queue.append(source_node)
-
-            visited.add(node)
+        graph = self.graph()
+        if start_node not in graph:
+            return set()
+        visited = graph.reversed().reachable(start_node)
         visited.remove(start_node)
         return visited
 
@@ -540,16 +609,10 @@ class Scheme(QObject):
         start_node : :class:`.SchemeNode`
 
         """
-        visited = set()  # type: Set[SchemeNode]
-        queue = deque([start_node])
-        while queue:
-            node = queue.popleft()
-            snodes = [link.sink_node for link in self.output_links(node)]
-            for source_node in snodes:
-                if source_node not in visited:
-                    queue.append(source_node)
-
-            visited.add(node)
+        graph = self.graph()
+        if start_node not in graph:
+            return set()
+        visited = graph.reachable(start_node)
         visited.remove(start_node)
         return visited
 
@@ -600,14 +663,27 @@ class Scheme(QObject):
     def find_links(self, source_node=None, source_channel=None,
                    sink_node=None, sink_channel=None):
         # type: (Optional[SchemeNode], Optional[OutputSignal], Optional[SchemeNode], Optional[InputSignal]) -> List[SchemeLink]
-        # TODO: Speedup - keep index of links by nodes and channels
         result = []
 
         def match(query, value):
             # type: (Optional[T], T) -> bool
             return query is None or value == query
 
-        for link in self.__links:
+        if source_node is not None:
+            links = self.__links_by_source.get(source_node, [])
+            if sink_node is not None:
+                links = min(links, self.__links_by_sink.get(sink_node, []),
+                            key=len)
+        elif sink_node is not None:
+            links = self.__links_by_sink.get(sink_node, [])
+        else:
+            links = self.__links
+
+        if source_channel is None and sink_channel is None and \
+                (source_node is None or sink_node is None):
+            return list(links)
+
+        for link in links:
             if match(source_node, link.source_node) and \
                     match(sink_node, link.sink_node) and \
                     match(source_channel, link.source_channel) and \
@@ -735,17 +811,31 @@ class Scheme(QObject):
         """
         pass
 
+    def sync_node_properties_for(self, nodes):
+        # type: (Iterable[SchemeNode]) -> None
+        """
+        Sync the properties of `nodes` (e.g. before copying a part of the
+        workflow).
+
+        This is an extension point for subclasses that can sync individual
+        nodes. The default implementation does not scope the sync and
+        calls :func:`sync_node_properties`.
+        """
+        self.sync_node_properties()
+
     def save_to(self, stream, pretty=True, **kwargs):
         """
         Save the scheme as an xml formatted file to `stream`
 
+        If `stream` is a filename the file is replaced atomically.
+
         See also
         --------
         readwrite.scheme_to_ows_stream
         """
         with ExitStack() as exitstack:
             if isinstance(stream, str):
-                stream = exitstack.enter_context(open(stream, "wb"))
+                stream = exitstack.enter_context(atomic_write(stream, "wb"))
             self.sync_node_properties()
             readwrite.scheme_to_ows_stream(self, stream, pretty, **kwargs)
 
@@ -8,20 +8,23 @@ widgets in a scheme workflow.
 
 """
 import os
+import sys
+import enum
+import pickle
 import logging
 import warnings
-import enum
+import tempfile
 import functools
 
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from operator import attrgetter
-from functools import partial, reduce
+from functools import reduce
 from itertools import chain
 
 import typing
 from typing import (
     Any, Optional, List, NamedTuple, Set, Dict, Callable,
-    Sequence, Union, DefaultDict, Type
+    Sequence, Union, DefaultDict, Type, Tuple
 )
 
 from AnyQt.QtCore import QObject, QTimer, QSettings, QEvent
@@ -29,9 +32,10 @@ from AnyQt.QtCore import pyqtSignal, pyqtSlot as Slot
 
 from . import LinkEvent
 from ..utils import unique, mapping_get, group_by_all
+from ..utils.graph import Graph
+from ..utils.settings import SettingsNotifier
 from ..registry import OutputSignal, InputSignal
 from .scheme import Scheme, SchemeNode, SchemeLink
-from ..utils.graph import traverse_bf, strongly_connected_components
 
 if typing.TYPE_CHECKING:
     V = typing.TypeVar("V")
@@ -245,6 +249,47 @@ class _OutputState:
     __str__ = __repr__
 
 
+@functools.singledispatch
+def estimate_size(value):
+    # type: (Any) -> int
+    """
+    Estimate the memory size (in bytes) of an output `value`.
+
+    The default uses :func:`sys.getsizeof` (i.e. the object's `__sizeof__`).
+    Estimators for specific types can be registered with
+    ``estimate_size.register(type, func)``.
+
+    See Also
+    --------
+    SignalManager.set_memory_budget
+    """
+    return sys.getsizeof(value)
+
+
+class _SpilledValue:
+    """An output value evicted (pickled) to a spill file."""
+    __slots__ = ("filename",)
+
+    def __init__(self, filename):
+        # type: (str) -> None
+        self.filename = filename
+
+    def load(self):
+        # type: () -> Any
+        with open(self.filename, "rb") as f:
+            return pickle.load(f)
+
+    def discard(self):
+        # type: () -> None
+        try:
+            os.remove(self.filename)
+        except OSError:
+            log.warning("Could not remove %r", self.filename, exc_info=True)
+
+    def __repr__(self):
+        return "_SpilledValue({!r})".format(self.filename)
+
+
 class _LinkExtra:
     """Extra data tracked for a SchemeLink"""
     __slots__ = ("flags",)
@@ -309,6 +354,11 @@ class SignalManager(QObject):
     Waiting = RuntimeState.Waiting
     Processing = RuntimeState.Processing
 
+    #: The number of times lighter nodes can be admitted ahead of an
+    #: eligible node that does not fit in the free capacity, before the
+    #: capacity is reserved for it.
+    MaxBypass = 2
+
     #: Emitted when the state of the signal manager changes.
     stateChanged = pyqtSignal(int)
     #: Emitted when signals are added to the queue.
@@ -329,14 +379,24 @@ class SignalManager(QObject):
     #: emitting `finished`.
     started = pyqtSignal()
 
-    def __init__(self, parent=None, *, max_running=None, **kwargs):
-        # type: (Optional[QObject], Optional[int], Any) -> None
+    def __init__(self, parent=None, *, max_running=None, memory_budget=None,
+                 **kwargs):
+        # type: (Optional[QObject], Optional[int], Optional[int], Any) -> None
         super().__init__(parent, **kwargs)
         self.__workflow = None  # type: Optional[Scheme]
         self.__input_queue = []  # type: List[Signal]
 
         # mapping a node to its current outputs
         self.__node_outputs = {}  # type: Dict[SchemeNode, DefaultDict[OutputSignal, _OutputState]]
+        #: Estimated sizes of the resident (not spilled) output values in
+        #: least recently sent order.
+        self.__resident = OrderedDict()  # type: typing.OrderedDict[Tuple[SchemeNode, OutputSignal], int]
+        #: Resident outputs that could not be spilled (until next send)
+        self.__unspillable = set()  # type: Set[Tuple[SchemeNode, OutputSignal]]
+        self.__memory_budget = memory_budget  # type: Optional[int]
+        self.__spill_dir = None  # type: Optional[str]
+        self.__spill_tempdir = None  # type: Optional[tempfile.TemporaryDirectory]
+        self.__size_estimator = estimate_size  # type: Callable[[Any], int]
 
         #: Extra link state
         self.__link_extra = defaultdict(_LinkExtra)  # type: DefaultDict[SchemeLink, _LinkExtra]
@@ -346,6 +406,19 @@ class SignalManager(QObject):
         self.__update_timer = QTimer(self, interval=100, singleShot=True)
         self.__update_timer.timeout.connect(self.__process_next)
         self.__max_running = max_running
+        #: Cached resolved `max_active()` value
+        self.__max_active = None  # type: Optional[int]
+        #: Runtime overrides of node resource weights
+        self.__resource_weights = {}  # type: Dict[SchemeNode, int]
+        #: The number of times lighter nodes were admitted ahead of a
+        #: waiting node
+        self.__bypassed = {}  # type: Dict[SchemeNode, int]
+        #: Cached topological order (node -> index) for the workflow graph
+        self.__order_graph = None  # type: Optional[Graph[SchemeNode]]
+        self.__order = {}  # type: Dict[SchemeNode, int]
+        SettingsNotifier.instance().settingsChanged.connect(
+            self.__on_settings_changed
+        )
         self.__has_finished = True
         if isinstance(parent, Scheme):
             self.set_workflow(parent)
@@ -391,8 +464,14 @@ class SignalManager(QObject):
             self.__workflow.link_added.disconnect(self.__on_link_added)
             self.__workflow.link_removed.disconnect(self.__on_link_removed)
             self.__workflow.removeEventFilter(self)
+            for node in self.__node_outputs:
+                self.__release_outputs(node)
             self.__node_outputs = {}
             self.__input_queue = []
+            self.__resource_weights = {}
+            self.__bypassed = {}
+            self.__order_graph = None
+            self.__order = {}
 
         self.__workflow = workflow
 
@@ -515,7 +594,9 @@ class SignalManager(QObject):
         log.info("Removing pending signals for '%s'.", node.title)
         self.remove_pending_signals(node)
 
+        self.__release_outputs(node)
         del self.__node_outputs[node]
+        self.__resource_weights.pop(node, None)
         node.state_changed.disconnect(self._update)
         node.removeEventFilter(self)
 
@@ -559,7 +640,7 @@ class SignalManager(QObject):
             link = event.link()
             log.info("Scheduling close signal (%s).", link)
             signals: List[Signal] = [Signal.Close(link, None, id, event.pos())
-                                     for id in self.link_contents(link)]
+                                     for id in self.__link_contents(link)]
             self._schedule(signals)
         return super().eventFilter(recv, event)
 
@@ -587,7 +668,19 @@ class SignalManager(QObject):
         # type: (SchemeLink) -> Dict[Any, Any]
         """
         Return the contents on the `link`.
+
+        Values that were spilled to disk (see `set_memory_budget`) are
+        reloaded.
         """
+        contents = self.__link_contents(link)
+        if any(isinstance(v, _SpilledValue) for v in contents.values()):
+            contents = {key: value.load() if isinstance(value, _SpilledValue)
+                        else value for key, value in contents.items()}
+        return contents
+
+    def __link_contents(self, link):
+        # type: (SchemeLink) -> Dict[Any, Any]
+        # Return the link contents without reloading the spilled values.
         node, channel = link.source_node, link.source_channel
 
         if node in self.__node_outputs:
@@ -656,8 +749,11 @@ class SignalManager(QObject):
         else:
             sigtype = Signal.New
 
+        self.__release_output(node, channel)
         state.outputs[id] = value
         assert len(state.outputs) == 1
+        if value is not None and not LazyValue.is_lazy(value):
+            self.__resident[node, channel] = self.__size_estimator(value)
         # clear invalidated flag
         if state.flags & _OutputState.Invalidated:
             log.debug("%r clear invalidated flag on channel %r",
@@ -682,6 +778,7 @@ class SignalManager(QObject):
             link.set_runtime_state_flag(SchemeLink.Invalidated, False)
 
         self._schedule(signals)
+        self.__enforce_memory_budget()
 
     def invalidate(self, node, channel):
         # type: (SchemeNode, OutputSignal) -> None
@@ -726,7 +823,7 @@ class SignalManager(QObject):
             "`purge_link` is deprecated.", DeprecationWarning, stacklevel=2
         )
         self._schedule([Signal(link, None, id)
-                        for id in self.link_contents(link)])
+                        for id in self.__link_contents(link)])
 
     def _schedule(self, signals):
         # type: (List[Signal]) -> None
@@ -742,7 +839,7 @@ class SignalManager(QObject):
 
         for link in {sig.link for sig in signals}:
             # update the SchemeLink's runtime state flags
-            contents = self.link_contents(link)
+            contents = self.__link_contents(link)
             if any(value is not None for value in contents.values()):
                 state = SchemeLink.Active
             else:
@@ -849,6 +946,8 @@ class SignalManager(QObject):
             self.processingFinished.emit()
             self.processingFinished[SchemeNode].emit(node)
             self._set_runtime_state(SignalManager.Waiting)
+        # The delivered outputs can now be spilled
+        self.__enforce_memory_budget()
 
     def compress_signals(self, signals):
         # type: (List[Signal]) -> List[Signal]
@@ -1103,9 +1202,8 @@ class SignalManager(QObject):
         if self.__workflow is None:
             return []
         workflow = self.__workflow
-        expand = partial(expand_node, workflow)
-
-        components = strongly_connected_components(workflow.nodes, expand)
+        components = workflow.graph(enabled_only=True) \
+                             .strongly_connected_components()
         node_scc = {node: scc for scc in components for node in scc}
 
         def isincycle(node):  # type: (SchemeNode) -> bool
@@ -1185,13 +1283,14 @@ class SignalManager(QObject):
         eligible = [n for n in self.node_update_front() if self.is_ready(n)]
         if not eligible:
             return False
-        max_active = self.max_active()
-        nactive = len(set(self.active_nodes()) | set(self.blocking_nodes()))
+        eligible = self.__prioritized(eligible)
+        capacity = self.max_active()
+        used = self.__used_capacity()
 
         log.debug(
-            "Process next, queued signals: %i, nactive: %i "
+            "Process next, queued signals: %i, used: %i "
             "(max_active: %i)",
-            len(self.__input_queue), nactive, max_active
+            len(self.__input_queue), used, capacity
         )
         _ = lambda nodes: list(map(attrgetter('title'), nodes))
         log.debug("Pending nodes: %s", _(self.pending_nodes()))
@@ -1207,17 +1306,98 @@ class SignalManager(QObject):
                 selected_node = node
                 break
 
-        # Return if over committed, except in the case that the selected_node
-        # is already active.
-        if use_max_active and nactive >= max_active and selected_node is None:
-            return False
-
-        if selected_node is None:
+        if selected_node is None and not use_max_active:
             selected_node = eligible[0]
 
-        self.process_node(selected_node)
-        self.__maybe_emit_finished()
-        return True
+        if selected_node is not None:
+            self.process_node(selected_node)
+            self.__maybe_emit_finished()
+            return True
+
+        # Admission control: fill the free capacity with eligible nodes in
+        # the priority order (lighter nodes can fill in the capacity a
+        # heavier node does not fit in). A node is always admitted when
+        # nothing else is active, regardless of its weight. Once lighter
+        # nodes were admitted ahead of a waiting node `MaxBypass` times,
+        # the capacity is reserved for it (no further nodes are admitted
+        # until it fits).
+        bypassed = self.__bypassed
+        for node in list(bypassed):
+            if node not in eligible:
+                del bypassed[node]
+        waiting = []  # type: List[SchemeNode]
+        processed = False
+        for node in eligible:
+            if processed and not (self.is_pending(node) and
+                                  self.is_ready(node)):
+                # state changed by a preceding update
+                continue
+            weight = self.node_resource_weight(node)
+            if used > 0 and used + weight > capacity:
+                waiting.append(node)
+                continue
+            if any(bypassed.get(w, 0) >= self.MaxBypass for w in waiting):
+                break
+            for w in waiting:
+                bypassed[w] = bypassed.get(w, 0) + 1
+            bypassed.pop(node, None)
+            self.process_node(node)
+            processed = True
+            used = self.__used_capacity()
+
+        if processed:
+            self.__maybe_emit_finished()
+        return processed
+
+    def __used_capacity(self):
+        # type: () -> int
+        occupied = set(self.active_nodes()) | set(self.blocking_nodes())
+        return sum(map(self.node_resource_weight, occupied))
+
+    def __prioritized(self, nodes):
+        # type: (List[SchemeNode]) -> List[SchemeNode]
+        """
+        Sort `nodes` by their position in the topological order of the
+        workflow (over enabled links).
+        """
+        workflow = self.__workflow
+        if workflow is None or len(nodes) < 2:
+            return nodes
+        # The graph is cached by the workflow until its topology changes
+        graph = workflow.graph(enabled_only=True)
+        if graph is not self.__order_graph:
+            self.__order_graph = graph
+            self.__order = {node: i for i, node in
+                            enumerate(graph.topological_order())}
+        return sorted(nodes, key=self.__order.__getitem__)
+
+    def node_resource_weight(self, node):
+        # type: (SchemeNode) -> int
+        """
+        Return the resource weight of `node`.
+
+        This is the number of `max_active` slots the node occupies while
+        it is active. Unless set with `set_node_resource_weight` it is
+        the `resource_weight` of the node's widget description.
+        """
+        weight = self.__resource_weights.get(node)
+        if weight is None:
+            weight = getattr(node.description, "resource_weight", 1)
+        return weight
+
+    def set_node_resource_weight(self, node, weight):
+        # type: (SchemeNode, Optional[int]) -> None
+        """
+        Set the resource weight of `node` (or reset it to the default
+        if `weight` is None).
+        """
+        if weight is None:
+            self.__resource_weights.pop(node, None)
+        elif weight < 0:
+            raise ValueError("weight must be non-negative")
+        else:
+            self.__resource_weights[node] = weight
+        self._update()
 
     def _update(self):  # type: () -> None
         """
@@ -1253,25 +1433,181 @@ class SignalManager(QObject):
     def set_max_active(self, val: int) -> None:
         if self.__max_running != val:
             self.__max_running = val
+            self.__max_active = None
             self._update()
 
     def max_active(self) -> int:
+        """
+        Return the capacity for concurrently active (running) nodes.
+
+        The value is resolved from (in order) `set_max_active`, the
+        `MAX_ACTIVE_NODES` environment variable and the
+        `orangecanvas.scheme.signalmanager/max-active-nodes` setting. Zero
+        (the default) means the number of cpus and a negative value is
+        interpreted relative to the cpu count.
+
+        Each active node occupies its `node_resource_weight` of the
+        capacity.
+
+        The resolved value is cached and only updated when
+        `set_max_active` is called or the setting is changed through
+        :class:`~orangecanvas.utils.settings.Settings`.
+        """
+        if self.__max_active is None:
+            self.__max_active = self.__resolve_max_active()
+        return self.__max_active
+
+    def __resolve_max_active(self) -> int:
         value = self.__max_running  # type: Optional[int]
         if value is None:
             value = mapping_get(os.environ, "MAX_ACTIVE_NODES", int, None)
         if value is None:
             s = QSettings()
             s.beginGroup(__name__)
-            value = s.value("max-active-nodes", defaultValue=1, type=int)
+            value = s.value("max-active-nodes", defaultValue=0, type=int)
 
-        if value < 0:
+        if value <= 0:
             ccount = os.cpu_count()
             if ccount is None:
                 return 1
             else:
                 return max(1, ccount + value)
         else:
-            return max(1, value)
+            return value
+
+    def set_memory_budget(self, nbytes, spill_dir=None):
+        # type: (Optional[int], Optional[str]) -> None
+        """
+        Set the memory budget (in bytes) for the retained node outputs.
+
+        `SignalManager` keeps the last value sent on every output channel
+        (to be delivered on new links). When the estimated total size of
+        these values exceeds `nbytes` the least recently sent values whose
+        signals were already delivered are pickled to `spill_dir` (a
+        temporary directory by default) and are transparently reloaded by
+        `link_contents` and `signals_on_link` when needed. `None`, lazy
+        and unpicklable values are never spilled.
+
+        If `nbytes` is `None` (the default) there is no budget.
+
+        See Also
+        --------
+        set_size_estimator, resident_size
+        """
+        self.__memory_budget = nbytes
+        self.__spill_dir = spill_dir
+        self.__enforce_memory_budget()
+
+    def memory_budget(self):
+        # type: () -> Optional[int]
+        """
+        Return the memory budget for the retained node outputs.
+        """
+        return self.__memory_budget
+
+    def set_size_estimator(self, estimator):
+        # type: (Optional[Callable[[Any], int]]) -> None
+        """
+        Set the function used to estimate the size (in bytes) of the output
+        values. If `None` then :func:`estimate_size` is used.
+
+        The estimate is made when the value is sent.
+        """
+        self.__size_estimator = estimator or estimate_size
+
+    def resident_size(self, node=None):
+        # type: (Optional[SchemeNode]) -> int
+        """
+        Return the estimated size (in bytes) of the retained (in memory)
+        output values of `node` or of all nodes if `node` is `None`.
+        """
+        if node is None:
+            return sum(self.__resident.values())
+        return sum(size for (n, _), size in self.__resident.items()
+                   if n is node)
+
+    def __enforce_memory_budget(self):
+        # type: () -> None
+        budget = self.__memory_budget
+        if budget is None:
+            return
+        total = self.resident_size()
+        if total <= budget:
+            return
+        # outputs with undelivered signals
+        pending = {(sig.link.source_node, sig.link.source_channel)
+                   for sig in self.__input_queue}
+        for key, size in list(self.__resident.items()):
+            if total <= budget:
+                break
+            if key in pending or key in self.__unspillable:
+                continue
+            if self.__spill(*key):
+                total -= size
+
+    def __spill(self, node, channel):
+        # type: (SchemeNode, OutputSignal) -> bool
+        # Pickle the output value of node/channel to a spill file and
+        # replace it with a _SpilledValue.
+        state = self.__node_outputs[node][channel]
+        (id, value), = state.outputs.items()
+        fd, filename = tempfile.mkstemp(
+            prefix="output-", suffix=".pickle", dir=self.__spill_directory()
+        )
+        try:
+            with open(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:  # pylint: disable=broad-except
+            log.warning("Could not spill output %r of %r", channel.name,
+                        node.title, exc_info=True)
+            _SpilledValue(filename).discard()
+            self.__unspillable.add((node, channel))
+            return False
+        log.debug("Spilled output %r of %r to %r", channel.name, node.title,
+                  filename)
+        state.outputs[id] = _SpilledValue(filename)
+        del self.__resident[node, channel]
+        return True
+
+    def __spill_directory(self):
+        # type: () -> str
+        if self.__spill_dir is not None:
+            os.makedirs(self.__spill_dir, exist_ok=True)
+            return self.__spill_dir
+        if self.__spill_tempdir is None:
+            self.__spill_tempdir = tempfile.TemporaryDirectory(
+                prefix="signalmanager-"
+            )
+        return self.__spill_tempdir.name
+
+    def __release_output(self, node, channel):
+        # type: (SchemeNode, OutputSignal) -> None
+        # Forget the retained output value of node/channel (remove the
+        # spill file if any).
+        key = (node, channel)
+        self.__resident.pop(key, None)
+        self.__unspillable.discard(key)
+        state = self.__node_outputs[node].get(channel)
+        if state is not None:
+            for value in state.outputs.values():
+                if isinstance(value, _SpilledValue):
+                    value.discard()
+
+    def __release_outputs(self, node):
+        # type: (SchemeNode) -> None
+        for channel in list(self.__node_outputs[node]):
+            self.__release_output(node, channel)
+
+    @Slot(list)
+    def __on_settings_changed(self, keys):
+        # type: (List[str]) -> None
+        if MaxActiveNodesKey in keys:
+            self.__max_active = None
+            self._update()
+
+
+#: The settings key for the default maximum number of active nodes.
+MaxActiveNodesKey = __name__ + "/max-active-nodes"
 
 
 def can_enable_dynamic(link, value):
@@ -1378,6 +1714,18 @@ def expand_node(workflow, node):
             if link.enabled]
 
 
+def topological_order(workflow):
+    # type: (Scheme) -> List[SchemeNode]
+    """
+    Return the `workflow` nodes in a topological order (over enabled
+    links).
+
+    Nodes are otherwise kept in the workflow's order. Nodes in (or
+    downstream of) a cycle are appended at the end.
+    """
+    return workflow.graph(enabled_only=True).topological_order()
+
+
 def dependent_nodes(scheme, node):
     # type: (Scheme, SchemeNode) -> List[SchemeNode]
     """
@@ -1388,7 +1736,10 @@ def dependent_nodes(scheme, node):
     ----
     This does not include nodes only reachable by disables links.
     """
-    nodes = list(traverse_bf(node, partial(expand_node, scheme)))
+    graph = scheme.graph(enabled_only=True)
+    if node not in graph:
+        return []
+    nodes = list(graph.traverse_bf(node))
     assert nodes[0] is node
     # Remove the first item (`node`).
     return nodes[1:]
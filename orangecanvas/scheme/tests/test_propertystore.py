@@ -0,0 +1,74 @@
+import gc
+import pickle
+import threading
+import unittest
+
+from ..propertystore import PropertyStore, PropertiesSnapshot, default_store
+
+
+class TestPropertyStore(unittest.TestCase):
+    def test_snapshot(self):
+        store = PropertyStore()
+        props = {"a": [1, 2, 3], "b": {"c": "d"}}
+        snap = store.snapshot(props)
+        self.assertIsInstance(snap, PropertiesSnapshot)
+        self.assertEqual(dict(snap), props)
+        self.assertEqual(snap.to_dict(), props)
+        self.assertEqual(list(snap), ["a", "b"])
+        self.assertEqual(len(snap), 2)
+        # values are copies
+        snap["a"].append(4)
+        self.assertEqual(snap["a"], [1, 2, 3])
+        props["a"].append(4)
+        self.assertEqual(snap["a"], [1, 2, 3])
+
+    def test_sharing(self):
+        store = PropertyStore()
+        big = list(range(10000))
+        s1 = store.snapshot({"data": big, "x": 1})
+        self.assertEqual(len(store), 2)
+        nbytes = store.nbytes()
+        s2 = store.snapshot({"data": list(big), "x": 2})
+        # only the changed value is stored again
+        self.assertEqual(len(store), 3)
+        self.assertLess(store.nbytes() - nbytes, 100)
+        self.assertNotEqual(s1, s2)
+        self.assertEqual(s1, store.snapshot({"data": big, "x": 1}))
+        del s1, s2
+        gc.collect()
+        self.assertEqual(len(store), 0)
+
+    def test_equality(self):
+        store = PropertyStore()
+        s1 = store.snapshot({"a": 1, "b": 1.0})
+        # compare as the original dicts would
+        self.assertEqual(s1, store.snapshot({"b": 1, "a": True}))
+        self.assertNotEqual(s1, store.snapshot({"a": 1}))
+        self.assertNotEqual(s1, store.snapshot({"a": 1, "b": 2}))
+        self.assertEqual({"n": s1}, {"n": store.snapshot({"a": 1, "b": 1})})
+
+    def test_unpicklable(self):
+        store = PropertyStore()
+        lock = threading.Lock()
+        snap = store.snapshot({"lock": lock, "a": 1})
+        self.assertIs(snap["lock"], lock)
+        self.assertEqual(snap, store.snapshot({"lock": lock, "a": 1}))
+        self.assertNotEqual(snap, store.snapshot({"lock": None, "a": 1}))
+
+    def test_pickle(self):
+        store = default_store()
+        big = list(range(10000))
+        s1 = store.snapshot({"data": big, "x": 1})
+        s2 = store.snapshot({"data": big, "x": 2})
+        single = pickle.dumps(s1)
+        both = pickle.dumps([s1, s2])
+        # the shared chunk is written once
+        self.assertLess(len(both) - len(single), 100)
+        r1, r2 = pickle.loads(both)
+        self.assertEqual(r1, s1)
+        self.assertEqual(r2, s2)
+        self.assertEqual(r2.to_dict(), {"data": big, "x": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,13 @@
 Test read write
 """
 import io
+import os
+import random
+import tempfile
+import zlib
+from ast import literal_eval
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 from xml.etree import ElementTree as ET
 
 from ...gui import test
@@ -12,6 +19,7 @@ from .. import Scheme, SchemeNode, SchemeLink, \
                SchemeArrowAnnotation, SchemeTextAnnotation
 
 from .. import readwrite
+from ...utils.shtools import backup_name
 
 
 class TestReadWrite(test.QAppTestCase):
@@ -127,6 +135,237 @@ class TestReadWrite(test.QAppTestCase):
         with self.assertRaises(TypeError):
             readwrite.literal_dumps(float("nan"))
 
+        with self.assertRaises(TypeError):
+            readwrite.literal_dumps([1, 2, float("inf")])
+
+        shared = [1, [2]]
+        self.assertEqual(readwrite.literal_dumps([shared, shared]),
+                         repr([shared, shared]))
+
+    def test_literal_round_trip(self):
+        rng = random.Random(42)
+        scalars = [
+            lambda: rng.randint(-10 ** 20, 10 ** 20),
+            lambda: rng.uniform(-1e6, 1e6),
+            lambda: rng.choice([0.0, -0.0, 1e-300, 1e300, 5e-324]),
+            lambda: rng.choice([True, False, None]),
+            lambda: "".join(rng.choice("ab '\"\\\n\té\u2603\x00")
+                            for _ in range(rng.randint(0, 8))),
+            lambda: bytes(rng.randint(0, 255)
+                          for _ in range(rng.randint(0, 8))),
+        ]
+
+        def gen(depth):
+            r = rng.random()
+            if depth > 3 or r < 0.4:
+                return rng.choice(scalars)()
+            n = rng.randint(0, 6)
+            if r < 0.6:
+                return [gen(depth + 1) for _ in range(n)]
+            elif r < 0.7:
+                return [rng.choice(scalars[:2])() for _ in range(n * 20)]
+            elif r < 0.85:
+                return tuple(gen(depth + 1) for _ in range(n))
+            else:
+                keys = [rng.choice(scalars)() for _ in range(n)]
+                return {k: gen(depth + 1) for k in keys}
+
+        for _ in range(300):
+            obj = gen(0)
+            s = readwrite.literal_dumps(obj)
+            self.assertEqual(s, repr(obj))
+            self.assertEqual(readwrite._literal_parse(s), obj)
+            self.assertEqual(readwrite.literal_loads(s), obj)
+            for indent in (1, 4):
+                s = readwrite.literal_dumps(obj, indent=indent)
+                self.assertEqual(literal_eval(s), obj)
+                self.assertEqual(readwrite._literal_parse(s), obj)
+
+    def test_literal_parse(self):
+        parse = readwrite._literal_parse
+        for s in ["(1)", "[1,]", "()", "(1,)", "{1: 2,}", "[1.5, 2, 1e5]",
+                  "  [ 1 ,\n 2 ] ", "b'ab'", "'\\n'", "-0.0", "[[]]"]:
+            self.assertEqual(parse(s), literal_eval(s), s)
+        # invalid or not supported by the fast parser
+        for s in ["[1 2]", "[1,,2]", "{1, 2}", "{1: 2: 3}", "0x10", "01",
+                  "'a' 'b'", "[", "1 2", "{1:}", "u'a'", "1e", "Nonex",
+                  "b'\xe9'", "-", "(,)", "{1}"]:
+            with self.assertRaises(ValueError, msg=s):
+                parse(s)
+        # literal_loads falls back to literal_eval
+        self.assertEqual(readwrite.literal_loads("{1, 2}" + " " * 4096),
+                         {1, 2})
+
+    def _scheme(self):
+        reg = registry_tests.small_testing_registry()
+        scheme = Scheme(title="<T&\"itle>", description="a\nb\tc")
+        zero = scheme.new_node(reg.widget("zero"), title="zéro")
+        one = scheme.new_node(reg.widget("one"),
+                              properties={"a": [1, 2.5, "\u2603"]})
+        add = scheme.new_node(reg.widget("add"), properties={"b": "<&>"})
+        scheme.new_link(zero, "value", add, "left")
+        scheme.new_link(one, "value", add, "right")
+        scheme.add_annotation(SchemeArrowAnnotation((0, 0), (10, 10)))
+        scheme.add_annotation(
+            SchemeTextAnnotation((0, 100, 200, 200), "a < b & \n c"))
+        scheme.set_window_group_presets([
+            Scheme.WindowGroup("G", True, [(one, b"\x00\x01")])
+        ])
+        return scheme
+
+    def test_stream_writer(self):
+        scheme = self._scheme()
+        for pretty in [False, True]:
+            tree = readwrite.scheme_to_etree(scheme)
+            if pretty:
+                readwrite.indent(tree.getroot(), 0)
+            expected = io.BytesIO()
+            tree.write(expected, encoding="utf-8", xml_declaration=True)
+            stream = io.BytesIO()
+            readwrite.scheme_to_ows_stream(scheme, stream, pretty=pretty)
+            self.assertEqual(stream.getvalue(), expected.getvalue())
+            self.assertFalse(stream.closed)
+
+    def test_properties_cache(self):
+        scheme = self._scheme()
+        one, add = scheme.nodes[1:]
+        with patch.object(readwrite, "dumps", wraps=readwrite.dumps) as dumps:
+            readwrite.scheme_to_ows_stream(scheme, io.BytesIO())
+            self.assertEqual(dumps.call_count, 2)
+            dumps.reset_mock()
+            readwrite.scheme_to_ows_stream(scheme, io.BytesIO())
+            self.assertEqual(dumps.call_count, 0)
+            token = add.properties_token()
+            add.properties = add.properties
+            self.assertEqual(add.properties_token(), token)
+            add.properties = {"b": "c"}
+            self.assertNotEqual(add.properties_token(), token)
+            stream = io.BytesIO()
+            readwrite.scheme_to_ows_stream(scheme, stream)
+            dumps.assert_called_once_with(
+                {"b": "c"}, format="literal", pickle_fallback=False)
+        stream.seek(0)
+        scheme_1 = readwrite.scheme_load(
+            Scheme(), stream, registry_tests.small_testing_registry())
+        self.assertEqual(scheme_1.nodes[2].properties, {"b": "c"})
+
+    def test_ows_file(self):
+        scheme = self._scheme()
+        expected = io.BytesIO()
+        readwrite.scheme_to_ows_stream(scheme, expected, pretty=True)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "a.ows")
+            with open(fname, "wb") as f:
+                f.write(b"old contents")
+            os.chmod(fname, 0o640)
+            readwrite.scheme_to_ows_file(scheme, fname, pretty=True)
+            with open(fname, "rb") as f:
+                self.assertEqual(f.read(), expected.getvalue())
+            self.assertEqual(os.stat(fname).st_mode & 0o777, 0o640)
+            # An error leaves the existing file untouched
+            with patch.object(readwrite._EventRecorder, "replay",
+                              side_effect=ValueError), \
+                    ThreadPoolExecutor(1) as executor:
+                f = readwrite.scheme_to_ows_file(
+                    scheme, fname, executor=executor)
+                self.assertIsInstance(f.exception(5), ValueError)
+            with open(fname, "rb") as f:
+                self.assertEqual(f.read(), expected.getvalue())
+            self.assertEqual(os.listdir(tmpdir), ["a.ows"])
+
+            scheme.nodes[1].properties = {"a": 1}
+            with ThreadPoolExecutor(1) as executor:
+                f = readwrite.scheme_to_ows_file(
+                    scheme, fname, executor=executor)
+                self.assertIsNone(f.result(5))
+            with open(fname, "rb") as f:
+                scheme_1 = readwrite.scheme_load(
+                    Scheme(), f, registry_tests.small_testing_registry())
+            self.assertEqual(scheme_1.nodes[1].properties, {"a": 1})
+            self.assertEqual(os.listdir(tmpdir), ["a.ows"])
+
+    def test_ows_file_backups(self):
+        scheme = self._scheme()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "a.ows")
+
+            def contents(name):
+                with open(name, "rb") as f:
+                    return f.read()
+            for i in range(3):
+                scheme.title = "v{}".format(i)
+                readwrite.scheme_to_ows_file(scheme, fname, backups=2)
+            current = contents(fname)
+            first = contents(backup_name(fname, 1))
+            second = contents(backup_name(fname, 2))
+            self.assertNotEqual(current, first)
+            self.assertNotEqual(first, second)
+            # Failed writes (twice, as in repeated autosave retries) do not
+            # rotate the backups
+            scheme.title = "failed"
+            for _ in range(2):
+                with patch("os.fsync", side_effect=OSError):
+                    with self.assertRaises(OSError):
+                        readwrite.scheme_to_ows_file(scheme, fname, backups=2)
+            self.assertEqual(contents(fname), current)
+            self.assertEqual(contents(backup_name(fname, 1)), first)
+            self.assertEqual(contents(backup_name(fname, 2)), second)
+            self.assertEqual(len(os.listdir(tmpdir)), 3)
+
+    def test_fragment(self):
+        reg = registry_tests.small_testing_registry()
+        scheme = self._scheme()
+        zero, one, add = scheme.nodes
+        nodes, links = [zero, add], scheme.links[:1]
+        data = readwrite.fragment_dumps(nodes, links)
+        self.assertTrue(data.startswith(readwrite.FRAGMENT_MAGIC))
+        fragment = Scheme()
+        readwrite.fragment_load(fragment, data, registry=reg)
+        self.assertEqual([n.title for n in fragment.nodes], ["zéro", "add"])
+        self.assertEqual(
+            [n.description.qualified_name for n in fragment.nodes],
+            [zero.description.qualified_name, add.description.qualified_name])
+        self.assertEqual(fragment.nodes[1].properties, {"b": "<&>"})
+        self.assertEqual(fragment.nodes[0].position, zero.position)
+        link = fragment.links[0]
+        self.assertIs(link.source_node, fragment.nodes[0])
+        self.assertIs(link.sink_node, fragment.nodes[1])
+        self.assertEqual(
+            (link.source_channel.name, link.sink_channel.name),
+            ("value", "left"))
+
+        # The xml fragment loads as a regular workflow
+        stream = io.BytesIO()
+        readwrite.fragment_to_ows_stream(nodes, links, stream)
+        stream.seek(0)
+        fragment = readwrite.scheme_load(Scheme(), stream, reg)
+        self.assertEqual(len(fragment.nodes), 2)
+        self.assertEqual(len(fragment.links), 1)
+        self.assertEqual(fragment.nodes[1].properties, {"b": "<&>"})
+
+        # links must not leave the node set
+        with self.assertRaises(ValueError):
+            readwrite.fragment_dumps([zero], links)
+        with self.assertRaises(readwrite.InvalidFormatError):
+            readwrite.fragment_load(Scheme(), b"garbage", registry=reg)
+        with self.assertRaises(readwrite.InvalidFormatError):
+            readwrite.fragment_load(
+                Scheme(), readwrite.FRAGMENT_MAGIC + b"garbage", registry=reg)
+
+        # no pickled node properties
+        add.properties = {"b": object()}
+        with self.assertRaises((ValueError, TypeError)):
+            readwrite.fragment_dumps(nodes, links)
+        payload = readwrite.literal_dumps((
+            [("add", add.description.qualified_name, "", "", "add",
+              (0.0, 0.0), (readwrite.dumps({}, format="pickle")[0],
+                           "pickle"))],
+            []
+        ))
+        data = readwrite.FRAGMENT_MAGIC + zlib.compress(payload.encode())
+        with self.assertRaises(readwrite.InvalidFormatError):
+            readwrite.fragment_load(Scheme(), data, registry=reg)
+
     def test_resolve_replaced(self):
         tree = ET.parse(io.BytesIO(FOOBAR_v20.encode()))
         parsed = readwrite.parse_ows_etree_v_2_0(tree)
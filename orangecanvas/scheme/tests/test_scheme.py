@@ -123,6 +123,24 @@ class TestScheme(test.QCoreAppTestCase):
         self.assertSequenceEqual(list(spy), [[0, n1], [0, n2]])
         self.assertSequenceEqual(w.nodes, [n2, n1])
 
+    def test_set_node_positions(self):
+        reg = small_testing_registry()
+        w = Scheme()
+        n1, n2 = w.new_node(reg.widget("one")), w.new_node(reg.widget("one"))
+        events = []
+        w.node_positions_about_to_change.connect(
+            lambda nodes: events.append(("about", nodes)))
+        n1.position_changed.connect(lambda pos: events.append(("n1", pos)))
+        n2.position_changed.connect(lambda pos: events.append(("n2", pos)))
+        w.node_positions_changed.connect(
+            lambda nodes: events.append(("changed", nodes)))
+        w.set_node_positions([n1, n2], [(1, 1), (2, 2)])
+        self.assertEqual(events, [("about", [n1, n2]), ("n1", (1, 1)),
+                                  ("n2", (2, 2)), ("changed", [n1, n2])])
+        self.assertEqual((n1.position, n2.position), ((1, 1), (2, 2)))
+        with self.assertRaises(ValueError):
+            w.set_node_positions([n1, n2], [(0, 0)])
+
     def test_insert_link(self):
         reg = small_testing_registry()
         one_desc = reg.widget("one")
@@ -151,3 +169,75 @@ class TestScheme(test.QCoreAppTestCase):
         w.insert_annotation(0, a3)
         self.assertSequenceEqual(w.annotations, [a3, a1, a2])
         self.assertSequenceEqual(list(spy), [[0, a1], [1, a2], [0, a3]])
+
+    def test_graph(self):
+        reg = small_testing_registry()
+        one_desc = reg.widget("one")
+        add_desc = reg.widget("add")
+        n1, n2, n3 = SchemeNode(one_desc), SchemeNode(one_desc), SchemeNode(add_desc)
+        w = Scheme()
+        w.add_node(n1)
+        w.add_node(n2)
+        graph = w.graph()
+        self.assertEqual(graph.nodes, (n1, n2))
+        self.assertIs(w.graph(), graph)
+        w.add_node(n3)
+        graph = w.graph()
+        self.assertEqual(graph.nodes, (n1, n2, n3))
+        l1 = w.new_link(n1, "value", n3, "left")
+        l2 = w.new_link(n2, "value", n3, "right")
+        self.assertEqual(list(w.graph().edges()), [(n1, n3), (n2, n3)])
+        self.assertEqual(w.upstream_nodes(n3), {n1, n2})
+        self.assertEqual(w.downstream_nodes(n1), {n3})
+        self.assertEqual(w.downstream_nodes(n3), set())
+
+        graph = w.graph()
+        w.graph(enabled_only=True)
+        l2.set_enabled(False)
+        self.assertIs(w.graph(), graph)
+        self.assertEqual(list(w.graph(enabled_only=True).edges()), [(n1, n3)])
+        w.remove_link(l1)
+        self.assertEqual(list(w.graph().edges()), [(n2, n3)])
+        self.assertEqual(list(w.graph(enabled_only=True).edges()), [])
+        w.remove_node(n3)
+        self.assertEqual(w.graph().nodes, (n1, n2))
+        # Removed links no longer affect the graph
+        l2.set_enabled(True)
+        self.assertEqual(list(w.graph(enabled_only=True).edges()), [])
+        # Nodes not in the workflow
+        self.assertEqual(w.upstream_nodes(n3), set())
+        self.assertEqual(w.downstream_nodes(n3), set())
+
+    def test_find_links(self):
+        reg = small_testing_registry()
+        w = Scheme()
+        ones = [w.new_node(reg.widget("one")) for _ in range(3)]
+        adds = [w.new_node(reg.widget("add")) for _ in range(3)]
+
+        def check():
+            links = w.links
+            for source in ones + adds + [None]:
+                for sink in adds + [None]:
+                    self.assertEqual(
+                        w.find_links(source_node=source, sink_node=sink),
+                        [l for l in links
+                         if source in (None, l.source_node) and
+                         sink in (None, l.sink_node)])
+
+        l1 = w.new_link(ones[0], "value", adds[0], "left")
+        w.new_link(ones[1], "value", adds[0], "right")
+        w.insert_link(0, SchemeLink(ones[0], "value", adds[1], "left"))
+        w.insert_link(1, SchemeLink(adds[0], "result", adds[1], "right"))
+        w.new_link(adds[1], "result", adds[2], "left")
+        check()
+        w.remove_link(l1)
+        check()
+        self.assertTrue(w.creates_cycle(
+            SchemeLink(adds[2], "result", adds[0], "left")))
+        self.assertFalse(w.creates_cycle(
+            SchemeLink(adds[0], "result", adds[2], "right")))
+        w.remove_node(adds[1])
+        check()
+        self.assertEqual(w.find_links(sink_node=adds[2]), [])
+        w.insert_link(0, SchemeLink(ones[2], "value", adds[2], "left"))
+        check()
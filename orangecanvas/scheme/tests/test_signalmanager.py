@@ -1,13 +1,18 @@
+import os
 import sys
+import tempfile
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from AnyQt.QtTest import QSignalSpy
 
 from orangecanvas.scheme import Scheme, SchemeNode, SchemeLink
 from orangecanvas.scheme.signalmanager import (
-    SignalManager, Signal, compress_signals, compress_single, LazyValue
+    SignalManager, Signal, compress_signals, compress_single, LazyValue,
+    MaxActiveNodesKey, topological_order
 )
+from orangecanvas.utils.graph import Graph
+from orangecanvas.utils.settings import SettingsNotifier
 from orangecanvas.registry import tests as registry_tests
 from orangecanvas.gui.test import QCoreAppTestCase
 
@@ -87,6 +92,12 @@ class TestingSignalManager(SignalManager):
             self.send(node, out, "hello")
 
 
+class ActiveSignalManager(SignalManager):
+    """Nodes enter a running state on input (until reset by the test)."""
+    def send_to_node(self, node, signals):
+        node.set_state_flags(SchemeNode.Running, True)
+
+
 class TestSignalManager(QCoreAppTestCase):
     def setUp(self):
         super().setUp()
@@ -276,6 +287,192 @@ class TestSignalManager(QCoreAppTestCase):
         self.assertEqual(len(start_spy), 2)
         self.assertEqual(len(fin_spy), 2)
 
+    def test_max_active(self):
+        sm = TestingSignalManager(max_running=3)
+        self.assertEqual(sm.max_active(), 3)
+        sm.set_max_active(5)
+        self.assertEqual(sm.max_active(), 5)
+        sm.set_max_active(None)
+        with patch.dict("os.environ", {"MAX_ACTIVE_NODES": "2"}):
+            self.assertEqual(sm.max_active(), 2)
+            with patch.dict("os.environ", {"MAX_ACTIVE_NODES": "4"}):
+                # cached
+                self.assertEqual(sm.max_active(), 2)
+                notifier = SettingsNotifier.instance()
+                notifier.settingsChanged.emit(["some/other/key"])
+                self.assertEqual(sm.max_active(), 2)
+                notifier.settingsChanged.emit([MaxActiveNodesKey])
+                self.assertEqual(sm.max_active(), 4)
+
+    def test_max_active_default(self):
+        sm = TestingSignalManager(max_running=0)
+        self.assertEqual(sm.max_active(), max(os.cpu_count() or 1, 1))
+
+    def test_topological_order(self):
+        workflow = self.scheme
+        zero, one, add = workflow.nodes[:3]
+        mult = SchemeNode(self.reg.widget("mult"))
+        workflow.insert_node(0, mult)
+        workflow.new_link(add, "result", mult, "left")
+        self.assertEqual(topological_order(workflow), [zero, one, add, mult])
+
+    def test_admission(self):
+        workflow = Scheme()
+        zero = workflow.new_node(self.reg.widget("zero"))
+        adds = [workflow.new_node(self.reg.widget("add")) for _ in range(4)]
+        for add in adds:
+            workflow.new_link(zero, "value", add, "left")
+        sm = ActiveSignalManager(max_running=2)
+        sm.set_workflow(workflow)
+        sm.start()
+        sm.set_node_resource_weight(adds[1], 2)
+        self.assertEqual(sm.node_resource_weight(adds[1]), 2)
+        self.assertEqual(sm.node_resource_weight(adds[0]), 1)
+        spy = QSignalSpy(sm.processingFinished[SchemeNode])
+        sm.send(zero, zero.output_channel("value"), 1)
+        self.assertTrue(spy.wait())
+        # adds[1] does not fit; the capacity is filled with adds[2]
+        self.assertEqual([args[0] for args in spy], [adds[0], adds[2]])
+        self.assertEqual(sm.active_nodes(), [adds[0], adds[2]])
+
+        adds[0].set_state_flags(SchemeNode.Running, False)
+        self.assertTrue(spy.wait())
+        self.assertEqual(spy[-1][0], adds[3])
+
+        adds[2].set_state_flags(SchemeNode.Running, False)
+        adds[3].set_state_flags(SchemeNode.Running, False)
+        self.assertTrue(spy.wait())
+        self.assertEqual(spy[-1][0], adds[1])
+        self.assertEqual(len(spy), 4)
+
+    def test_admission_reserve(self):
+        workflow = Scheme()
+        zero = workflow.new_node(self.reg.widget("zero"))
+        adds = [workflow.new_node(self.reg.widget("add")) for _ in range(6)]
+        for add in adds:
+            workflow.new_link(zero, "value", add, "left")
+        sm = ActiveSignalManager(max_running=2)
+        sm.set_workflow(workflow)
+        sm.start()
+        sm.set_node_resource_weight(adds[1], 2)
+        spy = QSignalSpy(sm.processingFinished[SchemeNode])
+        sm.send(zero, zero.output_channel("value"), 1)
+        self.assertTrue(spy.wait())
+        self.assertEqual([args[0] for args in spy], [adds[0], adds[2]])
+        adds[0].set_state_flags(SchemeNode.Running, False)
+        self.assertTrue(spy.wait())
+        self.assertEqual(spy[-1][0], adds[3])
+        # adds[1] was bypassed MaxBypass times; the capacity is reserved
+        adds[2].set_state_flags(SchemeNode.Running, False)
+        self.assertFalse(spy.wait(200))
+        self.assertEqual(sm.active_nodes(), [adds[3]])
+        adds[3].set_state_flags(SchemeNode.Running, False)
+        self.assertTrue(spy.wait())
+        self.assertEqual(spy[-1][0], adds[1])
+        self.assertEqual(len(spy), 4)
+
+    def test_priority_order_cached(self):
+        workflow = Scheme()
+        zero = workflow.new_node(self.reg.widget("zero"))
+        adds = [workflow.new_node(self.reg.widget("add")) for _ in range(2)]
+        links = [workflow.new_link(zero, "value", add, "left")
+                 for add in adds]
+        sm = TestingSignalManager()
+        sm.set_workflow(workflow)
+        sm.start()
+        with patch.object(Graph, "topological_order", autospec=True,
+                          side_effect=Graph.topological_order) as order:
+            for i in range(2):
+                sm.send(zero, zero.output_channel("value"), i)
+                sm.process_queued()
+                self.assertEqual(order.call_count, 1)
+            # the order is recomputed when the topology changes
+            links[0].set_enabled(False)
+            links[0].set_enabled(True)
+            sm.send(zero, zero.output_channel("value"), 2)
+            sm.process_queued()
+            self.assertEqual(order.call_count, 2)
+
+    def test_memory_budget(self):
+        workflow = self.scheme
+        sm = self.signal_manager
+        n0, n1, n2 = workflow.nodes
+        l0, _ = workflow.links
+        out0, out1 = n0.output_channel("value"), n1.output_channel("value")
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        mb = 2 ** 20
+        sm.set_memory_budget(int(1.5 * mb), spill_dir=tmpdir.name)
+        self.assertEqual(sm.memory_budget(), int(1.5 * mb))
+        a, b = b"a" * mb, b"b" * mb
+        sm.send(n0, out0, a)
+        sm.send(n1, out1, b)
+        # Undelivered values are not spilled
+        self.assertGreater(sm.resident_size(), 2 * mb)
+        self.assertEqual(os.listdir(tmpdir.name), [])
+        sm.process_queued()
+        self.assertEqual(n2.property("-input-left"), a)
+        self.assertEqual(n2.property("-input-right"), b)
+        # The least recently sent value is spilled
+        self.assertEqual(sm.resident_size(n0), 0)
+        self.assertGreater(sm.resident_size(n1), mb)
+        self.assertEqual(sm.resident_size(),
+                         sm.resident_size(n1) + sm.resident_size(n2))
+        self.assertEqual(len(os.listdir(tmpdir.name)), 1)
+
+        # and is reloaded on demand
+        self.assertEqual(sm.link_contents(l0), {None: a})
+        self.assertEqual([s.value for s in sm.signals_on_link(l0)], [a])
+        self.assertEqual(sm.resident_size(n0), 0)
+
+        # A new link receives the reloaded value
+        workflow.remove_link(l0)
+        sm.process_queued()
+        self.assertIsNone(n2.property("-input-left"))
+        workflow.add_link(l0)
+        sm.process_queued()
+        self.assertEqual(n2.property("-input-left"), a)
+
+        # Replacing the value removes the spill file
+        sm.send(n0, out0, None)
+        self.assertEqual(os.listdir(tmpdir.name), [])
+        self.assertEqual(sm.link_contents(l0), {None: None})
+
+        sm.send(n0, out0, a)
+        sm.process_queued()
+        # b is now the least recently sent
+        self.assertEqual(sm.resident_size(n1), 0)
+        self.assertEqual(len(os.listdir(tmpdir.name)), 1)
+        # Removing the node removes the spill file
+        workflow.remove_node(n1)
+        self.assertEqual(os.listdir(tmpdir.name), [])
+
+    def test_memory_budget_estimator(self):
+        workflow = self.scheme
+        sm = self.signal_manager
+        n0, n1, n2 = workflow.nodes
+        l0, _ = workflow.links
+        out0 = n0.output_channel("value")
+        sm.set_size_estimator(lambda value: 100)
+        sm.send(n0, out0, 1)
+        self.assertEqual(sm.resident_size(n0), 100)
+        # Unpicklable values are not spilled
+        sm.set_memory_budget(10)
+        sm.send(n0, out0, lambda: 1)
+        sm.process_queued()
+        self.assertEqual(sm.resident_size(n0), 100)
+        self.assertEqual(sm.resident_size(n2), 0)
+        self.assertEqual(sm.resident_size(n1), 0)
+        sm.send(n0, out0, 1)
+        sm.process_queued()
+        self.assertEqual(sm.resident_size(n0), 0)
+        self.assertEqual(sm.link_contents(l0), {None: 1})
+        # LazyValues are not tracked
+        sm.send(n0, out0, LazyValue[int](lambda: 1))
+        self.assertEqual(sm.resident_size(n0), 0)
+        sm.set_workflow(None)
+        self.assertEqual(sm.resident_size(), 0)
+
     def test_compress_signals(self):
         workflow = self.scheme
         link = workflow.links[0]
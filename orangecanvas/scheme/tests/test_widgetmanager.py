@@ -1,6 +1,8 @@
+import time
 import unittest
 import weakref
 from collections import Counter
+from unittest import mock
 
 from AnyQt.QtCore import QEvent
 from AnyQt.QtWidgets import QWidget, QApplication, QAction
@@ -10,7 +12,9 @@ from orangecanvas.gui.windowlistmanager import WindowListManager
 from orangecanvas.scheme import (
     Scheme, NodeEvent, SchemeLink, LinkEvent, WorkflowEvent
 )
-from orangecanvas.scheme.widgetmanager import WidgetManager
+from orangecanvas.scheme.widgetmanager import (
+    WidgetManager, adjacent_nodes_priority, pending_inputs_priority
+)
 from orangecanvas.registry import tests as registry_tests
 from orangecanvas.scheme.tests import EventSpy
 
@@ -29,6 +33,26 @@ class TestingWidgetManager(WidgetManager):
         return widget.restoreGeometry(state)
 
 
+class DelayedWidgetManager(TestingWidgetManager):
+    """
+    A widget manager with configurable widget construction delays
+    (in seconds) recording the widget creation start times.
+    """
+    def __init__(self, *args, delays=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delays = delays or {}
+        self.created = []  # (node, start time) in creation order
+
+    def create_widget_for_node(self, node):
+        self.created.append((node, time.perf_counter()))
+        time.sleep(self.delays.get(node, 0))
+        return super().create_widget_for_node(node)
+
+    def process_slice(self):
+        # run a single predictive creation slice
+        self._WidgetManager__process_init_queue()
+
+
 class TestWidgetManager(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -311,3 +335,131 @@ class TestWidgetManager(unittest.TestCase):
 
         workflow.remove_node(nodes[0])
         self.assertNotIn(ac1, w2.actions())
+
+    def add_nodes(self, count):
+        reg = registry_tests.small_testing_registry()
+        return [self.scheme.new_node(reg.widget("negate"))
+                for _ in range(count)]
+
+    def test_create_predictive(self):
+        workflow = self.scheme
+        nodes = workflow.nodes
+        wm = TestingWidgetManager()
+        wm.set_creation_policy(WidgetManager.Predictive)
+        self.assertIs(wm.creation_policy(), WidgetManager.Predictive)
+        spy = QSignalSpy(wm.widget_for_node_added)
+        wm.set_workflow(workflow)
+        self.assertEqual(len(spy), 0)
+        while len(spy) < 3:
+            self.assertTrue(spy.wait())
+        self.assertSetEqual({n for n, _ in spy}, set(nodes))
+        # nodes added later are also pre-created
+        node, = self.add_nodes(1)
+        spy = QSignalSpy(wm.widget_for_node_added)
+        self.assertTrue(spy.wait())
+        self.assertIs(spy[0][0], node)
+
+    def test_predictive_slice_budget(self):
+        self.add_nodes(7)
+        nodes = self.scheme.nodes
+        wm = DelayedWidgetManager(delays={n: 0.01 for n in nodes})
+        wm.set_predictive_slice_budget(25)
+        wm.set_predictive_limit(None)
+        wm.set_workflow(self.scheme)
+        wm.set_creation_policy(WidgetManager.Predictive)
+        slices = []
+        while len(wm.created) < len(nodes):
+            start, count = time.perf_counter(), len(wm.created)
+            wm.process_slice()
+            created = wm.created[count:]
+            self.assertGreaterEqual(len(created), 1)
+            # no creation is started after the budget is spent
+            self.assertTrue(all(t - start < 0.025 for _, t in created))
+            slices.append(len(created))
+        self.assertEqual(sum(slices), len(nodes))
+        self.assertGreater(len(slices), 1)
+        self.assertTrue(all(count <= 3 for count in slices))
+
+        # a construction exceeding the budget still creates one per slice
+        nodes = self.add_nodes(2)
+        wm.delays = {n: 0.03 for n in nodes}
+        count = len(wm.created)
+        wm.process_slice()
+        self.assertEqual(len(wm.created), count + 1)
+
+    def test_predictive_priority(self):
+        self.add_nodes(5)
+        nodes = self.scheme.nodes
+        priorities = dict(zip(nodes, [0, 3, 1, 3, 0, 5, 1, 2]))
+        wm = DelayedWidgetManager()
+        wm.set_predictive_slice_budget(1000)
+        wm.set_predictive_limit(None)
+        priority = priorities.get
+        wm.set_creation_priority(priority)
+        self.assertIs(wm.creation_priority(), priority)
+        wm.set_workflow(self.scheme)
+        wm.set_creation_policy(WidgetManager.Predictive)
+        wm.process_slice()
+        expected = [nodes[i] for i in [5, 1, 3, 7, 2, 6, 0, 4]]
+        self.assertEqual([n for n, _ in wm.created], expected)
+
+    def test_predictive_default_priority(self):
+        zero, one, add = self.scheme.nodes
+        wm = DelayedWidgetManager()
+        wm.set_workflow(self.scheme)
+        w = wm.widget_for_node(add)
+        QApplication.sendEvent(w, QEvent(QEvent.WindowActivate))
+        negate, = self.add_nodes(1)
+        self.scheme.new_link(add, "result", negate, "value")
+        wm.set_predictive_slice_budget(1000)
+        wm.set_creation_policy(WidgetManager.Predictive)
+        wm.process_slice()
+        # nodes linked to the activated widget first
+        self.assertEqual([n for n, _ in wm.created],
+                         [add, zero, one, negate])
+
+    def test_predictive_limit(self):
+        self.add_nodes(5)
+        nodes = self.scheme.nodes
+        wm = DelayedWidgetManager()
+        wm.set_predictive_limit(3)
+        self.assertEqual(wm.predictive_limit(), 3)
+        wm.set_workflow(self.scheme)
+        wm.set_creation_policy(WidgetManager.Predictive)
+        spy = QSignalSpy(wm.widget_for_node_added)
+        while len(spy) < 3:
+            self.assertTrue(spy.wait())
+        self.assertFalse(spy.wait(50))
+        self.assertEqual([n for n, _ in wm.created], nodes[:3])
+        # on demand creation is not limited
+        wm.widget_for_node(nodes[-1])
+        self.assertEqual(len(wm.created), 4)
+        wm.set_predictive_limit(4)
+        self.assertTrue(spy.wait())
+        self.assertFalse(spy.wait(50))
+        self.assertEqual(len(wm.created), 5)
+
+    def test_priority_helpers(self):
+        zero, one, add = self.scheme.nodes
+        negate, = self.add_nodes(1)
+        selected = [zero]
+        priority = adjacent_nodes_priority(self.scheme, lambda: selected)
+        self.assertEqual([priority(n) for n in [zero, one, add, negate]],
+                         [2, 0, 1, 0])
+        # the focus nodes are evaluated once per creation slice
+        focus = mock.Mock(return_value=selected)
+        wm = DelayedWidgetManager()
+        wm.set_predictive_slice_budget(1000)
+        wm.set_creation_priority(adjacent_nodes_priority(self.scheme, focus))
+        wm.set_workflow(self.scheme)
+        wm.set_creation_policy(WidgetManager.Predictive)
+        wm.process_slice()
+        self.assertEqual(focus.call_count, 1)
+        self.assertEqual([n for n, _ in wm.created][:2], [zero, add])
+
+        class SignalManager:
+            def is_pending(self, node):
+                return node is add
+        priority = pending_inputs_priority(SignalManager())
+        self.assertEqual([priority(n) for n in [zero, one, add, negate]],
+                         [False, False, True, False])
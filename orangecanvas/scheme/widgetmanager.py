@@ -1,4 +1,5 @@
 import enum
+import time
 import itertools
 import weakref
 from functools import partial
@@ -9,7 +10,10 @@ import traceback
 from collections import deque
 from xml.sax.saxutils import escape
 
-from typing import Iterable, Dict, Deque, Optional, List, Tuple
+from typing import (
+    Iterable, Dict, Deque, Optional, List, Tuple, Callable, Set, Any,
+    Collection
+)
 
 from AnyQt.QtCore import Qt, QObject, QEvent, QTimer, QCoreApplication
 from AnyQt.QtCore import Slot, Signal
@@ -25,7 +29,9 @@ from orangecanvas.utils.qinvoke import connect_with_context
 
 log = logging.getLogger(__name__)
 
-__all__ = ["WidgetManager"]
+__all__ = [
+    "WidgetManager", "adjacent_nodes_priority", "pending_inputs_priority"
+]
 
 Workflow = Scheme
 Node = SchemeNode
@@ -96,10 +102,20 @@ class WidgetManager(QObject):
         #: Widgets are created only when first accessed with `widget_for_node`
         #: (e.g. when activated in the view).
         OnDemand = "OnDemand"
+        #: Widgets are created in time bounded slices from the event loop,
+        #: ordered by the creation priority, up to a limit (the rest are
+        #: created when first accessed with `widget_for_node`).
+        Predictive = "Predictive"
 
     Normal = CreationPolicy.Normal
     Immediate = CreationPolicy.Immediate
     OnDemand = CreationPolicy.OnDemand
+    Predictive = CreationPolicy.Predictive
+
+    #: Default time budget of a `Predictive` creation slice (milliseconds)
+    PredictiveSliceBudget = 20
+    #: Default limit on the number of `Predictive` pre-created widgets
+    PredictiveLimit = 20
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -115,6 +131,12 @@ class WidgetManager(QObject):
         self.__init_timer = QTimer(self, singleShot=True)
         self.__init_timer.timeout.connect(self.__process_init_queue)
 
+        # Predictive creation state
+        self.__precreated = set()  # type: Set[SchemeNode]
+        self.__predictive_slice_budget = WidgetManager.PredictiveSliceBudget
+        self.__predictive_limit = WidgetManager.PredictiveLimit  # type: Optional[int]
+        self.__creation_priority = None  # type: Optional[Callable[[SchemeNode], Any]]
+
         self.__activation_monitor = ActivationMonitor(self)
         self.__activation_counter = itertools.count()
         self.__activation_monitor.activated.connect(self.__mark_activated)
@@ -169,7 +191,8 @@ class WidgetManager(QObject):
                 if self.__workflow is not None:
                     for node in self.__workflow.nodes:
                         self.ensure_created(node)
-            elif self.__creation_policy == WidgetManager.Normal:
+            elif self.__creation_policy in (WidgetManager.Normal,
+                                            WidgetManager.Predictive):
                 if not self.__init_timer.isActive() and self.__init_queue:
                     self.__init_timer.start()
             elif self.__creation_policy == WidgetManager.OnDemand:
@@ -183,6 +206,62 @@ class WidgetManager(QObject):
         """
         return self.__creation_policy
 
+    def set_creation_priority(self, priority):
+        # type: (Optional[Callable[[SchemeNode], Any]]) -> None
+        """
+        Set the function ordering the widget creation with the `Predictive`
+        creation policy.
+
+        `priority` is called with a node and must return a sort key; the
+        widgets for nodes with higher keys are created first (ties are
+        created in the order the nodes were added). The priorities are
+        reevaluated at the start of every creation slice.
+
+        If `None` (the default) the nodes linked to the most recently
+        activated widgets are created first.
+
+        .. seealso::
+            :func:`adjacent_nodes_priority`, :func:`pending_inputs_priority`
+        """
+        self.__creation_priority = priority
+
+    def creation_priority(self):
+        # type: () -> Optional[Callable[[SchemeNode], Any]]
+        """
+        Return the `Predictive` creation priority function.
+        """
+        return self.__creation_priority
+
+    def set_predictive_slice_budget(self, msec):
+        # type: (int) -> None
+        """
+        Set the time budget (in milliseconds) of a single `Predictive`
+        creation slice.
+
+        No widget creation is started after the budget is spent (but at
+        least one widget is created in each slice).
+        """
+        self.__predictive_slice_budget = msec
+
+    def predictive_slice_budget(self):
+        # type: () -> int
+        return self.__predictive_slice_budget
+
+    def set_predictive_limit(self, limit):
+        # type: (Optional[int]) -> None
+        """
+        Set the maximum number of widgets created in advance with the
+        `Predictive` creation policy (`None` for no limit).
+        """
+        self.__predictive_limit = limit
+        if self.__creation_policy == WidgetManager.Predictive and \
+                self.__init_queue and not self.__init_timer.isActive():
+            self.__init_timer.start()
+
+    def predictive_limit(self):
+        # type: () -> Optional[int]
+        return self.__predictive_limit
+
     def create_widget_for_node(self, node):
         # type: (SchemeNode) -> QWidget
         """
@@ -364,7 +443,8 @@ class WidgetManager(QObject):
             self.ensure_created(node)
         else:
             self.__init_queue.append(node)
-            if self.__creation_policy == WidgetManager.Normal:
+            if self.__creation_policy in (WidgetManager.Normal,
+                                          WidgetManager.Predictive):
                 self.__init_timer.start()
 
     def __on_node_removed(self, node):  # type: (SchemeNode) -> None
@@ -377,6 +457,7 @@ class WidgetManager(QObject):
         node.removeEventFilter(self)
         if node in self.__init_queue:
             self.__init_queue.remove(node)
+        self.__precreated.discard(node)
         item = self.__item_for_node.get(node)
 
         if item is not None and item.widget is not None:
@@ -395,7 +476,9 @@ class WidgetManager(QObject):
 
     @Slot()
     def __process_init_queue(self):
-        if self.__init_queue:
+        if self.__creation_policy == WidgetManager.Predictive:
+            self.__process_predictive_slice()
+        elif self.__init_queue:
             node = self.__init_queue.popleft()
             assert self.__workflow is not None
             assert node in self.__workflow.nodes
@@ -406,6 +489,59 @@ class WidgetManager(QObject):
                 if self.__init_queue:
                     self.__init_timer.start()
 
+    def __predictive_limit_reached(self):
+        # type: () -> bool
+        limit = self.__predictive_limit
+        return limit is not None and len(self.__precreated) >= limit
+
+    def __process_predictive_slice(self):
+        # Create widgets in the priority order until the slice's time
+        # budget is spent.
+        if not self.__init_queue or self.__predictive_limit_reached():
+            return
+        start = time.perf_counter()
+        budget = self.__predictive_slice_budget / 1000
+        priority = self.__creation_priority
+        if priority is None:
+            priority = self.__default_creation_priority
+        if isinstance(priority, _SlicePriority):
+            # evaluate the priority's state once for the whole slice
+            priority = priority.factory()
+        # stable sort; equal priorities are created in the queue order
+        order = sorted(self.__init_queue, key=priority, reverse=True)
+        try:
+            for node in order:
+                if self.__predictive_limit_reached():
+                    break
+                if node not in self.__init_queue:
+                    # created or removed in the meantime
+                    continue
+                log.debug("__process_predictive_slice: '%s'", node.title)
+                # note: ensure_created removes the node from the init queue
+                self.ensure_created(node)
+                self.__precreated.add(node)
+                if time.perf_counter() - start >= budget:
+                    break
+        finally:
+            if self.__init_queue and not self.__predictive_limit_reached():
+                self.__init_timer.start()
+
+    def __default_creation_priority(self, node):
+        # type: (SchemeNode) -> int
+        # the activation order of the most recently activated linked widget
+        workflow = self.__workflow
+        assert workflow is not None
+        orders = [-1]
+        for link in workflow.find_links(source_node=node):
+            item = self.__item_for_node.get(link.sink_node)
+            if item is not None:
+                orders.append(item.activation_order)
+        for link in workflow.find_links(sink_node=node):
+            item = self.__item_for_node.get(link.source_node)
+            if item is not None:
+                orders.append(item.activation_order)
+        return max(orders)
+
     def __mark_activated(self, widget):  # type: (QWidget) ->  None
         # Update the tracked stacking order for `widget`
         item = self.__item_for_widget.get(widget)
@@ -690,6 +826,69 @@ class WidgetManager(QObject):
         return []
 
 
+def adjacent_nodes_priority(workflow, nodes):
+    # type: (Scheme, Callable[[], Collection[SchemeNode]]) -> Callable[[SchemeNode], int]
+    """
+    Return a creation priority function (see
+    :func:`WidgetManager.set_creation_priority`) preferring the nodes in or
+    linked to the nodes returned by `nodes` (e.g. the current selection).
+
+    Parameters
+    ----------
+    workflow : Scheme
+    nodes : Callable[[], Collection[SchemeNode]]
+    """
+    def factory():
+        # type: () -> Callable[[SchemeNode], int]
+        focus = set(nodes())
+        adjacent = set()
+        for node in focus:
+            adjacent.update(link.sink_node for link in
+                            workflow.find_links(source_node=node))
+            adjacent.update(link.source_node for link in
+                            workflow.find_links(sink_node=node))
+
+        def priority(node):
+            # type: (SchemeNode) -> int
+            if node in focus:
+                return 2
+            elif node in adjacent:
+                return 1
+            else:
+                return 0
+        return priority
+    return _SlicePriority(factory)
+
+
+class _SlicePriority:
+    """
+    A creation priority whose state is evaluated once per creation slice.
+
+    `factory` is called at the start of each `Predictive` creation slice
+    and returns the `node -> key` function used for the slice.
+    """
+    def __init__(self, factory):
+        # type: (Callable[[], Callable[[SchemeNode], Any]]) -> None
+        self.factory = factory
+
+    def __call__(self, node):
+        # type: (SchemeNode) -> Any
+        return self.factory()(node)
+
+
+def pending_inputs_priority(signal_manager):
+    # type: (Any) -> Callable[[SchemeNode], bool]
+    """
+    Return a creation priority function (see
+    :func:`WidgetManager.set_creation_priority`) preferring the nodes with
+    pending inputs in the `signal_manager` (:class:`SignalManager`).
+    """
+    def priority(node):
+        # type: (SchemeNode) -> bool
+        return signal_manager.is_pending(node)
+    return priority
+
+
 # Utility class used to preserve window stacking order.
 class ActivationMonitor(QObject):
     """
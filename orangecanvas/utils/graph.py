@@ -1,14 +1,286 @@
-import itertools
+"""
+Graph algorithms.
+
+:class:`Graph` is an immutable directed graph stored in a compressed sparse
+row (CSR) layout (the nodes are mapped to consecutive integers and the
+successors of all nodes are stored in a single `array`), suitable for
+building once and querying many times. All algorithms are iterative (no
+recursion limit on deep graphs).
+
+The functions :func:`traverse_bf` and :func:`strongly_connected_components`
+work on graphs defined by an `expand` function.
+"""
+from array import array
 from collections import deque
-from typing import TypeVar, Iterable, Callable, Set, List, Hashable
+from typing import (
+    TypeVar, Iterable, Callable, Set, List, Hashable, Generic, Tuple,
+    Sequence, Optional, Iterator
+)
 
 __all__ = [
-    "traverse_bf", "strongly_connected_components"
+    "Graph", "traverse_bf", "strongly_connected_components"
 ]
 
 H = TypeVar("H", bound=Hashable)
 
 
+class Graph(Generic[H]):
+    """
+    An immutable directed graph with hashable `nodes` and `edges`.
+
+    The order of nodes and of each node's successors (the order of
+    `edges`) is preserved. Parallel edges are allowed.
+
+    Parameters
+    ----------
+    nodes : Iterable[H]
+        The graph nodes.
+    edges : Iterable[Tuple[H, H]]
+        The (source, target) edges. Both must be in `nodes`.
+    """
+    __slots__ = ("__nodes", "__index", "__offsets", "__targets",
+                 "__reversed")
+
+    def __init__(self, nodes=(), edges=()):
+        # type: (Iterable[H], Iterable[Tuple[H, H]]) -> None
+        self.__nodes = tuple(nodes)  # type: Tuple[H, ...]
+        self.__index = {node: i for i, node in enumerate(self.__nodes)}
+        if len(self.__index) != len(self.__nodes):
+            raise ValueError("Duplicate nodes")
+        index = self.__index
+        try:
+            pairs = [(index[source], index[target])
+                     for source, target in edges]
+        except KeyError as err:
+            raise ValueError("{!r} is not a node".format(err.args[0])) \
+                from None
+        self.__offsets, self.__targets = _csr(len(self.__nodes), pairs)
+        self.__reversed = None  # type: Optional[Graph[H]]
+
+    @classmethod
+    def from_expand(cls, nodes, expand):
+        # type: (Iterable[H], Callable[[H], Iterable[H]]) -> Graph[H]
+        """
+        Create a graph from `nodes` and an `expand` function returning the
+        successors of a node.
+
+        Nodes reachable from `nodes` (by `expand`) are also included
+        (following `nodes` in the order they are first encountered).
+        """
+        nodes = list(nodes)
+        seen = set(nodes)
+        edges = []  # type: List[Tuple[H, H]]
+        i = 0
+        while i < len(nodes):
+            node = nodes[i]
+            for succ in expand(node):
+                edges.append((node, succ))
+                if succ not in seen:
+                    seen.add(succ)
+                    nodes.append(succ)
+            i += 1
+        return cls(nodes, edges)
+
+    @property
+    def nodes(self):
+        # type: () -> Tuple[H, ...]
+        """The graph nodes."""
+        return self.__nodes
+
+    def edges(self):
+        # type: () -> Iterator[Tuple[H, H]]
+        """Iterate over all the (source, target) edges."""
+        nodes, offsets, targets = self.__nodes, self.__offsets, self.__targets
+        for i, node in enumerate(nodes):
+            for j in range(offsets[i], offsets[i + 1]):
+                yield node, nodes[targets[j]]
+
+    def __len__(self):
+        # type: () -> int
+        return len(self.__nodes)
+
+    def __contains__(self, node):
+        # type: (H) -> bool
+        return node in self.__index
+
+    def index(self, node):
+        # type: (H) -> int
+        """Return the integer index of `node`."""
+        return self.__index[node]
+
+    def successors(self, node):
+        # type: (H) -> List[H]
+        """Return the successors of `node`."""
+        i = self.__index[node]
+        nodes, targets = self.__nodes, self.__targets
+        return [nodes[j] for j in
+                targets[self.__offsets[i]: self.__offsets[i + 1]]]
+
+    def predecessors(self, node):
+        # type: (H) -> List[H]
+        """Return the predecessors of `node`."""
+        return self.reversed().successors(node)
+
+    def reversed(self):
+        # type: () -> Graph[H]
+        """Return the graph with all edges reversed (cached)."""
+        if self.__reversed is None:
+            offsets, targets = self.__offsets, self.__targets
+            pairs = [(targets[j], i) for i in range(len(self.__nodes))
+                     for j in range(offsets[i], offsets[i + 1])]
+            rev = Graph.__new__(Graph)  # type: Graph[H]
+            rev.__nodes, rev.__index = self.__nodes, self.__index
+            rev.__offsets, rev.__targets = _csr(len(self.__nodes), pairs)
+            rev.__reversed = self
+            self.__reversed = rev
+        return self.__reversed
+
+    def traverse_bf(self, start):
+        # type: (H) -> Iterator[H]
+        """
+        Breadth first traversal of the graph starting from `start`.
+        """
+        nodes = self.__nodes
+        for i in self.__bf(self.__index[start]):
+            yield nodes[i]
+
+    def reachable(self, start):
+        # type: (H) -> Set[H]
+        """
+        Return a set of all nodes reachable from `start` (including
+        `start`).
+        """
+        nodes = self.__nodes
+        return {nodes[i] for i in self.__bf(self.__index[start])}
+
+    def __bf(self, start):
+        # type: (int) -> Iterator[int]
+        offsets, targets = self.__offsets, self.__targets
+        visited = bytearray(len(self.__nodes))
+        visited[start] = 1
+        queue = deque([start])
+        while queue:
+            i = queue.popleft()
+            yield i
+            for j in targets[offsets[i]: offsets[i + 1]]:
+                if not visited[j]:
+                    visited[j] = 1
+                    queue.append(j)
+
+    def topological_order(self):
+        # type: () -> List[H]
+        """
+        Return the nodes in a topological order.
+
+        Nodes are otherwise kept in the graph's order. Nodes in (or
+        reachable from) a cycle are appended at the end.
+        """
+        nodes, offsets, targets = self.__nodes, self.__offsets, self.__targets
+        n = len(nodes)
+        indegree = array("l", [0]) * n
+        for j in targets:
+            indegree[j] += 1
+        order = [i for i in range(n) if not indegree[i]]
+        k = 0
+        while k < len(order):
+            i = order[k]
+            for j in targets[offsets[i]: offsets[i + 1]]:
+                indegree[j] -= 1
+                if not indegree[j]:
+                    order.append(j)
+            k += 1
+        if len(order) < n:
+            seen = bytearray(n)
+            for i in order:
+                seen[i] = 1
+            order.extend(i for i in range(n) if not seen[i])
+        return [nodes[i] for i in order]
+
+    def strongly_connected_components(self):
+        # type: () -> List[List[H]]
+        """
+        Return a list of strongly connected components.
+
+        Iterative implementation of Tarjan's SCC algorithm. The components
+        are in reverse topological order (a component precedes all the
+        components it can be reached from).
+        """
+        nodes, offsets, targets = self.__nodes, self.__offsets, self.__targets
+        n = len(nodes)
+        # node -> int increasing node numbering as encountered in DFS
+        # traversal (-1 not yet visited)
+        index = array("l", [-1]) * n
+        # node -> int the lowest node index reachable from a node
+        lowlink = array("l", [0]) * n
+        onstack = bytearray(n)
+        stack = []       # type: List[int]
+        components = []  # type: List[List[H]]
+        counter = 0
+        # DFS 'call stack' of (node, position of the next edge to visit)
+        callstack = []   # type: List[Tuple[int, int]]
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            onstack[root] = 1
+            callstack.append((root, offsets[root]))
+            while callstack:
+                v, e = callstack[-1]
+                end = offsets[v + 1]
+                while e < end:
+                    w = targets[e]
+                    e += 1
+                    if index[w] == -1:
+                        # descend into w
+                        callstack[-1] = (v, e)
+                        index[w] = lowlink[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        onstack[w] = 1
+                        callstack.append((w, offsets[w]))
+                        break
+                    elif onstack[w] and index[w] < lowlink[v]:
+                        lowlink[v] = index[w]
+                else:
+                    # all successors of v are done
+                    callstack.pop()
+                    if lowlink[v] == index[v]:
+                        i = len(stack) - 1
+                        while stack[i] != v:
+                            i -= 1
+                        scc = stack[i:]
+                        del stack[i:]
+                        for w in scc:
+                            onstack[w] = 0
+                        components.append([nodes[w] for w in scc])
+                    if callstack:
+                        u = callstack[-1][0]
+                        if lowlink[v] < lowlink[u]:
+                            lowlink[u] = lowlink[v]
+        return components
+
+
+def _csr(n, pairs):
+    # type: (int, Sequence[Tuple[int, int]]) -> Tuple[array, array]
+    """
+    Return the CSR (offsets, targets) arrays for `n` nodes and
+    (source, target) index `pairs` (stable wrt. the order of `pairs`).
+    """
+    offsets = array("l", [0]) * (n + 1)
+    for source, _ in pairs:
+        offsets[source + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+    fill = array("l", offsets[:n])
+    targets = array("l", [0]) * len(pairs)
+    for source, target in pairs:
+        targets[fill[source]] = target
+        fill[source] += 1
+    return offsets, targets
+
+
 def traverse_bf(start, expand):
     # type: (H, Callable[[H], Iterable[H]]) -> Iterable[H]
     """
@@ -20,6 +292,10 @@ def traverse_bf(start, expand):
         A starting node
     expand : (H) -> Iterable[H]
         A function returning children of a node.
+
+    See also
+    --------
+    Graph.traverse_bf
     """
     queue = deque([start])
     visited = set()  # type: Set[H]
@@ -36,58 +312,10 @@ def strongly_connected_components(nodes, expand):
     """
     Return a list of strongly connected components.
 
-    Implementation of Tarjan's SCC algorithm.
+    Same as ``Graph.from_expand(nodes, expand).strongly_connected_components()``
+
+    See also
+    --------
+    Graph.strongly_connected_components
     """
-    # SCC found
-    components = []  # type: List[List[H]]
-    # node stack in BFS
-    stack = []       # type: List[H]
-    # == set(stack) : a set of all nodes in stack (for faster lookup)
-    stackset = set()
-
-    # node -> int increasing node numbering as encountered in DFS traversal
-    index = {}
-    # node -> int the lowest node index reachable from a node
-    lowlink = {}
-
-    indexgen = itertools.count()
-
-    def push_node(v):
-        # type: (H) -> None
-        """Push node onto the stack."""
-        stack.append(v)
-        stackset.add(v)
-        index[v] = lowlink[v] = next(indexgen)
-
-    def pop_scc(v):
-        # type: (H) -> List[H]
-        """Pop from the stack a SCC rooted at node v."""
-        i = stack.index(v)
-        scc = stack[i:]
-        del stack[i:]
-        stackset.difference_update(scc)
-        return scc
-
-    def isvisited(node):  # type: (H) -> bool
-        return node in index
-
-    def strong_connect(v):
-        # type: (H) -> None
-        push_node(v)
-
-        for w in expand(v):
-            if not isvisited(w):
-                strong_connect(w)
-                lowlink[v] = min(lowlink[v], lowlink[w])
-            elif w in stackset:
-                lowlink[v] = min(lowlink[v], index[w])
-
-        if index[v] == lowlink[v]:
-            scc = pop_scc(v)
-            components.append(scc)
-
-    for node in nodes:
-        if not isvisited(node):
-            strong_connect(node)
-
-    return components
+    return Graph.from_expand(nodes, expand).strongly_connected_components()
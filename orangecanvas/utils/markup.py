@@ -1,9 +1,10 @@
+import hashlib
+import threading
 from collections import OrderedDict
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from xml.sax.saxutils import escape
 
-from typing import Mapping, Callable
-
-import docutils.core
+from typing import Mapping, Callable, Optional, Tuple
 
 
 def render_plain(content: str) -> str:
@@ -74,6 +75,8 @@ def render_rst(content: str) -> str:
     -------
     html : str
     """
+    # Imported here; it is slow to import and only needed for rst content
+    import docutils.core
     overrides = {
         "report_level": 10,  # suppress errors from appearing in the html
         "output-encoding": "utf-8"
@@ -94,11 +97,122 @@ ContentRenderer = OrderedDict([
 ])  # type: Mapping[str, Callable[[str], str]]
 
 
-def render_as_rich_text(content: str, content_type="text/plain") -> str:
-    # split off the parameters (not supported)
-    content_type, _, _ = content_type.partition(";")
-    renderer = ContentRenderer.get(content_type.lower(), render_plain)
+def _render_as_rich_text(content: str, content_type: str) -> str:
+    renderer = ContentRenderer.get(content_type, render_plain)
     try:
         return renderer(content)
     except (ImportError, ValueError):
         return render_plain(content)
+
+
+class _RenderCache:
+    """
+    A thread safe LRU cache of rendered html keyed by the content type and
+    a hash of the content.
+    """
+    def __init__(self, maxsize=256):
+        # type: (int) -> None
+        self.maxsize = maxsize
+        self.__lock = threading.Lock()
+        self.__items = OrderedDict()  # type: OrderedDict[Tuple[str, bytes], str]
+
+    @staticmethod
+    def key(content: str, content_type: str) -> Tuple[str, bytes]:
+        digest = hashlib.sha1(content.encode("utf-8", "surrogatepass"))
+        return content_type, digest.digest()
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[str]:
+        with self.__lock:
+            html = self.__items.get(key)
+            if html is not None:
+                self.__items.move_to_end(key)
+            return html
+
+    def put(self, key: Tuple[str, bytes], html: str) -> None:
+        with self.__lock:
+            self.__items[key] = html
+            self.__items.move_to_end(key)
+            while len(self.__items) > self.maxsize:
+                self.__items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__items.clear()
+
+
+_render_cache = _RenderCache()
+
+#: Content types that are cheap to render (are never rendered asynchronously)
+_TRIVIAL_CONTENT_TYPES = {"text/plain", "text/html"}
+
+
+def _normalize_content_type(content_type: str) -> str:
+    # split off the parameters (not supported)
+    content_type, _, _ = content_type.partition(";")
+    return content_type.strip().lower()
+
+
+def render_as_rich_text(content: str, content_type="text/plain") -> str:
+    """
+    Render `content` of `content_type` as a html fragment.
+
+    The results are cached (see :func:`cached_rich_text`).
+    """
+    content_type = _normalize_content_type(content_type)
+    if content_type in _TRIVIAL_CONTENT_TYPES:
+        return _render_as_rich_text(content, content_type)
+    key = _render_cache.key(content, content_type)
+    html = _render_cache.get(key)
+    if html is None:
+        html = _render_as_rich_text(content, content_type)
+        _render_cache.put(key, html)
+    return html
+
+
+def cached_rich_text(content: str, content_type="text/plain") -> Optional[str]:
+    """
+    Return the rendered html for `content` if it is readily available
+    (cached or cheap to render), otherwise return None.
+    """
+    content_type = _normalize_content_type(content_type)
+    if content_type in _TRIVIAL_CONTENT_TYPES:
+        return _render_as_rich_text(content, content_type)
+    return _render_cache.get(_render_cache.key(content, content_type))
+
+
+_executor = None  # type: Optional[Executor]
+_executor_lock = threading.Lock()
+
+
+def _default_executor() -> Executor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="markup-render"
+            )
+        return _executor
+
+
+def render_as_rich_text_async(
+        content: str, content_type="text/plain", executor=None
+) -> 'Future[str]':
+    """
+    Render `content` of `content_type` as a html fragment in `executor`
+    (a shared single worker thread by default).
+
+    If the result is readily available (see :func:`cached_rich_text`) the
+    returned future is already done.
+
+    Returns
+    -------
+    html : Future[str]
+    """
+    html = cached_rich_text(content, content_type)
+    if html is not None:
+        f = Future()  # type: Future[str]
+        f.set_result(html)
+        return f
+    if executor is None:
+        executor = _default_executor()
+    return executor.submit(render_as_rich_text, content, content_type)
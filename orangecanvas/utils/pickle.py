@@ -6,12 +6,25 @@ from AnyQt.QtCore import QSettings
 
 from orangecanvas import config
 from ..scheme import Scheme, SchemeNode, SchemeLink, BaseSchemeAnnotation
+from ..scheme.propertystore import default_store
 
 
 class Pickler(pickle.Pickler):
     def __init__(self, file, document):
         super().__init__(file)
         self.document = document
+        self.store = default_store()
+
+    def reducer_override(self, obj):
+        # Store the (non clean) node properties as snapshots; value chunks
+        # shared between nodes (e.g. duplicated nodes) are written only once.
+        if isinstance(obj, SchemeNode):
+            reduced = obj.__reduce_ex__(pickle.DEFAULT_PROTOCOL)
+            description, title, position, properties, parent = reduced[2]
+            state = (description, title, position,
+                     self.store.snapshot(properties), parent)
+            return reduced[:2] + (state,) + reduced[3:]
+        return NotImplemented
 
     def persistent_id(self, obj):
         if isinstance(obj, Scheme):
@@ -4,23 +4,30 @@ import sys
 import re
 import json
 import email
+import threading
 from operator import itemgetter
 from urllib.parse import urlparse
 from urllib.request import url2pathname
-from typing import List, Dict, Optional, Union, cast
+from typing import List, Dict, Optional, Union, Tuple, Iterable, cast
 
 import packaging.version
 
 if sys.version_info < (3, 10):
-    from importlib_metadata import EntryPoint, Distribution, entry_points, PackageNotFoundError
+    from importlib_metadata import (
+        EntryPoint, EntryPoints, Distribution, PackageNotFoundError
+    )
 else:
-    from importlib.metadata import EntryPoint, Distribution, entry_points, PackageNotFoundError
+    from importlib.metadata import (
+        EntryPoint, EntryPoints, Distribution, PackageNotFoundError
+    )
 
 
 __all__ = [
     "Distribution", "EntryPoint", "entry_points", "normalize_name", "trim",
     "trim_leading_lines", "trim_trailing_lines", "parse_meta", "get_dist_meta",
-    "get_distribution", "develop_root", "get_dist_url"
+    "get_distribution", "develop_root", "get_dist_url",
+    "DistributionSnapshot", "distribution_snapshot",
+    "invalidate_distribution_snapshot",
 ]
 
 
@@ -170,8 +177,156 @@ def get_dist_meta(dist: Distribution) -> Dict[str, Union[str, List[str]]]:
     return meta
 
 
+def _dist_normalized_name(dist: Distribution) -> str | None:
+    name = getattr(dist, "_normalized_name", None)
+    if not name:
+        try:
+            name = dist.name
+        except Exception:  # broken/missing metadata
+            return None
+        if not name:
+            return None
+    return normalize_name(name)
+
+
+class DistributionSnapshot:
+    """
+    An immutable snapshot of installed distributions.
+
+    All distributions are discovered with a single pass over the import
+    machinery (every `sys.path` entry is walked only once) and are indexed
+    by their normalized name. Entry points of all distributions are
+    collected up front so group queries do not rescan the environment.
+
+    Parameters
+    ----------
+    distributions: Iterable[Distribution]
+        The distributions in `sys.path` precedence order. If a project is
+        present more than once, the first one found wins (same as
+        :func:`importlib.metadata.entry_points`).
+    """
+    def __init__(self, distributions: Iterable[Distribution]) -> None:
+        dists: Dict[str, Distribution] = {}
+        for dist in distributions:
+            name = _dist_normalized_name(dist)
+            if name is not None and name not in dists:
+                dists[name] = dist
+        self.__dists = dists
+        self.__entry_points = EntryPoints(
+            ep for dist in dists.values() for ep in dist.entry_points
+        )
+        self.__versions: Dict[str, str | None] = {}
+        self.__direct_urls: Dict[str, dict | None] = {}
+
+    def distributions(self) -> List[Distribution]:
+        """Return all distributions in the snapshot."""
+        return list(self.__dists.values())
+
+    def get(self, name: str) -> Optional[Distribution]:
+        """Return the distribution for project `name` or None."""
+        return self.__dists.get(normalize_name(name))
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_name(name) in self.__dists
+
+    def __len__(self) -> int:
+        return len(self.__dists)
+
+    def version(self, name: str) -> str | None:
+        """Return the installed version of project `name` or None."""
+        key = normalize_name(name)
+        try:
+            return self.__versions[key]
+        except KeyError:
+            pass
+        dist = self.__dists.get(key)
+        version = dist.version if dist is not None else None
+        self.__versions[key] = version
+        return version
+
+    def direct_url(self, name: str) -> dict | None:
+        """Return the PEP-0610 direct_url dict for project `name` or None."""
+        key = normalize_name(name)
+        try:
+            return self.__direct_urls[key]
+        except KeyError:
+            pass
+        dist = self.__dists.get(key)
+        url = _direct_url(dist) if dist is not None else None
+        self.__direct_urls[key] = url
+        return url
+
+    def entry_points(self, **params) -> EntryPoints:
+        """
+        Return entry points of all distributions matching `params` (as in
+        :func:`importlib.metadata.entry_points`).
+        """
+        if params:
+            return self.__entry_points.select(**params)
+        return self.__entry_points
+
+
+def _sys_path_fingerprint() -> Tuple[Tuple[str, int], ...]:
+    """
+    Return a fingerprint of `sys.path` entries and their modification times.
+
+    Installing or removing a distribution changes the contents and thus
+    the mtime of the directory it is installed into.
+    """
+    def mtime(path):
+        try:
+            return os.stat(path or ".").st_mtime_ns
+        except (OSError, ValueError, TypeError):
+            return -1
+    return tuple((path, mtime(path)) for path in sys.path
+                 if isinstance(path, str))
+
+
+_snapshot_lock = threading.Lock()
+_snapshot: Tuple[Tuple[Tuple[str, int], ...], DistributionSnapshot] | None = None
+
+
+def distribution_snapshot() -> DistributionSnapshot:
+    """
+    Return a (shared) snapshot of installed distributions.
+
+    The snapshot is cached and reused for as long as the `sys.path`
+    entries and their modification times do not change.
+    """
+    global _snapshot
+    fingerprint = _sys_path_fingerprint()
+    with _snapshot_lock:
+        if _snapshot is not None and _snapshot[0] == fingerprint:
+            return _snapshot[1]
+        snapshot = DistributionSnapshot(Distribution.discover())
+        _snapshot = (fingerprint, snapshot)
+        return snapshot
+
+
+def invalidate_distribution_snapshot() -> None:
+    """
+    Invalidate the cached snapshot (for instance after (un)installing
+    distributions in a way not reflected in `sys.path` mtimes).
+    """
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
+
+
+def entry_points(**params) -> EntryPoints:
+    """
+    Return entry points for all installed distributions selected by
+    `params`.
+
+    Same as :func:`importlib.metadata.entry_points` but served from the
+    shared :func:`distribution_snapshot`.
+    """
+    return distribution_snapshot().entry_points(**params)
+
+
 def get_distribution(name: str) -> Optional[Distribution]:
-    try:
-        return Distribution.from_name(name)
-    except PackageNotFoundError:
-        return None
+    """
+    Return the installed distribution for project `name` or None if it
+    is not installed.
+    """
+    return distribution_snapshot().get(name)
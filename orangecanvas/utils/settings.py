@@ -6,12 +6,15 @@ A more `dict` like interface for QSettings
 
 """
 import abc
+import bisect
+import copy
 import logging
 
 import typing
 from typing import List, Dict, Tuple, Union, Any, Type, Optional
 from collections import namedtuple
 from collections.abc import MutableMapping
+from contextlib import contextmanager
 
 from AnyQt.QtCore import QObject, QEvent, QCoreApplication, QSettings
 from AnyQt.QtCore import pyqtSignal as Signal
@@ -86,24 +89,145 @@ class _pickledvalue:
         raise RuntimeError("'_pickledvalue' instances should not be created")
 
 
+class SettingsNotifier(QObject):
+    """
+    A process wide notifier for changes written through :class:`Settings`.
+
+    Use :func:`SettingsNotifier.instance` to get the shared instance and
+    connect to :attr:`settingsChanged` to invalidate any values derived
+    from the settings.
+    """
+    #: Emitted with a list of (full) keys whose values were written or
+    #: removed by a `Settings` instance. A committed transaction emits this
+    #: only once with all the changed keys.
+    settingsChanged = Signal(list)
+
+    __instance = None  # type: Optional[SettingsNotifier]
+
+    @classmethod
+    def instance(cls):
+        # type: () -> SettingsNotifier
+        if cls.__instance is None:
+            cls.__instance = cls()
+        return cls.__instance
+
+
+#: Sentinel for a key missing from the store (cached negative lookup) or
+#: removed in a pending transaction.
+_MISSING = object()
+
+
+class _SettingsState:
+    """
+    State shared between a :class:`Settings` instance and its groups.
+    """
+    def __init__(self, store):
+        # type: (QSettings) -> None
+        self.store = store
+        #: A read-through cache of stored values (fullkey -> value or
+        #: _MISSING).
+        self.cache = {}  # type: Dict[str, Any]
+        #: Sorted list of all stored keys (or None if not yet read)
+        self.keys = None  # type: Optional[List[str]]
+        #: Incremented on every change to the stored keys
+        self.version = 0
+        #: Transaction nesting depth
+        self.depth = 0
+        #: Writes pending the transaction commit (fullkey -> value or
+        #: _MISSING for removed)
+        self.pending = {}  # type: Dict[str, Any]
+        #: Deferred change events (target, key) -> [etype, value, oldValue]
+        self.events = {}  # type: Dict[Tuple[int, str], list]
+        #: Set while this state is emitting the global notification
+        self.notifying = False
+
+    def invalidate(self, keys=None):
+        # type: (Optional[List[str]]) -> None
+        if keys is None:
+            self.cache.clear()
+        else:
+            for key in keys:
+                self.cache.pop(key, None)
+        # Writes pending in a transaction are not yet in the store.
+        self.cache.update(self.pending)
+        # The key set might have changed.
+        self.keys = None
+        self.version += 1
+
+    def allkeys(self):
+        # type: () -> List[str]
+        if self.keys is None:
+            keys = set(self.store.allKeys())
+            for key, value in self.pending.items():
+                if value is _MISSING:
+                    keys.discard(key)
+                else:
+                    keys.add(key)
+            self.keys = sorted(keys)
+        return self.keys
+
+    def setkey(self, fullkey, present):
+        # type: (str, bool) -> None
+        keys = self.keys
+        if keys is not None:
+            i = bisect.bisect_left(keys, fullkey)
+            exists = i < len(keys) and keys[i] == fullkey
+            if present and not exists:
+                keys.insert(i, fullkey)
+            elif not present and exists:
+                del keys[i]
+            else:
+                return
+        self.version += 1
+
+    def hasprefix(self, prefix):
+        # type: (str) -> bool
+        keys = self.allkeys()
+        i = bisect.bisect_left(keys, prefix)
+        return i < len(keys) and keys[i].startswith(prefix)
+
+
+def _copy_value(value):
+    # Do not hand out the cached mutable containers.
+    if isinstance(value, (list, dict, set)):
+        return copy.copy(value)
+    return value
+
+
 class Settings(QObject, MutableMapping, metaclass=QABCMeta):
     """
     A `dict` like interface to a QSettings store.
+
+    The stored values are cached in memory (the cache is shared with all
+    groups created by :func:`group`). Writes made through other `Settings`
+    instances invalidate the cache (see :class:`SettingsNotifier`); use
+    :func:`invalidate` if the store is modified directly.
     """
     valueChanged = Signal(str, object)
     valueAdded = Signal(str, object)
     keyRemoved = Signal(str)
 
-    def __init__(self, parent=None, defaults=(), path=None, store=None):
+    def __init__(self, parent=None, defaults=(), path=None, store=None,
+                 **kwargs):
         super().__init__(parent)
-        if store is None:
-            store = QSettings()
-
+        state = kwargs.pop("_state", None)  # type: Optional[_SettingsState]
+        if kwargs:
+            raise TypeError("Unexpected keyword arguments: {}"
+                            .format(", ".join(kwargs)))
+        if state is None:
+            if store is None:
+                store = QSettings()
+            state = _SettingsState(store)
+            SettingsNotifier.instance().settingsChanged.connect(
+                self.__onSettingsChanged
+            )
         path = (path or "").rstrip("/")
 
         self.__path = path
         self.__defaults = dict([(slot.key, slot) for slot in defaults])
-        self.__store = store
+        self.__state = state
+        self.__store = state.store
+        self.__iterCache = (-1, [])  # type: Tuple[int, List[str]]
 
     def __key(self, key):
         """
@@ -114,6 +238,128 @@ class Settings(QObject, MutableMapping, metaclass=QABCMeta):
         else:
             return key
 
+    def __stored(self, fullkey):
+        """
+        Return the stored value for `fullkey` or _MISSING if not stored.
+        """
+        cache = self.__state.cache
+        try:
+            return cache[fullkey]
+        except KeyError:
+            pass
+        if self.__store.contains(fullkey):
+            slot = self.__defaults.get(fullkey, None)
+            value = self.__value(fullkey, slot.value_type if slot else None)
+        else:
+            value = _MISSING
+        cache[fullkey] = value
+        return value
+
+    def __write(self, fullkey, value):
+        """
+        Write (or remove if `value` is _MISSING) the `fullkey` value.
+        """
+        state = self.__state
+        state.cache[fullkey] = value
+        state.setkey(fullkey, value is not _MISSING)
+        state.pending[fullkey] = value
+
+    def __post(self, etype, key, value, oldValue):
+        """
+        Send (or defer if in a transaction) the change event.
+        """
+        state = self.__state
+        if state.depth:
+            tkey = (id(self), key)
+            event = state.events.get(tkey)
+            if event is None:
+                state.events[tkey] = [self, etype, key, value, oldValue]
+            else:
+                # Coalesce; keep the first old value and the last value
+                first = event[1]
+                if etype == SettingChangedEvent.SettingRemoved:
+                    event[1] = etype
+                elif first == SettingChangedEvent.SettingRemoved:
+                    event[1] = SettingChangedEvent.SettingChanged
+                event[3] = value
+        else:
+            self.__commit(sync=False)
+            QCoreApplication.sendEvent(
+                self, SettingChangedEvent(etype, key, value, oldValue)
+            )
+
+    def __commit(self, sync=True):
+        state = self.__state
+        pending, state.pending = state.pending, {}
+        events, state.events = state.events, {}
+        store = self.__store
+        for fullkey, value in pending.items():
+            if value is _MISSING:
+                if store.contains(fullkey):
+                    store.remove(fullkey)
+            else:
+                store.setValue(fullkey, value)
+        if sync and pending:
+            store.sync()
+
+        for target, etype, key, value, oldValue in events.values():
+            if etype == SettingChangedEvent.SettingRemoved and \
+                    oldValue is None and value is None:
+                continue
+            QCoreApplication.sendEvent(
+                target, SettingChangedEvent(etype, key, value, oldValue)
+            )
+        if pending:
+            state.notifying = True
+            try:
+                SettingsNotifier.instance().settingsChanged.emit(list(pending))
+            finally:
+                state.notifying = False
+
+    @contextmanager
+    def transaction(self):
+        """
+        Return a context manager batching all writes (including writes
+        made through groups) until the (outermost) transaction exits.
+
+        The written values are readable immediately, but are only
+        written to the store on exit, followed by a single store sync.
+        Change events/signals are sent once per changed key and
+        :class:`SettingsNotifier` emits a single notification.
+
+        .. note:: There is no rollback. Writes are committed even if
+                  the block exits with an exception.
+
+        Example
+        -------
+        >>> with settings.transaction():
+        ...     settings["a"] = 1
+        ...     settings["b"] = 2
+        """
+        state = self.__state
+        state.depth += 1
+        try:
+            yield self
+        finally:
+            state.depth -= 1
+            if state.depth == 0:
+                self.__commit()
+
+    def invalidate(self):
+        """
+        Invalidate the cached values.
+
+        Call this if the underlying store was modified directly (not
+        through a `Settings` instance).
+        """
+        self.__state.invalidate()
+
+    def __onSettingsChanged(self, keys):
+        # type: (List[str]) -> None
+        state = self.__state
+        if not state.notifying:
+            state.invalidate(keys)
+
     def __delitem__(self, key):
         """
         Delete the setting for key. If key is a group remove the
@@ -128,16 +374,17 @@ class Settings(QObject, MutableMapping, metaclass=QABCMeta):
 
         if self.isgroup(key):
             group = self.group(key)
-            for key in group:
-                del group[key]
+            with self.transaction():
+                for key in group:
+                    del group[key]
 
         else:
             fullkey = self.__key(key)
 
             oldValue = self.get(key)
 
-            if self.__store.contains(fullkey):
-                self.__store.remove(fullkey)
+            if self.__stored(fullkey) is not _MISSING:
+                self.__write(fullkey, _MISSING)
 
             newValue = None
             if fullkey in self.__defaults:
@@ -146,9 +393,7 @@ class Settings(QObject, MutableMapping, metaclass=QABCMeta):
             else:
                 etype = SettingChangedEvent.SettingRemoved
 
-            QCoreApplication.sendEvent(
-                self, SettingChangedEvent(etype, key, newValue, oldValue)
-            )
+            self.__post(etype, key, newValue, oldValue)
 
     def __value(self, fullkey, value_type):
         if value_type is None:
@@ -176,9 +421,9 @@ class Settings(QObject, MutableMapping, metaclass=QABCMeta):
 
         fullkey = self.__key(key)
         slot = self.__defaults.get(fullkey, None)
-
-        if self.__store.contains(fullkey):
-            value = self.__value(fullkey, slot.value_type if slot else None)
+        value = self.__stored(fullkey)
+        if value is not _MISSING:
+            value = _copy_value(value)
         elif slot is not None:
             value = slot.default_value
         else:
@@ -210,30 +455,31 @@ class Settings(QObject, MutableMapping, metaclass=QABCMeta):
             oldValue = None
             etype = SettingChangedEvent.SettingAdded
 
-        self.__store.setValue(fullkey, value)
-
-        QCoreApplication.sendEvent(
-            self, SettingChangedEvent(etype, key, value, oldValue)
-        )
+        self.__write(fullkey, _copy_value(value))
+        self.__post(etype, key, value, oldValue)
 
     def __contains__(self, key):
         """
         Return `True` if settings contain the `key`, False otherwise.
         """
         fullkey = self.__key(key)
-        return self.__store.contains(fullkey) or (fullkey in self.__defaults)
+        return fullkey in self.__defaults or \
+            self.__stored(fullkey) is not _MISSING
 
     def __iter__(self):
         """Return an iterator over over all keys.
         """
-        keys = self.__store.allKeys() + list(self.__defaults.keys())
-
-        if self.__path:
-            path = self.__path + "/"
-            keys = filter(lambda key: key.startswith(path), keys)
-            keys = [key[len(path):] for key in keys]
-
-        return iter(sorted(set(keys)))
+        version, keys = self.__iterCache
+        state = self.__state
+        if version != state.version or state.keys is None:
+            keys = state.allkeys() + list(self.__defaults.keys())
+            if self.__path:
+                path = self.__path + "/"
+                keys = [key[len(path):] for key in keys
+                        if key.startswith(path)]
+            keys = sorted(set(keys))
+            self.__iterCache = (state.version, keys)
+        return iter(keys)
 
     def __len__(self):
         return len(list(iter(self)))
@@ -242,7 +488,8 @@ class Settings(QObject, MutableMapping, metaclass=QABCMeta):
         if self.__path:
             path = "/".join([self.__path, path])
 
-        return Settings(self, self.__defaults.values(), path, self.__store)
+        return Settings(self, self.__defaults.values(), path, self.__store,
+                        _state=self.__state)
 
     def isgroup(self, key):
         """
@@ -251,7 +498,9 @@ class Settings(QObject, MutableMapping, metaclass=QABCMeta):
         if key not in self:
             raise KeyError("{0!r} is not a valid key".format(key))
 
-        return len(self.group(key)) > 0
+        prefix = self.__key(key) + "/"
+        return self.__state.hasprefix(prefix) or \
+            any(k.startswith(prefix) for k in self.__defaults)
 
     def isdefault(self, key):
         """
@@ -259,13 +508,23 @@ class Settings(QObject, MutableMapping, metaclass=QABCMeta):
         """
         if key not in self:
             raise KeyError(key)
-        return not self.__store.contains(self.__key(key))
+        return self.__stored(self.__key(key)) is _MISSING
 
     def clear(self):
         """
         Clear the settings and restore the defaults.
         """
+        state = self.__state
+        keys = list(state.allkeys())
+        state.pending.clear()
         self.__store.clear()
+        state.invalidate()
+        if keys:
+            state.notifying = True
+            try:
+                SettingsNotifier.instance().settingsChanged.emit(keys)
+            finally:
+                state.notifying = False
 
     def add_default_slot(self, default):
         """
@@ -283,11 +542,11 @@ class Settings(QObject, MutableMapping, metaclass=QABCMeta):
             etype = SettingChangedEvent.SettingChanged
             if not self.isdefault(key):
                 # Replacing a default value.
-                self.__store.remove(self.__key(key))
+                self.__write(self.__key(key), _MISSING)
 
         self.__defaults[key] = default
-        event = SettingChangedEvent(etype, key, value, oldValue)
-        QCoreApplication.sendEvent(self, event)
+        self.__state.version += 1
+        self.__post(etype, key, value, oldValue)
 
     def get_default_slot(self, key):
         return self.__defaults[self.__key(key)]
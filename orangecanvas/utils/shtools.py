@@ -1,12 +1,25 @@
-from typing import List, Optional, Generator
+from typing import List, Optional, Generator, IO, Callable
 
 import os
 import sys
+import shutil
 import tempfile
 import subprocess
 from contextlib import contextmanager
 
 
+def _get_umask():
+    # type: () -> int
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+#: The process umask, read once at import (the umask cannot be queried
+#: without setting it, which would race with other threads creating files).
+_UMASK = _get_umask()
+
+
 def python_process(
         args: List[str],
         script_name: Optional[str]=None,
@@ -148,3 +161,131 @@ def temp_named_file(
     finally:
         if delete:
             os.remove(name)
+
+
+@contextmanager
+def atomic_write(
+        filename: str, mode: str = "wb", fsync: bool = True,
+        before_replace: Optional[Callable[[], None]] = None, **kwargs
+) -> Generator[IO, None, None]:
+    """
+    Open a temporary file next to `filename` for writing and on successful
+    exit from the context atomically replace `filename` with it.
+
+    If the context exits with an error the temporary file is removed and
+    `filename` is left untouched. The new file inherits the permission
+    bits of the replaced file.
+
+    Parameters
+    ----------
+    filename: str
+        The target filename. If it is a symbolic link, the link target is
+        replaced.
+    mode: str
+        File open mode ("wb" or "w").
+    fsync: bool
+        Flush the file contents to disk before the rename.
+    before_replace: Optional[Callable[[], None]]
+        Called after the new contents were completely written (and
+        synced) immediately before `filename` is replaced (e.g. to rotate
+        backups with :func:`rotate_backups`). It is not called if the
+        write fails; if it raises `filename` is not replaced.
+    kwargs:
+        Passed to `open` (e.g. `encoding`)
+
+    Examples
+    --------
+    >>> with atomic_write("a.txt", "w", encoding="utf-8") as f:
+    ...     f.write("Hello")
+    """
+    if mode not in ("w", "wb", "wt"):
+        raise ValueError("invalid mode: {!r}".format(mode))
+    filename = os.path.realpath(filename)
+    dirname, basename = os.path.split(filename)
+    fd, tmpname = tempfile.mkstemp(
+        prefix="." + basename + ".", suffix=".tmp", dir=dirname
+    )
+    try:
+        with open(fd, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        try:
+            mode_ = os.stat(filename).st_mode & 0o777
+        except FileNotFoundError:
+            mode_ = 0o666 & ~_UMASK
+        os.chmod(tmpname, mode_)
+        if before_replace is not None:
+            before_replace()
+        os.replace(tmpname, filename)
+    except BaseException:
+        try:
+            os.remove(tmpname)
+        except OSError:
+            pass
+        raise
+    if fsync:
+        _fsync_dir(dirname)
+
+
+def _fsync_dir(dirname):
+    # type: (str) -> None
+    # Make the rename itself durable (POSIX only; directories cannot be
+    # opened on Windows).
+    if os.name != "posix":
+        return
+    try:
+        fd = os.open(dirname, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def backup_name(filename: str, n: int) -> str:
+    """
+    Return the name of the `n`-th backup of `filename`.
+
+    >>> backup_name("a/b.ows", 2)
+    'a/b.2.ows'
+    """
+    base, ext = os.path.splitext(filename)
+    return "{}.{}{}".format(base, n, ext)
+
+
+def rotate_backups(filename: str, count: int) -> None:
+    """
+    Shift the existing backups of `filename` (see :func:`backup_name`) by
+    one, dropping the oldest, and make `filename` the first backup.
+
+    `filename` itself is left in place (the first backup is a hard link or,
+    where not supported, a copy), so it can be atomically replaced
+    afterwards (e.g. in the `before_replace` callback of
+    :func:`atomic_write`, so the backups are not rotated by failed
+    writes).
+
+    Parameters
+    ----------
+    filename: str
+        The file name.
+    count: int
+        The number of backups to keep.
+    """
+    if count <= 0 or not os.path.exists(filename):
+        return
+    for i in range(count - 1, 0, -1):
+        src = backup_name(filename, i)
+        if os.path.exists(src):
+            os.replace(src, backup_name(filename, i + 1))
+    first = backup_name(filename, 1)
+    if os.path.exists(first):
+        os.remove(first)
+    try:
+        os.link(filename, first)
+    except OSError:
+        shutil.copy2(filename, first)
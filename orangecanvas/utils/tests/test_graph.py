@@ -1,6 +1,73 @@
+import sys
+import random
+import itertools
 import unittest
 
-from orangecanvas.utils.graph import strongly_connected_components
+from orangecanvas.utils.graph import (
+    Graph, strongly_connected_components, traverse_bf
+)
+
+
+def scc_recursive(nodes, expand):
+    """
+    The previous recursive implementation of Tarjan's SCC algorithm (for
+    reference).
+    """
+    components = []
+    stack = []
+    stackset = set()
+    index = {}
+    lowlink = {}
+    indexgen = itertools.count()
+
+    def strong_connect(v):
+        stack.append(v)
+        stackset.add(v)
+        index[v] = lowlink[v] = next(indexgen)
+        for w in expand(v):
+            if w not in index:
+                strong_connect(w)
+                lowlink[v] = min(lowlink[v], lowlink[w])
+            elif w in stackset:
+                lowlink[v] = min(lowlink[v], index[w])
+        if index[v] == lowlink[v]:
+            i = stack.index(v)
+            scc = stack[i:]
+            del stack[i:]
+            stackset.difference_update(scc)
+            components.append(scc)
+
+    for node in nodes:
+        if node not in index:
+            strong_connect(node)
+    return components
+
+
+def random_dag(rng, n, m):
+    # m random forward edges over a random node order
+    order = list(range(n))
+    rng.shuffle(order)
+    graph = {i: [] for i in range(n)}
+    for _ in range(m if n > 1 else 0):
+        i = rng.randrange(n - 1)
+        j = rng.randrange(i + 1, n)
+        graph[order[i]].append(order[j])
+    return graph
+
+
+def random_cyclic(rng, n, m, back):
+    graph = random_dag(rng, n, m)
+    for _ in range(back):
+        graph[rng.randrange(n)].append(rng.randrange(n))
+    return graph
+
+
+def chain(n, back=()):
+    graph = {i: [i + 1] for i in range(n - 1)}
+    graph[n - 1] = []
+    for i, j in back:
+        graph[i].append(j)
+    return graph
 
 
 class TestSCC(unittest.TestCase):
@@ -41,3 +108,117 @@ class TestSCC(unittest.TestCase):
               8: [8]}
         scc = strongly_connected_components(G3, G3.__getitem__)
         self.assertEqual(scc, [[1, 2, 3], [6, 7], [4, 5], [8]])
+
+
+class TestGraph(unittest.TestCase):
+    def test_graph(self):
+        g = Graph("abcd", [("a", "b"), ("a", "c"), ("b", "c"), ("a", "b")])
+        self.assertEqual(g.nodes, ("a", "b", "c", "d"))
+        self.assertEqual(len(g), 4)
+        self.assertIn("d", g)
+        self.assertNotIn("e", g)
+        self.assertEqual(g.index("c"), 2)
+        self.assertEqual(g.successors("a"), ["b", "c", "b"])
+        self.assertEqual(g.successors("d"), [])
+        self.assertEqual(g.predecessors("c"), ["a", "b"])
+        self.assertEqual(list(g.edges()),
+                         [("a", "b"), ("a", "c"), ("a", "b"), ("b", "c")])
+        self.assertIs(g.reversed().reversed(), g)
+        self.assertEqual(list(g.traverse_bf("a")), ["a", "b", "c"])
+        self.assertEqual(g.reachable("b"), {"b", "c"})
+        self.assertEqual(g.reversed().reachable("c"), {"a", "b", "c"})
+        with self.assertRaises(ValueError):
+            Graph("ab", [("a", "c")])
+        with self.assertRaises(ValueError):
+            Graph("aa")
+
+    def test_topological_order(self):
+        g = Graph("abcd", [("c", "a"), ("a", "b"), ("c", "b"), ("c", "a")])
+        self.assertEqual(g.topological_order(), ["c", "d", "a", "b"])
+        # nodes in or downstream of a cycle are last
+        g = Graph("abcd", [("a", "b"), ("b", "a"), ("b", "c")])
+        self.assertEqual(g.topological_order(), ["d", "a", "b", "c"])
+
+    def test_from_expand(self):
+        G = {1: [2], 2: [3, 1], 3: [4], 4: []}
+        g = Graph.from_expand([2], G.__getitem__)
+        self.assertEqual(g.nodes, (2, 3, 1, 4))
+        self.assertEqual(list(g.edges()), [(2, 3), (2, 1), (3, 4), (1, 2)])
+
+    def test_scc_reference(self):
+        # Compare with the previous implementation on random graphs
+        rng = random.Random(42)
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, 5000))
+        try:
+            for _ in range(200):
+                n = rng.randrange(1, 300)
+                m = rng.randrange(0, 3 * n)
+                graphs = [
+                    random_dag(rng, n, m),
+                    random_cyclic(rng, n, m, rng.randrange(1, n + 1)),
+                ]
+                for G in graphs:
+                    nodes = list(G)
+                    rng.shuffle(nodes)
+                    self.assertEqual(
+                        strongly_connected_components(nodes, G.__getitem__),
+                        scc_recursive(nodes, G.__getitem__)
+                    )
+                    start = rng.choice(nodes)
+                    self.assertEqual(
+                        list(Graph.from_expand(nodes, G.__getitem__)
+                             .traverse_bf(start)),
+                        list(traverse_bf(start, G.__getitem__))
+                    )
+        finally:
+            sys.setrecursionlimit(limit)
+
+    def assertSCC(self, graph, components):
+        # `components` are the strongly connected components of `graph`
+        # in reverse topological order.
+        component = {node: i for i, scc in enumerate(components)
+                     for node in scc}
+        self.assertEqual(sum(map(len, components)), len(graph))
+        self.assertEqual(set(component), set(graph.nodes))
+        # no edges to later components (no cycles between components)
+        self.assertEqual([(u, v) for u, v in graph.edges()
+                          if component[u] < component[v]], [])
+        rev = graph.reversed()
+        for scc in filter(lambda scc: len(scc) > 1, components):
+            # all nodes in a component are mutually reachable (within the
+            # component)
+            members = set(scc)
+            for g in (graph, rev):
+                seen = {scc[0]}
+                queue = [scc[0]]
+                while queue:
+                    for v in g.successors(queue.pop()):
+                        if v not in seen and v in members:
+                            seen.add(v)
+                            queue.append(v)
+                self.assertEqual(seen, members)
+
+    def test_scc_large(self):
+        rng = random.Random(0)
+        n = 100000
+        graphs = [
+            chain(n),
+            chain(n, back=[(n - 1, 0)]),
+            chain(n, back=[(rng.randrange(n), rng.randrange(n))
+                           for _ in range(20)]),
+            random_dag(rng, n, 2 * n),
+            random_cyclic(rng, n, 2 * n, 50),
+        ]
+        results = []
+        for G in graphs:
+            graph = Graph.from_expand(G, G.__getitem__)
+            components = graph.strongly_connected_components()
+            self.assertSCC(graph, components)
+            start = rng.randrange(n)
+            self.assertEqual(list(graph.traverse_bf(start)),
+                             list(traverse_bf(start, G.__getitem__)))
+            results.append(components)
+
+        self.assertEqual(results[0], [[i] for i in reversed(range(n))])
+        self.assertEqual(results[1], [list(range(n))])
@@ -1,4 +1,9 @@
+import subprocess
+import sys
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
 from orangecanvas.utils import markup
 
 
@@ -33,3 +38,42 @@ class TestMarkup(unittest.TestCase):
         self.assertTrue(c.startswith("<"))
         c = markup.render_as_rich_text(RST, "text/plain")
         self.assertIn("<", c)
+
+    def test_cache(self):
+        cache = markup._RenderCache(maxsize=2)
+        with patch.object(markup, "_render_cache", cache), \
+                patch.object(markup, "render_rst",
+                             wraps=markup.render_rst) as render_rst, \
+                patch.dict(markup.ContentRenderer, {"text/rst": render_rst}):
+            self.assertIsNone(markup.cached_rich_text(RST, "text/rst"))
+            c = markup.render_as_rich_text(RST, "text/rst")
+            self.assertEqual(markup.render_as_rich_text(RST, "Text/RST"), c)
+            self.assertEqual(markup.cached_rich_text(RST, "text/rst"), c)
+            self.assertEqual(render_rst.call_count, 1)
+            markup.render_as_rich_text("a", "text/rst")
+            markup.render_as_rich_text("b", "text/rst")
+            # LRU eviction
+            self.assertIsNone(markup.cached_rich_text(RST, "text/rst"))
+            self.assertIsNotNone(markup.cached_rich_text("a", "text/rst"))
+            # trivial content types are always readily available
+            self.assertEqual(markup.cached_rich_text(HTML, "text/html"), HTML)
+
+    def test_async(self):
+        with patch.object(markup, "_render_cache", markup._RenderCache()), \
+                ThreadPoolExecutor(1) as executor:
+            f = markup.render_as_rich_text_async(
+                RST, "text/rst", executor=executor)
+            c = f.result(10)
+            self.assertEqual(c, markup.render_as_rich_text(RST, "text/rst"))
+            f = markup.render_as_rich_text_async(
+                RST, "text/rst", executor=executor)
+            self.assertTrue(f.done())
+            self.assertEqual(f.result(), c)
+
+    def test_lazy_import(self):
+        out = subprocess.check_output([
+            sys.executable, "-c",
+            "import sys; import orangecanvas.utils.markup; "
+            "print('docutils' in sys.modules, 'commonmark' in sys.modules)"
+        ])
+        self.assertEqual(out.strip(), b"False False")
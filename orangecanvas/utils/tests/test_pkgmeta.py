@@ -1,9 +1,14 @@
 import os
+import sys
+import tempfile
 from unittest import TestCase
+from unittest.mock import patch
 
+from orangecanvas.utils import pkgmeta
 from orangecanvas.utils.pkgmeta import (
     Distribution, normalize_name, is_develop_egg, get_dist_meta, parse_meta,
-    trim, develop_root,
+    trim, develop_root, distribution_snapshot, get_distribution, entry_points,
+    invalidate_distribution_snapshot,
 )
 
 
@@ -54,3 +59,61 @@ class TestPkgMeta(TestCase):
 
     def test_trim(self):
         self.assertEqual(trim("A\n    a\n    b"), "A\na\nb")
+
+
+class TestDistributionSnapshot(TestCase):
+    def tearDown(self):
+        invalidate_distribution_snapshot()
+
+    def test_snapshot(self):
+        snapshot = distribution_snapshot()
+        self.assertIn("AnyQt", snapshot)
+        self.assertIn("anyqt", snapshot)
+        self.assertIsNotNone(snapshot.version("AnyQt"))
+        self.assertEqual(snapshot.get("AnyQt").name, "AnyQt")
+        self.assertIsNone(snapshot.get("not-an-installed-distribution"))
+        self.assertIsNone(snapshot.version("not-an-installed-distribution"))
+        self.assertEqual(get_distribution("AnyQt").name, "AnyQt")
+        self.assertIsNone(get_distribution("not-an-installed-distribution"))
+
+    def test_snapshot_cached(self):
+        invalidate_distribution_snapshot()
+        discover = Distribution.discover
+        with patch.object(pkgmeta.Distribution, "discover",
+                          side_effect=discover) as m:
+            s1 = distribution_snapshot()
+            get_distribution("AnyQt")
+            get_distribution("not-an-installed-distribution")
+            entry_points(group="console_scripts")
+            self.assertIs(distribution_snapshot(), s1)
+            self.assertEqual(m.call_count, 1)
+            invalidate_distribution_snapshot()
+            self.assertIsNot(distribution_snapshot(), s1)
+            self.assertEqual(m.call_count, 2)
+
+    def test_snapshot_sys_path_change(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            sys.path.append(tmp)
+            try:
+                self.assertIsNone(get_distribution("foo-bar-pkgmeta"))
+                distinfo = os.path.join(tmp, "foo_bar_pkgmeta-1.0.dist-info")
+                os.mkdir(distinfo)
+                with open(os.path.join(distinfo, "METADATA"), "w") as f:
+                    f.write("Metadata-Version: 2.1\n"
+                            "Name: foo-bar-pkgmeta\n"
+                            "Version: 1.0\n")
+                with open(os.path.join(distinfo, "entry_points.txt"), "w") as f:
+                    f.write("[orangecanvas.test.group]\n"
+                            "foo = foo_bar_pkgmeta:main\n")
+                # force an mtime change in case of coarse fs timestamps
+                st = os.stat(tmp)
+                os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+                dist = get_distribution("foo_bar_pkgmeta")
+                self.assertIsNotNone(dist)
+                self.assertEqual(dist.version, "1.0")
+                eps = entry_points(group="orangecanvas.test.group")
+                self.assertEqual([ep.name for ep in eps], ["foo"])
+                self.assertEqual(list(eps)[0].dist.name, "foo-bar-pkgmeta")
+            finally:
+                sys.path.remove(tmp)
+        self.assertIsNone(get_distribution("foo-bar-pkgmeta"))
@@ -1,5 +1,6 @@
 import unittest
 import os
+from unittest import mock
 
 from orangecanvas import resources
 from orangecanvas.resources import icon_loader
@@ -22,3 +23,22 @@ class TestIconLoader(unittest.TestCase):
         self.assertTrue(os.path.isfile(path))
         icon = loader.get(":icons/CanvasIcon.png")
         self.assertTrue(not icon.isNull())
+
+    def test_loader_package_data(self):
+        loader = icon_loader([("", os.path.dirname(resources.__file__))])
+        loader.package = "orangecanvas"
+        name = "icons/Arrow.svg"
+        # package data can be unavailable (get_data returns None) or
+        # unreadable; the icon is still loaded from the file
+        for side_effect in [lambda *_: None, OSError, ImportError]:
+            with mock.patch("pkgutil.get_data", side_effect=side_effect):
+                icon = loader.get(name)
+                self.assertFalse(icon.isNull())
+                loader._icon_cache.clear()
+
+    def test_loader_default_icon(self):
+        loader = icon_loader([("", os.path.dirname(resources.__file__))])
+        loader.package = "orangecanvas"
+        # no name with a package (e.g. a widget description without icon)
+        self.assertFalse(loader.get(None).isNull())
+        self.assertFalse(loader.get("icons/no-such-icon.svg").isNull())
@@ -9,7 +9,7 @@ import logging
 
 from AnyQt.QtCore import QSettings
 from ..settings import Settings, config_slot, QSettings_readArray, \
-    QSettings_writeArray, QSettings_writeArrayItem
+    QSettings_writeArray, QSettings_writeArrayItem, SettingsNotifier
 from ...gui import test
 
 
@@ -104,6 +104,94 @@ class TestUserSettings(test.QAppTestCase):
         self.assertSetEqual(set(settings.keys()),
                             set(["foo", "bar", "foobar/foo"]))
 
+    def _store(self):
+        self.file = tempfile.NamedTemporaryFile(suffix=".ini")
+        self.addCleanup(self.file.close)
+        return QSettings(self.file.name, QSettings.IniFormat)
+
+    def test_cache(self):
+        store = self._store()
+        settings = Settings(defaults=[config_slot("a", int, 0, "")],
+                            store=store)
+        settings["b"] = [1, 2]
+        self.assertEqual(list(settings), ["a", "b"])
+        self.assertNotIn("c", settings)
+        # Modify the store directly; the cached value is still returned
+        store.setValue("b", [3])
+        store.setValue("c", 1)
+        self.assertEqual(settings["b"], [1, 2])
+        self.assertNotIn("c", settings)
+        settings.invalidate()
+        self.assertEqual(settings["b"], [3])
+        self.assertIn("c", settings)
+        self.assertEqual(list(settings), ["a", "b", "c"])
+        # cached values are not shared with the caller
+        settings["b"].append(4)
+        self.assertEqual(settings["b"], [3])
+
+        # Writes through another instance invalidate the cache
+        other = Settings(store=store)
+        other["b"] = [5]
+        other["a"] = 3
+        del other["c"]
+        self.assertEqual(settings["b"], [5])
+        self.assertEqual(settings["a"], 3)
+        self.assertNotIn("c", settings)
+        self.assertEqual(list(settings), ["a", "b"])
+
+        group = settings.group("g")
+        group["x"] = 1
+        self.assertEqual(settings["g/x"], 1)
+        self.assertEqual(list(settings), ["a", "b", "g/x"])
+        del group["x"]
+        self.assertNotIn("g/x", settings)
+        self.assertEqual(list(settings), ["a", "b"])
+
+    def test_transaction(self):
+        store = self._store()
+        settings = Settings(defaults=[config_slot("a", int, 0, "")],
+                            store=store)
+        group = settings.group("g")
+        changed, added, removed, notified = [], [], [], []
+        settings.valueChanged.connect(lambda *args: changed.append(args))
+        settings.valueAdded.connect(lambda *args: added.append(args))
+        settings.keyRemoved.connect(removed.append)
+        SettingsNotifier.instance().settingsChanged.connect(notified.append)
+        self.addCleanup(
+            SettingsNotifier.instance().settingsChanged.disconnect,
+            notified.append
+        )
+        with settings.transaction():
+            settings["a"] = 1
+            settings["a"] = 2
+            group["x"] = 1
+            group["x"] = 2
+            with settings.transaction():
+                settings["tmp"] = 1
+                del settings["tmp"]
+            # Values are visible but not yet written to the store
+            self.assertEqual(settings["a"], 2)
+            self.assertEqual(settings["g/x"], 2)
+            self.assertFalse(store.contains("a"))
+            self.assertEqual(changed, [])
+            self.assertEqual(added, [])
+            self.assertEqual(notified, [])
+
+        self.assertEqual(store.value("a", type=int), 2)
+        self.assertEqual(store.value("g/x", type=int), 2)
+        self.assertFalse(store.contains("tmp"))
+        self.assertEqual(changed, [("a", 2)])
+        self.assertEqual(added, [("g/x", 2)])
+        self.assertEqual(removed, [])
+        self.assertEqual(len(notified), 1)
+        self.assertSetEqual(set(notified[0]), {"a", "g/x", "tmp"})
+
+        # without a transaction every write notifies
+        settings["a"] = 3
+        settings["a"] = 4
+        self.assertEqual(changed[1:], [("a", 3), ("a", 4)])
+        self.assertEqual(notified[1:], [["a"], ["a"]])
+
 
 class TestQSettings_array(unittest.TestCase):
     filename = ""  # type: str
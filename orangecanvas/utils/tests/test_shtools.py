@@ -1,6 +1,10 @@
 import os
+import tempfile
 
-from orangecanvas.utils.shtools import python_process, temp_named_file
+from orangecanvas.utils.shtools import (
+    python_process, temp_named_file, atomic_write, rotate_backups,
+    backup_name, _UMASK
+)
 
 import unittest
 
@@ -25,3 +29,58 @@ class Test(unittest.TestCase):
                     c = f.read()
                     self.assertEqual(c, content)
             self.assertFalse(os.path.exists(fname))
+
+    def test_atomic_write(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "a.txt")
+            with atomic_write(fname, "w", encoding="utf-8") as f:
+                f.write("Hello")
+                self.assertFalse(os.path.exists(fname))
+            with open(fname, encoding="utf-8") as f:
+                self.assertEqual(f.read(), "Hello")
+            with self.assertRaises(ValueError):
+                with atomic_write(fname, "wb") as f:
+                    f.write(b"World")
+                    raise ValueError
+            with open(fname, encoding="utf-8") as f:
+                self.assertEqual(f.read(), "Hello")
+            self.assertEqual(os.listdir(tmpdir), ["a.txt"])
+
+    def test_rotate_backups(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "a.ows")
+            rotate_backups(fname, 2)  # no file yet
+            self.assertEqual(os.listdir(tmpdir), [])
+            for i in range(4):
+                with atomic_write(fname, "w",
+                                  before_replace=lambda: rotate_backups(fname, 2)) as f:
+                    f.write(str(i))
+
+            def read(name):
+                with open(name) as f:
+                    return f.read()
+            self.assertEqual(read(fname), "3")
+            self.assertEqual(read(backup_name(fname, 1)), "2")
+            self.assertEqual(read(backup_name(fname, 2)), "1")
+            self.assertEqual(len(os.listdir(tmpdir)), 3)
+
+    @unittest.skipUnless(os.name == "posix", "POSIX permission bits")
+    def test_atomic_write_mode(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "a.txt")
+            umask = os.umask(0o022)
+            try:
+                with atomic_write(fname, "w") as f:
+                    f.write("a")
+                # the umask is not changed by atomic_write
+                self.assertEqual(os.umask(0o022), 0o022)
+            finally:
+                os.umask(umask)
+            # new file: 0o666 & ~umask (umask as read at import)
+            self.assertEqual(os.stat(fname).st_mode & 0o777,
+                             0o666 & ~_UMASK)
+            # existing file: its permission bits are preserved
+            os.chmod(fname, 0o640)
+            with atomic_write(fname, "w") as f:
+                f.write("b")
+            self.assertEqual(os.stat(fname).st_mode & 0o777, 0o640)
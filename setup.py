@@ -18,7 +18,7 @@ AUTHOR_EMAIL = 'contact@orange.biolab.si'
 
 LICENSE = "GPLv3"
 DOWNLOAD_URL = 'https://github.com/biolab/orange-canvas-core'
-PACKAGES = find_packages()
+PACKAGES = find_packages(exclude=["benchmarks", "benchmarks.*"])
 
 PACKAGE_DATA = {
     "orangecanvas": ["icons/*.svg", "icons/*png"],